@@ -0,0 +1,115 @@
+# body_metrics.py
+
+import zlib
+from typing import Dict, Any
+
+CHUNK_SIZE = 64 * 1024
+
+# Bytes that are not UTF-8 continuation bytes (0x80-0xBF), deleted to count the continuation bytes in C
+_NON_CONTINUATION = bytes(byte for byte in range(256) if not 0x80 <= byte <= 0xBF)
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+# Maps whitespace to b" " and every other byte to b"x", so word starts are the b" x" pairs
+_WORD_TABLE = bytes(0x20 if byte in _WHITESPACE else 0x78 for byte in range(256))
+
+class BodyMetrics:
+    """
+    BodyMetrics computes size, line, word and character counts and a hash of a response body incrementally, chunk by chunk.
+
+    Attributes:
+        bytes (int): Number of bytes fed.
+        chars (int): Number of characters, assuming UTF-8 (invalid sequences count one per lead byte).
+        lines (int): Number of lines, a trailing line without a newline included.
+        words (int): Number of whitespace separated words.
+
+    Methods:
+        feed(chunk: bytes) -> None
+        hexdigest() -> str
+        as_dict() -> Dict[str, Any]
+
+    Notes:
+        Every count is carried across chunk boundaries (a word or a multi-byte character split
+        between two chunks is counted once), so feeding the body in any chunking gives the same
+        result as counting the whole body. Only a few bytes of state are kept per response: the
+        body itself never has to be held to compute its metrics. The hash is a running CRC-32,
+        several times cheaper than a cryptographic digest and enough to tell response bodies apart;
+        it matches ResponseFingerprint's body hash for UTF-8 bodies.
+    """
+
+    __slots__ = ("bytes", "chars", "lines", "words", "_crc", "_in_word", "_last_byte")
+
+    def __init__(self) -> None:
+        self.bytes = 0
+        self.chars = 0
+        self.lines = 0
+        self.words = 0
+        self._crc = 0
+        self._in_word = False
+        self._last_byte = None
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        feed adds the next chunk of the body to the counts.
+        """
+        if not chunk:
+            return
+        self.bytes += len(chunk)
+        self.chars += len(chunk) - len(chunk.translate(None, _NON_CONTINUATION))
+        self.lines += chunk.count(b"\n")
+        mapped = chunk.translate(_WORD_TABLE)
+        self.words += mapped.count(b" x")
+        # A word at the start of the chunk has no whitespace before it, unless it continues the previous chunk's word
+        if not self._in_word and mapped[0] == 0x78:
+            self.words += 1
+        self._last_byte = chunk[-1]
+        self._in_word = self._last_byte not in _WHITESPACE
+        self._crc = zlib.crc32(chunk, self._crc)
+
+    def hexdigest(self) -> str:
+        return f"{self._crc:08x}"
+
+    def as_dict(self) -> Dict[str, Any]:
+        """
+        as_dict returns the final counts, including the last line when the body does not end with a newline.
+        """
+        lines = self.lines
+        if self._last_byte is not None and self._last_byte != ord("\n"):
+            lines += 1
+        return {
+            "bytes": self.bytes,
+            "chars": self.chars,
+            "lines": lines,
+            "words": self.words,
+            "hash": self.hexdigest()
+        }
+
+    @classmethod
+    def of(cls, body: bytes) -> "BodyMetrics":
+        metrics = cls()
+        metrics.feed(body)
+        return metrics
+
+async def read_body(response, chunk_size: int = CHUNK_SIZE, scanner=None, limit: int = None):
+    """
+    read_body reads an aiohttp response body chunk by chunk, computing its metrics in the same pass.
+
+    Args:
+        response (aiohttp.ClientResponse): Response whose body has not been read yet.
+        chunk_size ([int]): Maximum size of the chunks read from the stream.
+        scanner ([SignatureScanner]): Signature scanner fed every chunk; reading stops early once it reports the outcome decided.
+        limit ([int]): Maximum number of bytes read, the rest of the body is left unread.
+
+    Returns:
+        Tuple[bytes, BodyMetrics]: The raw body and its metrics, both covering only the part read when the scanner or the limit stopped it.
+    """
+    metrics = BodyMetrics()
+    chunks = []
+    async for chunk in response.content.iter_chunked(chunk_size):
+        if limit is not None:
+            chunk = chunk[:limit - metrics.bytes]
+        metrics.feed(chunk)
+        chunks.append(chunk)
+        if scanner is not None and scanner.feed(chunk):
+            break
+        if limit is not None and metrics.bytes >= limit:
+            break
+    return b"".join(chunks), metrics
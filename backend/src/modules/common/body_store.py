@@ -0,0 +1,127 @@
+# body_store.py
+
+import os
+import json
+import zlib
+import hashlib
+from typing import Dict, Any, Optional
+
+BODY_STORE_ROOT = os.path.join("src", "database", "bodies")
+
+class BodyStore:
+    """
+    BodyStore is a content-addressed store of compressed response bodies, with a reference table per job.
+
+    Attributes:
+        root (str): Directory holding the store: objects/ for the bodies and refs/ for the job tables.
+        compression_level (int): zlib compression level of the stored bodies.
+        stored (int): Number of bodies written by this instance.
+        deduplicated (int): Number of puts answered by a body already in the store.
+
+    Methods:
+        put(body: bytes) -> str
+        get(digest: str) -> Optional[bytes]
+        add_ref(job_id: str, result_id: Any, digest: str, content_type: str = None) -> None
+        save_refs(job_id: str) -> None
+        load_refs(job_id: str) -> Dict[str, Dict]
+        get_result_body(job_id: str, result_id: Any) -> Optional[Tuple[bytes, str]]
+        stats() -> Dict[str, int]
+
+    Notes:
+        Bodies are keyed by their SHA-256 and stored once, zlib compressed, under
+        objects/<first 2 hex digits>/<remaining digits>, so a thousand identical error pages cost a
+        single small file. Nothing but the digests seen so far is kept in memory: bodies go to disk
+        as soon as they are compressed and are decompressed from disk when read. Object files and reference
+        tables are written to a temporary file and os.replace'd, so a reader never sees a partial file.
+    """
+
+    def __init__(self, root: str = BODY_STORE_ROOT, compression_level: int = 6) -> None:
+        self.root = root
+        self.compression_level = compression_level
+        self.stored = 0
+        self.deduplicated = 0
+        self._known = set()
+        self._refs: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def _object_path(self, digest: str) -> str:
+        if len(digest) != 64 or any(char not in "0123456789abcdef" for char in digest):
+            raise ValueError(f"Invalid body digest: {digest}")
+        return os.path.join(self.root, "objects", digest[:2], digest[2:])
+
+    def _refs_path(self, job_id: str) -> str:
+        if not job_id or os.sep in job_id or "/" in job_id or job_id.startswith("."):
+            raise ValueError(f"Invalid job id: {job_id}")
+        return os.path.join(self.root, "refs", f"{job_id}.json")
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as file:
+            file.write(data)
+        os.replace(temporary, path)
+
+    def put(self, body: bytes) -> str:
+        """
+        put stores a body unless an identical one is already stored and returns its digest.
+        """
+        digest = hashlib.sha256(body).hexdigest()
+        if digest in self._known:
+            self.deduplicated += 1
+            return digest
+        path = self._object_path(digest)
+        if os.path.exists(path):
+            self.deduplicated += 1
+        else:
+            self._write_atomic(path, zlib.compress(body, self.compression_level))
+            self.stored += 1
+        self._known.add(digest)
+        return digest
+
+    def get(self, digest: str) -> Optional[bytes]:
+        """
+        get returns the body stored under a digest, None when there is none.
+
+        Raises:
+            ValueError: If the digest is malformed.
+        """
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as file:
+            return zlib.decompress(file.read())
+
+    def add_ref(self, job_id: str, result_id: Any, digest: str, content_type: str = None) -> None:
+        """
+        add_ref records that a result row of a job has the body stored under `digest`.
+        """
+        self._refs.setdefault(job_id, {})[str(result_id)] = {"digest": digest, "content_type": content_type}
+
+    def save_refs(self, job_id: str) -> None:
+        """
+        save_refs writes the reference table of a job, replacing any previous one.
+        """
+        refs = self._refs.pop(job_id, {})
+        self._write_atomic(self._refs_path(job_id), json.dumps(refs).encode("utf-8"))
+
+    def load_refs(self, job_id: str) -> Dict[str, Dict[str, Any]]:
+        path = self._refs_path(job_id)
+        if not os.path.exists(path):
+            return {}
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+
+    def get_result_body(self, job_id: str, result_id: Any):
+        """
+        get_result_body returns the (body, content type) captured for a result row of a job, None when there is none.
+        """
+        ref = self.load_refs(job_id).get(str(result_id))
+        if ref is None:
+            return None
+        body = self.get(ref["digest"])
+        if body is None:
+            return None
+        return body, ref.get("content_type")
+
+    def stats(self) -> Dict[str, int]:
+        return {"stored": self.stored, "deduplicated": self.deduplicated}
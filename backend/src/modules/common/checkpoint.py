@@ -0,0 +1,229 @@
+# checkpoint.py
+
+import os
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+CHECKPOINT_VERSION = 1
+
+class WorkCheckpoint:
+    """
+    WorkCheckpoint tracks which work items of a run are done and periodically persists the point to resume from.
+
+    Attributes:
+        path (str): JSON file the checkpoint is written to, None to keep it in memory only.
+        watermark (int): Index of the first work item not known to be done, every item before it is done.
+        in_flight (Set[int]): Items started and not done yet.
+        completed (Set[int]): Items done beyond the watermark.
+        interval (float): Minimum number of seconds between two periodic saves.
+        extra_state (Callable[[], Dict]): Returns additional small data saved with every checkpoint.
+        static_state (Dict): Data that does not change during the run (job id, config), written once next to the checkpoint.
+        results (Callable[[], List]): Returns the live list of results, whose new rows are appended next to the checkpoint.
+
+    Methods:
+        begin(index: int) -> None
+        complete(index: int) -> None
+        is_completed(index: int) -> bool
+        state() -> Dict[str, Any]
+        save() -> None
+        remove() -> None
+        sidecar_path(name: str) -> str
+        load(path: str) -> Optional[Dict[str, Any]]
+        from_state(path: str, state: Dict[str, Any], ...) -> WorkCheckpoint
+
+    Notes:
+        Concurrent workers complete items out of order, so the watermark only advances over a contiguous
+        run of done items and completions ahead of it are kept in a set, which stays about as small as the
+        number of workers. Resuming restarts at the watermark and skips the items already completed ahead of
+        it; items that were in flight are sent again. Saves are atomic: the JSON is written to a temporary
+        file in the same directory and os.replace'd over the previous checkpoint, so a crash mid-write never
+        leaves a truncated file behind.
+        The periodic save only holds the resume point, so its cost does not grow with the run: the static state
+        is written once to `<job>.config.json` and the results are appended to `<job>.results.jsonl`, one JSON
+        row per line, each save writing only the rows added since the previous one. The checkpoint records how
+        many rows and bytes of that file it covers, so rows appended by a save interrupted before the checkpoint
+        was replaced are ignored on load. A results list replaced or shortened (filters changed) is rewritten.
+    """
+
+    def __init__(
+        self,
+        path: str = None,
+        start_index: int = 0,
+        interval: float = 5.0,
+        extra_state: Callable[[], Dict[str, Any]] = None,
+        static_state: Dict[str, Any] = None,
+        results: Callable[[], List[Any]] = None
+    ) -> None:
+        self.path = path
+        self.watermark = start_index
+        self.in_flight = set()
+        self.completed = set()
+        self.interval = interval
+        self.extra_state = extra_state
+        self.static_state = static_state
+        self.results = results
+        self._last_save = time.monotonic()
+        self._static_saved = False
+        # The results list last written, with how many of its rows and bytes the results file holds
+        self._results_list = None
+        self._results_count = 0
+        self._results_offset = 0
+
+    def begin(self, index: int) -> None:
+        self.in_flight.add(index)
+
+    def complete(self, index: int) -> None:
+        """
+        complete marks an item done, advances the watermark over any contiguous done items and saves if the interval elapsed.
+        """
+        self.in_flight.discard(index)
+        if index == self.watermark:
+            self.watermark += 1
+            while self.watermark in self.completed:
+                self.completed.discard(self.watermark)
+                self.watermark += 1
+        elif index > self.watermark:
+            self.completed.add(index)
+        if self.path and time.monotonic() - self._last_save >= self.interval:
+            self.save()
+
+    def is_completed(self, index: int) -> bool:
+        return index < self.watermark or index in self.completed
+
+    def state(self) -> Dict[str, Any]:
+        state = {
+            "version": CHECKPOINT_VERSION,
+            "watermark": self.watermark,
+            "in_flight": sorted(self.in_flight),
+            "completed": sorted(self.completed),
+            "saved_at": time.time()
+        }
+        if callable(self.results):
+            state["results_count"] = self._results_count
+            state["results_offset"] = self._results_offset
+        if callable(self.extra_state):
+            state.update(self.extra_state())
+        return state
+
+    def save(self) -> None:
+        """
+        save atomically writes the current state to the checkpoint file.
+        """
+        self._last_save = time.monotonic()
+        if not self.path:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if self.static_state is not None and not self._static_saved:
+            self._write_atomic(self.sidecar_path("config"), self.static_state)
+            self._static_saved = True
+        if callable(self.results):
+            self._append_results(self.results())
+        self._write_atomic(self.path, self.state())
+
+    def _append_results(self, rows: List[Any]) -> None:
+        """
+        _append_results writes the rows added since the last save to the results file, all of them when the list was replaced.
+        """
+        rewrite = rows is not self._results_list or len(rows) < self._results_count
+        if not rewrite and len(rows) == self._results_count:
+            return
+        start = 0 if rewrite else self._results_count
+        with open(self.sidecar_path("results"), "wb" if rewrite else "ab") as file:
+            if not rewrite:
+                # Drops rows of a save interrupted before its checkpoint was written
+                file.truncate(self._results_offset)
+            for row in rows[start:]:
+                file.write(json.dumps(row).encode("utf-8") + b"\n")
+            file.flush()
+            os.fsync(file.fileno())
+            self._results_offset = file.tell()
+        self._results_list = rows
+        self._results_count = len(rows)
+
+    @staticmethod
+    def _write_atomic(path: str, data: Dict[str, Any]) -> None:
+        temporary = f"{path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, path)
+
+    def sidecar_path(self, name: str) -> str:
+        return sidecar_path(self.path, name)
+
+    def remove(self) -> None:
+        """
+        remove deletes the checkpoint file and its config and results files, once the run it describes has finished.
+        """
+        if not self.path:
+            return
+        for path in (self.path, self.sidecar_path("config"), self.sidecar_path("results")):
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def load(path: str) -> Optional[Dict[str, Any]]:
+        """
+        load reads a checkpoint file with its config and results files, None when it does not exist.
+
+        Raises:
+            ValueError: If the file is not a checkpoint of a supported version.
+        """
+        if not path or not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as file:
+            try:
+                state = json.load(file)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Corrupted checkpoint {path}: {e}")
+        if not isinstance(state, dict) or state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format in {path}")
+        config_path = sidecar_path(path, "config")
+        if os.path.exists(config_path):
+            with open(config_path, "r", encoding="utf-8") as file:
+                state = {**json.load(file), **state}
+        if "results_count" in state:
+            state["results"] = []
+            results_path = sidecar_path(path, "results")
+            if os.path.exists(results_path):
+                with open(results_path, "rb") as file:
+                    data = file.read(state["results_offset"])
+                state["results"] = [json.loads(line) for line in data.splitlines()[:state["results_count"]]]
+            if len(state["results"]) != state["results_count"]:
+                raise ValueError(f"Checkpoint {path} is missing results")
+        return state
+
+    @classmethod
+    def from_state(
+        cls,
+        path: str,
+        state: Dict[str, Any],
+        interval: float = 5.0,
+        extra_state: Callable[[], Dict[str, Any]] = None,
+        static_state: Dict[str, Any] = None,
+        results: Callable[[], List[Any]] = None
+    ) -> "WorkCheckpoint":
+        """
+        from_state rebuilds a checkpoint from a loaded state, the in-flight items of the interrupted run counting as not done.
+        Its first save rewrites the results file from the results reloaded by the run.
+        """
+        checkpoint = cls(path, state.get("watermark", 0), interval, extra_state, static_state, results)
+        checkpoint.completed = {index for index in state.get("completed", []) if index >= checkpoint.watermark}
+        return checkpoint
+
+def sidecar_path(path: str, name: str) -> str:
+    """
+    sidecar_path returns the file stored next to a checkpoint, `<job>.config.json` or `<job>.results.jsonl`.
+    """
+    base = path[:-len(".json")] if path.endswith(".json") else path
+    return f"{base}.{name}.jsonl" if name == "results" else f"{base}.{name}.json"
+
+def checkpoint_path(engine: str, job_id: str) -> str:
+    """
+    checkpoint_path returns where the checkpoint of a job is stored, under src/database/<engine>/checkpoints.
+    """
+    return os.path.join("src", "database", engine, "checkpoints", f"{job_id}.json")
@@ -0,0 +1,400 @@
+# http_archive.py
+
+import os
+import json
+import time
+import asyncio
+import hashlib
+from typing import Dict, Any, Optional
+from urllib.parse import urlencode
+from src.modules.common.http_response import HttpResponse
+
+RECORD_MAGIC = b"TRACE-ARCHIVE/1"
+# Archives named in job configurations are kept in this directory
+ARCHIVE_ROOT = os.path.join("src", "database", "archives")
+# Request headers set by the transport rather than the request itself, left out of the archive keys
+TRANSPORT_HEADERS = frozenset(("host", "content-length", "connection", "keep-alive", "transfer-encoding", "te"))
+
+class HttpArchive:
+    """
+    HttpArchive stores HTTP request/response exchanges in a compact append-only archive file with a side index.
+
+    Attributes:
+        path (str): Path of the archive file.
+        index_path (str): Path of the index file (archive path + ".idx").
+
+    Methods:
+        make_key(method: str, url: str, params: Dict = None, data: Any = None, headers: Dict = None) -> str
+        record(method: str, url: str, status: int, body: bytes, ...) -> None
+        record_error(method: str, url: str, error: str, ...) -> None
+        lookup(method: str, url: str, params: Dict = None, data: Any = None, headers: Dict = None) -> Optional[Dict]
+        close() -> None
+
+    Notes:
+        Each record is laid out WARC-style as a single header line
+        `TRACE-ARCHIVE/1 <meta length> <body length>\\r\\n`, followed by the JSON metadata
+        (request, status, headers, timing), the raw body bytes and a trailing `\\r\\n`.
+        The index file holds one JSON line per record mapping the request key to its offset,
+        so lookups only seek and read a single record. When the same request is recorded
+        more than once the latest record wins. A missing index is rebuilt by scanning the archive.
+        Transport errors are recorded too, with no status and the error message, so a replay fails
+        the same requests the recorded run did.
+        The request headers are part of the key (as a digest, transport headers aside), so a `Range` probe
+        and the full GET of a URL, or requests differing only by a fuzzed header value, are archived apart.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.index_path = path + ".idx"
+        self.index: Dict[str, int] = {}
+        self._archive_file = None
+        self._index_file = None
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Dict = None, data: Any = None, headers: Dict = None) -> str:
+        """
+        make_key builds the lookup key identifying a request in the archive.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            params ([Dict]): Query parameters sent alongside the URL.
+            data ([Any]): Request body as a dict, str or bytes.
+            headers ([Dict]): Request headers, names compared case-insensitively.
+
+        Returns:
+            str: "<METHOD> <url>[?<sorted query>] [<body digest>] [h:<headers digest>]".
+
+        Raises:
+            None
+
+        @requires method != "" and url != "";
+        @ensures result is identical for identical requests regardless of dict and header name ordering;
+        """
+        key = f"{method.upper()} {url}"
+        if params:
+            key += ("&" if "?" in url else "?") + urlencode(sorted(params.items()))
+        if data:
+            if isinstance(data, dict):
+                data = urlencode(sorted(data.items()))
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            key += " " + hashlib.sha1(data).hexdigest()
+        if headers:
+            fields = sorted(
+                f"{name.lower()}: {value}" for name, value in headers.items() if name.lower() not in TRANSPORT_HEADERS
+            )
+            if fields:
+                key += " h:" + hashlib.sha1("\r\n".join(fields).encode("utf-8")).hexdigest()
+        return key
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        body: bytes,
+        request_headers: Dict[str, str] = None,
+        response_headers: Dict[str, str] = None,
+        params: Dict = None,
+        data: Any = None,
+        elapsed: float = 0.0,
+        response_url: str = None,
+        error: str = None
+    ) -> None:
+        """
+        record appends a request/response exchange to the archive and its index.
+
+        Args:
+            method (str): HTTP method of the request.
+            url (str): Request URL.
+            status (int): Response status code (None for transport errors).
+            body (bytes): Raw response body.
+            request_headers ([Dict[str, str]]): Headers sent with the request.
+            response_headers ([Dict[str, str]]): Headers received with the response.
+            params ([Dict]): Query parameters of the request.
+            data ([Any]): Request body.
+            elapsed ([float]): Time in seconds between sending the request and reading the full body.
+            response_url ([str]): Final URL of the response after redirects.
+            error ([str]): Message of the transport error the request failed with, None when it got a response.
+
+        Returns:
+            None
+
+        Raises:
+            OSError: If the archive cannot be written.
+
+        @requires isinstance(body, bytes);
+        @ensures self.lookup(method, url, params, data, request_headers) is not None;
+        """
+        key = self.make_key(method, url, params, data, request_headers)
+        meta = json.dumps({
+            "key": key,
+            "method": method.upper(),
+            "url": url,
+            "response_url": response_url or url,
+            "status": status,
+            "request_headers": dict(request_headers or {}),
+            "response_headers": dict(response_headers or {}),
+            "elapsed": elapsed,
+            "error": error,
+            "recorded_at": time.time()
+        }).encode("utf-8")
+
+        if self._archive_file is None:
+            self._archive_file = open(self.path, "ab")
+            self._index_file = open(self.index_path, "a", encoding="utf-8")
+
+        offset = self._archive_file.seek(0, os.SEEK_END)
+        self._archive_file.write(RECORD_MAGIC + b" %d %d\r\n" % (len(meta), len(body)))
+        self._archive_file.write(meta)
+        self._archive_file.write(body)
+        self._archive_file.write(b"\r\n")
+        self._archive_file.flush()
+        self._index_file.write(json.dumps({"key": key, "offset": offset}) + "\n")
+        self._index_file.flush()
+        self.index[key] = offset
+
+    def record_error(
+        self,
+        method: str,
+        url: str,
+        error: str,
+        request_headers: Dict[str, str] = None,
+        params: Dict = None,
+        data: Any = None,
+        elapsed: float = 0.0
+    ) -> None:
+        """
+        record_error appends a request that failed without a response, carrying the error message.
+        """
+        self.record(method, url, None, b"", request_headers=request_headers, params=params, data=data, elapsed=elapsed, error=error)
+
+    def lookup(self, method: str, url: str, params: Dict = None, data: Any = None, headers: Dict = None) -> Optional[Dict]:
+        """
+        lookup returns the latest archived exchange matching the request.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            params ([Dict]): Query parameters.
+            data ([Any]): Request body.
+            headers ([Dict]): Request headers.
+
+        Returns:
+            Optional[Dict]: The record metadata with the raw body under "body", or None when the request was never recorded.
+
+        Raises:
+            ValueError: If the archive is corrupt at the indexed offset.
+
+        @ensures result is None or isinstance(result["body"], bytes);
+        """
+        offset = self.index.get(self.make_key(method, url, params, data, headers))
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            meta, body = self._read_record(f)
+        meta["body"] = body
+        return meta
+
+    def close(self) -> None:
+        """
+        close releases the archive and index file handles.
+        """
+        if self._archive_file is not None:
+            self._archive_file.close()
+            self._index_file.close()
+            self._archive_file = None
+            self._index_file = None
+
+    def _read_record(self, f) -> tuple:
+        """
+        _read_record reads one record starting at the current position of `f`.
+        """
+        header = f.readline()
+        parts = header.split()
+        if len(parts) != 3 or parts[0] != RECORD_MAGIC:
+            raise ValueError(f"Corrupt archive record in {self.path}")
+        meta_length, body_length = int(parts[1]), int(parts[2])
+        meta = json.loads(f.read(meta_length))
+        body = f.read(body_length)
+        f.read(2)
+        return meta, body
+
+    def _load_index(self) -> None:
+        """
+        _load_index loads the side index, rebuilding it from the archive if it is missing.
+        """
+        if not os.path.exists(self.path):
+            return
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.index[entry["key"]] = entry["offset"]
+            return
+
+        with open(self.path, "rb") as f, open(self.index_path, "w", encoding="utf-8") as index_file:
+            size = os.fstat(f.fileno()).st_size
+            while f.tell() < size:
+                offset = f.tell()
+                meta, _ = self._read_record(f)
+                self.index[meta["key"]] = offset
+                index_file.write(json.dumps({"key": meta["key"], "offset": offset}) + "\n")
+
+
+class ReplayHttpClient:
+    """
+    ReplayHttpClient serves HTTP responses from an HttpArchive instead of the network.
+
+    Attributes:
+        archive (HttpArchive): Archive to replay from.
+        replay_latency (bool): Whether to sleep for the recorded response time before returning.
+
+    Methods:
+        async def get(url: str, headers: dict = None, proxy: str = None) -> str
+        async def send(method: str, url: str, headers: Dict = None, cookies: Dict = None, data: Any = None, params: Dict = None, proxy: str = None, timeout: int = 5) -> Dict[str, Any]
+
+    Notes:
+        `get` mirrors the crawler's RealHTTPClient and `send` mirrors both the fuzzer and the DBF
+        AsyncHttpClient, so the same replay client can stand in for any of them.
+        Requests missing from the archive behave like transport errors of the live clients.
+    """
+
+    def __init__(self, archive: HttpArchive, replay_latency: bool = False) -> None:
+        self.archive = archive
+        self.replay_latency = replay_latency
+
+    async def _replay(self, method: str, url: str, params: Dict = None, data: Any = None, headers: Dict = None) -> Optional[Dict]:
+        record = self.archive.lookup(method, url, params, data, headers)
+        if record is not None and self.replay_latency and record.get("elapsed"):
+            await asyncio.sleep(record["elapsed"])
+        return record
+
+    async def get(self, url, headers=None, proxy=None):
+        """
+        get returns the archived body of a GET request to `url`.
+
+        Args:
+            url (str): The URL of the archived GET request.
+            headers (dict, optional): Headers of the archived request.
+            proxy (str, optional): Ignored, kept for interface compatibility.
+
+        Returns:
+            str: The archived response content.
+
+        Raises:
+            KeyError: If the request is not in the archive.
+            ConnectionError: If the request was recorded failing with a transport error.
+
+        @requires url != "";
+        @ensures response == string.
+        """
+        record = await self._replay("GET", url, headers=headers)
+        if record is None:
+            raise KeyError(f"No archived response for GET {url}")
+        if record.get("error") is not None:
+            raise ConnectionError(record["error"])
+        return record["body"].decode("utf-8", errors="replace")
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] = None,
+        cookies: Dict[str, str] = None,
+        data: Any = None,
+        params: Dict[str, str] = None,
+        proxy: str = None,
+        timeout: int = 5
+    ) -> Dict[str, Any]:
+        """
+        send() returns the archived response for the request in the same shape as AsyncHttpClient.send().
+
+        Args:
+            method (str): The HTTP method of the archived request.
+            url (str): The URL of the archived request.
+            headers (Optional[Dict[str, str]]): Headers of the archived request.
+            cookies, proxy, timeout: Ignored, kept for interface compatibility.
+            data (Optional[Any]): Body of the archived request.
+            params (Optional[Dict[str, str]]): Query parameters of the archived request.
+
+        Returns:
+            HttpResponse: The archived response, readable like the dict AsyncHttpClient used to return.
+
+        Raises:
+            None
+
+        @ensures "url" in result and "status" in result and "text" in result;
+        """
+        record = await self._replay(method, url, params, data, headers)
+        if record is None:
+            return HttpResponse.error(url, f"No archived response for {method.upper()} {url}")
+        if record.get("error") is not None:
+            return HttpResponse.error(url, record["error"])
+        return HttpResponse(
+            url=record["response_url"],
+            status=record["status"],
+            body=record["body"],
+            headers=record.get("response_headers", {}),
+            elapsed=record.get("elapsed", 0.0)
+        )
+
+
+def archive_file_path(name: str, root: str = ARCHIVE_ROOT) -> str:
+    """
+    archive_file_path returns where the archive named in a job configuration is kept: a plain file name under `root`.
+
+    Raises:
+        ValueError: If the name is empty or is a path rather than a file name.
+    """
+    if not name or os.path.basename(name) != name or "\\" in name or name.startswith("."):
+        raise ValueError(f"Invalid archive name: {name!r}, expected a file name without directories.")
+    return os.path.join(root, name)
+
+def build_http_client(live_client_cls, archive_mode: str = None, archive_path: str = None, replay_latency: bool = False, archive_root: str = ARCHIVE_ROOT):
+    """
+    build_http_client returns the HTTP client for a job according to its archive settings.
+
+    Args:
+        live_client_cls (type): Live client class accepting an `archive` keyword (RealHTTPClient or an AsyncHttpClient).
+        archive_mode ([str]): None for live traffic, "record" to archive live traffic or "replay" to serve from the archive.
+        archive_path ([str]): File name of the archive under archive_root, required when archive_mode is set.
+        replay_latency ([bool]): Whether replayed responses wait for their recorded latency.
+        archive_root ([str]): Directory the archives are kept in.
+
+    Returns:
+        object: A live client, a recording live client or a ReplayHttpClient, to be released with close_http_client.
+
+    Raises:
+        ValueError: If archive_mode is unknown or archive_path is missing or not a plain file name.
+    """
+    if not archive_mode:
+        return live_client_cls()
+    if not archive_path:
+        raise ValueError("archive_path is required when archive_mode is set.")
+    if archive_mode not in ("record", "replay"):
+        raise ValueError(f"Unknown archive mode: {archive_mode}")
+    archive = HttpArchive(archive_file_path(archive_path, archive_root))
+    if archive_mode == "record":
+        return live_client_cls(archive=archive)
+    return ReplayHttpClient(archive, replay_latency=replay_latency)
+
+async def close_http_client(client) -> None:
+    """
+    close_http_client releases what a client built by build_http_client holds: its connections when it can close them, and its archive.
+    """
+    close = getattr(client, "close", None)
+    if callable(close):
+        result = close()
+        if asyncio.iscoroutine(result):
+            await result
+    archive = getattr(client, "archive", None)
+    if archive is not None:
+        archive.close()
@@ -0,0 +1,163 @@
+# http_response.py
+
+import codecs
+from typing import Dict, List, Any, Optional
+from src.modules.common.body_metrics import BodyMetrics
+
+SNIPPET_CHARS = 200
+
+def header_value(headers: Dict[str, str], name: str) -> Optional[str]:
+    """
+    header_value returns the value of a header looked up case-insensitively, None when absent.
+    """
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+def declared_length(headers: Dict[str, str]) -> Optional[int]:
+    """
+    declared_length returns the full body size announced by the headers: the total of a Content-Range, else the
+    Content-Length. None when neither gives it, such as for chunked bodies.
+    """
+    content_range = header_value(headers, "content-range")
+    if content_range:
+        total = content_range.rpartition("/")[2].strip()
+        if total.isdigit():
+            return int(total)
+    content_length = header_value(headers, "content-length")
+    if content_length and content_length.strip().isdigit():
+        return int(content_length)
+    return None
+
+def charset_from_headers(headers: Dict[str, str]) -> Optional[str]:
+    """
+    charset_from_headers returns the normalized charset declared in the Content-Type header, None when absent or unknown.
+    JSON bodies default to UTF-8 (RFC 8259).
+    """
+    content_type = (header_value(headers, "content-type") or "").lower()
+    for parameter in content_type.split(";")[1:]:
+        key, _, value = parameter.strip().partition("=")
+        if key == "charset" and value:
+            try:
+                return codecs.lookup(value.strip("\"' ")).name
+            except LookupError:
+                return None
+    if content_type.startswith("application/json"):
+        return "utf-8"
+    return None
+
+class HttpResponse:
+    """
+    HttpResponse is a lightweight bytes-first HTTP response that decodes its body only when the text is accessed.
+
+    Attributes:
+        url (str): Final URL of the response.
+        status (int): HTTP status code, None when the request failed.
+        headers (Dict[str, str]): Response headers.
+        body (bytes): Raw response body.
+        elapsed (float): Seconds between sending the request and reading the body.
+        metrics (Dict[str, Any]): BodyMetrics counts of the full body.
+        charset (str): Charset declared in the headers, None when undeclared.
+        signatures (List[str]): IDs of the error signatures found while streaming the body, None when it was not scanned.
+        truncated (bool): True when reading stopped early, because a signature decided the outcome or a byte range was read.
+        timing (RequestTiming): Connect, TTFB and total times of the request, None when the client does not trace them.
+
+    Methods:
+        text -> str (property)
+        snippet(chars: int = 200) -> str
+        __getitem__(key: str) -> Any
+        get(key: str, default: Any = None) -> Any
+
+    Notes:
+        Undeclared charsets are decoded as UTF-8 with replacement characters instead of running charset
+        detection over the whole body, which is what makes aiohttp's `response.text()` expensive. Most
+        fuzzer and DBF responses only need their status, length and a snippet: `snippet()` decodes at most
+        a few hundred bytes and the lengths come from the metrics, so the full text is never built for them.
+        The object also answers the dict keys the clients used to return ("url", "status", "text", ...),
+        so existing `response["text"]` callers keep working.
+    """
+
+    __slots__ = ("url", "status", "headers", "body", "elapsed", "charset", "signatures", "truncated", "timing", "_metrics", "_text")
+
+    KEYS = ("url", "status", "text", "headers", "elapsed", "metrics", "signatures")
+
+    def __init__(
+        self,
+        url: str,
+        status: Optional[int],
+        body: bytes = b"",
+        headers: Dict[str, str] = None,
+        elapsed: float = 0.0,
+        metrics: Dict[str, Any] = None,
+        text: str = None,
+        signatures: List[str] = None,
+        truncated: bool = False,
+        timing=None
+    ) -> None:
+        self.url = url
+        self.status = status
+        self.body = body
+        self.headers = headers or {}
+        self.elapsed = elapsed
+        self.charset = charset_from_headers(self.headers)
+        self._text = text
+        self._metrics = metrics
+        self.signatures = signatures
+        self.truncated = truncated
+        self.timing = timing
+
+    @classmethod
+    def error(cls, url: str, message: str) -> "HttpResponse":
+        """
+        error builds the response returned when a request fails, carrying the error message as its text.
+        """
+        return cls(url, None, text=message)
+
+    @property
+    def metrics(self) -> Optional[Dict[str, Any]]:
+        """
+        metrics are the BodyMetrics counts of the body, computed here only when the client did not stream them.
+        Error responses carry no metrics.
+        """
+        if self._metrics is None and self.status is not None:
+            self._metrics = BodyMetrics.of(self.body).as_dict()
+        return self._metrics
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.body.decode(self.charset or "utf-8", errors="replace")
+        return self._text
+
+    @property
+    def length(self) -> int:
+        """
+        length is the body length in characters, taken from the metrics for UTF-8 bodies so no decoding is needed.
+        """
+        if self._text is None and self.metrics and self.charset in (None, "utf-8"):
+            return self.metrics["chars"]
+        return len(self.text)
+
+    def snippet(self, chars: int = SNIPPET_CHARS) -> str:
+        """
+        snippet decodes only the start of the body, enough for `chars` characters in any charset.
+        """
+        if self._text is not None:
+            return self._text[:chars]
+        return self.body[:chars * 4].decode(self.charset or "utf-8", errors="replace")[:chars]
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self.KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.KEYS
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self[key] if key in self.KEYS else default
+
+    def __repr__(self) -> str:
+        return f"HttpResponse({self.status} {self.url} [{len(self.body)} bytes])"
@@ -0,0 +1,224 @@
+# latency_histogram.py
+
+import math
+from array import array
+from typing import Dict, List, Any, Optional
+
+# Each power-of-two range of values is split into 2**(SUB_BUCKET_BITS - 1) linear sub-buckets
+SUB_BUCKET_BITS = 6
+# Values are recorded in microseconds, anything above 2**MAX_VALUE_BITS µs (~19 hours) is clamped
+MAX_VALUE_BITS = 36
+PERCENTILES = (50, 90, 99)
+
+class LatencyHistogram:
+    """
+    LatencyHistogram is an HDR-style histogram of durations with log-spaced buckets of bounded relative error.
+
+    Attributes:
+        count (int): Number of recorded values.
+        total (float): Sum of the recorded values, in seconds.
+        min (float): Smallest recorded value, in seconds, None when empty.
+        max (float): Largest recorded value, in seconds, None when empty.
+
+    Methods:
+        record(seconds: float) -> None
+        percentile(percent: float) -> Optional[float]
+        percentiles(percents: List[float]) -> List[Optional[float]]
+        merge(other: LatencyHistogram) -> None
+        summary() -> Dict[str, Any]
+
+    Notes:
+        Values are counted in microseconds. Below 2**SUB_BUCKET_BITS µs every value has its own bucket;
+        above, each power-of-two range [2**k, 2**(k+1)) is split into 32 equal sub-buckets, so a
+        percentile is off by at most 1/32 (~3%) of its value whatever its magnitude. The counters live in a
+        fixed array of 1024 64-bit integers (8 KB), allocated once: recording is an index computation
+        and an increment, and the memory used does not grow with the number of requests.
+    """
+
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+    HALF_SUB_BUCKETS = SUB_BUCKETS >> 1
+    BUCKETS = SUB_BUCKETS + (MAX_VALUE_BITS - SUB_BUCKET_BITS) * HALF_SUB_BUCKETS
+    MAX_VALUE = (1 << MAX_VALUE_BITS) - 1
+
+    def __init__(self) -> None:
+        self.counts = array("Q", bytes(8 * self.BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def _index(cls, micros: int) -> int:
+        if micros < cls.SUB_BUCKETS:
+            return micros
+        shift = micros.bit_length() - SUB_BUCKET_BITS
+        return cls.SUB_BUCKETS + (shift - 1) * cls.HALF_SUB_BUCKETS + (micros >> shift) - cls.HALF_SUB_BUCKETS
+
+    @classmethod
+    def _upper_bound(cls, index: int) -> int:
+        """
+        _upper_bound returns the largest value, in microseconds, counted in a bucket.
+        """
+        if index < cls.SUB_BUCKETS:
+            return index
+        offset = index - cls.SUB_BUCKETS
+        shift = offset // cls.HALF_SUB_BUCKETS + 1
+        sub_bucket = offset % cls.HALF_SUB_BUCKETS + cls.HALF_SUB_BUCKETS
+        return ((sub_bucket + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        """
+        record adds one duration, negative durations counting as zero.
+        """
+        seconds = max(seconds, 0.0)
+        micros = min(int(seconds * 1_000_000), self.MAX_VALUE)
+        self.counts[self._index(micros)] += 1
+        self.count += 1
+        self.total += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """
+        percentile returns the value, in seconds, below which `percent` percent of the recorded values fall, None when empty.
+
+        Raises:
+            ValueError: If percent is not between 0 and 100.
+        """
+        return self.percentiles([percent])[0]
+
+    def percentiles(self, percents: List[float]) -> List[Optional[float]]:
+        """
+        percentiles returns several percentiles, in seconds, in one pass over the buckets.
+        """
+        for percent in percents:
+            if not 0 <= percent <= 100:
+                raise ValueError(f"Percentile must be between 0 and 100, got {percent}")
+        if not self.count:
+            return [None] * len(percents)
+        ranks = sorted((max(1, math.ceil(percent / 100 * self.count)), position) for position, percent in enumerate(percents))
+        values = [self.max] * len(percents)
+        next_rank, seen = 0, 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            seen += bucket_count
+            while next_rank < len(ranks) and seen >= ranks[next_rank][0]:
+                rank, position = ranks[next_rank]
+                # The highest value the bucket stands for, never beyond the exact extremes; the last rank is the exact max
+                if rank < self.count:
+                    value = self._upper_bound(index) / 1_000_000
+                    values[position] = min(max(value, self.min), self.max)
+                next_rank += 1
+            if next_rank == len(ranks):
+                break
+        return values
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        merge adds the values recorded by another histogram to this one.
+        """
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        summary returns the count, mean, percentiles and maximum, in milliseconds.
+        """
+        summary = {"count": self.count}
+        if not self.count:
+            return summary
+        summary["mean_ms"] = round(self.total / self.count * 1000, 3)
+        for percent, value in zip(PERCENTILES, self.percentiles(PERCENTILES)):
+            summary[f"p{percent}_ms"] = round(value * 1000, 3)
+        summary["max_ms"] = round(self.max * 1000, 3)
+        return summary
+
+class RequestStats:
+    """
+    RequestStats aggregates the timings, bytes and errors of the requests of one job.
+
+    Attributes:
+        connect (LatencyHistogram): Connection setup times, DNS resolution included.
+        ttfb (LatencyHistogram): Times from sending the request to receiving the response headers.
+        total (LatencyHistogram): Times from sending the request to reading the whole body.
+        requests (int): Number of recorded requests.
+        errors (int): Requests that got no response (connection errors, timeouts...).
+        server_errors (int): Responses with a 5xx status.
+        bytes_received (int): Body bytes received.
+
+    Methods:
+        record(response: HttpResponse) -> None
+        record_error() -> None
+        summary(running_time: float) -> Dict[str, Any]
+
+    Notes:
+        Three fixed-size histograms and a few counters, so about 25 KB per job however long it runs.
+        Responses from clients that do not trace connections only feed the total histogram.
+    """
+
+    def __init__(self) -> None:
+        self.connect = LatencyHistogram()
+        self.ttfb = LatencyHistogram()
+        self.total = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.server_errors = 0
+        self.bytes_received = 0
+
+    def record(self, response) -> None:
+        """
+        record adds the outcome of one response, an HttpResponse or a dict with the same keys.
+        """
+        status = response["status"]
+        if status is None:
+            self.record_error()
+            return
+        self.requests += 1
+        if status >= 500:
+            self.server_errors += 1
+        metrics = response.get("metrics")
+        if metrics:
+            self.bytes_received += metrics.get("bytes", 0)
+        timing = getattr(response, "timing", None)
+        if timing is not None:
+            if timing.connect is not None:
+                self.connect.record(timing.connect)
+            if timing.ttfb is not None:
+                self.ttfb.record(timing.ttfb)
+        elapsed = response.get("elapsed")
+        if elapsed is not None:
+            self.total.record(elapsed)
+
+    def record_error(self) -> None:
+        self.requests += 1
+        self.errors += 1
+
+    def summary(self, running_time: float) -> Dict[str, Any]:
+        """
+        summary returns the latency percentiles of each phase, the throughput and the error rates.
+        """
+        return {
+            "latency": {
+                "connect": self.connect.summary(),
+                "ttfb": self.ttfb.summary(),
+                "total": self.total.summary()
+            },
+            "bytes_received": self.bytes_received,
+            "bytes_per_second": self.bytes_received / running_time if running_time > 0 else 0,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0,
+            "server_errors": self.server_errors,
+            "server_error_rate": self.server_errors / self.requests if self.requests else 0
+        }
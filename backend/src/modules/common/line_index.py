@@ -0,0 +1,184 @@
+# line_index.py
+
+import os
+import mmap
+import array
+import hashlib
+from typing import Iterator
+
+INDEX_SUFFIX = ".lidx"
+# Indexes are cached here rather than next to the files they index
+INDEX_CACHE_ROOT = os.path.join("src", "database", "line_index")
+# Index header: source file size and mtime (ns), used to detect stale indexes
+HEADER_ITEMS = 2
+
+def index_path(path: str, root: str = INDEX_CACHE_ROOT) -> str:
+    """
+    index_path returns where the index of a file is cached, keyed by the file's absolute path, size and mtime.
+    """
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}\0{stat.st_size}\0{stat.st_mtime_ns}".encode("utf-8", errors="surrogateescape")
+    return os.path.join(root, hashlib.sha256(key).hexdigest()[:32] + INDEX_SUFFIX)
+
+def write_index(path: str, offsets: array.array, root: str = INDEX_CACHE_ROOT) -> str:
+    """
+    write_index persists the offsets of the non-blank lines of a file whose writer already knows them,
+    so LineIndexedFile never has to scan it.
+
+    Returns:
+        str: The path of the index.
+
+    Raises:
+        OSError: If the index cannot be written.
+    """
+    stat = os.stat(path)
+    destination = index_path(path, root)
+    os.makedirs(root, exist_ok=True)
+    tmp_path = destination + ".tmp"
+    with open(tmp_path, "wb") as f:
+        array.array("Q", [stat.st_size, stat.st_mtime_ns]).tofile(f)
+        offsets.tofile(f)
+    os.replace(tmp_path, destination)
+    return destination
+
+class LineIndexedFile:
+    """
+    LineIndexedFile gives O(1) random access to the non-blank lines of a text file through a memory map and a line offset index.
+
+    Attributes:
+        path (str): Path of the text file.
+        index_root (str): Directory the offset index is cached in.
+
+    Methods:
+        __len__() -> int
+        line(index: int) -> str
+        __getitem__(index: int) -> str
+        iter_from(start: int = 0) -> Iterator[str]
+        close() -> None
+
+    Notes:
+        Lines are returned stripped and blank lines are skipped, matching how wordlists have always been read.
+        The index stores the byte offset of every non-blank line as an unsigned 64-bit integer and is written
+        once to a cache directory, then memory-mapped on later opens, so counting lines and seeking to a resume
+        offset never rescan the file. The cached index is named after the file's path, size and mtime, so
+        nothing is written next to the file and an edited file gets a new index. When the index cannot be
+        written it is kept in memory instead.
+        Many jobs can share one instance; the data is only paged in by the OS as lines are read.
+    """
+
+    def __init__(self, path: str, index_root: str = INDEX_CACHE_ROOT) -> None:
+        self.path = path
+        self.index_root = index_root
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._index_map = None
+        self._offsets = self._load_index()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def line(self, index: int) -> str:
+        """
+        line returns the stripped line at `index` among the non-blank lines.
+
+        Args:
+            index (int): 0-based line number.
+
+        Returns:
+            str: The decoded line.
+
+        Raises:
+            IndexError: If index is out of range.
+
+        @requires 0 <= index < len(self);
+        """
+        start = self._offsets[index]
+        end = self._data.find(b"\n", start)
+        if end == -1:
+            end = len(self._data)
+        return self._data[start:end].strip().decode("utf-8", errors="replace")
+
+    def __getitem__(self, index: int) -> str:
+        """
+        __getitem__ makes the file usable wherever a list of words is expected.
+        """
+        return self.line(index)
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        """
+        iter_from lazily yields the stripped non-blank lines starting at line `start`.
+        """
+        if start >= len(self._offsets):
+            return
+        data = self._data
+        position = self._offsets[start]
+        size = len(data)
+        while position < size:
+            end = data.find(b"\n", position)
+            if end == -1:
+                end = size
+            line = data[position:end].strip()
+            if line:
+                yield line.decode("utf-8", errors="replace")
+            position = end + 1
+
+    def close(self) -> None:
+        """
+        close releases the memory maps and the file handle.
+        """
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._offsets = array.array("Q")
+        if self._index_map is not None:
+            self._index_map.close()
+            self._index_map = None
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+        self._file.close()
+
+    def _load_index(self):
+        """
+        _load_index memory-maps a fresh persisted index or builds (and tries to persist) a new one.
+        """
+        stat = os.stat(self.path)
+        header = array.array("Q", [stat.st_size, stat.st_mtime_ns])
+        try:
+            with open(index_path(self.path, self.index_root), "rb") as f:
+                index_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            view = memoryview(index_map).cast("Q")
+            if view[:HEADER_ITEMS].tolist() == header.tolist():
+                self._index_map = index_map
+                return view[HEADER_ITEMS:]
+            view.release()
+            index_map.close()
+        except (OSError, ValueError, TypeError):
+            pass
+
+        offsets = self._build_offsets()
+        try:
+            write_index(self.path, offsets, self.index_root)
+        except OSError:
+            pass
+        return offsets
+
+    def _build_offsets(self) -> array.array:
+        """
+        _build_offsets scans the file once and records the offset of every non-blank line.
+        """
+        offsets = array.array("Q")
+        if not self._data:
+            return offsets
+        data = self._data
+        data.seek(0)
+        position = 0
+        readline = data.readline
+        append = offsets.append
+        while True:
+            line = readline()
+            if not line:
+                break
+            if line.strip():
+                append(position)
+            position += len(line)
+        return offsets
@@ -0,0 +1,58 @@
+# request_timing.py
+
+import time
+from typing import Dict, Optional
+import aiohttp
+
+class RequestTiming:
+    """
+    RequestTiming holds the phase timings of one request, in seconds from the moment it was sent.
+
+    Attributes:
+        dns (float): DNS resolution time, None when no lookup was made (cached or IP address).
+        connect (float): Time to get a connection, DNS and TLS handshake included, None when one was reused.
+        ttfb (float): Time to the first byte of the response, i.e. until its headers were received.
+        total (float): Time until the whole body was read, set by the client.
+    """
+
+    __slots__ = ("dns", "connect", "ttfb", "total")
+
+    def __init__(self) -> None:
+        self.dns: Optional[float] = None
+        self.connect: Optional[float] = None
+        self.ttfb: Optional[float] = None
+        self.total: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Optional[float]]:
+        return {"dns": self.dns, "connect": self.connect, "ttfb": self.ttfb, "total": self.total}
+
+async def _on_request_start(session, context, params) -> None:
+    context.started = time.perf_counter()
+
+async def _on_dns_resolvehost_start(session, context, params) -> None:
+    context.dns_started = time.perf_counter()
+
+async def _on_dns_resolvehost_end(session, context, params) -> None:
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx.dns = time.perf_counter() - context.dns_started
+
+async def _on_connection_create_end(session, context, params) -> None:
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx.connect = time.perf_counter() - context.started
+
+async def _on_request_end(session, context, params) -> None:
+    if context.trace_request_ctx is not None:
+        context.trace_request_ctx.ttfb = time.perf_counter() - context.started
+
+def timing_trace_config() -> aiohttp.TraceConfig:
+    """
+    timing_trace_config returns an aiohttp TraceConfig filling the RequestTiming passed as a request's trace_request_ctx.
+    aiohttp fires on_request_end once the response headers are received, before the body is read, which is what TTFB measures.
+    """
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(_on_request_start)
+    trace_config.on_dns_resolvehost_start.append(_on_dns_resolvehost_start)
+    trace_config.on_dns_resolvehost_end.append(_on_dns_resolvehost_end)
+    trace_config.on_connection_create_end.append(_on_connection_create_end)
+    trace_config.on_request_end.append(_on_request_end)
+    return trace_config
@@ -0,0 +1,125 @@
+# response_fingerprint.py
+
+import zlib
+from typing import Dict, Tuple, Optional
+
+class ResponseFingerprint:
+    """
+    ResponseFingerprint summarizes a response by status, length, word count, line count and body hash.
+
+    Attributes:
+        status (int): HTTP status code.
+        length (int): Body length.
+        words (int): Whitespace separated word count.
+        lines (int): Line count.
+        body_hash (str): CRC-32 of the UTF-8 encoded body, as 8 hex digits.
+
+    Methods:
+        from_text(status: int, text: str) -> ResponseFingerprint
+        from_metrics(status: int, metrics: Dict) -> ResponseFingerprint
+        cluster_key(length_bucket: int) -> Tuple
+    """
+
+    __slots__ = ("status", "length", "words", "lines", "body_hash")
+
+    def __init__(self, status: int, length: int, words: int, lines: int, body_hash: str) -> None:
+        self.status = status
+        self.length = length
+        self.words = words
+        self.lines = lines
+        self.body_hash = body_hash
+
+    @classmethod
+    def from_text(cls, status: int, text: str) -> "ResponseFingerprint":
+        return cls(
+            status=status,
+            length=len(text),
+            words=len(text.split()),
+            lines=len(text.splitlines()),
+            body_hash=f"{zlib.crc32(text.encode('utf-8', errors='replace')):08x}"
+        )
+
+    @classmethod
+    def from_metrics(cls, status: int, metrics: Dict) -> "ResponseFingerprint":
+        """
+        from_metrics builds the fingerprint from BodyMetrics counts taken over the full streamed body.
+        """
+        return cls(
+            status=status,
+            length=metrics["chars"],
+            words=metrics["words"],
+            lines=metrics["lines"],
+            body_hash=metrics["hash"]
+        )
+
+    def shape(self) -> Tuple[int, int, int]:
+        return self.status, self.words, self.lines
+
+    def cluster_key(self, length_bucket: int) -> Tuple[int, int, int, int]:
+        """
+        cluster_key groups responses of the same status, word and line counts whose lengths fall in the same bucket.
+        """
+        return self.status, self.words, self.lines, self.length // max(1, length_bucket)
+
+    def as_dict(self) -> Dict:
+        return {
+            "status": self.status,
+            "length": self.length,
+            "words": self.words,
+            "lines": self.lines,
+            "body_hash": self.body_hash
+        }
+
+class BaselineSet:
+    """
+    BaselineSet holds the fingerprints of calibration responses and tells whether a response looks like one of them.
+
+    Attributes:
+        length_tolerance (int): Extra length slack accepted around the calibrated length range.
+
+    Methods:
+        add(fingerprint: ResponseFingerprint) -> None
+        matches(fingerprint: ResponseFingerprint) -> bool
+        as_list() -> List[Dict]
+
+    Notes:
+        A response matches when its body hash equals a calibration body, or when it has the same status,
+        word and line counts as a calibration shape and its length lies within the lengths observed for
+        that shape (widened by length_tolerance). Calibration payloads have different lengths, so a shape
+        whose length varied between samples reflects the payload and is matched on its word and line
+        counts alone.
+    """
+
+    def __init__(self, length_tolerance: int = 0) -> None:
+        self.length_tolerance = length_tolerance
+        self.hashes = set()
+        # (status, words, lines) -> [min length, max length]
+        self.shapes: Dict[Tuple[int, int, int], list] = {}
+
+    def __len__(self) -> int:
+        return len(self.shapes)
+
+    def add(self, fingerprint: ResponseFingerprint) -> None:
+        self.hashes.add(fingerprint.body_hash)
+        bounds = self.shapes.get(fingerprint.shape())
+        if bounds is None:
+            self.shapes[fingerprint.shape()] = [fingerprint.length, fingerprint.length]
+        else:
+            bounds[0] = min(bounds[0], fingerprint.length)
+            bounds[1] = max(bounds[1], fingerprint.length)
+
+    def matches(self, fingerprint: ResponseFingerprint) -> bool:
+        if fingerprint.body_hash in self.hashes:
+            return True
+        bounds: Optional[list] = self.shapes.get(fingerprint.shape())
+        if bounds is None:
+            return False
+        if bounds[0] != bounds[1]:
+            return True
+        return bounds[0] - self.length_tolerance <= fingerprint.length <= bounds[1] + self.length_tolerance
+
+    def as_list(self):
+        return [
+            {"status": status, "words": words, "lines": lines, "min_length": bounds[0], "max_length": bounds[1]}
+            for (status, words, lines), bounds in self.shapes.items()
+        ]
@@ -0,0 +1,354 @@
+# result_filter.py
+
+import re
+import functools
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+NUMERIC_FIELDS = ("status", "size", "words", "lines", "time")
+TEXT_FIELDS = ("body",)
+
+_TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>\d+(?:\.\d+)?)
+      | (?P<string>"(?:[^"\\]|\\.)*"|'(?:[^'\\]|\\.)*')
+      | (?P<operator>==|!=|<=|>=|!~|<|>|~|\(|\)|\[|\]|,|\.|-)
+      | (?P<name>[A-Za-z_][A-Za-z0-9_\-]*)
+    )""", re.VERBOSE)
+
+class FilterSyntaxError(ValueError):
+    """
+    FilterSyntaxError is raised when a filter expression cannot be parsed or uses an operator its field does not support.
+    """
+
+class FilterExpression:
+    """
+    FilterExpression is a result filter expression compiled once into a tree of closures.
+
+    Attributes:
+        source (str): The expression text.
+        fields (Set[str]): Fields the expression reads, "header" included when any header is referenced.
+        headers (Set[str]): Lower-cased names of the headers the expression reads.
+
+    Methods:
+        __call__(subject: Dict[str, Any]) -> bool
+        subject(status: int, text: str, headers: Dict = None, elapsed: float = None) -> Dict[str, Any]
+
+    Notes:
+        Grammar, with the usual precedence (not > and > or) and parentheses:
+            status == 200            status in [200, 301-399]       status not in [404]
+            size > 1000              words != 12                    lines <= 3
+            time >= 0.5              body ~ "sql syntax"            body !~ 'not found'
+            header.server ~ "nginx"  header["content-type"] == "application/json"
+        Numeric fields (status, size, words, lines, time) support ==, !=, <, <=, >, >=, in and not in,
+        where list items may be ranges written lo-hi. Text fields (body and headers) support ==, !=,
+        ~ and !~, the last two being case-insensitive regex searches. Regexes and value sets are
+        built at compile time, so evaluating a response is only a few closure calls. Subjects compute
+        each field on first use, so the costly ones (body, words, lines) are only computed when referenced.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source = source
+        self.fields: Set[str] = set()
+        self.headers: Set[str] = set()
+        self._tokens = self._tokenize(source)
+        self._position = 0
+        self._predicate = self._parse_or()
+        if self._position != len(self._tokens):
+            raise FilterSyntaxError(f"Unexpected '{self._tokens[self._position][1]}' in filter expression: {source}")
+        del self._tokens
+
+    def __call__(self, subject: Dict[str, Any]) -> bool:
+        return self._predicate(subject)
+
+    def __repr__(self) -> str:
+        return f"FilterExpression({self.source!r})"
+
+    def subject(self, status: int, text: str, headers: Dict[str, str] = None, elapsed: float = None) -> Dict[str, Any]:
+        """
+        subject builds the evaluation input of a response given as plain values.
+
+        Args:
+            status (int): HTTP status code.
+            text (str): Response body.
+            headers ([Dict[str, str]]): Response headers.
+            elapsed ([float]): Response time in seconds.
+
+        Returns:
+            Dict[str, Any]: Lazily computed field values keyed by field name, headers under "headers" with lower-cased names.
+        """
+        return ResponseSubject(SimpleNamespace(status_code=status, text=text, headers=headers, elapsed=elapsed))
+
+    @staticmethod
+    def _tokenize(source: str) -> List[tuple]:
+        tokens = []
+        position = 0
+        source = source.rstrip()
+        while position < len(source):
+            match = _TOKEN_PATTERN.match(source, position)
+            if match is None or match.end() == position:
+                raise FilterSyntaxError(f"Invalid character at position {position} in filter expression: {source}")
+            kind = match.lastgroup
+            tokens.append((kind, match.group(kind)))
+            position = match.end()
+        return tokens
+
+    def _peek(self) -> Optional[tuple]:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _accept(self, value: str) -> bool:
+        token = self._peek()
+        if token is not None and token[0] in ("operator", "name") and token[1].lower() == value:
+            self._position += 1
+            return True
+        return False
+
+    def _expect(self, value: str) -> None:
+        if not self._accept(value):
+            raise FilterSyntaxError(f"Expected '{value}' in filter expression: {self.source}")
+
+    def _next(self, kind: str) -> str:
+        token = self._peek()
+        if token is None or token[0] != kind:
+            found = "end of expression" if token is None else f"'{token[1]}'"
+            raise FilterSyntaxError(f"Expected a {kind} but found {found} in filter expression: {self.source}")
+        self._position += 1
+        return token[1]
+
+    def _parse_or(self) -> Callable:
+        operands = [self._parse_and()]
+        while self._accept("or"):
+            operands.append(self._parse_and())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda subject: any(operand(subject) for operand in operands)
+
+    def _parse_and(self) -> Callable:
+        operands = [self._parse_not()]
+        while self._accept("and"):
+            operands.append(self._parse_not())
+        if len(operands) == 1:
+            return operands[0]
+        return lambda subject: all(operand(subject) for operand in operands)
+
+    def _parse_not(self) -> Callable:
+        if self._accept("not"):
+            operand = self._parse_not()
+            return lambda subject: not operand(subject)
+        if self._accept("("):
+            operand = self._parse_or()
+            self._expect(")")
+            return operand
+        return self._parse_comparison()
+
+    def _parse_field(self) -> Tuple[str, Callable]:
+        name = self._next("name").lower()
+        if name == "header":
+            if self._accept("."):
+                header = self._next("name").lower()
+            else:
+                self._expect("[")
+                header = self._unquote(self._next("string")).lower()
+                self._expect("]")
+            self.fields.add("header")
+            self.headers.add(header)
+            return "text", lambda subject: subject["headers"].get(header, "")
+        if name in NUMERIC_FIELDS:
+            self.fields.add(name)
+            return "number", lambda subject: subject[name] or 0
+        if name in TEXT_FIELDS:
+            self.fields.add(name)
+            return "text", lambda subject: subject[name] or ""
+        raise FilterSyntaxError(f"Unknown field '{name}' in filter expression: {self.source}")
+
+    def _parse_comparison(self) -> Callable:
+        kind, getter = self._parse_field()
+        negate = self._accept("not")
+        if negate or self._accept("in"):
+            if negate:
+                self._expect("in")
+            if kind != "number":
+                raise FilterSyntaxError(f"'in' only applies to numeric fields: {self.source}")
+            contains = self._parse_set()
+            if negate:
+                return lambda subject: not contains(getter(subject))
+            return lambda subject: contains(getter(subject))
+
+        operator = self._next("operator")
+        if kind == "number":
+            value = self._parse_number()
+            comparisons = {
+                "==": lambda subject: getter(subject) == value,
+                "!=": lambda subject: getter(subject) != value,
+                "<": lambda subject: getter(subject) < value,
+                "<=": lambda subject: getter(subject) <= value,
+                ">": lambda subject: getter(subject) > value,
+                ">=": lambda subject: getter(subject) >= value,
+            }
+        else:
+            value = self._unquote(self._next("string"))
+            pattern = self._compile_regex(value) if operator in ("~", "!~") else None
+            comparisons = {
+                "==": lambda subject: getter(subject) == value,
+                "!=": lambda subject: getter(subject) != value,
+                "~": lambda subject: pattern.search(getter(subject)) is not None,
+                "!~": lambda subject: pattern.search(getter(subject)) is None,
+            }
+        if operator not in comparisons:
+            raise FilterSyntaxError(f"Operator '{operator}' is not supported for {kind} fields: {self.source}")
+        return comparisons[operator]
+
+    def _parse_set(self) -> Callable:
+        """
+        _parse_set compiles a [a, b, lo-hi, ...] list into a membership test backed by a frozenset and range bounds.
+        """
+        self._expect("[")
+        values, ranges = set(), []
+        while True:
+            low = self._parse_number()
+            if self._accept("-"):
+                ranges.append((low, self._parse_number()))
+            else:
+                values.add(low)
+            if self._accept("]"):
+                break
+            self._expect(",")
+        values = frozenset(values)
+        if not ranges:
+            return values.__contains__
+        return lambda value: value in values or any(low <= value <= high for low, high in ranges)
+
+    def _parse_number(self):
+        text = self._next("number")
+        return float(text) if "." in text else int(text)
+
+    def _compile_regex(self, value: str):
+        try:
+            return re.compile(value, re.IGNORECASE)
+        except re.error as e:
+            raise FilterSyntaxError(f"Invalid regex '{value}' in filter expression: {e}")
+
+    @staticmethod
+    def _unquote(token: str) -> str:
+        return re.sub(r"\\(.)", r"\1", token[1:-1])
+
+@functools.lru_cache(maxsize=128)
+def compile_filter(source: str) -> FilterExpression:
+    """
+    compile_filter compiles a filter expression, reusing the compiled form of expressions seen before.
+
+    Raises:
+        FilterSyntaxError: If the expression is invalid.
+    """
+    if not source or not source.strip():
+        raise FilterSyntaxError("Filter expression is empty.")
+    return FilterExpression(source.strip())
+
+class ResponseSubject(dict):
+    """
+    ResponseSubject is the evaluation input of a live response, each field being computed on first use.
+
+    Notes:
+        The response is any object with `status_code` and `text`, and optionally `length`, `elapsed`,
+        `headers` and `metrics` (BodyMetrics counts). The text is only read when an expression looks at
+        the body, or at words/lines of a response streamed without metrics, so a lazily decoded response
+        filtered on status and size is never decoded.
+    """
+
+    def __init__(self, response: Any) -> None:
+        super().__init__()
+        self.response = response
+
+    def __missing__(self, field: str) -> Any:
+        response = self.response
+        if field == "status":
+            value = response.status_code or 0
+        elif field == "size":
+            length = getattr(response, "length", None)
+            value = len(response.text) if length is None else length
+        elif field == "time":
+            value = getattr(response, "elapsed", None) or 0.0
+        elif field == "body":
+            value = response.text
+        elif field in ("words", "lines"):
+            metrics = getattr(response, "metrics", None)
+            if metrics:
+                value = metrics[field]
+            else:
+                value = len(response.text.split()) if field == "words" else len(response.text.splitlines())
+        elif field == "headers":
+            value = {name.lower(): header for name, header in (getattr(response, "headers", None) or {}).items()}
+        else:
+            raise KeyError(field)
+        self[field] = value
+        return value
+
+def sizes_expression(sizes: List[int]) -> Optional[str]:
+    """
+    sizes_expression turns a list of response sizes into the expression matching any of them.
+    """
+    if not sizes:
+        return None
+    return f"size in [{', '.join(str(int(size)) for size in sizes)}]"
+
+def combine_expressions(operator: str, *sources: Optional[str]) -> Optional[str]:
+    """
+    combine_expressions joins the given expressions with "and" or "or", skipping empty ones.
+    """
+    sources = [source for source in sources if source]
+    if not sources:
+        return None
+    if len(sources) == 1:
+        return sources[0]
+    return f" {operator} ".join(f"({source})" for source in sources)
+
+def subject_from_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    subject_from_result builds the evaluation input of a stored result row, so filters can be re-run server-side.
+
+    Notes:
+        Stored rows keep a snippet rather than the full body, so body, words and lines fall back
+        to the snippet when the row does not carry its own counts.
+    """
+    body = result.get("body") or result.get("snippet") or ""
+    status = result.get("status", result.get("response"))
+    return {
+        "status": status or 0,
+        "size": result.get("length", len(body)),
+        "words": result["words"] if "words" in result else len(body.split()),
+        "lines": result["lines"] if "lines" in result else len(body.splitlines()),
+        "time": result.get("time") or 0.0,
+        "body": body,
+        "headers": {name.lower(): value for name, value in (result.get("headers") or {}).items()}
+    }
+
+def apply_filters(results: List[Dict[str, Any]], match: str = None, filter: str = None) -> List[Dict[str, Any]]:
+    """
+    apply_filters re-runs match/filter expressions over stored result rows.
+
+    Args:
+        results (List[Dict]): Stored result rows.
+        match ([str]): Expression a row must satisfy to be kept.
+        filter ([str]): Expression hiding the rows that satisfy it.
+
+    Returns:
+        List[Dict]: The rows kept, in their original order.
+
+    Raises:
+        FilterSyntaxError: If an expression is invalid or reads the body or headers, which stored rows do not keep.
+    """
+    matcher = compile_filter(match) if match else None
+    hider = compile_filter(filter) if filter else None
+    for expression in (matcher, hider):
+        unstored = sorted(field + "s" if field == "header" else field for field in expression.fields - set(NUMERIC_FIELDS)) if expression is not None else []
+        if unstored:
+            raise FilterSyntaxError(f"Stored results keep no {' or '.join(unstored)}, they can only be re-filtered on {', '.join(NUMERIC_FIELDS)}: {expression.source}")
+    kept = []
+    for result in results:
+        subject = subject_from_result(result)
+        if matcher is not None and not matcher(subject):
+            continue
+        if hider is not None and hider(subject):
+            continue
+        kept.append(result)
+    return kept
@@ -0,0 +1,197 @@
+# signature_matcher.py
+
+import re
+from array import array
+from typing import Dict, List, Iterable, Optional, Tuple
+
+# Length of the signature prefixes searched for to skip the bytes that cannot start a match
+PREFIX_LENGTH = 3
+
+# Error signatures flagged out of the box, keyed by signature ID
+DEFAULT_SIGNATURES: Dict[str, str] = {
+    "sql.mysql": "you have an error in your sql syntax",
+    "sql.mysql_warning": "warning: mysql",
+    "sql.mysqli": "mysqli_fetch",
+    "sql.mssql_quote": "unclosed quotation mark after the character string",
+    "sql.mssql_driver": "odbc sql server driver",
+    "sql.oledb": "microsoft ole db provider for",
+    "sql.oracle": "ora-00933",
+    "sql.oracle_quote": "ora-01756",
+    "sql.postgres": "pg::syntaxerror",
+    "sql.postgres_syntax": "syntax error at or near",
+    "sql.postgres_warning": "warning: pg_query",
+    "sql.sqlite": "sqlite3::",
+    "sql.sqlite_error": "sqlite.exception",
+    "sql.pdo": "sqlstate[",
+    "sql.jdbc": "java.sql.sqlexception",
+    "trace.python": "traceback (most recent call last)",
+    "trace.java": "exception in thread \"",
+    "trace.java_frame": "\tat java.",
+    "trace.dotnet": "server error in '/' application",
+    "trace.dotnet_exception": "system.nullreferenceexception",
+    "trace.php_fatal": "fatal error: uncaught",
+    "trace.php_warning": "<b>warning</b>:",
+    "trace.node": "referenceerror:",
+    "trace.ruby": "actioncontroller::routingerror",
+    "disclosure.path_etc": "root:x:0:0:",
+    "disclosure.win_ini": "[extensions]",
+}
+
+class SignatureMatcher:
+    """
+    SignatureMatcher compiles many literal signatures into one Aho-Corasick automaton that scans response bodies in a single pass.
+
+    Attributes:
+        signatures (Dict[str, str]): Signature patterns keyed by signature ID.
+        stop_on_match (bool): Whether scanners report the outcome as decided at the first match.
+
+    Methods:
+        scanner() -> SignatureScanner
+        scan(data: bytes) -> List[str]
+
+    Notes:
+        Matching is ASCII case-insensitive. The automaton is a dense DFA: failure links are resolved at
+        compile time into a flat 256-entry-per-state transition table, so each body byte costs a single
+        table lookup and never backtracks. From the root state the scanner jumps straight to the next
+        occurrence of a signature's first three bytes with one C-level regex search, so the Python loop only
+        runs over the few bytes that can start a match. The state is carried between chunks, so a signature
+        split across two chunks is still found.
+    """
+
+    def __init__(self, signatures: Dict[str, str] = None, stop_on_match: bool = False) -> None:
+        self.signatures = dict(DEFAULT_SIGNATURES if signatures is None else signatures)
+        if not self.signatures:
+            raise ValueError("At least one signature is required.")
+        self.stop_on_match = stop_on_match
+        patterns = []
+        for signature_id, pattern in self.signatures.items():
+            encoded = pattern.lower().encode("utf-8")
+            if len(encoded) < 2:
+                raise ValueError(f"Signature {signature_id} must be at least 2 bytes long.")
+            patterns.append((signature_id, encoded))
+        self._delta, self._outputs = self._compile(patterns)
+        prefixes = sorted({encoded[:PREFIX_LENGTH] for _, encoded in patterns})
+        self._prefix_pattern = re.compile(b"|".join(re.escape(prefix) for prefix in prefixes))
+
+    @staticmethod
+    def _compile(patterns: List[Tuple[str, bytes]]):
+        """
+        _compile builds the trie, then breadth-first computes failure links and folds them into a complete transition table.
+        """
+        goto: List[Dict[int, int]] = [{}]
+        outputs: List[Tuple[str, ...]] = [()]
+        for signature_id, encoded in patterns:
+            state = 0
+            for byte in encoded:
+                following = goto[state].get(byte)
+                if following is None:
+                    following = len(goto)
+                    goto[state][byte] = following
+                    goto.append({})
+                    outputs.append(())
+                state = following
+            outputs[state] += (signature_id,)
+
+        delta = array("I", bytes(4 * 256 * len(goto)))
+        fail = [0] * len(goto)
+        queue = []
+        for byte, state in goto[0].items():
+            delta[byte] = state
+            queue.append(state)
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            outputs[state] += outputs[fail[state]]
+            base, fail_base = state * 256, fail[state] * 256
+            delta[base:base + 256] = delta[fail_base:fail_base + 256]
+            for byte, following in goto[state].items():
+                fail[following] = delta[fail_base + byte]
+                delta[base + byte] = following
+                queue.append(following)
+        return delta, outputs
+
+    def scanner(self) -> "SignatureScanner":
+        return SignatureScanner(self)
+
+    def scan(self, data: bytes) -> List[str]:
+        """
+        scan returns the IDs of the signatures found in a whole body.
+        """
+        scanner = self.scanner()
+        scanner.feed(data)
+        return scanner.matches
+
+class SignatureScanner:
+    """
+    SignatureScanner is the incremental scan of one body by a SignatureMatcher.
+
+    Attributes:
+        matches (List[str]): IDs of the signatures found so far, in the order they were first seen.
+        decided (bool): True once the matcher's stop_on_match is set and a signature was found.
+
+    Methods:
+        feed(chunk: bytes) -> bool
+    """
+
+    __slots__ = ("matcher", "matches", "decided", "_state", "_seen")
+
+    def __init__(self, matcher: SignatureMatcher) -> None:
+        self.matcher = matcher
+        self.matches: List[str] = []
+        self.decided = False
+        self._state = 0
+        self._seen = set()
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        feed scans the next chunk of the body and returns whether the outcome is decided, so reading can stop.
+        """
+        if not chunk or self.decided:
+            return self.decided
+        data = chunk.lower()
+        delta, outputs = self.matcher._delta, self.matcher._outputs
+        search = self.matcher._prefix_pattern.search
+        state, position, end = self._state, 0, len(data)
+        searching = True
+        while position < end:
+            if state == 0 and searching:
+                found = search(data, position)
+                if found is None:
+                    # Only the last bytes can start a signature continuing in the next chunk
+                    position = max(position, end - PREFIX_LENGTH + 1)
+                    searching = False
+                    continue
+                position = found.start()
+            state = delta[state * 256 + data[position]]
+            position += 1
+            if outputs[state]:
+                for signature_id in outputs[state]:
+                    if signature_id not in self._seen:
+                        self._seen.add(signature_id)
+                        self.matches.append(signature_id)
+                if self.matcher.stop_on_match:
+                    self.decided = True
+                    break
+        self._state = state
+        return self.decided
+
+def build_signature_matcher(
+    use_defaults: bool = True,
+    signatures: Optional[Dict[str, str]] = None,
+    stop_on_match: bool = False
+) -> Optional[SignatureMatcher]:
+    """
+    build_signature_matcher combines the default signatures and custom ones into a matcher, None when there are none.
+    """
+    combined = dict(DEFAULT_SIGNATURES) if use_defaults else {}
+    combined.update(signatures or {})
+    if not combined:
+        return None
+    return SignatureMatcher(combined, stop_on_match=stop_on_match)
+
+def reflects_payload(body: bytes, payloads: Iterable[str]) -> bool:
+    """
+    reflects_payload tells whether any of the payloads appears verbatim in the body.
+    """
+    return any(payload and payload.encode("utf-8") in body for payload in payloads)
@@ -0,0 +1,340 @@
+# wordlist_store.py
+
+import os
+import json
+import uuid
+import array
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, List, Optional, AsyncIterable, Callable
+from python_multipart.multipart import MultipartParser, parse_options_header
+from src.modules.common.line_index import LineIndexedFile, index_path, write_index
+
+WORDLIST_STORE_ROOT = os.path.join("src", "database", "wordlists")
+# Wordlist IDs are the first hex digits of the SHA-256 of the stored words
+WORDLIST_ID_LENGTH = 16
+# Longer lines are dropped instead of being buffered until their newline
+MAX_WORD_BYTES = 4096
+
+class WordlistWriter:
+    """
+    WordlistWriter normalizes and deduplicates a wordlist streamed in chunks, writing the words kept to a temporary file of the store.
+
+    Attributes:
+        name (str): Name the wordlist is listed under.
+        entries (int): Distinct words written.
+        directory_words (int): Words written that end with a slash, which scans only request bare.
+        duplicates (int): Words dropped as repeats of an earlier word.
+        skipped (int): Blank, comment and overlong lines dropped.
+        bytes_received (int): Bytes fed.
+
+    Methods:
+        feed(chunk: bytes) -> None
+        finish() -> Dict[str, Any]
+        abort() -> None
+
+    Notes:
+        Lines may be split anywhere between chunks. Each word is stripped of surrounding whitespace and of
+        its leading slashes (the scan joins every word to its directory with one), and lowercased with
+        `lowercase`. Blank lines and, with `skip_comments`, lines starting with "#" are dropped. Like
+        DedupPayloadSource, only a 64-bit hash of each distinct word is remembered, so deduplicating
+        millions of words takes a few hundred megabytes at most whatever their length.
+    """
+
+    def __init__(self, store: "WordlistStore", name: str, lowercase: bool = False, skip_comments: bool = True) -> None:
+        self.store = store
+        self.name = name
+        self.lowercase = lowercase
+        self.skip_comments = skip_comments
+        self.entries = 0
+        self.directory_words = 0
+        self.duplicates = 0
+        self.skipped = 0
+        self.bytes_received = 0
+        self._seen = set()
+        self._partial = b""
+        self._overlong = False
+        self._digest = hashlib.sha256()
+        self._offsets = array.array("Q")
+        self._position = 0
+        os.makedirs(store.root, exist_ok=True)
+        self._tmp_path = os.path.join(store.root, f"upload-{uuid.uuid4().hex}.tmp")
+        self._file = open(self._tmp_path, "wb")
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        feed adds the next chunk of the uploaded file, keeping its unfinished last line for the next chunk.
+        """
+        self.bytes_received += len(chunk)
+        lines = chunk.split(b"\n")
+        lines[0] = self._partial + lines[0]
+        self._partial = lines.pop()
+        if self._overlong and lines:
+            # The end of a line already dropped
+            self._overlong = False
+            self.skipped += 1
+            del lines[0]
+        self._add(lines)
+        if len(self._partial) > MAX_WORD_BYTES:
+            self._partial = b""
+            self._overlong = True
+
+    def _add(self, lines: List[bytes]) -> None:
+        """
+        _add writes the words of complete lines not seen before in one write, recording their offsets for the line index.
+        """
+        seen, offsets = self._seen, self._offsets
+        lowercase, skip_comments = self.lowercase, self.skip_comments
+        position = self._position
+        kept = []
+        directory_words = 0
+        for line in lines:
+            word = line.strip().lstrip(b"/")
+            if lowercase:
+                word = word.lower()
+            # 35 is "#"
+            if not word or len(word) > MAX_WORD_BYTES or (skip_comments and word[0] == 35):
+                self.skipped += 1
+                continue
+            # The built-in 64-bit SipHash of the word, randomized per process but only compared within one upload
+            digest = hash(word)
+            if digest in seen:
+                self.duplicates += 1
+                continue
+            seen.add(digest)
+            kept.append(word)
+            # 47 is "/"
+            if word[-1] == 47:
+                directory_words += 1
+            offsets.append(position)
+            position += len(word) + 1
+        if kept:
+            data = b"\n".join(kept) + b"\n"
+            self._file.write(data)
+            self._digest.update(data)
+            self.entries += len(kept)
+            self.directory_words += directory_words
+            self._position = position
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        finish adds the last line and moves the words into the store.
+
+        Returns:
+            Dict[str, Any]: The metadata of the stored wordlist.
+
+        Raises:
+            ValueError: If no word was kept.
+        """
+        if self._overlong:
+            self.skipped += 1
+        elif self._partial:
+            self._add([self._partial])
+        self._partial = b""
+        self._file.close()
+        self._seen = set()
+        if not self.entries:
+            self.abort()
+            raise ValueError("The wordlist has no words.")
+        return self.store._commit(self, self._digest.hexdigest()[:WORDLIST_ID_LENGTH], self._tmp_path, self._offsets)
+
+    def abort(self) -> None:
+        """
+        abort discards the words written so far.
+        """
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+class WordlistStore:
+    """
+    WordlistStore keeps uploaded wordlists on disk as deduplicated line-indexed files that scans read through shared memory maps.
+
+    Attributes:
+        root (str): Directory holding <id>.txt (one word per line), <id>.json (metadata) and the line index of every wordlist.
+
+    Methods:
+        writer(name: str, lowercase: bool = False, skip_comments: bool = True) -> WordlistWriter
+        get(wordlist_id: str) -> Optional[Dict[str, Any]]
+        list() -> List[Dict[str, Any]]
+        acquire(wordlist_id: str) -> LineIndexedFile
+        release(wordlist_id: str) -> None
+        delete(wordlist_id: str) -> bool
+
+    Notes:
+        A wordlist's ID is derived from the SHA-256 of its stored words, so uploading the same list twice
+        stores it once. The line index is built when the upload completes, so opening a wordlist of
+        millions of words maps two files and reads nothing else. Jobs using the same wordlist share one
+        LineIndexedFile, opened by the first `acquire` and closed by the last `release`; a wordlist in use
+        cannot be deleted. Files are written under a temporary name and os.replace'd, so a reader never
+        sees a partial file.
+    """
+
+    def __init__(self, root: str = WORDLIST_STORE_ROOT) -> None:
+        self.root = root
+        self._open: Dict[str, LineIndexedFile] = {}
+        self._users: Dict[str, int] = {}
+
+    def _path(self, wordlist_id: str, suffix: str) -> Optional[str]:
+        if not isinstance(wordlist_id, str) or len(wordlist_id) != WORDLIST_ID_LENGTH or any(char not in "0123456789abcdef" for char in wordlist_id):
+            return None
+        return os.path.join(self.root, wordlist_id + suffix)
+
+    def writer(self, name: str, lowercase: bool = False, skip_comments: bool = True) -> WordlistWriter:
+        return WordlistWriter(self, name, lowercase, skip_comments)
+
+    def _commit(self, writer: WordlistWriter, wordlist_id: str, tmp_path: str, offsets: array.array) -> Dict[str, Any]:
+        existing = self.get(wordlist_id)
+        if existing is not None:
+            os.remove(tmp_path)
+            return existing
+        path = self._path(wordlist_id, ".txt")
+        os.replace(tmp_path, path)
+        # The writer knows every line offset, the index is saved now rather than rebuilt by the first job
+        write_index(path, offsets, self.root)
+        meta = {
+            "id": wordlist_id,
+            "name": writer.name,
+            "entries": writer.entries,
+            "directory_words": writer.directory_words,
+            "duplicates": writer.duplicates,
+            "skipped": writer.skipped,
+            "bytes": os.path.getsize(path),
+            "uploaded_bytes": writer.bytes_received,
+            "created_at": datetime.now().isoformat()
+        }
+        meta_path = self._path(wordlist_id, ".json")
+        with open(meta_path + ".tmp", "w", encoding="utf-8") as file:
+            json.dump(meta, file)
+        os.replace(meta_path + ".tmp", meta_path)
+        return meta
+
+    def get(self, wordlist_id: str) -> Optional[Dict[str, Any]]:
+        """
+        get returns the metadata of a wordlist, None when there is no such wordlist.
+        """
+        path = self._path(wordlist_id, ".json")
+        if path is None or not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def list(self) -> List[Dict[str, Any]]:
+        if not os.path.isdir(self.root):
+            return []
+        wordlists = [self.get(name[:-len(".json")]) for name in os.listdir(self.root) if name.endswith(".json")]
+        return sorted((meta for meta in wordlists if meta is not None), key=lambda meta: meta["created_at"])
+
+    def acquire(self, wordlist_id: str) -> LineIndexedFile:
+        """
+        acquire returns the shared memory-mapped view of a wordlist, to be given back with `release`.
+
+        Raises:
+            KeyError: If there is no such wordlist.
+        """
+        if wordlist_id not in self._open:
+            if self.get(wordlist_id) is None:
+                raise KeyError(f"No wordlist {wordlist_id}")
+            self._open[wordlist_id] = LineIndexedFile(self._path(wordlist_id, ".txt"), index_root=self.root)
+            self._users[wordlist_id] = 0
+        self._users[wordlist_id] += 1
+        return self._open[wordlist_id]
+
+    def release(self, wordlist_id: str) -> None:
+        """
+        release gives back a wordlist obtained with `acquire`, closing it once no job uses it.
+        """
+        if wordlist_id not in self._users:
+            return
+        self._users[wordlist_id] -= 1
+        if self._users[wordlist_id] <= 0:
+            del self._users[wordlist_id]
+            self._open.pop(wordlist_id).close()
+
+    def delete(self, wordlist_id: str) -> bool:
+        """
+        delete removes a wordlist, returning False when there is no such wordlist.
+
+        Raises:
+            ValueError: If a job is using the wordlist.
+        """
+        if self.get(wordlist_id) is None:
+            return False
+        if wordlist_id in self._users:
+            raise ValueError(f"Wordlist {wordlist_id} is used by a running job.")
+        words_path = self._path(wordlist_id, ".txt")
+        paths = [self._path(wordlist_id, ".json")]
+        if os.path.exists(words_path):
+            paths += [index_path(words_path, self.root), words_path]
+        for path in paths:
+            if os.path.exists(path):
+                os.remove(path)
+        return True
+
+async def read_upload(chunks: AsyncIterable[bytes], content_type: str, feed: Callable[[bytes], None]) -> Optional[str]:
+    """
+    read_upload passes an uploaded file to `feed` chunk by chunk while the request body streams in, without buffering it.
+
+    Args:
+        chunks (AsyncIterable[bytes]): The request body.
+        content_type (str): The request's Content-Type header.
+        feed (Callable[[bytes], None]): Called with every chunk of the file.
+
+    Returns:
+        Optional[str]: The file name of a multipart/form-data upload, whose first file part is the file and
+        other fields are ignored. None for any other content type, the whole body being the file.
+
+    Raises:
+        ValueError: If a multipart body has no boundary or no file part.
+    """
+    media_type, options = parse_options_header(content_type or "")
+    if media_type != b"multipart/form-data":
+        async for chunk in chunks:
+            feed(chunk)
+        return None
+    boundary = options.get(b"boundary")
+    if not boundary:
+        raise ValueError("The multipart upload has no boundary.")
+
+    part = {"field": b"", "value": b"", "headers": {}, "file": False}
+    uploaded = {}
+
+    def on_header_field(data, start, end):
+        part["field"] += data[start:end]
+
+    def on_header_value(data, start, end):
+        part["value"] += data[start:end]
+
+    def on_header_end():
+        part["headers"][part["field"].lower()] = part["value"]
+        part["field"] = part["value"] = b""
+
+    def on_headers_finished():
+        _, disposition = parse_options_header(part["headers"].get(b"content-disposition", b""))
+        filename = disposition.get(b"filename")
+        part["file"] = filename is not None and "filename" not in uploaded
+        if part["file"]:
+            uploaded["filename"] = filename.decode("utf-8", errors="replace")
+
+    def on_part_data(data, start, end):
+        if part["file"]:
+            feed(bytes(data[start:end]))
+
+    def on_part_end():
+        part["headers"] = {}
+        part["file"] = False
+
+    parser = MultipartParser(boundary, callbacks={
+        "on_header_field": on_header_field,
+        "on_header_value": on_header_value,
+        "on_header_end": on_header_end,
+        "on_headers_finished": on_headers_finished,
+        "on_part_data": on_part_data,
+        "on_part_end": on_part_end
+    })
+    async for chunk in chunks:
+        parser.write(chunk)
+    parser.finalize()
+    if "filename" not in uploaded:
+        raise ValueError("The multipart upload has no file part.")
+    return uploaded["filename"]
@@ -1,10 +1,20 @@
 import os
 import time
 import logging
+import random
+import string
 import asyncio
-from typing import List, Dict, Callable, Optional
+from collections import deque
+from typing import List, Dict, Any, Callable, Optional
+from urllib.parse import urljoin
 from src.modules.dbf.dbf_response_processor import ResponseProcessor
 from src.modules.dbf.httpmock import AsyncHttpClient
+from src.modules.dbf.directory_tree import PathTrie, build_tree
+from src.modules.dbf.word_expansion import WordExpander
+from src.modules.dbf.wildcard_filter import WildcardFilter
+from src.modules.common.http_response import HttpResponse, header_value, declared_length
+from src.modules.common.checkpoint import WorkCheckpoint
+from src.modules.common.latency_histogram import RequestStats
 
 log_path = os.path.join(os.path.dirname(__file__), "directory_bruteforce.log")
 logging.basicConfig(
@@ -14,13 +24,61 @@ logging.basicConfig(
     format="%(asctime)s [%(levelname)s] %(message)s"
 )
 
+# Statuses of a path that exists as a directory: listed, redirected to its trailing slash, or forbidden
+DIRECTORY_STATUSES = (200, 301, 302, 307, 308, 403)
+REDIRECT_STATUSES = (301, 302, 307, 308)
+# Statuses marking a path as dead, no descent is made below it
+DEAD_STATUSES = (0, 404, 410)
+# Most dead paths remembered for pruning, past it descents are no longer pruned
+MAX_DEAD_PATHS = 50000
+# get requests every word in full, head and range probe it first and only GET the paths that answer
+PROBE_MODES = ("get", "head", "range")
+
 class MockResponse:
-    def __init__(self, url: str, status: int, text: str):
+    def __init__(self, url: str, status: int, text: str, response: HttpResponse = None):
         self.url = url
         self.status_code = status
-        self.text = text
+        self._text = text
         self.payload = None
         self.error = False
+        self.headers = None
+        self.elapsed = None
+        self.metrics = None
+        self.signatures = None
+        # Full body size announced by a probe's headers, reported instead of the length of the part read
+        self.declared_length = None
+        # Client response the text is decoded from on first access, when not given up front
+        self.response = response
+        if response is not None:
+            self.headers = response.get("headers")
+            self.elapsed = response.get("elapsed")
+            self.metrics = response.get("metrics")
+            self.signatures = response.get("signatures")
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.response["text"]
+        return self._text
+
+    @property
+    def length(self) -> int:
+        if self.declared_length is not None:
+            return self.declared_length
+        if self._text is None and isinstance(self.response, HttpResponse):
+            return self.response.length
+        return len(self.text)
+
+    def snippet(self, chars: int = 200) -> str:
+        if self._text is None and isinstance(self.response, HttpResponse):
+            return self.response.snippet(chars)
+        return self.text[:chars]
+
+    @property
+    def body(self) -> bytes:
+        if isinstance(self.response, HttpResponse):
+            return self.response.body
+        return self.text.encode("utf-8")
 
 class DirectoryBruteForceManager:
     def __init__(self, http_client: AsyncHttpClient = None) -> None:
@@ -29,15 +87,46 @@ class DirectoryBruteForceManager:
         self.http_client = http_client or AsyncHttpClient()
         self.request_count = 0
         self.attempt_limit = -1
+        self.concurrency = 10
+        self.rate = None
         self.start_time = None
         self.end_time = None
         self._paused = False
         self._stopped = False
         self.wordlist = []
         self.current_index = 0
+        self.start_index = 0
+        self.stop_index = 0
+        self._next_send = 0.0
+        self.recursive = False
+        self.max_depth = 0
+        self.depth_budget = None
+        self.directories = []
+        self.dead_paths = PathTrie()
+        self.pruned_directories = 0
+        self._known_directories = set()
+        self._next_directory = 0
+        self._outstanding = 0
+        self._work_changed = None
+        self.expander = WordExpander()
+        self.extensions_on_hit = False
+        self.expanded_hits = 0
+        self._bare_only_words = 0
+        self._bare_only_counted = True
+        self._deferred = deque()
+        self.wildcards = None
+        self.calibration_samples = 3
+        self.calibration_requests = 0
+        self.probe = "get"
+        self.probe_bytes = 1024
+        self.probe_fallback = False
+        self.probe_requests = 0
+        self.confirm_requests = 0
         self.on_new_row = None 
         self.progress_callback = None
         self.last_row = None
+        self.checkpoint = None
+        self.request_stats = RequestStats()
 
     def configure_scan(
         self,
@@ -48,10 +137,51 @@ class DirectoryBruteForceManager:
         show_only_status: List[int] = None,
         length_filter: int = None,
         headers: Dict[str, str] = None,
-        attempt_limit: int = -1
+        attempt_limit: int = -1,
+        match_expression: str = None,
+        filter_expression: str = None,
+        start_index: int = 0,
+        concurrency: int = 10,
+        rate: float = None,
+        recursive: bool = False,
+        max_depth: int = 3,
+        depth_budget: int = None,
+        extensions: List[str] = None,
+        suffixes: List[str] = None,
+        extensions_on_hit: bool = False,
+        auto_calibrate: bool = False,
+        calibration_samples: int = 3,
+        probe: str = "get",
+        probe_bytes: int = 1024,
+        directory_words: int = None
     ) -> None:
+        """
+        Configure the scan. `concurrency` workers send the requests, at most `rate` per second when set,
+        and a positive `attempt_limit` caps the number of words scanned from `start_index` in each directory.
+        In recursive mode the directories found are scanned too, down to `max_depth` levels below the top
+        directory and at most `depth_budget` directories per level when set. With `probe` set to head or range,
+        every word is first requested with HEAD or with a GET of its first `probe_bytes` bytes, and only the
+        paths that do not answer a dead status are requested again in full. `directory_words`, the number of
+        words of the whole wordlist ending with a slash when already known, gives the request total up front.
+        """
         if not target_url or not wordlist:
             raise ValueError("Missing required configuration parameters.")
+        if start_index < 0:
+            raise ValueError("Start index must not be negative.")
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+        if rate is not None and rate <= 0:
+            raise ValueError("The request rate must be positive.")
+        if recursive and (max_depth is None or max_depth < 1):
+            raise ValueError("Recursive scans need a maximum depth of at least 1.")
+        if depth_budget is not None and depth_budget < 1:
+            raise ValueError("The per-depth budget must be at least 1.")
+        if auto_calibrate and calibration_samples < 1:
+            raise ValueError("Calibration needs at least one sample.")
+        if probe not in PROBE_MODES:
+            raise ValueError(f"Unknown probe mode: {probe}")
+        if probe == "range" and probe_bytes < 1:
+            raise ValueError("Range probes need at least one byte.")
 
         self.config = {
             "target_url": target_url.rstrip('/'),
@@ -64,98 +194,423 @@ class DirectoryBruteForceManager:
         }
         self.wordlist = wordlist
         self.attempt_limit = attempt_limit
+        self.concurrency = concurrency
+        self.rate = rate
+        self.recursive = recursive
+        self.max_depth = max_depth if recursive else 0
+        self.depth_budget = depth_budget
+        self.expander = WordExpander(extensions, suffixes)
+        self.extensions_on_hit = extensions_on_hit and self.expander.count > 1
+        self.wildcards = WildcardFilter() if auto_calibrate else None
+        self.calibration_samples = calibration_samples
+        self.calibration_requests = 0
+        self.probe = probe
+        self.probe_bytes = probe_bytes
+        self.probe_fallback = False
+        self.probe_requests = 0
+        self.confirm_requests = 0
         self.response_processor.set_filters(show_only_status or [200], hide_status or [], length_filter)
+        self.response_processor.set_expressions(match_expression, filter_expression)
         
         # Reset control flags and counters
         self._paused = False
         self._stopped = False
-        self.current_index = 0
+        self.start_index = start_index
+        self.current_index = start_index
+        self.stop_index = len(wordlist) if attempt_limit is None or attempt_limit <= 0 else min(len(wordlist), start_index + attempt_limit)
+        # Words only requested bare are counted while the top directory's words are generated, unless already known
+        self._bare_only_words = 0
+        self._bare_only_counted = self.expander.count == 1
+        if not self._bare_only_counted and directory_words is not None and start_index == 0 and self.stop_index == len(wordlist):
+            self._bare_only_words = directory_words
+            self._bare_only_counted = True
+        self.expanded_hits = 0
         self.request_count = 0
+        self.checkpoint = None
+        self.request_stats = RequestStats()
+        self.directories = []
+        self.dead_paths = PathTrie()
+        self.pruned_directories = 0
+        self._known_directories = set()
+        self._add_directory(self.config["top_dir"], 0)
+
+    def set_signature_matcher(self, matcher) -> None:
+        """
+        Flag the results with the error signatures found in their body, scanned while streaming
+        when the HTTP client supports it. None disables signature matching.
+        """
+        self.response_processor.set_signature_matcher(matcher)
+        if hasattr(self.http_client, "signature_matcher"):
+            self.http_client.signature_matcher = matcher
+
+    def enable_checkpoints(
+        self,
+        path: str,
+        interval: float = 5.0,
+        extra_state: Callable[[], Dict[str, Any]] = None,
+        resume_state: Dict[str, Any] = None,
+        static_state: Dict[str, Any] = None
+    ) -> WorkCheckpoint:
+        """
+        Track the scanned work items and save the resume point to `path` every `interval` seconds
+        and when the scan ends. With `resume_state`, the scan restarts from that checkpoint's watermark
+        with the results and directories it had found. `static_state` (the job config) is written once, and
+        the results are appended to the checkpoint's results file rather than rewritten on every save.
+        Must be called after configure_scan.
+        """
+        def state() -> Dict[str, Any]:
+            data = {"directories": self.directories}
+            if callable(extra_state):
+                data.update(extra_state())
+            return data
+
+        def results() -> List[Dict[str, Any]]:
+            return self.response_processor.filtered
+
+        if resume_state is None:
+            # Items are numbered per variant, the first one of word start_index is start_index * variants
+            self.checkpoint = WorkCheckpoint(path, self.start_index * self.expander.count, interval, state, static_state, results)
+        else:
+            self.checkpoint = WorkCheckpoint.from_state(path, resume_state, interval, state, static_state, results)
+            self.current_index = self.checkpoint.watermark
+            self.response_processor.load(resume_state.get("results", []))
+            for directory in resume_state.get("directories", [])[1:]:
+                self._add_directory(directory["path"], directory["depth"])
+            logging.info("Resuming scan from work item %d", self.checkpoint.watermark)
+        return self.checkpoint
 
     async def start_scan(self) -> None:
+        """
+        Scan the words in [start_index, stop_index) of every directory: the top directory first, then in
+        recursive mode each directory found, level by level. Work items are streamed onto a bounded queue
+        drained by `concurrency` workers, each waiting for the next send slot when a rate is set
+        """
         self.start_time = time.perf_counter()
+        self._next_send = 0.0
+        self._next_directory = 0
+        self._outstanding = 0
+        self._work_changed = asyncio.Event()
+        self._deferred = deque()
         target = self.config["target_url"]
-        top = self.config["top_dir"]
-        wordlist = self.config["wordlist"]
         headers = self.config["headers"]
-        total_requests = len(wordlist)
-
-        for i, word in enumerate(wordlist):
-            # Store current position
-            self.current_index = i
-                
-            while self._paused and not self._stopped:
-                await self._wait_pause()
-                
+        concurrency = max(1, self.concurrency)
+        logging.info("Scan started on %d words, %d variant(s) each, with %d worker(s)%s%s", self.stop_index - self.start_index, self.expander.count,
+                     concurrency, f" at {self.rate} requests/s" if self.rate else "", f", recursing {self.max_depth} level(s)" if self.recursive else "")
+
+        queue = asyncio.Queue(maxsize=concurrency * 2)
+        producer = asyncio.create_task(self._produce_words(queue, concurrency))
+        workers = [asyncio.create_task(self._scan_worker(queue, target, headers)) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(producer, *workers)
+        finally:
+            for task in [producer, *workers]:
+                task.cancel()
+            if self.checkpoint is not None:
+                self.checkpoint.save()
             if self._stopped:
-                logging.info("Scan stopped after pause.")
+                logging.info("Scan stopped after %d requests", self.request_count)
+            self.end_time = time.perf_counter()
+
+    def get_total_requests(self) -> int:
+        """
+        Number of requests of the scan, computed from the word and variant counts: it grows as directories
+        are found in recursive mode and as bare words are found with extensions_on_hit. With extensions and no
+        directory_words, it is an upper bound until the top directory's words have all been generated
+        """
+        words = max(0, self.stop_index - self.start_index)
+        if self.extensions_on_hit:
+            return words * len(self.directories) + self.expanded_hits * (self.expander.count - 1)
+        return self.expander.requests_for(words, self._bare_only_words) * len(self.directories)
+
+    def _add_directory(self, path: str, depth: int) -> bool:
+        """Queue a directory for scanning unless it is known, dead, too deep or over its level's budget"""
+        path = path.strip("/")
+        if path in self._known_directories:
+            return False
+        if depth > 0:
+            if depth > self.max_depth or self.dead_paths.covers(path):
+                self.pruned_directories += 1
+                return False
+            if self.depth_budget is not None and sum(1 for directory in self.directories if directory["depth"] == depth) >= self.depth_budget:
+                self.pruned_directories += 1
+                logging.info("Depth %d budget reached, not descending into /%s/", depth, path)
+                return False
+            logging.info("Directory found: /%s/ (depth %d)", path, depth)
+        self._known_directories.add(path)
+        self.directories.append({"path": path, "depth": depth})
+        return True
+
+    def _mark_dead(self, path: str, depth: int) -> None:
+        """
+        Remember a dead path so no directory is queued below it. Only directories scanned above max_depth
+        can queue one, so the paths of deeper ones and of non-recursive scans are not kept, and the trie
+        stops growing at MAX_DEAD_PATHS
+        """
+        if depth < self.max_depth and len(self.dead_paths) < MAX_DEAD_PATHS:
+            self.dead_paths.add(path)
+
+    def _directory_found(self, full_url: str, word: str, response) -> Optional[str]:
+        """The URL of the directory a response reveals: a trailing slash path that exists, or a redirect to one"""
+        status = response["status"]
+        if status not in DIRECTORY_STATUSES:
+            return None
+        if word.endswith("/"):
+            return full_url
+        slashed = full_url + "/"
+        if (response.get("url") or full_url) == slashed:
+            # The client followed the redirect to the trailing slash
+            return slashed
+        location = header_value(response.get("headers"), "location")
+        if status in REDIRECT_STATUSES and location and urljoin(full_url, location) == slashed:
+            return slashed
+        return None
+
+    def _pending_items(self):
+        """
+        Generate the (index, word, directory) items left to scan, directory by directory as they are found, skipping
+        those a resumed checkpoint already completed. Word i of directory n is numbered (n * words + i) * variants plus
+        its variant, words being the number of words scanned per directory, so the numbers of consecutive directories
+        leave no gap the checkpoint watermark would stall at; with extensions_on_hit only the bare words are generated,
+        plus the variants a resumed scan still owes
+        """
+        variants = self.expander.count
+        per_directory = (self.stop_index - self.start_index) * variants
+        completed = self.checkpoint.is_completed if self.checkpoint is not None else lambda index: False
+        while self._next_directory < len(self.directories):
+            ordinal = self._next_directory
+            self._next_directory += 1
+            directory = self.directories[ordinal]
+            count_bare_only = ordinal == 0 and not self._bare_only_counted
+            for i in range(self.start_index, self.stop_index):
+                word = self.wordlist[i]
+                if count_bare_only and not self.expander.applies(word):
+                    self._bare_only_words += 1
+                base = ordinal * per_directory + i * variants
+                if not completed(base):
+                    yield base, word, directory
+                    if self.extensions_on_hit:
+                        continue
+                elif not self.extensions_on_hit and not self.expander.applies(word):
+                    continue
+                if self.expander.applies(word):
+                    for variant in range(1, variants):
+                        if not completed(base + variant):
+                            yield base + variant, self.expander.expand(word, variant), directory
+            if count_bare_only:
+                self._bare_only_counted = True
+
+    async def _produce_words(self, queue: asyncio.Queue, worker_count: int) -> None:
+        """
+        Enqueue the items left to scan, the variants of the bare words found first, then one stop marker per worker.
+        Once the known items are exhausted, wait for those in flight, which may find new directories or words
+        """
+        if self.probe != "get" and not self.probe_fallback:
+            await self._calibrate_probe()
+        items = self._pending_items()
+        while not self._stopped:
+            item = self._deferred.popleft() if self._deferred else next(items, None)
+            if item is not None:
+                if self.wildcards is not None and item[2]["path"] not in self.wildcards.calibrated:
+                    await self._calibrate_directory(item[2])
+                self._outstanding += 1
+                await queue.put(item)
+            elif self._outstanding:
+                self._work_changed.clear()
+                await self._work_changed.wait()
+                # Directories found since the generator ran out are picked up by a new one
+                items = self._pending_items()
+            else:
                 break
-                
-            path = f"{top}/{word}" if top else word
+        for _ in range(worker_count):
+            await queue.put(None)
+
+    async def _calibrate_directory(self, directory: Dict[str, Any]) -> None:
+        """Request random paths in a directory, with the first extension for every other one, and learn its soft 404"""
+        alphabet = string.ascii_lowercase + string.digits
+        samples = []
+        for sample in range(self.calibration_samples):
+            word = "".join(random.choices(alphabet, k=10 + 4 * sample))
+            if sample % 2 and self.expander.count > 1:
+                word = self.expander.expand(word, 1)
+            path = f"{directory['path']}/{word}" if directory["path"] else word
+            full_url = f"{self.config['target_url']}/{path}"
+            response = await self.http_client.send(method="GET", url=full_url, headers=self.config["headers"])
+            self.calibration_requests += 1
+            samples.append((full_url, word, response))
+        if self.wildcards.calibrate(directory["path"], samples):
+            logging.info("Directory /%s answers random paths, suppressing the responses that look like them", directory["path"])
+
+    async def _calibrate_probe(self) -> None:
+        """
+        Probe the top directory and a random path in it and GET them too, falling back to GET for the whole scan
+        when the statuses disagree: servers that reject HEAD (405, 501) or answer it differently than GET
+        """
+        target, headers = self.config["target_url"], self.config["headers"]
+        top = self.directories[0]["path"]
+        word = "".join(random.choices(string.ascii_lowercase + string.digits, k=12))
+        for path in (f"{top}/" if top else "", f"{top}/{word}" if top else word):
             full_url = f"{target}/{path}"
+            probed = await self._send_probe(full_url, headers)
+            response = await self.http_client.send(method="GET", url=full_url, headers=headers)
+            self.calibration_requests += 2
+            # A range probe of a whole page is answered with its first bytes
+            probed_status = 200 if probed["status"] == 206 else probed["status"]
+            if probed_status != response["status"]:
+                self.probe_fallback = True
+                logging.info("%s %s answered %s instead of %s, scanning with GET", self.probe.upper(), full_url, probed["status"], response["status"])
+                return
+
+    async def _send_probe(self, full_url: str, headers: Dict[str, str]):
+        if self.probe == "head":
+            return await self.http_client.send(method="HEAD", url=full_url, headers=headers)
+        return await self.http_client.send(method="GET", url=full_url, headers={**headers, "Range": f"bytes=0-{self.probe_bytes - 1}"})
+
+    async def _fetch(self, full_url: str, headers: Dict[str, str]):
+        """
+        Request a word, returning its response and whether that is a probe: in probe mode the paths answering
+        a dead status or failing keep their probe, the others are confirmed with a full GET
+        """
+        if self.probe == "get" or self.probe_fallback:
+            return await self.http_client.send(method="GET", url=full_url, headers=headers), False
+        self.probe_requests += 1
+        probed = await self._send_probe(full_url, headers)
+        if not probed["status"] or probed["status"] in DEAD_STATUSES:
+            return probed, True
+        self.request_stats.record(probed)
+        self.confirm_requests += 1
+        return await self.http_client.send(method="GET", url=full_url, headers=headers), False
+
+    def _settle_variants(self, index: int, word: str, directory: Dict[str, Any], found: bool) -> None:
+        """
+        Once a bare word is scanned, mark its variants done when they do not apply to it, and with extensions_on_hit
+        queue them when the word was found or mark them done when it was not, so the checkpoint watermark moves past them
+        """
+        variants = self.expander.count
+        if variants == 1 or index % variants:
+            return
+        if self.extensions_on_hit and found and self.expander.applies(word):
+            self.expanded_hits += 1
+            self._deferred.extend((index + variant, self.expander.expand(word, variant), directory) for variant in range(1, variants))
+        elif (self.extensions_on_hit or not self.expander.applies(word)) and self.checkpoint is not None:
+            for variant in range(1, variants):
+                self.checkpoint.complete(index + variant)
+
+    async def _scan_worker(self, queue: asyncio.Queue, target: str, headers: Dict[str, str]) -> None:
+        """Scan the items pulled from the queue until a stop marker, discarding those dequeued after a stop"""
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
             try:
-                response = await self.http_client.send(
-                    method="GET",
-                    url=full_url,
-                    headers=headers
-                )
-                mock = MockResponse(response["url"], response["status"], response["text"])
-                mock.payload = word
-                mock.error = response["status"] not in [200, 403]
-                self.response_processor.process_response(mock)
-                
-                # Create a result object that can be sent to frontend
-                result_item = {
-                    "id": self.request_count + 1,
-                    "url": full_url,
-                    "status": response["status"],
-                    "payload": word,
-                    "length": len(response["text"]),
-                    "error": mock.error
-                }
-                
-                self.last_row = result_item
-                if callable(self.on_new_row):
-                    self.on_new_row(result_item)
-                    
-                logging.info("Scanned %s [%d]", full_url, response["status"])
-                self.request_count += 1
-                
-                self.progress_callback(self.request_count, total_requests, word, None)
-                
-                # Add a small delay to avoid overwhelming the server
-                await asyncio.sleep(0.1)
-                
-            except Exception as e:
-                logging.error("Request error for %s: %s", full_url, str(e))
-                error_response = MockResponse(full_url, 0, str(e))
-                error_response.payload = word
-                error_response.error = True
-                self.response_processor.process_response(error_response)
-                
-                # Create an error result object
-                error_item = {
-                    "id": self.request_count + 1,
-                    "url": full_url,
-                    "status": 0,
-                    "payload": word,
-                    "length": 0,
-                    "error": True
-                }
-                
-                self.last_row = error_item
-                if callable(self.on_new_row):
-                    self.on_new_row(error_item)
-                    
+                while self._paused and not self._stopped:
+                    await self._wait_pause()
+                if self._stopped:
+                    continue
+                await self._throttle()
+                await self._scan_word(*item, target, headers)
+            finally:
+                self._outstanding -= 1
+                self._work_changed.set()
+
+    async def _throttle(self) -> None:
+        """Wait for the next send slot, slots being 1 / rate seconds apart, when a rate is set"""
+        if not self.rate:
+            return
+        now = time.perf_counter()
+        slot = max(now, self._next_send)
+        self._next_send = slot + 1.0 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def _scan_word(self, i: int, word: str, directory: Dict[str, Any], target: str, headers: Dict[str, str]) -> None:
+        """Request a single word in a directory, emit its result row and queue the directory it reveals"""
+        self.current_index = i
+        if self.checkpoint is not None:
+            self.checkpoint.begin(i)
+        path = f"{directory['path']}/{word}" if directory["path"] else word
+        full_url = f"{target}/{path}"
+        try:
+            response, probed = await self._fetch(full_url, headers)
+            self.request_stats.record(response)
+
+            # Wildcard and soft 404 answers are counted but neither stored, emitted nor descended into
+            if self.wildcards is not None and self.wildcards.matches(directory["path"], full_url, word, response):
                 self.request_count += 1
-                
-                self.progress_callback(self.request_count, total_requests, word, str(e))
-        
-        # Set end time if not stopped
-        if not self._stopped:
-            self.end_time = time.perf_counter()
-        else:
-            self.end_time = time.perf_counter()
+                self._settle_variants(i, word, directory, False)
+                self._complete(i)
+                if callable(self.progress_callback):
+                    self.progress_callback(self.request_count, self.get_total_requests(), word, None)
+                return
+
+            mock = MockResponse(response["url"], response["status"], None, response=response)
+            mock.payload = word
+            mock.error = response["status"] not in [200, 403]
+            if probed:
+                mock.declared_length = declared_length(response.get("headers"))
+            self.response_processor.process_response(mock)
+
+            if response["status"] in DEAD_STATUSES:
+                self._mark_dead(path, directory["depth"])
+            elif directory["depth"] < self.max_depth and self._directory_found(full_url, word, response):
+                self._add_directory(path, directory["depth"] + 1)
+            self._settle_variants(i, word, directory, response["status"] not in DEAD_STATUSES)
+
+            # Count the request before building its row so concurrent rows get distinct ids
+            self.request_count += 1
+            result_item = {
+                "id": self.request_count,
+                "url": full_url,
+                "status": response["status"],
+                "payload": word,
+                "length": mock.length,
+                "error": mock.error,
+                "depth": directory["depth"]
+            }
+
+            self.last_row = result_item
+            if callable(self.on_new_row):
+                self.on_new_row(result_item)
+
+            logging.info("Scanned %s [%s]", full_url, response["status"])
+            self._complete(i)
+
+            if callable(self.progress_callback):
+                self.progress_callback(self.request_count, self.get_total_requests(), word, None)
+
+        except Exception as e:
+            logging.error("Request error for %s: %s", full_url, str(e))
+            self.request_stats.record_error()
+            error_response = MockResponse(full_url, 0, str(e))
+            error_response.payload = word
+            error_response.error = True
+            self.response_processor.process_response(error_response)
+            self._mark_dead(path, directory["depth"])
+            self._settle_variants(i, word, directory, False)
+
+            self.request_count += 1
+            error_item = {
+                "id": self.request_count,
+                "url": full_url,
+                "status": 0,
+                "payload": word,
+                "length": 0,
+                "error": True,
+                "depth": directory["depth"]
+            }
+
+            self.last_row = error_item
+            if callable(self.on_new_row):
+                self.on_new_row(error_item)
+
+            self._complete(i)
+
+            if callable(self.progress_callback):
+                self.progress_callback(self.request_count, self.get_total_requests(), word, str(e))
+
+    def _complete(self, index: int) -> None:
+        """Record a scanned word in the checkpoint, before the progress callback can cancel the scan"""
+        if self.checkpoint is not None:
+            self.checkpoint.complete(index)
 
     async def _wait_pause(self, interval=0.5):
         """Helper method to wait during pause state"""
@@ -179,29 +634,59 @@ class DirectoryBruteForceManager:
         if not self.end_time:
             self.end_time = time.perf_counter()
 
-    def get_metrics(self) -> Dict[str, float]:
-        """Get metrics about the scan progress and results"""
-        current_time = time.perf_counter()
-        total_time = (self.end_time or current_time) - (self.start_time or current_time) if self.start_time else 0
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get metrics about the scan progress and results, request latency percentiles, bytes/second and error rates included"""
+        total_time = self._running_time()
         rps = self.request_count / total_time if total_time > 0 else 0
-        return {
+        metrics = {
             "running_time": total_time,
             "processed_requests": self.request_count,
-            "filtered_requests": len(self.response_processor.get_filtered_results()),
-            "requests_per_second": rps
+            "filtered_requests": self.response_processor.filtered_count(),
+            "requests_per_second": rps,
+            "status_counts": dict(self.response_processor.status_counts)
         }
+        if self.expander.count > 1:
+            metrics["variants_per_word"] = self.expander.count
+            if self.extensions_on_hit:
+                metrics["expanded_words"] = self.expanded_hits
+        if self.wildcards is not None or self.probe != "get":
+            metrics["calibration_requests"] = self.calibration_requests
+        if self.wildcards is not None:
+            metrics.update(self.wildcards.summary())
+        if self.probe != "get":
+            metrics["probe"] = "get" if self.probe_fallback else self.probe
+            metrics["probe_requests"] = self.probe_requests
+            metrics["confirm_requests"] = self.confirm_requests
+        if self.recursive:
+            metrics["directories"] = len(self.directories)
+            metrics["pruned_directories"] = self.pruned_directories
+            metrics["dead_paths"] = len(self.dead_paths)
+        metrics.update(self.request_stats.summary(total_time))
+        return metrics
 
-    def get_filtered_results(self) -> List[Dict]:
-        """Get the filtered results from the response processor"""
-        filtered_results = self.response_processor.get_filtered_results()
-        
-        # Add id field if not present
-        for i, result in enumerate(filtered_results):
-            if 'id' not in result:
-                result['id'] = i + 1
-                
-        return filtered_results
+    def get_request_stats(self) -> Dict[str, Any]:
+        """Get the latency percentiles, bytes/second and error rates of the requests sent so far, and the soft 404s suppressed when calibrated"""
+        stats = self.request_stats.summary(self._running_time())
+        if self.wildcards is not None:
+            stats["suppressed"] = sum(self.wildcards.suppressed.values())
+        return stats
+
+    def _running_time(self) -> float:
+        current_time = time.perf_counter()
+        return (self.end_time or current_time) - (self.start_time or current_time) if self.start_time else 0
+
+    def get_filtered_results(self, start: int = 0) -> List[Dict]:
+        """Get the filtered results from the response processor, from position `start` on"""
+        return self.response_processor.get_filtered_results(start)
+
+    def get_filtered_count(self) -> int:
+        """Number of filtered results, without copying them"""
+        return self.response_processor.filtered_count()
     
+    def get_tree(self) -> Dict[str, Any]:
+        """Get the filtered results and the directories found as a tree of paths below the target"""
+        return build_tree(self.config["target_url"], self.get_filtered_results(), [directory["path"] for directory in self.directories[1:]])
+
     def save_results_to_txt(self, filename: str = "dbf_results.txt") -> None:
         """Save the filtered results to a text file"""
         results = self.get_filtered_results()
@@ -1,62 +1,171 @@
 import json
+from src.modules.common.http_response import header_value
+from src.modules.common.result_filter import compile_filter, ResponseSubject, subject_from_result
+from src.modules.common.signature_matcher import reflects_payload
 
 class ResponseProcessor:
+    """
+    Filters the scan responses as they come in. Only the results passing the filters are kept, the others
+    are only counted, so memory grows with the results found rather than the requests sent.
+    """
+
     def __init__(self, response=None):
-        self.response = response or []
-    
+        # Append-only between filter changes, ids are the 1-based position of a result
+        self.filtered = []
+        # Kept up to date as responses come in so the counts never rescan the responses
+        self.total = 0
+        self.status_counts = {}
+        self.status_code_filter = []
+        self.hide_codes = []
+        self.length_threshold = 0
+        self.matcher = None
+        self.hider = None
+        self.body_store = None
+        self.signature_matcher = None
+        self._predicate = self._compile_predicate()
+        self.load(response or [])
+
     def process_response(self, response):
-        self.response.append({
+        """Count a response and, if it passes the compiled filters, add it to the filtered results"""
+        result = {
             "url": response.url,
             "status": response.status_code,
             "payload": response.payload,
-            "length": len(response.text),
+            "length": response.length if hasattr(response, "length") else len(response.text),
             "error": response.error
-        })
+        }
+        elapsed = getattr(response, "elapsed", None)
+        if elapsed is not None:
+            result["time"] = elapsed
+        metrics = getattr(response, "metrics", None)
+        if metrics:
+            result["words"] = metrics["words"]
+            result["lines"] = metrics["lines"]
+        self._count(result)
+        if self._predicate(result, ResponseSubject(response)):
+            # Only the bodies of the results kept are captured and scanned
+            body = getattr(response, "body", None)
+            if self.signature_matcher is not None and response.status_code and body is not None:
+                signatures = getattr(response, "signatures", None)
+                if signatures is None:
+                    signatures = self.signature_matcher.scan(body)
+                reflected = response.payload and reflects_payload(body, [response.payload])
+                result["signatures"] = list(signatures) + (["reflected"] if reflected else [])
+            if self.body_store is not None and response.status_code and body is not None:
+                result["body_ref"] = self.body_store.put(body)
+                result["content_type"] = header_value(getattr(response, "headers", None), "content-type")
+            self._add_filtered(result)
+
+    def _count(self, result):
+        self.total += 1
+        status = result.get("status")
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+
+    def _add_filtered(self, result):
+        result["id"] = len(self.filtered) + 1
+        self.filtered.append(result)
+
+    def set_signature_matcher(self, matcher):
+        """Flag the filtered results with the error signatures found in their body, None to disable it"""
+        self.signature_matcher = matcher
+
+    def set_body_store(self, body_store):
+        """Capture the full body of the filtered results in a BodyStore, None to disable it"""
+        self.body_store = body_store
 
     def set_filters(self, status_filter, hide_codes=None, length_threshold=None):
         self.status_code_filter = status_filter
         self.hide_codes = hide_codes or []
         self.length_threshold = length_threshold or 0
+        self._predicate = self._compile_predicate()
+        self.refilter()
+
+    def set_expressions(self, match=None, filter=None):
+        """Compile the match/filter expressions (see result_filter.FilterExpression) applied to every response"""
+        self.matcher = compile_filter(match) if match else None
+        self.hider = compile_filter(filter) if filter else None
+        self._predicate = self._compile_predicate()
+        self.refilter()
+
+    def _compile_predicate(self):
+        """
+        Fold the status, length and expression filters into a single closure evaluated once per response.
+        Stored results have no body, so when filters change they are re-checked without a subject and
+        expressions then see the stored fields only.
+        """
+        show = frozenset(self.status_code_filter or [])
+        hide = frozenset(self.hide_codes or [])
+        min_length = self.length_threshold or 0
+        matcher, hider = self.matcher, self.hider
+
+        def predicate(result, subject=None):
+            status = result.get("status")
+            if show and status not in show:
+                return False
+            if hide and status in hide:
+                return False
+            if min_length and result.get("length", 0) < min_length:
+                return False
+            if matcher is None and hider is None:
+                return True
+            if subject is None:
+                subject = subject_from_result(result)
+            if matcher is not None and not matcher(subject):
+                return False
+            return hider is None or not hider(subject)
+        return predicate
+
+    def refilter(self):
+        """
+        Re-check the filtered results after the filters changed and renumber those kept. Responses dropped
+        earlier are not kept, so filters changed during a scan only narrow its results
+        """
+        kept = self.filtered
+        self.filtered = []
+        for res in kept:
+            if self._predicate(res):
+                self._add_filtered(res)
+
+    def load(self, results):
+        """Replace the results and the counts with stored results, e.g. those of a resumed checkpoint"""
+        self.filtered = []
+        self.total = 0
+        self.status_counts = {}
+        for res in results:
+            self._count(res)
+            if self._predicate(res):
+                self._add_filtered(dict(res))
 
     def filter_by_status(self, status_codes):
-        return [r for r in self.response if r.get("status") in status_codes]
+        """The filtered results with one of `status_codes`, responses dropped by the filters are not kept"""
+        return [r for r in self.filtered if r.get("status") in status_codes]
 
     def filter_by_content_length(self, min_len=0, max_len=float('inf')):
-        return [r for r in self.response if min_len <= r.get("length", 0) <= max_len]
+        """The filtered results with a length in [min_len, max_len], responses dropped by the filters are not kept"""
+        return [r for r in self.filtered if min_len <= r.get("length", 0) <= max_len]
 
     def extract_successful(self):
-        return [r for r in self.response if r.get("status") and 200 <= r["status"] < 300]
+        """The filtered results with a 2xx status, responses dropped by the filters are not kept"""
+        return [r for r in self.filtered if r.get("status") and 200 <= r["status"] < 300]
 
     def log_results(self):
-        for res in self.response:
+        """Print the filtered results"""
+        for res in self.filtered:
             print(f"[{res.get('status', 'ERROR')}] {res['url']} (len={res.get('length', 0)})")
             if res.get('error'):
                 print(f"  ↳ Error: {res['error']}")
     
-    def get_filtered_results(self):
-        filtered = []
-
-        for res in self.response:
-            status = res.get("status")
-            length = res.get("length", 0)
-
-            # Apply show_only filter
-            if self.status_code_filter and status not in self.status_code_filter:
-                continue
-
-            # Apply hide_status filter
-            if self.hide_codes and status in self.hide_codes:
-                continue
+    def get_filtered_results(self, start=0):
+        """
+        The filtered results from position `start` on, to fetch only the ones added since a previous call.
+        Always a new list, so callers cannot change the results by modifying it
+        """
+        return self.filtered[start:]
 
-            # Apply content length filter
-            if self.length_threshold and length < self.length_threshold:
-                continue
+    def filtered_count(self):
+        return len(self.filtered)
 
-            filtered.append(res)
+    def counts(self):
+        """Total, filtered and per-status response counts"""
+        return {"total": self.total, "filtered": len(self.filtered), "status": dict(self.status_counts)}
 
-        return filtered
-
-
-
-    
-    
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Iterable, List
+from urllib.parse import urlsplit
+
+def path_segments(path: str) -> List[str]:
+    """Split a URL path into its non-empty segments"""
+    return [segment for segment in path.split("/") if segment]
+
+class PathTrie:
+    """Prefix trie of URL path segments, a path is covered when it or one of its parent directories was added"""
+
+    def __init__(self) -> None:
+        self.root: Dict[str, Any] = {}
+        self.size = 0
+
+    def add(self, path: str) -> None:
+        """Add a path, dropping the paths below it that are now covered by it"""
+        node = self.root
+        for segment in path_segments(path):
+            if node.get(None):
+                return
+            node = node.setdefault(segment, {})
+        if not node.get(None):
+            self.size += 1 - self._count(node)
+            node.clear()
+            node[None] = True
+
+    def _count(self, node: Dict[str, Any]) -> int:
+        if node.get(None):
+            return 1
+        return sum(self._count(child) for child in node.values())
+
+    def covers(self, path: str) -> bool:
+        """Whether the path or one of its prefixes was added"""
+        node = self.root
+        for segment in path_segments(path):
+            if node.get(None):
+                return True
+            node = node.get(segment)
+            if node is None:
+                return False
+        return bool(node.get(None))
+
+    def __len__(self) -> int:
+        return self.size
+
+def build_tree(base_url: str, results: Iterable[Dict[str, Any]], directories: Iterable[str] = ()) -> Dict[str, Any]:
+    """Nest the result URLs and the discovered directory paths under base_url into a tree of {name, path, status, directory, children}"""
+    base_path = urlsplit(base_url).path.rstrip("/")
+    tree = {"name": "/", "path": "/", "status": None, "directory": True, "children": {}}
+
+    def insert(segments: List[str], status=None, directory: bool = False) -> None:
+        node = tree
+        for position, segment in enumerate(segments):
+            children = node["children"]
+            if segment not in children:
+                children[segment] = {
+                    "name": segment,
+                    "path": "/" + "/".join(segments[:position + 1]),
+                    "status": None,
+                    "directory": False,
+                    "children": {}
+                }
+            node = children[segment]
+        if status is not None:
+            node["status"] = status
+        node["directory"] = node["directory"] or directory
+
+    for directory in directories:
+        insert(path_segments(directory), directory=True)
+    for result in results:
+        path = urlsplit(result["url"]).path
+        relative = path[len(base_path):] if path.startswith(base_path + "/") else path
+        insert(path_segments(relative), result.get("status"), directory=path.endswith("/"))
+
+    def freeze(node: Dict[str, Any]) -> Dict[str, Any]:
+        children = [freeze(child) for _, child in sorted(node["children"].items())]
+        node = dict(node, children=children)
+        node["directory"] = node["directory"] or bool(children)
+        return node
+    return freeze(tree)
@@ -1,7 +1,55 @@
+import time
+import asyncio
 import aiohttp
+from src.modules.common.body_metrics import read_body
+from src.modules.common.http_response import HttpResponse, header_value
+from src.modules.common.request_timing import RequestTiming, timing_trace_config
 from typing import Optional, Dict, Any
 
+def range_limit(headers: Optional[Dict[str, str]]) -> Optional[int]:
+    """Number of bytes a `Range: bytes=0-N` request header asks for, None without one"""
+    value = header_value(headers, "range")
+    if not value or not value.startswith("bytes=0-"):
+        return None
+    end = value[len("bytes=0-"):].strip()
+    return int(end) + 1 if end.isdigit() else None
+
 class AsyncHttpClient:
+    """
+    Sends the scan requests through one aiohttp session whose connections are kept alive, so a scan does not pay a
+    new TCP/TLS connection per word and a ranged request cut short only closes its own connection
+    """
+
+    def __init__(self, archive=None, signature_matcher=None, connection_limit: int = 100) -> None:
+        # Optional HttpArchive that every exchange is recorded to
+        self.archive = archive
+        # Optional SignatureMatcher scanning every body while it streams
+        self.signature_matcher = signature_matcher
+        # Fills the RequestTiming of each request with its connect and TTFB times
+        self._trace_config = timing_trace_config()
+        # Most connections open at once, the scan's concurrency
+        self.connection_limit = connection_limit
+        self._session = None
+        self._session_loop = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """The client's session, opened on first use or when the running event loop changed"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trace_configs=[self._trace_config]
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """Close the session and its open connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
 
     async def send(
         self,
@@ -9,23 +57,50 @@ class AsyncHttpClient:
         url: str,
         headers: Optional[Dict[str, str]] = None,
         timeout: int = 5
-    ) -> Dict[str, any]:
+    ) -> HttpResponse:
         try:
-            async with aiohttp.ClientSession(headers=headers) as session:
-                async with session.request(
-                    method=method.upper(),
-                    url=url,
-                    timeout=timeout
-                ) as response:
-                    return {
-                        "url": str(response.url),
-                        "status": response.status,
-                        "text": await response.text()
-                    }
+            started = time.perf_counter()
+            timing = RequestTiming()
+            async with self._get_session().request(
+                method=method.upper(),
+                url=url,
+                headers=headers,
+                timeout=timeout,
+                trace_request_ctx=timing
+            ) as response:
+                scanner = self.signature_matcher.scanner() if self.signature_matcher is not None else None
+                # A ranged request reads no more than its range even when the server sends the whole body,
+                # the connection is then closed instead of draining the rest
+                limit = range_limit(headers)
+                body, metrics = await read_body(response, scanner=scanner, limit=limit)
+                cut = limit is not None and not response.content.at_eof()
+                if cut:
+                    response.close()
+                timing.total = time.perf_counter() - started
+                if self.archive is not None:
+                    self.archive.record(
+                        method=method,
+                        url=url,
+                        status=response.status,
+                        body=body,
+                        request_headers=headers,
+                        response_headers=dict(response.headers),
+                        elapsed=timing.total,
+                        response_url=str(response.url)
+                    )
+                return HttpResponse(
+                    url=str(response.url),
+                    status=response.status,
+                    body=body,
+                    headers=dict(response.headers),
+                    elapsed=timing.total,
+                    metrics=metrics.as_dict(),
+                    signatures=scanner.matches if scanner is not None else None,
+                    truncated=cut or (scanner is not None and scanner.decided),
+                    timing=timing
+                )
         except Exception as e:
             print(f"[AsyncHttpClient] Error sending request to {url}: {e}")
-            return {
-                "url": url,
-                "status": None,
-                "text": str(e)
-            }
\ No newline at end of file
+            if self.archive is not None:
+                self.archive.record_error(method=method, url=url, error=str(e), request_headers=headers, elapsed=time.perf_counter() - started)
+            return HttpResponse.error(url, str(e))
\ No newline at end of file
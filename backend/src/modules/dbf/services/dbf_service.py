@@ -7,8 +7,15 @@ import os
 import json
 import time
 import random
+import functools
 
 from src.modules.dbf.dbf_manager import DirectoryBruteForceManager
+from src.modules.dbf.httpmock import AsyncHttpClient
+from src.modules.common.http_archive import build_http_client, close_http_client
+from src.modules.common.checkpoint import WorkCheckpoint, checkpoint_path
+from src.modules.common.body_store import BodyStore
+from src.modules.common.signature_matcher import build_signature_matcher
+from src.modules.common.wordlist_store import WordlistStore
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -21,23 +28,63 @@ job_results = {}
 # Format: {job_id: {status, results_file, urls_processed, complated_at, logs}}
 active_connections = {}
 # Format: {job_id: {websocket1, websocket2, ...}}
+# Minimum number of seconds between two recomputations of the request statistics pushed with the progress
+STATS_INTERVAL = 1.0
 
 # Dictionary to keep track of dbf instances
 dbf_instances: Dict[str, Any] = {}
 
+# Uploaded wordlists, shared by the jobs that reference them by ID
+wordlist_store = WordlistStore()
+
 # Pydantic models
 class DBFConfig(BaseModel):
     """
     Configuration model for DBF jobs
     """
     target_url: str
-    wordlist: List[str]
+    # Inline words, or the ID of a wordlist uploaded to /api/wordlists
+    wordlist: Optional[List[str]] = None
+    wordlist_id: Optional[str] = None
     top_dir: Optional[str] = ''
     hide_status: Optional[List[int]] = None
     show_only_status: Optional[List[int]] = None
     length_filter: Optional[int] = None
     headers: Optional[Dict[str, str]] = None
+    # Maximum number of words scanned, -1 for the whole wordlist
     attempt_limit: Optional[int] = -1
+    # Number of workers sending requests in parallel, at most `rate` requests per second when set
+    concurrency: Optional[int] = 10
+    rate: Optional[float] = None
+    # Also scan the directories found, down to max_depth levels and at most depth_budget directories per level
+    recursive: Optional[bool] = False
+    max_depth: Optional[int] = 3
+    depth_budget: Optional[int] = None
+    # Variants of every word, expanded while scanning: word.<extension>, then each form followed by each suffix (e.g. '~', '.bak')
+    extensions: Optional[List[str]] = None
+    suffixes: Optional[List[str]] = None
+    # Only try the variants of the words whose bare form was found (not 404)
+    extensions_on_hit: Optional[bool] = False
+    # Request random paths in every directory first and suppress the responses that look like theirs (wildcard, soft 404)
+    auto_calibrate: Optional[bool] = False
+    calibration_samples: Optional[int] = 3
+    # 'head' or 'range' probe every word with HEAD or the first probe_bytes bytes and only GET the paths that answer
+    probe: Optional[str] = 'get'
+    probe_bytes: Optional[int] = 1024
+    # Result expressions such as 'status in [200-299] and size > 0', see result_filter.FilterExpression
+    match_expression: Optional[str] = None
+    filter_expression: Optional[str] = None
+    # Keep the full body of every result in the content-addressed body store
+    capture_bodies: Optional[bool] = False
+    # Flag results whose body contains error signatures: the built-in SQL error/stack trace set and/or custom ones keyed by ID
+    signature_scan: Optional[bool] = False
+    signatures: Optional[Dict[str, str]] = None
+    # Stop reading a body at its first signature match
+    stop_on_signature: Optional[bool] = False
+    # Record/replay settings: archive_mode is 'record' or 'replay', archive_path a file name under src/database/archives
+    archive_mode: Optional[str] = None
+    archive_path: Optional[str] = None
+    replay_latency: Optional[bool] = False
 
     # Handles any formatted issues with from the frontend
     class Config:
@@ -60,6 +107,12 @@ class DBFJobResponse(BaseModel):
     processed_requests: Optional[int] = 0
     filtered_requests: Optional[int] = 0
     requests_per_second: Optional[float] = 0
+    # Connect/TTFB/total latency percentiles in milliseconds, throughput and error rates
+    latency: Optional[Dict[str, Any]] = None
+    bytes_per_second: Optional[float] = None
+    error_rate: Optional[float] = None
+    # Responses suppressed as wildcard or soft 404 answers
+    suppressed: Optional[int] = None
 
 class DBFResultItem(BaseModel):
     """
@@ -71,6 +124,13 @@ class DBFResultItem(BaseModel):
     payload: str
     length: int
     error: bool
+    time: Optional[float] = None
+    words: Optional[int] = None
+    lines: Optional[int] = None
+    # Digest of the full body in the body store, when captured
+    body_ref: Optional[str] = None
+    # IDs of the error signatures found in the body
+    signatures: Optional[List[str]] = None
 
 class DBFResults(BaseModel):
     """
@@ -78,6 +138,13 @@ class DBFResults(BaseModel):
     """
     results: List[DBFResultItem]
 
+class DBFResultFilter(BaseModel):
+    """
+    Match/filter expressions re-applied to the stored results of a job, on status, size, words, lines and time only.
+    """
+    match: Optional[str] = None
+    filter: Optional[str] = None
+
 class DBFProgressTracker:
     """
     Tracks progress of a DBF job and broadcasts updates through the websockets
@@ -88,6 +155,10 @@ class DBFProgressTracker:
         self.filtered_count = 0
         self.total_count = 0
         self.logs = []
+        # Returns the manager's request statistics, polled at most every STATS_INTERVAL seconds
+        self.stats_source = None
+        self.request_stats = {}
+        self._stats_refreshed = 0
 
     def add_log(self, message):
         """
@@ -99,7 +170,7 @@ class DBFProgressTracker:
 
         # Update the logs in running_jobs 
         if self.job_id in running_jobs:
-            running_jobs[self.job_id]['logs'] = self.logs.copy()
+            running_jobs[self.job_id]['logs'] = self.logs
         logger.info(f'Job {self.job_id}: {message}')
 
         # Broadcast the log message to the connected websockets
@@ -139,11 +210,13 @@ class DBFProgressTracker:
                 rps = 0
             
             # Update the metrics in running_jobs
+            stats = self.refresh_request_stats()
             running_jobs[self.job_id].update({
                 'processed_requests': self.processed_count,
                 'filtered_requests': self.filtered_count,
                 'progress': progress,
-                'requests_per_second': rps
+                'requests_per_second': rps,
+                **stats
             })
 
             # Broadcast progress update to the connected websockets
@@ -152,7 +225,8 @@ class DBFProgressTracker:
                 'filtered_requests': self.filtered_count,
                 'progress': progress,
                 'requests_per_second': rps,
-                'current_payload': current_payload
+                'current_payload': current_payload,
+                **stats
             })
         
         # Log the progress
@@ -161,6 +235,16 @@ class DBFProgressTracker:
         elif current_payload:
             self.add_log(f'Processed: {self.processed_count}/{total}, Current: {current_payload}')
                 
+    def refresh_request_stats(self):
+        """
+        Return the latency, throughput and error rate statistics, recomputed at most every STATS_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        if callable(self.stats_source) and now - self._stats_refreshed >= STATS_INTERVAL:
+            self.request_stats = self.stats_source()
+            self._stats_refreshed = now
+        return self.request_stats
+
     def set_status(self, status):
         """
         Set job status and broadcast to connected clients.
@@ -193,21 +277,27 @@ class DBFProgressTracker:
         self.broadcast_message('new_row', {'row': result})
         self.filtered_count = len(result) if isinstance(result, list) else self.filtered_count + 1
 
-async def run_dbf_task(job_id: str, config: DBFConfig):
+async def run_dbf_task(job_id: str, config: DBFConfig, resume_state: Dict[str, Any] = None):
     """
     Run a DBF job asynchronously and update state.
+    With resume_state, the job restarts from that checkpoint instead of the first word.
     """
     tracker = DBFProgressTracker(job_id)
     tracker.add_log(f'Starting DBF job with config: {config.model_dump()}')
-    tracker.total_count = len(config.wordlist)
+    tracker.total_count = len(config.wordlist or [])
+    wordlist = None
+    http_client = None
 
     try:
         tracker.set_status('running')
         running_jobs[job_id]['started_at'] = datetime.now().isoformat()
 
         # Initialize the DBF Manager instance
-        dbf_manager = DirectoryBruteForceManager()
+        live_client_cls = functools.partial(AsyncHttpClient, connection_limit=config.concurrency or 10)
+        http_client = build_http_client(live_client_cls, config.archive_mode, config.archive_path, config.replay_latency)
+        dbf_manager = DirectoryBruteForceManager(http_client=http_client)
         dbf_instances[job_id] = dbf_manager
+        tracker.stats_source = dbf_manager.get_request_stats
 
         # Attach the row broadcast callback
         def handle_new_row(row):
@@ -222,12 +312,12 @@ async def run_dbf_task(job_id: str, config: DBFConfig):
                 if job_status == 'stopped':
                     dbf_manager.stop()
                     raise asyncio.CancelledError('Job stopped by user')
-                elif job_status == 'paused':
+                elif job_status == 'paused' and not dbf_manager._paused:
+                    # Workers still finishing their requests report in too, wait for the resume only once
                     dbf_manager.pause()
                     asyncio.create_task(wait_for_resume(job_id, dbf_manager))
             
-            metrics = dbf_manager.get_metrics()
-            tracker.filtered_count = metrics['filtered_requests']
+            tracker.filtered_count = dbf_manager.get_filtered_count()
             
             tracker.update_progress_from_callback(processed, total, current_payload, error)
             
@@ -235,16 +325,55 @@ async def run_dbf_task(job_id: str, config: DBFConfig):
 
         # Configure the DBF manager
         tracker.add_log('Configuring Directory Brute Force Scan')
+        directory_words = None
+        if config.wordlist_id:
+            wordlist = wordlist_store.acquire(config.wordlist_id)
+            directory_words = (wordlist_store.get(config.wordlist_id) or {}).get('directory_words')
+            tracker.add_log(f'Using wordlist {config.wordlist_id} ({len(wordlist)} words)')
         dbf_manager.configure_scan(
             target_url=config.target_url,
-            wordlist=config.wordlist,
+            wordlist=wordlist if wordlist is not None else config.wordlist,
             top_dir=config.top_dir or '',
             hide_status=config.hide_status or [],
             show_only_status=config.show_only_status or [],
             length_filter=config.length_filter,
             headers=config.headers or {},
-            attempt_limit=config.attempt_limit or -1
+            attempt_limit=config.attempt_limit or -1,
+            match_expression=config.match_expression,
+            filter_expression=config.filter_expression,
+            concurrency=config.concurrency or 10,
+            rate=config.rate,
+            recursive=config.recursive or False,
+            max_depth=config.max_depth or 3,
+            depth_budget=config.depth_budget,
+            extensions=config.extensions,
+            suffixes=config.suffixes,
+            extensions_on_hit=config.extensions_on_hit or False,
+            auto_calibrate=config.auto_calibrate or False,
+            calibration_samples=config.calibration_samples or 3,
+            probe=config.probe or 'get',
+            probe_bytes=config.probe_bytes or 1024,
+            directory_words=directory_words
         )
+        tracker.total_count = dbf_manager.get_total_requests()
+
+        body_store = BodyStore() if config.capture_bodies else None
+        dbf_manager.response_processor.set_body_store(body_store)
+        if config.signature_scan or config.signatures:
+            dbf_manager.set_signature_matcher(build_signature_matcher(
+                use_defaults=config.signature_scan or False,
+                signatures=config.signatures,
+                stop_on_match=config.stop_on_signature or False
+            ))
+
+        # Checkpoint the scan so it can be resumed after a stop or a restart
+        dbf_manager.enable_checkpoints(
+            checkpoint_path('dbf', job_id),
+            static_state={'job_id': job_id, 'config': config.model_dump()},
+            resume_state=resume_state
+        )
+        if resume_state:
+            tracker.add_log(f'Resuming from checkpoint at work item {dbf_manager.checkpoint.watermark}')
 
         # Start the scan
         tracker.add_log('Starting Directory Brute Force scan.')
@@ -256,20 +385,41 @@ async def run_dbf_task(job_id: str, config: DBFConfig):
         # Get filtered results
         results = dbf_manager.get_filtered_results()
 
+        if body_store is not None:
+            for result in results:
+                if result.get('body_ref'):
+                    body_store.add_ref(job_id, result['id'], result['body_ref'], result.get('content_type'))
+            body_store.save_refs(job_id)
+            metrics['body_store'] = body_store.stats()
+
         results_file = f'dbf_results_{job_id}.json'
         with open(results_file, 'w') as file:
             json.dump(results, file)
 
+        # The paths found as a directory tree
+        tree_file = f'dbf_tree_{job_id}.json'
+        with open(tree_file, 'w') as file:
+            json.dump(dbf_manager.get_tree(), file)
+
         tracker.add_log(f'Scan completed. Found {len(results)} matching paths.')
 
         # Update job status
         job_results[job_id] = {
             'status': 'completed',
             'results_file': results_file,
+            'tree_file': tree_file,
+            'directories': metrics.get('directories'),
+            'suppressed': metrics.get('suppressed'),
+            'wildcard_directories': metrics.get('wildcard_directories'),
+            'probe': metrics.get('probe'),
             'processed_requests': metrics['processed_requests'],
             'filtered_requests': metrics['filtered_requests'],
             'requests_per_second': metrics['requests_per_second'],
             'running_time': metrics['running_time'],
+            'latency': metrics['latency'],
+            'bytes_per_second': metrics['bytes_per_second'],
+            'error_rate': metrics['error_rate'],
+            'body_store': metrics.get('body_store'),
             'completed_at': datetime.now().isoformat(),
             'logs': tracker.logs
         }
@@ -282,6 +432,10 @@ async def run_dbf_task(job_id: str, config: DBFConfig):
             'message': 'Directory Brute Force scan completed successfully.'
         })
 
+        # The scan is complete, its checkpoint is no longer needed unless it was stopped early
+        if not dbf_manager._stopped:
+            dbf_manager.checkpoint.remove()
+
         # Remove the instance
         if job_id in dbf_instances:
             del dbf_instances[job_id]
@@ -336,6 +490,13 @@ async def run_dbf_task(job_id: str, config: DBFConfig):
             if job_id in running_jobs:
                 del running_jobs[job_id]
 
+    finally:
+        if wordlist is not None:
+            wordlist_store.release(config.wordlist_id)
+        # Release the archive however the job ended, so its last records are flushed
+        if http_client is not None:
+            await close_http_client(http_client)
+
 async def wait_for_resume(job_id: str, dbf_manager: DirectoryBruteForceManager):
     """
     Wait for job status to change from paused 
@@ -398,4 +559,10 @@ def get_job_logs(job_id: str) -> List[str]:
         return running_jobs[job_id]['logs']
     elif job_id in job_results and 'logs' in job_results[job_id]:
         return job_results[job_id]['logs']
-    return []
\ No newline at end of file
+    return []
+
+def load_checkpoint(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the checkpoint saved by an interrupted job, None if it has none.
+    """
+    return WorkCheckpoint.load(checkpoint_path('dbf', job_id))
@@ -1,8 +1,9 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 import logging
 import json
 import uuid
 from datetime import datetime
+from typing import Optional
 import os
 import asyncio
 
@@ -11,14 +12,20 @@ from src.modules.dbf.services.dbf_service import (
     DBFConfig,
     DBFJobResponse,
     DBFResults,
+    DBFResultFilter,
     running_jobs,
     dbf_instances,
     job_results,
     active_connections,
+    wordlist_store,
     run_dbf_task,
     get_job_status_message,
-    get_job_logs
+    get_job_logs,
+    load_checkpoint
 )
+from src.modules.common.result_filter import apply_filters, FilterSyntaxError
+from src.modules.common.body_store import BodyStore
+from src.modules.common.wordlist_store import read_upload
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -26,6 +33,7 @@ logger = logging.getLogger(__name__)
 
 # Create the routes for the different service
 dbf_router = APIRouter(prefix='/api/dbf', tags=['dbf'])
+wordlist_router = APIRouter(prefix='/api/wordlists', tags=['wordlists'])
 
 # Websocket handler for the DBF service
 async def handle_dbf_websocket(websocket: WebSocket, job_id: str):
@@ -135,6 +143,12 @@ def add_log_entry(job_id: str, message: str):
 async def start_dbf(config: DBFConfig, background_tasks: BackgroundTasks):
     logger.info(f'Received DBF configuration: {config}')
 
+    if config.wordlist_id:
+        if wordlist_store.get(config.wordlist_id) is None:
+            raise HTTPException(status_code=404, detail=f'Wordlist {config.wordlist_id} not found')
+    elif not config.wordlist:
+        raise HTTPException(status_code=400, detail='A wordlist or a wordlist_id is required')
+
     job_id = str(uuid.uuid4())
 
     # Register the job
@@ -180,6 +194,10 @@ async def get_dbf_status(job_id: str):
             processed_requests=job.get('processed_requests', 0),
             filtered_requests=job.get('filtered_requests', 0),
             requests_per_second=job.get('requests_per_second', 0),
+            latency=job.get('latency'),
+            bytes_per_second=job.get('bytes_per_second'),
+            error_rate=job.get('error_rate'),
+            suppressed=job.get('suppressed')
         )
     
     # Check if completed
@@ -194,6 +212,10 @@ async def get_dbf_status(job_id: str):
             processed_requests=job.get('processed_requests', 0),
             filtered_requests=job.get('filtered_requests', 0),
             requests_per_second=job.get('requests_per_second', 0),
+            latency=job.get('latency'),
+            bytes_per_second=job.get('bytes_per_second'),
+            error_rate=job.get('error_rate'),
+            suppressed=job.get('suppressed')
         )
     
     # Job not found
@@ -242,6 +264,61 @@ async def get_dbf_results(job_id: str):
     logger.warning(f'Job {job_id} not found in either running_jobs or job_results')
     raise HTTPException(status_code=404, detail=f'Results for job {job_id} not found.')
 
+@dbf_router.get('/{job_id}/tree')
+async def get_dbf_tree(job_id: str):
+    """
+    Return the paths found by a completed job as a directory tree.
+    """
+    if job_id in job_results:
+        tree_file = job_results[job_id].get('tree_file')
+        if not tree_file or not os.path.exists(tree_file):
+            raise HTTPException(status_code=404, detail=f'No tree saved for job {job_id}.')
+        with open(tree_file, 'r') as file:
+            return json.load(file)
+
+    # Build it from the results so far while the job runs
+    if job_id in dbf_instances:
+        return dbf_instances[job_id].get_tree()
+
+    raise HTTPException(status_code=404, detail=f'Job {job_id} not found')
+
+@dbf_router.get('/{job_id}/results/{result_id}/body')
+async def get_dbf_result_body(job_id: str, result_id: int):
+    """
+    Return the full response body captured for a result of a job run with capture_bodies.
+    """
+    try:
+        captured = BodyStore().get_result_body(job_id, result_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if captured is None:
+        raise HTTPException(status_code=404, detail=f'No body captured for result {result_id} of job {job_id}.')
+    body, content_type = captured
+    return Response(content=body, media_type=content_type or 'application/octet-stream')
+
+@dbf_router.post('/{job_id}/filter', response_model=DBFResults)
+async def filter_dbf_results(job_id: str, expressions: DBFResultFilter):
+    logger.info(f'Filtering results for job: {job_id}')
+
+    if job_id not in job_results:
+        if job_id in running_jobs:
+            raise HTTPException(status_code=202, detail='Job is still running, no results available yet.')
+        raise HTTPException(status_code=404, detail=f'Results for job {job_id} not found.')
+
+    results_file = job_results[job_id].get('results_file')
+    if not results_file or not os.path.exists(results_file):
+        return DBFResults(results=[])
+
+    with open(results_file, 'r') as file:
+        data = json.load(file)
+    try:
+        filtered = apply_filters(data, match=expressions.match, filter=expressions.filter)
+    except FilterSyntaxError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    add_log_entry(job_id, f'Results re-filtered via API: {len(filtered)} of {len(data)} records kept')
+    return DBFResults(results=filtered)
+
 @dbf_router.get('/{job_id}/logs')
 async def get_dbf_logs(job_id: str):
     logger.info(f'Getting logs for job: {job_id}')
@@ -344,7 +421,7 @@ async def pause_dbf_job(job_id: str):
     raise HTTPException(status_code=404, detail=f'Job {job_id} not found')
 
 @dbf_router.post('/{job_id}/resume')
-async def resume_dbf_job(job_id: str):
+async def resume_dbf_job(job_id: str, background_tasks: BackgroundTasks):
     logger.info(f'Request to resume job: {job_id}')
 
     if job_id in running_jobs:
@@ -370,11 +447,94 @@ async def resume_dbf_job(job_id: str):
 
         return {'success': True, 'message': 'Job resumed successfully'}
     
+    # Not running anymore: restart it from the checkpoint it saved when it was stopped or interrupted
+    try:
+        checkpoint = load_checkpoint(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if checkpoint and checkpoint.get('config'):
+        config = DBFConfig.model_validate(checkpoint['config'])
+        running_jobs[job_id] = {
+            'status': 'initializing',
+            'created_at': datetime.now().isoformat(),
+            'progress': 0,
+            'processed_requests': 0,
+            'filtered_requests': 0,
+            'requests_per_second': 0,
+            'logs': []
+        }
+        job_results.pop(job_id, None)
+        add_log_entry(job_id, f"Resuming from checkpoint at work item {checkpoint['watermark']}")
+        background_tasks.add_task(run_dbf_task, job_id, config, checkpoint)
+        return {'success': True, 'message': 'Job resumed from checkpoint', 'resumed_from': checkpoint['watermark']}
+
     logger.warning(f'Job {job_id} not found when attempting to resume')
     raise HTTPException(status_code=404, detail=f'Job {job_id} not found')
 
+@dbf_router.get('/{job_id}/checkpoint')
+async def get_dbf_checkpoint(job_id: str):
+    """
+    Return where an interrupted job would resume from.
+    """
+    try:
+        checkpoint = load_checkpoint(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f'No checkpoint for job {job_id}.')
+    return {
+        'job_id': job_id,
+        'watermark': checkpoint['watermark'],
+        'in_flight': checkpoint.get('in_flight', []),
+        'completed_ahead': len(checkpoint.get('completed', [])),
+        'results': len(checkpoint.get('results', [])),
+        'saved_at': datetime.fromtimestamp(checkpoint['saved_at']).isoformat()
+    }
+
+# Wordlist API endpoints
+@wordlist_router.post('')
+async def upload_wordlist(request: Request, name: Optional[str] = None, lowercase: bool = False, skip_comments: bool = True):
+    """
+    Store a wordlist streamed as the file of a multipart form or as the raw request body, deduplicated and normalized.
+    """
+    writer = wordlist_store.writer(name or 'wordlist', lowercase, skip_comments)
+    try:
+        filename = await read_upload(request.stream(), request.headers.get('content-type'), writer.feed)
+        if not name and filename:
+            writer.name = filename
+        meta = writer.finish()
+    except ValueError as e:
+        writer.abort()
+        raise HTTPException(status_code=400, detail=str(e))
+    except BaseException:
+        writer.abort()
+        raise
+    logger.info(f"Stored wordlist {meta['id']} ({meta['entries']} words)")
+    return meta
+
+@wordlist_router.get('')
+async def list_wordlists():
+    return {'wordlists': wordlist_store.list()}
+
+@wordlist_router.get('/{wordlist_id}')
+async def get_wordlist(wordlist_id: str):
+    meta = wordlist_store.get(wordlist_id)
+    if meta is None:
+        raise HTTPException(status_code=404, detail=f'Wordlist {wordlist_id} not found')
+    return meta
+
+@wordlist_router.delete('/{wordlist_id}')
+async def delete_wordlist(wordlist_id: str):
+    try:
+        deleted = wordlist_store.delete(wordlist_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f'Wordlist {wordlist_id} not found')
+    return {'success': True, 'message': f'Wordlist {wordlist_id} deleted'}
+
 def get_service_routers():
-    return [dbf_router]
+    return [dbf_router, wordlist_router]
 
 def get_websocket_handlers():
     return {
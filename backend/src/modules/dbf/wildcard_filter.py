@@ -0,0 +1,72 @@
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urljoin
+from src.modules.common.http_response import header_value
+from src.modules.common.response_fingerprint import ResponseFingerprint, BaselineSet
+
+# Placeholder standing for the requested word in calibrated redirect targets
+WORD_PLACEHOLDER = "{word}"
+
+class WildcardFilter:
+    """Fingerprints of the responses to random paths in each directory, the responses that look like them are soft 404s"""
+
+    def __init__(self, length_tolerance: int = 0) -> None:
+        self.length_tolerance = length_tolerance
+        self.baselines: Dict[str, BaselineSet] = {}
+        self.redirects: Dict[str, set] = {}
+        self.calibrated = set()
+        self.suppressed: Dict[str, int] = {}
+
+    @staticmethod
+    def fingerprint(response) -> ResponseFingerprint:
+        metrics = response.get("metrics")
+        if metrics:
+            return ResponseFingerprint.from_metrics(response["status"], metrics)
+        return ResponseFingerprint.from_text(response["status"], response["text"] or "")
+
+    @staticmethod
+    def redirect_target(full_url: str, word: str, response) -> Optional[str]:
+        """Where the response redirected to (Location header or the URL the client ended at), with the word replaced by a placeholder"""
+        location = header_value(response.get("headers"), "location")
+        target = urljoin(full_url, location) if location else response.get("url")
+        if not target or target == full_url:
+            return None
+        return target.replace(word, WORD_PLACEHOLDER) if word else target
+
+    def calibrate(self, directory: str, samples: List[Tuple[str, str, Any]]) -> bool:
+        """Learn the directory's soft 404 from (url, random word, response) samples, returns whether it answers random paths"""
+        self.calibrated.add(directory)
+        baselines = BaselineSet(self.length_tolerance)
+        redirects = set()
+        for full_url, word, response in samples:
+            # A real 404 or an error means random paths are not found
+            if response is None or not response["status"] or response["status"] == 404:
+                continue
+            baselines.add(self.fingerprint(response))
+            target = self.redirect_target(full_url, word, response)
+            if target is not None:
+                redirects.add(target)
+        if not len(baselines):
+            return False
+        self.baselines[directory] = baselines
+        self.redirects[directory] = redirects
+        return True
+
+    def matches(self, directory: str, full_url: str, word: str, response) -> bool:
+        """Whether a response looks like the directory's soft 404, counting it as suppressed when it does"""
+        baselines = self.baselines.get(directory)
+        if baselines is None or not response["status"]:
+            return False
+        matched = baselines.matches(self.fingerprint(response))
+        if not matched and self.redirects[directory]:
+            matched = self.redirect_target(full_url, word, response) in self.redirects[directory]
+        if matched:
+            self.suppressed[directory] = self.suppressed.get(directory, 0) + 1
+        return matched
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "calibrated_directories": len(self.calibrated),
+            "wildcard_directories": sorted(f"/{directory}" for directory in self.baselines),
+            "suppressed": sum(self.suppressed.values()),
+            "suppressed_by_directory": {f"/{directory}": count for directory, count in self.suppressed.items()}
+        }
@@ -0,0 +1,22 @@
+from typing import List
+
+class WordExpander:
+    """Expands each word into its extension and suffix variants on demand, variant 0 being the bare word"""
+
+    def __init__(self, extensions: List[str] = None, suffixes: List[str] = None) -> None:
+        forms = [""] + [f".{extension.strip().lstrip('.')}" for extension in extensions or [] if extension.strip().lstrip(".")]
+        endings = [""] + [suffix for suffix in suffixes or [] if suffix]
+        # word.php, word~ and word.php~ for extensions ["php"] and suffixes ["~"]
+        self.variants = list(dict.fromkeys(form + ending for form in forms for ending in endings))
+        self.count = len(self.variants)
+
+    def applies(self, word: str) -> bool:
+        """Directory words (trailing slash) and the empty word are only requested bare"""
+        return self.count > 1 and bool(word) and not word.endswith("/")
+
+    def expand(self, word: str, variant: int) -> str:
+        return word + self.variants[variant]
+
+    def requests_for(self, words: int, bare_only: int) -> int:
+        """Number of requests for `words` words of which `bare_only` are only requested bare"""
+        return (words - bare_only) * self.count + bare_only
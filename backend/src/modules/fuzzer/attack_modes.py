@@ -0,0 +1,205 @@
+# attack_modes.py
+
+import math
+import itertools
+from typing import List, Dict, Iterator, Optional, Tuple, Callable
+from src.modules.fuzzer.payload_source import PayloadSource
+
+ATTACK_MODES = ("sniper", "battering_ram", "pitchfork", "cluster_bomb")
+
+class AttackPlan:
+    """
+    AttackPlan enumerates the work items of a fuzzing run for one of the Burp-style attack modes.
+
+    Attributes:
+        mode (str): One of "sniper", "battering_ram", "pitchfork" or "cluster_bomb".
+        parameters (List[str]): Parameters receiving payloads, in order.
+        sources (Dict[str, PayloadSource]): Payload source of each parameter.
+
+    Methods:
+        count() -> Optional[int]
+        get(index: int) -> Dict[str, str]
+        iter_range(start: int = 0, stop: int = None) -> Iterator[Tuple[int, Dict[str, str]]]
+        shard(shard_index: int, shard_count: int) -> Tuple[int, int]
+
+    Notes:
+        Work items are dicts mapping parameter names to payloads and are numbered from 0:
+        - sniper: one parameter at a time with the shared source, payload-major (payload i goes to every parameter before payload i+1).
+        - battering_ram: the same payload in every parameter at once.
+        - pitchfork: the i-th payload of every parameter's source together, stopping at the shortest source.
+        - cluster_bomb: every combination of the parameters' sources, the last parameter changing fastest.
+        Counts are computed arithmetically from the source counts, and every mode can start at an arbitrary
+        index so a huge job can be split into index ranges (shards) and run by separate workers.
+    """
+
+    def __init__(self, mode: str, parameters: List[str], sources: Dict[str, PayloadSource]) -> None:
+        if mode not in ATTACK_MODES:
+            raise ValueError(f"Unknown attack mode: {mode}. Expected one of {', '.join(ATTACK_MODES)}.")
+        if not parameters:
+            raise ValueError("At least one parameter is required.")
+        missing = [param for param in parameters if param not in sources]
+        if missing:
+            raise ValueError(f"No payload source for parameter(s): {', '.join(missing)}")
+        self.mode = mode
+        self.parameters = parameters
+        self.sources = sources
+        # sniper and battering ram send a single payload list, taken from the first parameter
+        self.shared_source = sources[parameters[0]]
+
+    def count(self) -> Optional[int]:
+        """
+        count returns the total number of work items, or None when a generator source has an unknown size.
+        """
+        if self.mode in ("sniper", "battering_ram"):
+            size = self.shared_source.count()
+            if size is None:
+                return None
+            return size * len(self.parameters) if self.mode == "sniper" else size
+        sizes = [self.sources[param].count() for param in self.parameters]
+        if None in sizes:
+            return None
+        return min(sizes) if self.mode == "pitchfork" else math.prod(sizes)
+
+    def get(self, index: int) -> Dict[str, str]:
+        """
+        get decodes the work item at `index` without enumerating the ones before it.
+
+        Args:
+            index (int): 0-based work item index.
+
+        Returns:
+            Dict[str, str]: Payload of each parameter of the work item.
+
+        Raises:
+            IndexError: If index is out of range.
+            TypeError: If a source involved does not support random access.
+
+        @requires 0 <= index < self.count();
+        """
+        total = self.count()
+        if total is not None and not 0 <= index < total:
+            raise IndexError("work item index out of range")
+        if self.mode == "sniper":
+            payload_index, param_index = divmod(index, len(self.parameters))
+            return {self.parameters[param_index]: self.shared_source.get(payload_index)}
+        if self.mode == "battering_ram":
+            payload = self.shared_source.get(index)
+            return {param: payload for param in self.parameters}
+        if self.mode == "pitchfork":
+            return {param: self.sources[param].get(index) for param in self.parameters}
+
+        item = {}
+        for param in reversed(self.parameters):
+            index, position = divmod(index, self.sources[param].count())
+            item[param] = self.sources[param].get(position)
+        return {param: item[param] for param in self.parameters}
+
+    def iter_range(self, start: int = 0, stop: int = None) -> Iterator[Tuple[int, Dict[str, str]]]:
+        """
+        iter_range lazily yields (index, work item) pairs for indices in [start, stop).
+
+        Args:
+            start ([int]): First index to yield.
+            stop ([int]): Index to stop before, None for the end of the plan.
+
+        Returns:
+            Iterator[Tuple[int, Dict[str, str]]]: The numbered work items.
+
+        Raises:
+            None
+
+        @requires start >= 0;
+        @ensures every yielded index is in [start, stop);
+        """
+        items = self._iter_from(start)
+        if stop is not None:
+            items = itertools.islice(items, max(0, stop - start))
+        return zip(itertools.count(start), items)
+
+    def shard(self, shard_index: int, shard_count: int) -> Tuple[int, int]:
+        """
+        shard returns the [start, stop) index range of one of `shard_count` near-equal contiguous shards.
+
+        Raises:
+            ValueError: If the plan size is unknown or the shard arguments are invalid.
+        """
+        total = self.count()
+        if total is None:
+            raise ValueError("Cannot shard a plan with an unknown number of work items.")
+        if shard_count < 1 or not 0 <= shard_index < shard_count:
+            raise ValueError("shard_index must be in [0, shard_count).")
+        return total * shard_index // shard_count, total * (shard_index + 1) // shard_count
+
+    def _iter_from(self, start: int) -> Iterator[Dict[str, str]]:
+        parameters = self.parameters
+        if self.mode == "sniper":
+            return self._iter_sniper(start)
+        if self.mode == "battering_ram":
+            return ({param: payload for param in parameters} for payload in self.shared_source.iter_from(start))
+        if self.mode == "pitchfork":
+            columns = zip(*(self.sources[param].iter_from(start) for param in parameters))
+            return (dict(zip(parameters, row)) for row in columns)
+        return self._iter_cluster_bomb(start)
+
+    def _iter_sniper(self, start: int) -> Iterator[Dict[str, str]]:
+        """
+        _iter_sniper pulls one payload at a time from the shared source and aims it at every parameter in turn.
+        """
+        parameters = self.parameters
+        payload_index, param_index = divmod(start, len(parameters))
+        for payload in self.shared_source.iter_from(payload_index):
+            for param in parameters[param_index:]:
+                yield {param: payload}
+            param_index = 0
+
+    def _iter_cluster_bomb(self, start: int) -> Iterator[Dict[str, str]]:
+        """
+        _iter_cluster_bomb streams the first parameter's source and, for each of its payloads, walks the combinations
+        of the remaining (inner) sources as a mixed-radix counter, the last parameter changing fastest. Inner payloads
+        are fetched with get(), so resuming decodes the start position directly and only inner sources without random
+        access (generators, deduplicated sources) are held in memory.
+        """
+        parameters = self.parameters
+        pools = [self._random_access(self.sources[param]) for param in parameters[1:]]
+        getters = [getter for getter, _ in pools]
+        sizes = [size for _, size in pools]
+        inner_size = math.prod(sizes)
+        if inner_size == 0:
+            return
+        outer_index, inner_index = divmod(start, inner_size)
+        for payload in self.sources[parameters[0]].iter_from(outer_index):
+            digits = []
+            for size in reversed(sizes):
+                inner_index, digit = divmod(inner_index, size)
+                digits.append(digit)
+            digits.reverse()
+            values = [getter(digit) for getter, digit in zip(getters, digits)]
+            while True:
+                yield dict(zip(parameters, (payload, *values)))
+                # Carry over the digits that wrapped around, only the payloads that changed are fetched again
+                position = len(digits) - 1
+                while position >= 0 and digits[position] + 1 == sizes[position]:
+                    digits[position] = 0
+                    values[position] = getters[position](0)
+                    position -= 1
+                if position < 0:
+                    break
+                digits[position] += 1
+                values[position] = getters[position](digits[position])
+
+    @staticmethod
+    def _random_access(source: PayloadSource) -> Tuple[Callable[[int], str], int]:
+        """
+        _random_access returns a payload getter and the size of a source, its payloads listed only when it has no get().
+        """
+        size = source.count()
+        if size is not None:
+            if size == 0:
+                return source.get, 0
+            try:
+                source.get(0)
+                return source.get, size
+            except TypeError:
+                pass
+        payloads = list(source)
+        return payloads.__getitem__, len(payloads)
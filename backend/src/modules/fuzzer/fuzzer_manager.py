@@ -1,12 +1,27 @@
 # fuzzer_manager.py
 
 import os
+import json
 import time
+import random
+import string
 import logging
-from typing import List, Dict, Any, Callable
+from typing import List, Dict, Any, Callable, Iterable, Tuple, Union
 import asyncio
 from src.modules.fuzzer.fuzzer_response_processor import FuzzerResponseProcessor
 from src.modules.fuzzer.http_client import AsyncHttpClient
+from src.modules.fuzzer.payload_source import PayloadSource, as_payload_source
+from src.modules.fuzzer.attack_modes import AttackPlan
+from src.modules.fuzzer.payload_mutations import MutationPipeline, MutatedPayloadSource
+from src.modules.fuzzer.request_template import RenderedRequest, FormRequestTemplate, compile_request_template
+from src.modules.fuzzer.param_miner import ParamMiner
+from src.modules.fuzzer.open_loop import OpenLoopScheduler
+from src.modules.fuzzer.latency_anomaly import LatencyAnomalyDetector
+from src.modules.common.response_fingerprint import ResponseFingerprint, BaselineSet
+from src.modules.common.http_response import HttpResponse
+from src.modules.common.checkpoint import WorkCheckpoint
+from src.modules.common.signature_matcher import SignatureMatcher
+from src.modules.common.latency_histogram import RequestStats
 
 log_path = os.path.join(os.path.dirname(__file__), "fuzzing.log")
 logging.basicConfig(
@@ -17,12 +32,49 @@ logging.basicConfig(
 )
 
 class MockResponse:
-    def __init__(self, url: str, status: int, text: str):
+    def __init__(self, url: str, status: int, text: str, response: HttpResponse = None):
         self.url = url
         self.status_code = status
-        self.text = text
+        self._text = text
         self.payload = None
+        self.request_id = None
         self.error = False
+        self.headers = None
+        self.elapsed = None
+        self.metrics = None
+        self.signatures = None
+        # Response time outlier details, set when the latency was flagged for the fuzzed parameter
+        self.latency_anomaly = None
+        # Client response the text is decoded from on first access, when not given up front
+        self.response = response
+        if response is not None:
+            self.headers = response.get("headers")
+            self.elapsed = response.get("elapsed")
+            self.metrics = response.get("metrics")
+            self.signatures = response.get("signatures")
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = self.response["text"]
+        return self._text
+
+    @property
+    def length(self) -> int:
+        if self._text is None and isinstance(self.response, HttpResponse):
+            return self.response.length
+        return len(self.text)
+
+    def snippet(self, chars: int = 200) -> str:
+        if self._text is None and isinstance(self.response, HttpResponse):
+            return self.response.snippet(chars)
+        return self.text[:chars]
+
+    @property
+    def body(self) -> bytes:
+        if isinstance(self.response, HttpResponse):
+            return self.response.body
+        return self.text.encode("utf-8")
 
 class FuzzerManager:
     """
@@ -33,6 +85,9 @@ class FuzzerManager:
 
     Methods:
         configure_fuzzing(...) -> None
+        calibrate(samples: int = 3) -> Coroutine
+        enable_checkpoints(path: str, interval: float = 5.0, extra_state: Callable = None, resume_state: Dict = None, static_state: Dict = None) -> WorkCheckpoint
+        set_signature_matcher(matcher: SignatureMatcher) -> None
         start_fuzzing() -> Coroutine
         get_metrics() -> Dict[str, [int, float]]
         get_filtered_results() -> List[Dict]
@@ -53,6 +108,20 @@ class FuzzerManager:
         self.progress_callback = None
         self.on_new_row = None
         self.last_row = None
+        self.payload_source = None
+        self.attack_plan = None
+        self.mutation_pipeline = None
+        self.baselines = None
+        self.calibration_requests = 0
+        self.request_template = None
+        self.checkpoint = None
+        self.request_stats = RequestStats()
+        self.scheduler = None
+        self.latency_detector = LatencyAnomalyDetector()
+        self.confirmation_requests = 0
+        # Latency confirmation re-tests running beside the workers
+        self._retests = set()
+        self.mining_stats = None
 
     def set_progress_callback(self, callback: Callable):
         """
@@ -87,7 +156,22 @@ class FuzzerManager:
         proxy: str = None,
         body_template: Dict = None,
         parameters: List[str] = None,
-        payloads: List[str] = None
+        payloads: Union[List[str], str, PayloadSource] = None,
+        concurrency: int = 10,
+        dedup_payloads: bool = False,
+        attack_mode: str = "sniper",
+        parameter_payloads: Dict[str, Union[List[str], str, PayloadSource]] = None,
+        start_index: int = 0,
+        stop_index: int = None,
+        mutations: List[str] = None,
+        auto_calibrate: bool = False,
+        calibration_samples: int = 3,
+        raw_request: str = None,
+        json_template: Union[Dict, List, str] = None,
+        rate: float = None,
+        max_in_flight: int = 1000,
+        latency_z_threshold: float = 4.0,
+        latency_confirmations: int = 2
     ) -> None:
         """
         configure_fuzzing accepts and stores the configuration required for the fuzzing session.
@@ -100,7 +184,22 @@ class FuzzerManager:
             proxy ([str]):  proxy URL.
             body_template ([Dict]): Template for request body.
             parameters (List[str]): List of parameters to fuzz.
-            payloads ([str, List[str]]): Payloads or path to file containing them.
+            payloads ([str, List[str], PayloadSource]): Payloads, path to file containing them or a lazy payload source.
+            concurrency ([int]): Number of async workers sending requests in parallel.
+            dedup_payloads ([bool]): Drop repeated payloads while streaming them.
+            attack_mode ([str]): "sniper", "battering_ram", "pitchfork" or "cluster_bomb".
+            parameter_payloads ([Dict[str, ...]]): Payload source of individual parameters for pitchfork and cluster bomb, defaulting to `payloads`.
+            start_index ([int]): First work item index to send, for resuming or sharding.
+            stop_index ([int]): Work item index to stop before, None for the end of the plan.
+            mutations ([List[str]]): Mutation variants every base payload is expanded into, e.g. ["identity", "url_encode|base64"].
+            auto_calibrate ([bool]): Calibrate baselines with random payloads before fuzzing and cluster the responses.
+            calibration_samples ([int]): Number of random calibration payloads sent per parameter.
+            raw_request ([str]): Raw HTTP request with §name§ injection points, sent instead of target_url/http_method/body_template.
+            json_template ([Dict, List, str]): JSON body to send, the parameters being JSON pointers to its injection points.
+            rate ([float]): Requests per second to send on a fixed open-loop timetable instead of `concurrency` workers.
+            max_in_flight ([int]): Maximum number of outstanding requests in open-loop mode.
+            latency_z_threshold ([float]): z-score above which a response time is flagged as an outlier of its parameter, None to disable flagging.
+            latency_confirmations ([int]): Number of times a flagged request is re-sent to confirm the delay.
 
         Returns:
             None
@@ -108,20 +207,58 @@ class FuzzerManager:
         Raises:
             ValueError: If any required argument is missing or invalid.
 
-        @requires target_url is not None and target_url != "";
-        @requires http_method is not None and http_method != "";
-        @requires parameters is not None and len(parameters) > 0;
-        @requires payloads is not None and (isinstance(payloads, list) or os.path.isfile(payloads));
+        @requires (target_url is not None and target_url != "" and http_method is not None and http_method != "") or raw_request;
+        @requires (parameters is not None and len(parameters) > 0) or raw_request has injection points;
+        @requires payloads is not None or every parameter has an entry in parameter_payloads;
+        @requires concurrency > 0;
+        @requires rate is None or rate > 0;
         @ensures "target_url" in self.config and self.config["target_url"] == target_url;
-        @ensures isinstance(self.config["payloads"], list) and len(self.config["payloads"]) > 0;
+        @ensures self.attack_plan.count() is None or self.attack_plan.count() > 0;
         """
-        if not target_url or not http_method or not parameters or not payloads:
+        parameter_payloads = parameter_payloads or {}
+        if not raw_request and (not target_url or not http_method):
             raise ValueError("Missing required fuzzing configuration parameters.")
-        if isinstance(payloads, str) and os.path.isfile(payloads):
-            with open(payloads, "r", encoding="utf-8") as f:
-                payloads = [line.strip() for line in f if line.strip()]
-        if not isinstance(payloads, list) or not payloads:
+        # The template is compiled once, every request then only splices its payloads into it
+        request_template = compile_request_template(
+            target_url,
+            http_method or "GET",
+            headers=headers,
+            body_template=body_template,
+            parameters=parameters,
+            raw_request=raw_request,
+            json_template=json_template
+        )
+        if raw_request and not parameters:
+            parameters = request_template.injection_points
+        if not parameters:
+            raise ValueError("Missing required fuzzing configuration parameters.")
+        per_parameter = attack_mode in ("pitchfork", "cluster_bomb")
+        if not payloads and not (per_parameter and all(parameter_payloads.get(param) for param in parameters)):
+            raise ValueError("Missing required fuzzing configuration parameters.")
+        # Payload files are streamed from a memory-mapped line index instead of being read into a list
+        payload_source = as_payload_source(payloads, dedup=dedup_payloads) if payloads else None
+        sources = {param: payload_source for param in parameters}
+        if per_parameter:
+            for param, param_payloads in parameter_payloads.items():
+                if param in sources and param_payloads:
+                    sources[param] = as_payload_source(param_payloads, dedup=dedup_payloads)
+        mutation_pipeline = MutationPipeline(mutations) if mutations else None
+        if mutation_pipeline:
+            # Wrap each distinct source once so parameters sharing a source keep sharing it
+            mutated = {}
+            for param, source in sources.items():
+                if id(source) not in mutated:
+                    mutated[id(source)] = MutatedPayloadSource(source, mutation_pipeline)
+                sources[param] = mutated[id(source)]
+        attack_plan = AttackPlan(attack_mode, parameters, sources)
+        if attack_plan.count() == 0:
             raise ValueError("Payloads must be a non-empty list or a valid file path.")
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1.")
+        scheduler = OpenLoopScheduler(rate, max_in_flight) if rate is not None else None
+        latency_detector = LatencyAnomalyDetector(latency_z_threshold, latency_confirmations)
+        if auto_calibrate and calibration_samples < 1:
+            raise ValueError("Calibration needs at least one sample.")
         self.config = {
             "target_url": target_url,
             "http_method": http_method,
@@ -130,21 +267,108 @@ class FuzzerManager:
             "proxy": proxy,
             "body_template": body_template or {},
             "parameters": parameters,
-            "payloads": payloads
+            "payloads": payloads,
+            "concurrency": concurrency,
+            "attack_mode": attack_mode,
+            "start_index": start_index,
+            "stop_index": stop_index,
+            "auto_calibrate": auto_calibrate,
+            "calibration_samples": calibration_samples,
+            "raw_request": raw_request,
+            "json_template": json_template,
+            "rate": rate,
+            "max_in_flight": max_in_flight,
+            "latency_z_threshold": latency_z_threshold,
+            "latency_confirmations": latency_confirmations
         }
+        self.request_template = request_template
+        self.payload_source = payload_source
+        self.attack_plan = attack_plan
+        self.mutation_pipeline = mutation_pipeline
+        self.scheduler = scheduler
+        self.latency_detector = latency_detector
+        self.confirmation_requests = 0
+        self._retests = set()
 
         # Reset status flags
         self._paused = False
         self._stopped = False
         self.request_count = 0
+        self.baselines = None
+        self.calibration_requests = 0
+        self.checkpoint = None
+        self.request_stats = RequestStats()
 
         self.processed_ids = set()
 
+    def set_signature_matcher(self, matcher: SignatureMatcher) -> None:
+        """
+        set_signature_matcher flags the results with the error signatures found in their body. The HTTP client
+        scans each body while it streams when it supports it, the response processor scans the others.
+
+        Args:
+            matcher (SignatureMatcher): Compiled signatures, None to disable signature matching.
+
+        Returns:
+            None
+
+        Raises:
+            None
+
+        @ensures self.response_processor.signature_matcher == matcher;
+        """
+        self.response_processor.set_signature_matcher(matcher)
+        if hasattr(self.http_client, "signature_matcher"):
+            self.http_client.signature_matcher = matcher
+
+    def enable_checkpoints(
+        self,
+        path: str,
+        interval: float = 5.0,
+        extra_state: Callable[[], Dict[str, Any]] = None,
+        resume_state: Dict[str, Any] = None,
+        static_state: Dict[str, Any] = None
+    ) -> WorkCheckpoint:
+        """
+        enable_checkpoints tracks completed work items and saves the resume point to `path` every `interval` seconds
+        and when the run ends, stopped or not. Must be called after configure_fuzzing.
+
+        Args:
+            path (str): Checkpoint file.
+            interval ([float]): Minimum seconds between two periodic saves.
+            extra_state ([Callable]): Returns additional small data saved with every checkpoint.
+            resume_state ([Dict]): State of a previous checkpoint of the same configuration to resume from.
+            static_state ([Dict]): Data written once next to the checkpoint, e.g. the job configuration.
+
+        Returns:
+            WorkCheckpoint: The checkpoint tracker.
+
+        Raises:
+            None
+
+        @requires self.attack_plan is not None;
+        @ensures resume_state is None or self.config["start_index"] >= resume_state["watermark"];
+        """
+        # The results are appended to the checkpoint's results file as they grow, not rewritten on every save
+        def results() -> List[Dict[str, Any]]:
+            return self.response_processor.responses
+
+        if resume_state is None:
+            self.checkpoint = WorkCheckpoint(path, self.config.get("start_index", 0), interval, extra_state, static_state, results)
+        else:
+            self.checkpoint = WorkCheckpoint.from_state(path, resume_state, interval, extra_state, static_state, results)
+            self.config["start_index"] = max(self.config.get("start_index", 0), self.checkpoint.watermark)
+            # Rows found before the interruption are kept, clusters start over
+            self.response_processor.responses = list(resume_state.get("results", []))
+            logging.info(f"Resuming from work item {self.checkpoint.watermark}, skipping {len(self.checkpoint.completed)} item(s) completed ahead")
+        return self.checkpoint
+
     async def start_fuzzing(self) -> None:
-        self.start_time = time.perf_counter()
         """
         start_fuzzing begins fuzzing by sending requests using the provided configuration.
-        Sends HTTP requests for every parameter and payload combination, then processes the responses using the response processor.
+        The attack plan's work items in [start_index, stop_index) are numbered and streamed onto a bounded queue,
+        which a pool of `concurrency` async workers drains, then processes the responses using the response processor.
+        With a configured rate, the items are instead sent by an OpenLoopScheduler on a fixed timetable.
 
         Args:
             None
@@ -159,95 +383,414 @@ class FuzzerManager:
         @ensures self.request_count >= 0;
         @ensures self.end_time >= self.start_time;
         """
-        target_url = self.config.get("target_url")
-        http_method = self.config.get("http_method", "GET").upper()
-        headers = self.config.get("headers", {})
-        cookies = self.config.get("cookies", {})
-        proxy = self.config.get("proxy")
-        body_template = self.config.get("body_template", {})
-        parameters = self.config.get("parameters", [])
-        payloads = self.config.get("payloads", [])
-        logging.info(f"Fuzzing started with {len(payloads)} payloads across {len(parameters)} parameter(s)")
-        proxies = {"http": proxy, "https": proxy} if proxy else None
-        for payload in payloads:
-            # Check if paused or stopped
+        if self.config.get("auto_calibrate") and self.baselines is None:
+            await self.calibrate(self.config.get("calibration_samples", 3))
+        self.start_time = time.perf_counter()
+        concurrency = max(1, self.config.get("concurrency", 10))
+        start_index = self.config.get("start_index", 0)
+        stop_index = self.config.get("stop_index")
+        total_count = self.get_total_requests()
+        logging.info(f"Fuzzing started in {self.attack_plan.mode} mode with {total_count or 'a stream of'} requests across {len(self.attack_plan.parameters)} parameter(s) using {concurrency} worker(s)")
+
+        work_items = self.attack_plan.iter_range(start_index, stop_index)
+        if self.scheduler is not None:
+            logging.info(f"Open-loop schedule at {self.scheduler.rate} requests/s, at most {self.scheduler.max_in_flight} in flight")
+            try:
+                await self.scheduler.run(
+                    self._pending_work(work_items),
+                    lambda item: self._send_fuzz_request(*item, total_count),
+                    stopped=lambda: self._stopped,
+                    paused=lambda: self._paused
+                )
+                await self._wait_for_retests()
+            finally:
+                self._cancel_retests()
+                self._finish_run()
+            return
+
+        queue = asyncio.Queue(maxsize=concurrency * 2)
+        producer = asyncio.create_task(self._produce_work(queue, work_items, concurrency))
+        workers = [asyncio.create_task(self._fuzz_worker(queue, total_count)) for _ in range(concurrency)]
+        try:
+            await asyncio.gather(producer, *workers)
+            await self._wait_for_retests()
+        finally:
+            for task in [producer, *workers]:
+                task.cancel()
+            self._cancel_retests()
+            self._finish_run()
+
+    def _finish_run(self) -> None:
+        """
+        _finish_run saves the final checkpoint and stamps the end of the run, whether it completed, stopped or failed.
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.save()
+        if self._stopped:
+            logging.info(f'Fuzzing stopped after {self.request_count} requests')
+        self.end_time = time.perf_counter()
+
+    async def mine_parameters(
+        self,
+        target_url: str,
+        http_method: str,
+        candidates: Union[List[str], str, PayloadSource],
+        headers: Dict = None,
+        cookies: Dict = None,
+        proxy: str = None,
+        body_template: Dict = None,
+        as_json: bool = False,
+        batch_size: int = 256
+    ) -> List[Dict[str, Any]]:
+        """
+        mine_parameters discovers which candidate parameter names the target reacts to, packing `batch_size` names
+        per request and binary-splitting the batches that change the response (see ParamMiner).
+
+        Args:
+            target_url (str): URL to mine.
+            http_method (str): HTTP method, the names go in the query for GET and in the body otherwise.
+            candidates ([str, List[str], PayloadSource]): Candidate names, path to a file containing them or a lazy source.
+            headers ([Dict]): HTTP headers.
+            cookies ([Dict]): HTTP cookies.
+            proxy ([str]): proxy URL.
+            body_template ([Dict]): Fields sent with every request.
+            as_json ([bool]): Send the body as a JSON object instead of form fields.
+            batch_size ([int]): Maximum number of names per request.
+
+        Returns:
+            List[Dict[str, Any]]: The parameters found, each with its name, the reason ("changed" or "reflected"), status and length.
+
+        Raises:
+            ValueError: If the target or the candidates are missing.
+
+        @requires target_url and http_method;
+        @requires batch_size > 0;
+        @ensures self.mining_stats["found"] == len(result);
+        """
+        if not target_url or not http_method:
+            raise ValueError("Missing required parameter mining configuration.")
+        if not candidates:
+            raise ValueError("Parameter mining needs candidate names.")
+        template = FormRequestTemplate(target_url, http_method.upper(), headers or {}, body_template, [])
+        if as_json:
+            template.headers = {"Content-Type": "application/json", **template.headers}
+        proxy_config = {"http": proxy, "https": proxy} if proxy else None
+
+        async def send(values: Dict[str, str]):
+            request = template.render(values)
+            data = request.data
+            if as_json and data is not None:
+                data = json.dumps(data).encode("utf-8")
+            try:
+                return await self.http_client.send(
+                    method=request.method,
+                    url=request.url,
+                    headers=request.headers,
+                    cookies=cookies or {},
+                    data=data,
+                    params=request.params,
+                    proxy=proxy_config,
+                    timeout=5.0
+                )
+            except Exception as e:
+                logging.warning(f"Parameter mining request failed: {e}")
+                return None
+
+        miner = ParamMiner(send, batch_size=batch_size)
+        with as_payload_source(candidates, dedup=True) as source:
+            names = list(source)
+        found = await miner.mine(names)
+        self.mining_stats = {**miner.stats(), "candidates": len(names), "found": len(found)}
+        return found
+
+    async def calibrate(self, samples: int = 3) -> BaselineSet:
+        """
+        calibrate learns what "nothing interesting" looks like for the target by sending random junk payloads
+        to every fuzzed parameter, then hands the resulting baselines to the response processor.
+
+        Args:
+            samples ([int]): Number of random payloads sent per parameter.
+
+        Returns:
+            BaselineSet: Fingerprints of the calibration responses.
+
+        Raises:
+            None
+
+        @requires self.config is not None and all required keys are present;
+        @requires samples > 0;
+        @ensures self.response_processor.baselines is result;
+        """
+        baselines = BaselineSet()
+        alphabet = string.ascii_lowercase + string.digits
+        for param in self.config.get("parameters", []):
+            for length in range(8, 8 + 4 * samples, 4):
+                junk = "".join(random.choices(alphabet, k=length))
+                response = await self._send(self.request_template.render({param: junk}))
+                self.calibration_requests += 1
+                if response is not None:
+                    metrics = response.get("metrics")
+                    if metrics:
+                        baselines.add(ResponseFingerprint.from_metrics(response["status"], metrics))
+                    else:
+                        baselines.add(ResponseFingerprint.from_text(response["status"], response["text"]))
+        logging.info(f"Calibrated {len(baselines)} baseline response shape(s) from {self.calibration_requests} requests")
+        self.baselines = baselines
+        self.response_processor.set_baselines(baselines)
+        return baselines
+
+    def shard(self, shard_index: int, shard_count: int) -> None:
+        """
+        shard restricts the run to one of `shard_count` contiguous index ranges of the attack plan,
+        so a huge job can be split across workers.
+
+        Raises:
+            ValueError: If the plan size is unknown or the shard arguments are invalid.
+        """
+        start_index, stop_index = self.attack_plan.shard(shard_index, shard_count)
+        self.config["start_index"] = start_index
+        self.config["stop_index"] = stop_index
+
+    def get_total_requests(self) -> int:
+        """
+        get_total_requests returns the number of work items in the configured index range, 0 if unknown.
+        """
+        total = self.attack_plan.count()
+        if total is None:
+            return 0
+        stop_index = self.config.get("stop_index")
+        if stop_index is not None:
+            total = min(total, stop_index)
+        return max(0, total - self.config.get("start_index", 0))
+
+    def _pending_work(self, work_items: Iterable[Tuple[int, Dict[str, str]]]) -> Iterable[Tuple[int, Dict[str, str]]]:
+        """
+        _pending_work numbers the work items as (request_id, payload assignments), skipping those a resumed checkpoint already completed.
+        """
+        for index, assignments in work_items:
+            if self.checkpoint is not None and self.checkpoint.is_completed(index):
+                continue
+            yield index + 1, assignments
+
+    async def _produce_work(self, queue: asyncio.Queue, work_items: Iterable[Tuple[int, Dict[str, str]]], worker_count: int) -> None:
+        """
+        _produce_work lazily enqueues (request_id, payload assignments) work items, followed by one stop marker per worker.
+        The bounded queue keeps only a few payloads in memory at a time, however large the sources are.
+        """
+        for item in self._pending_work(work_items):
+            if self._stopped:
+                break
+            await queue.put(item)
+        for _ in range(worker_count):
+            await queue.put(None)
+
+    async def _fuzz_worker(self, queue: asyncio.Queue, total_count: int) -> None:
+        """
+        _fuzz_worker pulls work items from the queue and sends them until it receives a stop marker.
+        Items dequeued after a stop are discarded so the producer never blocks on a full queue.
+        """
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
             while self._paused and not self._stopped:
                 await asyncio.sleep(0.5)
             if self._stopped:
-                logging.info(f'Fuzzing stopped after {self.request_count} requests')
+                continue
+            await self._send_fuzz_request(*item, total_count)
+
+    async def _send_fuzz_request(self, request_id: int, assignments: Dict[str, str], total_count: int) -> None:
+        """
+        _send_fuzz_request sends a single fuzzing request and emits its result row.
+
+        Args:
+            request_id (int): 1-based position of the work item in the attack plan.
+            assignments (Dict[str, str]): Payload of each parameter fuzzed by this request.
+            total_count (int): Total number of work items, for progress reporting.
+
+        Returns:
+            None
+
+        Raises:
+            asyncio.CancelledError: If the progress callback cancels the job.
+        """
+        request = self.request_template.render(assignments)
+        target_url = request.url
+        payload = ", ".join(assignments.values())
+        injection = "&".join(f"{param}={value}" for param, value in assignments.items())
+        logging.debug(f"Sending {request.method} request to {target_url} with {injection}")
+        if self.checkpoint is not None:
+            self.checkpoint.begin(request_id - 1)
+        try:
+            response = await self._send(request, raise_errors=True)
+            mock = MockResponse(response["url"], response["status"], None, response=response)
+            mock.payload = payload
+            mock.request_id = request_id
+            mock.error = response["status"] not in [200]
+            self.request_count += 1
+            self.request_stats.record(response)
+            latency = self._latency_of(response)
+            if latency is not None:
+                mock.latency_anomaly = self._check_latency(",".join(assignments), request, latency)
+
+            # Responses matching a calibration baseline are counted but never surface as rows
+            if not self.response_processor.process_response(mock):
+                self._complete(request_id)
+                if callable(self.progress_callback):
+                    self.progress_callback(self.request_count, total_count, injection)
+                return
+
+            # Convert this into a table row format
+            row = {
+                "id": request_id,
+                "url": response["url"],
+                "response": response["status"],
+                "payload": payload,
+                "length": mock.length,
+                "error": mock.error,
+                "time": latency
+            }
+            if mock.latency_anomaly is not None:
+                row["latency_anomaly"] = mock.latency_anomaly
+
+            # Emit the row immediately, broadcasting is scheduled by the callback so it never blocks the workers
+            self.last_row = row
+            if callable(self.on_new_row):
+                self.on_new_row(row)
+
+            logging.debug(f'Recieve response {response['status']} from {response['url']}')
+            self._complete(request_id)
+
+            if callable(self.progress_callback):
+                self.progress_callback(self.request_count, total_count, injection)
+        except Exception as e:
+            print(f"[!] Request error {e}")
+            self.request_stats.record_error()
+            error_response = MockResponse(target_url, 0, str(e))
+            error_response.payload = payload
+            error_response.request_id = request_id
+            error_response.error = True
+
+            error_row = {
+                "id": request_id,
+                "url": target_url,
+                "response": 0,
+                "payload": payload,
+                "length": len(str(e)),
+                "error": True
+            }
+
+            self.last_row = error_row
+            if callable(self.on_new_row):
+                self.on_new_row(error_row)
+
+            self.response_processor.process_response(error_response)
+            self._complete(request_id)
+
+    @staticmethod
+    def _latency_of(response) -> Any:
+        """
+        _latency_of returns the time to first byte of a response when the client traced it, its total time otherwise, None when unknown.
+        """
+        timing = getattr(response, "timing", None)
+        if timing is not None and timing.ttfb is not None:
+            return timing.ttfb
+        return response.get("elapsed") if response["status"] is not None else None
+
+    def _check_latency(self, key: str, request: RenderedRequest, latency: float) -> Dict[str, Any]:
+        """
+        _check_latency adds a response time to the latency baseline of the fuzzed parameter(s) and, when it is an
+        outlier, schedules the re-tests confirming the delay on a task of their own, so the worker moves on to its
+        next item and the open-loop timetable is not held up. The returned details are shared with the result row
+        and completed in place by the re-tests: streamed rows show the outlier unconfirmed, the final results
+        carry the re-test latencies and the verdict.
+
+        Args:
+            key (str): Fuzzed parameter names, comma separated.
+            request (RenderedRequest): The request that was sent.
+            latency (float): Its response time in seconds.
+
+        Returns:
+            Dict[str, Any]: The z-score, the re-test latencies and whether they confirmed the delay, None when the latency is not an outlier.
+
+        Raises:
+            None
+
+        @ensures result is None or "z_score" in result;
+        """
+        z_score = self.latency_detector.observe(key, latency)
+        if z_score is None:
+            return None
+        anomaly = {"z_score": round(z_score, 2), "latency": latency, "retests": [], "confirmed": None}
+        if not self.latency_detector.confirmations:
+            logging.info(f"Response time outlier on {key}: {latency:.3f}s (z={z_score:.1f})")
+            return anomaly
+        task = asyncio.create_task(self._confirm_latency(key, request, anomaly))
+        self._retests.add(task)
+        task.add_done_callback(self._retests.discard)
+        return anomaly
+
+    async def _confirm_latency(self, key: str, request: RenderedRequest, anomaly: Dict[str, Any]) -> None:
+        """
+        _confirm_latency re-sends a flagged request `latency_confirmations` times, records the re-tests in the request
+        stats and fills in the re-test latencies and the verdict of the outlier details.
+        """
+        for _ in range(self.latency_detector.confirmations):
+            if self._stopped:
                 break
+            response = await self._send(request, label="Latency confirmation")
+            self.confirmation_requests += 1
+            if response is None:
+                self.request_stats.record_error()
+                continue
+            self.request_stats.record(response)
+            retest = self._latency_of(response)
+            if retest is not None:
+                anomaly["retests"].append(retest)
+        anomaly["confirmed"] = bool(anomaly["retests"]) and self.latency_detector.confirm(key, anomaly["retests"])
+        logging.info(f"Response time outlier on {key}: {anomaly['latency']:.3f}s (z={anomaly['z_score']:.1f}), confirmed: {anomaly['confirmed']}")
+
+    async def _wait_for_retests(self) -> None:
+        """
+        _wait_for_retests waits for the latency re-tests still running once every work item was sent.
+        """
+        while self._retests:
+            await asyncio.gather(*self._retests)
+
+    def _cancel_retests(self) -> None:
+        for task in list(self._retests):
+            task.cancel()
+
+    def _complete(self, request_id: int) -> None:
+        """
+        _complete records a processed work item in the checkpoint, before any callback can cancel the job.
+        """
+        if self.checkpoint is not None:
+            self.checkpoint.complete(request_id - 1)
+
+    async def _send(self, request: RenderedRequest, raise_errors: bool = False, label: str = "Calibration") -> Dict[str, Any]:
+        """
+        _send sends one request rendered from the template with the configured cookies and proxy.
+        Errors are re-raised when `raise_errors` is set, otherwise logged under `label` and reported as None.
+        """
+        proxy = self.config.get("proxy")
+        try:
+            return await self.http_client.send(
+                method=request.method,
+                url=request.url,
+                headers=request.headers,
+                cookies=self.config.get("cookies", {}),
+                data=request.data,
+                params=request.params,
+                proxy={"http": proxy, "https": proxy} if proxy else None,
+                timeout=5.0
+            )
+        except Exception as e:
+            if raise_errors:
+                raise
+            logging.warning(f"{label} request failed: {e}")
+            return None
 
-            for param in parameters:
-                # Check if paused or stopped
-                while self._paused and not self._stopped:
-                    await asyncio.sleep(0.5)
-                if self._stopped:
-                    logging.info(f'Fuzzing stopped after {self.request_count} requests')
-                    break
-
-                modified_body = body_template.copy()
-                modified_body[param] = payload
-                logging.info(f"Sending {http_method} request to {target_url} with {param}={payload}")
-                try:
-                    response = await self.http_client.send(
-                        method=http_method,
-                        url=target_url,
-                        headers=headers,
-                        cookies=cookies,
-                        data=modified_body if http_method in ["POST", "PUT"] else None,
-                        params=modified_body if http_method == "GET" else None,
-                        proxy=proxies,
-                        timeout=5.0
-                    )
-                    mock = MockResponse(response["url"], response["status"], response["text"])
-                    mock.payload = payload
-                    mock.error = response["status"] not in [200]
-
-                    # Convert this into a table row format
-                    row = {
-                        "id": self.request_count + 1,
-                        "url": response["url"],
-                        "response": response["status"],
-                        "payload": payload,
-                        "length": len(response["text"]),
-                        "error": mock.error
-                    }
-
-                    # Emit the row immediately
-                    if callable(self.on_new_row):
-                        self.last_row = row
-                        self.on_new_row(row)
-                        time.sleep(0.3)
-
-                    self.response_processor.process_response(mock)
-
-                    logging.info(f'Recieve response {response['status']} from {response['url']}')
-                    self.request_count += 1
-                    
-                    total_count = len(parameters) * len(payloads)
-                    self.progress_callback(self.request_count, total_count, f'{param}={payload}')
-                except Exception as e:
-                    print(f"[!] Request error {e}")
-                    error_response = MockResponse(target_url, 0, str(e))
-                    error_response.payload = payload
-                    error_response.error = True
-
-                    error_row = {
-                        "id": self.request_count + 1,
-                        "url": target_url,
-                        "response": 0,
-                        "payload": payload,
-                        "length": len(str(e)),
-                        "error": True
-                    }
-
-                    if callable(self.on_new_row):
-                        self.last_row = error_row
-                        self.on_new_row(error_row)
-
-                    self.response_processor.process_response(error_response)
-        self.end_time = time.perf_counter()
-    
     def get_metrics(self) -> Dict[str, Any]:
         """
         get_metrics returns performance metrics for the fuzzing session.
@@ -257,7 +800,12 @@ class FuzzerManager:
 
         Returns:
             Dict[str, [int, float]]: Metrics including total time, request count,
-            filtered request count, and requests per second.
+            filtered request count, requests per second and the request statistics
+            of get_request_stats (latency percentiles, bytes/second, error rates), plus per-transform
+            statistics when payload mutations are configured, baseline/cluster
+            counts when the run was calibrated, the schedule statistics
+            (missed schedules, coordinated-omission corrected latency) in open-loop mode
+            and the per-parameter latency baselines with their flagged/confirmed outliers.
 
         Raises:
             None
@@ -266,15 +814,57 @@ class FuzzerManager:
         @ensures result["processed_requests"] == self.request_count;
         @ensures result["filtered_requests"] >= 0;
         """
-        total_time = self.end_time - self.start_time if self.start_time and self.end_time else 0
+        total_time = self._running_time()
         rps = self.request_count / total_time if total_time > 0 else 0
-        return {
+        metrics = {
             "running_time": total_time,
             "processed_requests": self.request_count,
             "filtered_requests": len(self.response_processor.get_filtered_results()),
             "requests_per_second": rps
         }
+        metrics.update(self.request_stats.summary(total_time))
+        if self.scheduler is not None:
+            metrics["open_loop"] = self.scheduler.stats()
+        metrics["latency_baselines"] = self.latency_detector.summary()
+        if self.mining_stats is not None:
+            metrics["parameter_mining"] = self.mining_stats
+        metrics["confirmation_requests"] = self.confirmation_requests
+        if self.mutation_pipeline:
+            metrics["mutation_stats"] = self.mutation_pipeline.stats()
+        if self.baselines is not None:
+            metrics["calibration_requests"] = self.calibration_requests
+            metrics["baselines"] = self.baselines.as_list()
+            metrics["baseline_matches"] = self.response_processor.baseline_matches
+            metrics["clusters"] = self.response_processor.get_clusters()
+        return metrics
     
+    def get_request_stats(self) -> Dict[str, Any]:
+        """
+        get_request_stats returns the latency percentiles (connect, TTFB, total), bytes/second and error
+        rates of the requests sent so far, cheap enough to poll while the run is going.
+
+        Args:
+            None
+
+        Returns:
+            Dict[str, Any]: RequestStats summary over the running time, plus the open-loop schedule statistics in that mode.
+
+        Raises:
+            None
+        """
+        stats = self.request_stats.summary(self._running_time())
+        if self.scheduler is not None:
+            stats["open_loop"] = self.scheduler.stats()
+        return stats
+
+    def _running_time(self) -> float:
+        """
+        _running_time returns the seconds since the run started, up to its end once it is over.
+        """
+        if not self.start_time:
+            return 0
+        return (self.end_time or time.perf_counter()) - self.start_time
+
     def get_filtered_results(self) -> List[Dict]:
         """
         get_filtered_results returns the filtered results of the fuzzing session.
@@ -2,7 +2,12 @@
 
 import json
 import logging
-from typing import List
+from typing import List, Dict
+from src.modules.common.response_fingerprint import ResponseFingerprint, BaselineSet
+from src.modules.common.http_response import header_value
+from src.modules.common.result_filter import compile_filter, ResponseSubject
+from src.modules.common.body_store import BodyStore
+from src.modules.common.signature_matcher import SignatureMatcher, reflects_payload
 
 class FuzzerResponseProcessor:
     """
@@ -14,11 +19,27 @@ class FuzzerResponseProcessor:
     Methods:
         def __init__() -> None
         def set_filters(status_filter: List[int], hide_codes: List[int] = [], length_threshold: int = None) -> None
-        def process_response(response: object) -> None
+        def set_expressions(match: str = None, filter: str = None) -> None
+        def set_baselines(baselines: BaselineSet, length_bucket: int = 50) -> None
+        def set_body_store(body_store: BodyStore) -> None
+        def set_signature_matcher(matcher: SignatureMatcher) -> None
+        def process_response(response: object) -> bool
         def get_filtered_results() -> List[]
+        def get_clusters() -> List[Dict]
 
     Notes:
-        The processor is intended to work with `MockResponse`-like objects having attributes: status_code, text, url, and optionally payload, error.
+        The processor is intended to work with `MockResponse`-like objects having attributes: status_code, text, url, and optionally payload, error, headers, elapsed and metrics (full-body BodyMetrics counts).
+        Match/filter expressions (see result_filter.FilterExpression) are compiled once and evaluated on every response
+        after the status and length filters: a response is kept only if it satisfies the match expression and not the filter expression.
+        Once calibration baselines are set, responses resembling a baseline are only counted, and the remaining
+        responses are clustered online by status, word count, line count and length bucket: the first response
+        of each cluster is stored and later members only increase its `cluster_size`.
+        With a body store set, the full body of every stored result is captured in it and referenced
+        by the row's `body_ref` digest. With a signature matcher set, every stored row lists the IDs of the
+        error signatures in its body under `signatures` ("reflected" when the payload comes back verbatim),
+        reusing the matches the HTTP client found while streaming when there are any.
+        Responses flagged as response time outliers bypass the baseline and cluster suppression and keep
+        their `latency_anomaly` details.
     """
 
     def __init__(self) -> None:
@@ -26,6 +47,14 @@ class FuzzerResponseProcessor:
         self.status_code_filter = [200, 403, 500]
         self.hide_codes = []
         self.length_threshold = 0
+        self.baselines = None
+        self.length_bucket = 50
+        self.clusters: Dict[tuple, Dict] = {}
+        self.baseline_matches = 0
+        self.matcher = None
+        self.hider = None
+        self.body_store = None
+        self.signature_matcher = None
 
     def set_filters(self, status_filter: List[int], hide_codes: List[int] = [], length_threshold: [int] = None) -> None:
         """
@@ -54,7 +83,83 @@ class FuzzerResponseProcessor:
         self.hide_codes = hide_codes
         self.length_threshold = length_threshold
 
-    def process_response(self, response: object) -> None:
+    def set_expressions(self, match: str = None, filter: str = None) -> None:
+        """
+        set_expressions compiles the match and filter expressions applied to every processed response.
+
+        Args:
+            match ([str]): Expression a response must satisfy to be kept, e.g. 'status in [200-299] and words > 10'.
+            filter ([str]): Expression hiding the responses that satisfy it, e.g. 'size in [0, 1534]'.
+
+        Returns:
+            None
+
+        Raises:
+            FilterSyntaxError: If an expression is invalid.
+
+        @ensures (self.matcher is None) == (not match);
+        @ensures (self.hider is None) == (not filter);
+        """
+        self.matcher = compile_filter(match) if match else None
+        self.hider = compile_filter(filter) if filter else None
+
+    def set_baselines(self, baselines: BaselineSet, length_bucket: int = 50) -> None:
+        """
+        set_baselines enables baseline suppression and response clustering.
+
+        Args:
+            baselines (BaselineSet): Fingerprints of the calibration responses.
+            length_bucket ([int]): Width of the length buckets used to cluster responses.
+
+        Returns:
+            None
+
+        Raises:
+            None
+
+        @requires length_bucket > 0;
+        @ensures self.baselines == baselines;
+        """
+        self.baselines = baselines
+        self.length_bucket = length_bucket
+        self.clusters = {}
+        self.baseline_matches = 0
+
+    def set_body_store(self, body_store: BodyStore) -> None:
+        """
+        set_body_store enables capturing the full body of the stored results, None to disable it.
+
+        Args:
+            body_store (BodyStore): Store the bodies are written to.
+
+        Returns:
+            None
+
+        Raises:
+            None
+
+        @ensures self.body_store == body_store;
+        """
+        self.body_store = body_store
+
+    def set_signature_matcher(self, matcher: SignatureMatcher) -> None:
+        """
+        set_signature_matcher enables flagging the stored results with the error signatures found in their body, None to disable it.
+
+        Args:
+            matcher (SignatureMatcher): Compiled signatures.
+
+        Returns:
+            None
+
+        Raises:
+            None
+
+        @ensures self.signature_matcher == matcher;
+        """
+        self.signature_matcher = matcher
+
+    def process_response(self, response: object) -> bool:
         """
         process_response analyzes and stores the response if it passes filter criteria.
 
@@ -62,7 +167,7 @@ class FuzzerResponseProcessor:
             response (object): An object with at least `status_code`, `url`, and `text`.
 
         Returns:
-            None
+            bool: False if the response matched a calibration baseline and was suppressed, True otherwise.
 
         Raises:
             AttributeError: If the response lacks required attributes.
@@ -73,20 +178,72 @@ class FuzzerResponseProcessor:
         @ensures len(self.responses) >= 0;
         """
         status = response.status_code
-        content_length = len(response.text)
+        # Lazily decoded responses report their length without building the text
+        content_length = getattr(response, "length", None)
+        if content_length is None:
+            content_length = len(response.text)
+        metrics = getattr(response, "metrics", None)
+        # A response time outlier is a finding even when its body looks like a baseline
+        latency_anomaly = getattr(response, "latency_anomaly", None)
+        fingerprint = None
+        if self.baselines is not None and latency_anomaly is None:
+            if metrics:
+                fingerprint = ResponseFingerprint.from_metrics(status, metrics)
+            else:
+                fingerprint = ResponseFingerprint.from_text(status, response.text)
+            if self.baselines.matches(fingerprint):
+                self.baseline_matches += 1
+                return False
         if status in self.hide_codes:
-            return
-        logging.info("Filtered response: %s [%d bytes]", response.url, content_length)
-        if status in self.status_code_filter and content_length >= self.length_threshold:
-            self.responses.append({
-                "id": len(self.responses) + 1,
-                "response": status,
-                "url": response.url,
-                "payload": getattr(response, "payload", None),
-                "length": content_length,
-                "snippet": response.text[:200],
-                "error": getattr(response, "error", False)
-            })
+            return True
+        if status not in self.status_code_filter or content_length < (self.length_threshold or 0):
+            return True
+        elapsed = getattr(response, "elapsed", None)
+        if self.matcher is not None or self.hider is not None:
+            subject = ResponseSubject(response)
+            if self.matcher is not None and not self.matcher(subject):
+                return True
+            if self.hider is not None and self.hider(subject):
+                return True
+        cluster_key = None
+        if fingerprint is not None:
+            cluster_key = fingerprint.cluster_key(self.length_bucket)
+            cluster = self.clusters.get(cluster_key)
+            if cluster is not None:
+                cluster["cluster_size"] += 1
+                return True
+        logging.debug("Filtered response: %s [%d bytes]", response.url, content_length)
+        result = {
+            "id": len(self.responses) + 1,
+            "request_id": getattr(response, "request_id", None),
+            "response": status,
+            "url": response.url,
+            "payload": getattr(response, "payload", None),
+            "length": content_length,
+            "snippet": response.snippet(200) if hasattr(response, "snippet") else response.text[:200],
+            "error": getattr(response, "error", False)
+        }
+        if elapsed is not None:
+            result["time"] = elapsed
+        if metrics:
+            result.update({key: metrics[key] for key in ("lines", "words", "chars", "bytes", "hash")})
+        if latency_anomaly is not None:
+            result["latency_anomaly"] = latency_anomaly
+        body = getattr(response, "body", None)
+        if self.signature_matcher is not None and status and body is not None:
+            signatures = getattr(response, "signatures", None)
+            if signatures is None:
+                signatures = self.signature_matcher.scan(body)
+            payload = getattr(response, "payload", None)
+            result["signatures"] = list(signatures) + (["reflected"] if payload and reflects_payload(body, [payload]) else [])
+        if self.body_store is not None and status and body is not None:
+            result["body_ref"] = self.body_store.put(body)
+            result["content_type"] = header_value(getattr(response, "headers", None), "content-type")
+        if cluster_key is not None:
+            result["cluster_size"] = 1
+            self.clusters[cluster_key] = result
+        self.responses.append(result)
+        return True
 
     def get_filtered_results(self) -> List:
         """
@@ -103,4 +260,31 @@ class FuzzerResponseProcessor:
         
         @ensures isinstance(result, list);
         """
-        return self.responses
\ No newline at end of file
+        return self.responses
+
+    def get_clusters(self) -> List[Dict]:
+        """
+        get_clusters summarizes the response clusters found since calibration.
+
+        Args:
+            None
+
+        Returns:
+            List[Dict]: One entry per cluster with its shape, size and the id of its stored representative.
+
+        Raises:
+            None
+
+        @ensures len(result) == len(self.clusters);
+        """
+        return [
+            {
+                "status": status,
+                "words": words,
+                "lines": lines,
+                "length_bucket": bucket * self.length_bucket,
+                "size": result["cluster_size"],
+                "result_id": result["id"]
+            }
+            for (status, words, lines, bucket), result in self.clusters.items()
+        ]
@@ -1,13 +1,23 @@
 # http_client.py
+import time
+import asyncio
 from typing import List, Dict, Any
 import aiohttp
+from src.modules.common.body_metrics import read_body
+from src.modules.common.http_response import HttpResponse
+from src.modules.common.request_timing import RequestTiming, timing_trace_config
+
+# Methods whose requests carry a body
+BODY_METHODS = ("POST", "PUT", "PATCH", "DELETE")
 
 class AsyncHttpClient:
     """
     AsyncHttpClient represents an asynchronous HTTP client for sending requests using aiohttp.
 
     Attributes:
-        None
+        archive (HttpArchive): Optional archive every exchange is recorded to.
+        signature_matcher (SignatureMatcher): Optional matcher every body is scanned with while it streams.
+        connection_limit (int): Most connections kept open at once by the client's session.
 
     Methods:
         async def send(
@@ -20,11 +30,50 @@ class AsyncHttpClient:
             proxy: Optional[str] = None,
             timeout: int = 5
         ) -> Dict[str, Any]
+        async def close() -> None
 
     Notes:
         This client is designed to be used for async operations and works well with asyncio-based fuzzing or crawling tools.
+        The body is streamed in chunks and its metrics are computed while it is read, so they cover the full body.
+        The raw bytes are returned as is and only decoded if the caller reads the text.
+        With a signature matcher, each chunk is scanned as it arrives and reading stops early when the matcher decides.
+        Every request is traced: its connect, TTFB and total times are returned in the response's timing.
+        Requests share one session whose connections are kept alive, so connect is only timed for requests
+        that open a new connection. The session keeps no cookies between requests: each request sends only its own.
+        When an archive is set, every response is appended to it so the run can be replayed offline with ReplayHttpClient.
     """
 
+    def __init__(self, archive=None, signature_matcher=None, connection_limit: int = 100) -> None:
+        self.archive = archive
+        self.signature_matcher = signature_matcher
+        self.connection_limit = connection_limit
+        self._trace_config = timing_trace_config()
+        self._session = None
+        self._session_loop = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        _get_session returns the client's session, opening it on first use or when the running event loop changed.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.connection_limit),
+                cookie_jar=aiohttp.DummyCookieJar(),
+                trace_configs=[self._trace_config]
+            )
+            self._session_loop = loop
+        return self._session
+
+    async def close(self) -> None:
+        """
+        close closes the session and its open connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._session_loop = None
+
     async def send(
         self,
         method: str,
@@ -35,24 +84,28 @@ class AsyncHttpClient:
         params: List[str] = None,
         proxy: List[str] = None,
         timeout: int = 5
-    ) -> List[str]:
+    ) -> HttpResponse:
         """
-        send() asynchronously sends an HTTP request and returns a dictionary containing the response.
+        send() asynchronously sends an HTTP request and returns the response as a bytes-first HttpResponse.
 
         Args:
             method (str): The HTTP method to use (GET, POST, PUT, DELETE, PATCH).
             url (str): The full URL to send the request to.
             headers (Optional[Dict[str, str]]): HTTP headers to include in the request.
             cookies (Optional[Dict[str, str]]): Cookies to include in the request.
-            data (Optional[Any]): Data to send in the body of the request for POST/PUT.
+            data (Optional[Any]): Data to send in the body of the request for POST/PUT/PATCH/DELETE, a dict or raw bytes.
             params (Optional[Dict[str, str]]): Query parameters to include for GET requests.
             proxy (Optional[str]): Proxy URL to use for the request.
             timeout (int): Request timeout in seconds.
 
         Returns:
-            Dict[str, Any]: A dictionary containing: url (str): The URL of the response.
+            HttpResponse: Response readable like a dict with the keys: url (str): The URL of the response.
             status (int or None): The HTTP status code.
-            text (str): The body of the response or the error message.
+            text (str): The body of the response or the error message, decoded on first access.
+            headers (Dict[str, str]): The response headers.
+            elapsed (float): Seconds between sending the request and reading the body.
+            timing (RequestTiming): Connect, TTFB and total times of the request (attribute only).
+            metrics (Dict[str, Any]): Byte, character, line and word counts and hash of the full body.
 
         Raises:
             Exception: If an exception occurs while sending the request.
@@ -60,28 +113,60 @@ class AsyncHttpClient:
         @requires isinstance(method, str) and method.upper() in ["GET", "POST", "PUT", "DELETE", "PATCH"];
         @requires isinstance(url, str) and url.startswith("http");
         @requires timeout > 0;
-        @ensures isinstance(result, dict);
+        @ensures isinstance(result, HttpResponse);
         @ensures "url" in result and "status" in result and "text" in result;
         """
         try:
-            async with aiohttp.ClientSession(headers=headers, cookies=cookies) as session:
-                async with session.request(
-                    method=method.upper(),
-                    url=url,
-                    params=params if method.upper() == "GET" else None,
-                    data=data if method.upper() in ["POST", "PUT"] else None,
-                    proxy=proxy,
-                    timeout=timeout
-                ) as response:
-                    return {
-                        "url": str(response.url),
-                        "status": response.status,
-                        "text": await response.text()
-                    }
+            started = time.perf_counter()
+            timing = RequestTiming()
+            async with self._get_session().request(
+                method=method.upper(),
+                url=url,
+                headers=headers,
+                cookies=cookies,
+                params=params if method.upper() == "GET" else None,
+                data=data if method.upper() in BODY_METHODS else None,
+                proxy=proxy,
+                timeout=timeout,
+                trace_request_ctx=timing
+            ) as response:
+                scanner = self.signature_matcher.scanner() if self.signature_matcher is not None else None
+                body, metrics = await read_body(response, scanner=scanner)
+                timing.total = time.perf_counter() - started
+                if self.archive is not None:
+                    self.archive.record(
+                        method=method,
+                        url=url,
+                        status=response.status,
+                        body=body,
+                        request_headers=headers,
+                        response_headers=dict(response.headers),
+                        params=params if method.upper() == "GET" else None,
+                        data=data if method.upper() in BODY_METHODS else None,
+                        elapsed=timing.total,
+                        response_url=str(response.url)
+                    )
+                return HttpResponse(
+                    url=str(response.url),
+                    status=response.status,
+                    body=body,
+                    headers=dict(response.headers),
+                    elapsed=timing.total,
+                    metrics=metrics.as_dict(),
+                    signatures=scanner.matches if scanner is not None else None,
+                    truncated=scanner is not None and scanner.decided,
+                    timing=timing
+                )
         except Exception as e:
             print(f"[AsyncHttpClient] Error sending request to {url}: {e}")
-            return {
-                "url": url,
-                "status": None,
-                "text": str(e)
-            }
\ No newline at end of file
+            if self.archive is not None:
+                self.archive.record_error(
+                    method=method,
+                    url=url,
+                    error=str(e),
+                    request_headers=headers,
+                    params=params if method.upper() == "GET" else None,
+                    data=data if method.upper() in BODY_METHODS else None,
+                    elapsed=time.perf_counter() - started
+                )
+            return HttpResponse.error(url, str(e))
\ No newline at end of file
@@ -0,0 +1,223 @@
+# latency_anomaly.py
+
+import math
+from typing import Dict, List, Any, Optional
+
+class P2Quantile:
+    """
+    P2Quantile estimates one quantile of a stream with the P² algorithm (Jain & Chlamtac, 1985).
+
+    Attributes:
+        quantile (float): Quantile estimated, between 0 and 1.
+        count (int): Number of observations.
+
+    Methods:
+        add(value: float) -> None
+        value() -> Optional[float]
+
+    Notes:
+        Five markers track the minimum, the quantile, the maximum and two midpoints; each new value moves
+        their positions and the heights are adjusted with a piecewise-parabolic interpolation. The state is
+        five heights and five positions whatever the length of the stream, and no value is stored.
+    """
+
+    __slots__ = ("quantile", "count", "_heights", "_positions", "_desired", "_increments")
+
+    def __init__(self, quantile: float) -> None:
+        if not 0 < quantile < 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {quantile}")
+        self.quantile = quantile
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0, 2 * quantile, 4 * quantile, 2 + 2 * quantile, 4]
+        self._increments = [0, quantile / 2, quantile, (1 + quantile) / 2, 1]
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        heights = self._heights
+        if self.count <= 5:
+            heights.append(value)
+            heights.sort()
+            return
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = next(index for index in range(4) if heights[index] <= value < heights[index + 1])
+        positions, desired = self._positions, self._desired
+        for index in range(cell + 1, 5):
+            positions[index] += 1
+        for index in range(5):
+            desired[index] += self._increments[index]
+        for index in (1, 2, 3):
+            offset = desired[index] - positions[index]
+            if (offset >= 1 and positions[index + 1] - positions[index] > 1) or (offset <= -1 and positions[index - 1] - positions[index] < -1):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(index, step)
+                if not heights[index - 1] < height < heights[index + 1]:
+                    height = heights[index] + step * (heights[index + step] - heights[index]) / (positions[index + step] - positions[index])
+                heights[index] = height
+                positions[index] += step
+
+    def _parabolic(self, index: int, step: int) -> float:
+        heights, positions = self._heights, self._positions
+        return heights[index] + step / (positions[index + 1] - positions[index - 1]) * (
+            (positions[index] - positions[index - 1] + step) * (heights[index + 1] - heights[index]) / (positions[index + 1] - positions[index])
+            + (positions[index + 1] - positions[index] - step) * (heights[index] - heights[index - 1]) / (positions[index] - positions[index - 1])
+        )
+
+    def value(self) -> Optional[float]:
+        """
+        value returns the current estimate, exact (nearest rank) while fewer than five values were seen, None when empty.
+        """
+        if not self.count:
+            return None
+        if self.count <= 5:
+            return self._heights[min(len(self._heights) - 1, int(self.quantile * len(self._heights)))]
+        return self._heights[2]
+
+class LatencyBaseline:
+    """
+    LatencyBaseline is the streaming latency profile of one fuzzed parameter.
+
+    Attributes:
+        count (int): Number of latencies in the baseline.
+        mean (float): Mean latency, in seconds (Welford).
+        median (P2Quantile): Median latency sketch.
+        p90 (P2Quantile): 90th percentile latency sketch.
+        flagged (int): Latencies flagged as outliers, kept out of the baseline.
+        confirmed (int): Flagged latencies confirmed by the re-tests.
+
+    Methods:
+        add(latency: float) -> None
+        std() -> float
+        z_score(latency: float, std_floor: float) -> float
+        summary() -> Dict[str, Any]
+    """
+
+    __slots__ = ("count", "mean", "_m2", "median", "p90", "flagged", "confirmed")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.median = P2Quantile(0.5)
+        self.p90 = P2Quantile(0.9)
+        self.flagged = 0
+        self.confirmed = 0
+
+    def add(self, latency: float) -> None:
+        self.count += 1
+        delta = latency - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (latency - self.mean)
+        self.median.add(latency)
+        self.p90.add(latency)
+
+    def std(self) -> float:
+        return math.sqrt(self._m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def z_score(self, latency: float, std_floor: float) -> float:
+        """
+        z_score measures how many standard deviations a latency lies above the median; the median keeps
+        the centre robust to the odd slow response and the floor keeps a very stable target from flagging jitter.
+        """
+        center = self.median.value()
+        if center is None:
+            return 0.0
+        return (latency - center) / max(self.std(), std_floor)
+
+    def summary(self) -> Dict[str, Any]:
+        median, p90 = self.median.value(), self.p90.value()
+        return {
+            "count": self.count,
+            "mean_ms": round(self.mean * 1000, 3),
+            "std_ms": round(self.std() * 1000, 3),
+            "median_ms": round(median * 1000, 3) if median is not None else None,
+            "p90_ms": round(p90 * 1000, 3) if p90 is not None else None,
+            "flagged": self.flagged,
+            "confirmed": self.confirmed
+        }
+
+class LatencyAnomalyDetector:
+    """
+    LatencyAnomalyDetector flags payloads whose response time is an outlier for the parameter they were injected into,
+    the signature of time-based blind injection.
+
+    Attributes:
+        z_threshold (float): z-score above which a latency is flagged, None to only collect statistics.
+        confirmations (int): Number of times a flagged request is re-sent to confirm the delay.
+        min_samples (int): Baseline size required before anything is flagged.
+        min_excess (float): Minimum number of seconds above the median for a latency to be flagged.
+        std_floor (float): Smallest standard deviation used in the z-score, in seconds.
+        baselines (Dict[str, LatencyBaseline]): Latency profile of each parameter (or parameter combination).
+
+    Methods:
+        observe(key: str, latency: float) -> Optional[float]
+        confirm(key: str, latencies: List[float]) -> bool
+        summary() -> Dict[str, Dict[str, Any]]
+
+    Notes:
+        Each baseline is a Welford mean/variance and two P² quantile sketches: a few dozen numbers per
+        parameter, so detection can stay on for every run. Flagged latencies are left out of the baseline
+        so a burst of slow payloads does not widen it until they stop standing out. A flag is confirmed
+        when every re-test is an outlier too, which rules out a one-off network hiccup.
+    """
+
+    def __init__(
+        self,
+        z_threshold: Optional[float] = 4.0,
+        confirmations: int = 2,
+        min_samples: int = 10,
+        min_excess: float = 0.1,
+        std_floor: float = 0.005
+    ) -> None:
+        if z_threshold is not None and z_threshold <= 0:
+            raise ValueError("The latency z-score threshold must be positive.")
+        if confirmations < 0:
+            raise ValueError("The number of confirmation requests cannot be negative.")
+        self.z_threshold = z_threshold
+        self.confirmations = confirmations
+        self.min_samples = min_samples
+        self.min_excess = min_excess
+        self.std_floor = std_floor
+        self.baselines: Dict[str, LatencyBaseline] = {}
+
+    def _is_outlier(self, baseline: LatencyBaseline, latency: float) -> Optional[float]:
+        if self.z_threshold is None or baseline.count < self.min_samples:
+            return None
+        if latency - baseline.median.value() < self.min_excess:
+            return None
+        z_score = baseline.z_score(latency, self.std_floor)
+        return z_score if z_score >= self.z_threshold else None
+
+    def observe(self, key: str, latency: float) -> Optional[float]:
+        """
+        observe adds a latency to the baseline of `key` and returns its z-score when it is flagged as an outlier, None otherwise.
+        """
+        baseline = self.baselines.get(key)
+        if baseline is None:
+            baseline = self.baselines[key] = LatencyBaseline()
+        z_score = self._is_outlier(baseline, latency)
+        if z_score is None:
+            baseline.add(latency)
+        else:
+            baseline.flagged += 1
+        return z_score
+
+    def confirm(self, key: str, latencies: List[float]) -> bool:
+        """
+        confirm tells whether the re-test latencies of a flagged request are all outliers too.
+        """
+        baseline = self.baselines[key]
+        confirmed = all(self._is_outlier(baseline, latency) is not None for latency in latencies)
+        if confirmed:
+            baseline.confirmed += 1
+        return confirmed
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        return {key: baseline.summary() for key, baseline in self.baselines.items()}
@@ -0,0 +1,131 @@
+# open_loop.py
+
+import time
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable
+from src.modules.common.latency_histogram import LatencyHistogram
+
+class OpenLoopScheduler:
+    """
+    OpenLoopScheduler sends work items on a fixed timetable, `rate` per second, whatever the response latency.
+
+    Attributes:
+        rate (float): Requests per second; item i is due `i / rate` seconds after the run started.
+        max_in_flight (int): Maximum number of requests outstanding at once, bounding memory when the target stalls.
+        scheduled (int): Number of items sent.
+        missed (int): Items sent more than one interval after their due time, i.e. that missed their slot.
+        max_lag (float): Largest delay between an item's due time and its actual send, in seconds.
+        corrected (LatencyHistogram): Latencies measured from the due time (corrected for coordinated omission).
+        service (LatencyHistogram): Latencies measured from the actual send time.
+
+    Methods:
+        async run(work_items: Iterable[Any], send: Callable[[Any], Awaitable[None]], stopped: Callable[[], bool], paused: Callable[[], bool]) -> None
+        stats() -> Dict[str, Any]
+
+    Notes:
+        A closed loop only sends a request when a worker frees up, so when the target slows down it
+        also sends less, and the requests that should have gone out during the stall are never
+        measured: the latency percentiles look fine exactly when the service is not (coordinated
+        omission). Here each item's due time is fixed up front as start + i / rate, computed from the
+        start rather than by adding sleeps so the schedule never drifts, and latency is measured from
+        the due time: a request delayed by a stall, the event loop or the in-flight limit carries that
+        delay in its latency. Items that are late are sent immediately, catching up with the schedule.
+        Pausing shifts the remaining timetable by the length of the pause.
+    """
+
+    def __init__(self, rate: float, max_in_flight: int = 1000) -> None:
+        if not rate or rate <= 0:
+            raise ValueError("The request rate must be positive.")
+        if max_in_flight < 1:
+            raise ValueError("At least one request must be allowed in flight.")
+        self.rate = rate
+        self.max_in_flight = max_in_flight
+        self.interval = 1.0 / rate
+        self.scheduled = 0
+        self.missed = 0
+        self.max_lag = 0.0
+        self.corrected = LatencyHistogram()
+        self.service = LatencyHistogram()
+        self._started = None
+        self._finished = None
+
+    async def run(
+        self,
+        work_items: Iterable[Any],
+        send: Callable[[Any], Awaitable[None]],
+        stopped: Callable[[], bool] = lambda: False,
+        paused: Callable[[], bool] = lambda: False
+    ) -> None:
+        """
+        run sends every work item at its due time, waits for the outstanding ones and re-raises the first
+        error (or cancellation) raised by `send`, which stops the schedule.
+        """
+        in_flight = set()
+        failures = []
+        slots = asyncio.Semaphore(self.max_in_flight)
+
+        async def timed_send(item: Any, due: float) -> None:
+            sent = time.perf_counter()
+            try:
+                await send(item)
+            finally:
+                done = time.perf_counter()
+                self.corrected.record(done - due)
+                self.service.record(done - sent)
+                slots.release()
+
+        def finished(task: asyncio.Task) -> None:
+            in_flight.discard(task)
+            if task.cancelled():
+                failures.append(asyncio.CancelledError())
+            elif task.exception() is not None:
+                failures.append(task.exception())
+
+        self._started = start = time.perf_counter()
+        try:
+            for index, item in enumerate(work_items):
+                if stopped() or failures:
+                    break
+                if paused():
+                    pause_started = time.perf_counter()
+                    while paused() and not stopped():
+                        await asyncio.sleep(0.5)
+                    start += time.perf_counter() - pause_started
+                    if stopped():
+                        break
+                due = start + index * self.interval
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                await slots.acquire()
+                lag = time.perf_counter() - due
+                if lag > self.interval:
+                    self.missed += 1
+                self.max_lag = max(self.max_lag, lag)
+                self.scheduled += 1
+                task = asyncio.create_task(timed_send(item, due))
+                in_flight.add(task)
+                task.add_done_callback(finished)
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+        finally:
+            for task in list(in_flight):
+                task.cancel()
+            self._finished = time.perf_counter()
+        if failures:
+            raise failures[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        stats returns the target and achieved rates, the missed-schedule counts and both latency distributions in milliseconds.
+        """
+        elapsed = ((self._finished or time.perf_counter()) - self._started) if self._started else 0
+        return {
+            "target_rate": self.rate,
+            "achieved_rate": self.scheduled / elapsed if elapsed > 0 else 0,
+            "scheduled": self.scheduled,
+            "missed_schedules": self.missed,
+            "max_lag_ms": round(self.max_lag * 1000, 3),
+            "corrected_latency": self.corrected.summary(),
+            "service_latency": self.service.summary()
+        }
@@ -0,0 +1,164 @@
+# param_miner.py
+
+import random
+import string
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from src.modules.common.response_fingerprint import ResponseFingerprint, BaselineSet
+
+# Statuses answered when a batch makes the request too large, the batch is halved and retried
+_TOO_LARGE_STATUSES = (400, 413, 414, 431)
+
+class ParamMiner:
+    """
+    ParamMiner discovers the hidden parameters a target reacts to by packing many candidate names into each request.
+
+    Attributes:
+        batch_size (int): Number of candidate names sent per request, lowered by calibration if the target rejects that many.
+        requests (int): Number of requests sent so far, calibration included.
+        errors (int): Requests that got no response, counted as unchanged.
+        baselines (BaselineSet): Fingerprints of the responses to requests without a working parameter.
+
+    Methods:
+        async calibrate() -> int
+        async mine(candidates: List[str]) -> List[Dict[str, Any]]
+        stats() -> Dict[str, Any]
+
+    Notes:
+        This is adaptive group testing. Every batch is sent with a random value per name and its
+        response fingerprint compared with the baselines; most batches contain no real parameter and
+        cost one request for hundreds of names. A batch that changes the response is split in two and
+        the halves tested recursively. When the first half turns out unchanged, the second one is inferred
+        to hold the change without sending it, and a single name is always confirmed with a request of its
+        own, so an inference broken by names that only act together never produces a false positive.
+        Finding the parameters among N names takes about N / batch_size + hits * log2(batch_size)
+        requests instead of N.
+    """
+
+    def __init__(self, send: Callable[[Dict[str, str]], Awaitable[Any]], batch_size: int = 256, value_length: int = 8) -> None:
+        if batch_size < 1:
+            raise ValueError("The mining batch size must be at least 1.")
+        self._send = send
+        self.batch_size = batch_size
+        self.requests = 0
+        self.errors = 0
+        self.baselines: Optional[BaselineSet] = None
+        self._token = "".join(random.choices(string.ascii_lowercase, k=value_length))
+        self._junk_names = 0
+
+    def _values(self, names: List[str]) -> Dict[str, str]:
+        """
+        _values gives every name its own value: a run token followed by the name's position, so a reflected value identifies its name.
+        """
+        return {name: f"{self._token}{index}" for index, name in enumerate(names)}
+
+    async def _fingerprint(self, names: List[str]) -> Optional[tuple]:
+        """
+        _fingerprint sends the names and returns (fingerprint, body), None when the request failed.
+        """
+        values = self._values(names)
+        response = await self._send(values)
+        self.requests += 1
+        if response is None or response["status"] is None:
+            self.errors += 1
+            return None
+        metrics = response.get("metrics")
+        if metrics:
+            fingerprint = ResponseFingerprint.from_metrics(response["status"], metrics)
+        else:
+            fingerprint = ResponseFingerprint.from_text(response["status"], response["text"])
+        body = getattr(response, "body", None)
+        if body is None:
+            body = response["text"].encode("utf-8", errors="replace")
+        return fingerprint, body
+
+    def _junk(self, count: int) -> List[str]:
+        names = [f"{self._token[:4]}{self._junk_names + index:x}" for index in range(count)]
+        self._junk_names += count
+        return names
+
+    async def calibrate(self) -> int:
+        """
+        calibrate records the baseline responses, without parameters and with a batch of random names, and lowers
+        the batch size until the target accepts a full batch. Returns the batch size retained.
+        """
+        baselines = BaselineSet()
+        for _ in range(2):
+            sample = await self._fingerprint([])
+            if sample is not None:
+                baselines.add(sample[0])
+        while True:
+            sample = await self._fingerprint(self._junk(self.batch_size))
+            if sample is None or baselines.matches(sample[0]):
+                break
+            if sample[0].status in _TOO_LARGE_STATUSES and self.batch_size > 1:
+                self.batch_size //= 2
+                continue
+            # The target reacts to any parameter (e.g. echoes the query string): unknown names become part of the baseline
+            baselines.add(sample[0])
+            second = await self._fingerprint(self._junk(self.batch_size))
+            if second is not None:
+                baselines.add(second[0])
+            break
+        self.baselines = baselines
+        logging.info(f"Parameter mining calibrated {len(baselines)} baseline shape(s), {self.batch_size} names per request")
+        return self.batch_size
+
+    async def _changes(self, names: List[str]) -> Optional[tuple]:
+        """
+        _changes returns the fingerprint and body when the names change the response, None otherwise.
+        """
+        sample = await self._fingerprint(names)
+        if sample is None or self.baselines.matches(sample[0]):
+            return None
+        return sample
+
+    async def _isolate(self, names: List[str], sample: Optional[tuple], hits: List[Dict[str, Any]]) -> None:
+        """
+        _isolate finds the names responsible for a change, `sample` being the changed response of the whole group
+        or None when the change was only inferred.
+        """
+        if len(names) == 1:
+            if sample is None:
+                sample = await self._changes(names)
+                if sample is None:
+                    return
+            fingerprint, body = sample
+            reflected = self._values(names)[names[0]].encode("utf-8") in body
+            hits.append({
+                "name": names[0],
+                "reason": "reflected" if reflected else "changed",
+                "status": fingerprint.status,
+                "length": fingerprint.length
+            })
+            return
+        middle = len(names) // 2
+        left, right = names[:middle], names[middle:]
+        left_sample = await self._changes(left)
+        if left_sample is not None:
+            await self._isolate(left, left_sample, hits)
+            right_sample = await self._changes(right)
+            if right_sample is not None:
+                await self._isolate(right, right_sample, hits)
+        else:
+            await self._isolate(right, None, hits)
+
+    async def mine(self, candidates: List[str]) -> List[Dict[str, Any]]:
+        """
+        mine returns the candidate names that change the response, each with the reason ("changed" or "reflected"),
+        the status and the length of the response it produced alone.
+        """
+        if self.baselines is None:
+            await self.calibrate()
+        candidates = list(dict.fromkeys(name for name in candidates if name))
+        hits: List[Dict[str, Any]] = []
+        for start in range(0, len(candidates), self.batch_size):
+            batch = candidates[start:start + self.batch_size]
+            sample = await self._changes(batch)
+            if sample is not None:
+                await self._isolate(batch, sample, hits)
+        logging.info(f"Parameter mining found {len(hits)} parameter(s) among {len(candidates)} names in {self.requests} requests")
+        return hits
+
+    def stats(self) -> Dict[str, Any]:
+        return {"requests": self.requests, "errors": self.errors, "batch_size": self.batch_size}
@@ -0,0 +1,181 @@
+# payload_mutations.py
+
+import html
+import base64
+import functools
+from urllib.parse import quote
+from typing import List, Dict, Callable, Iterator, Optional
+from src.modules.fuzzer.payload_source import PayloadSource
+
+def _url_encode(payload: str) -> str:
+    return quote(payload, safe="")
+
+def _double_url_encode(payload: str) -> str:
+    return quote(quote(payload, safe=""), safe="")
+
+def _alternate_case(payload: str) -> str:
+    return "".join(char.upper() if index % 2 else char.lower() for index, char in enumerate(payload))
+
+def _unicode_escape(payload: str) -> str:
+    return "".join(f"\\u{ord(char):04x}" for char in payload)
+
+def _fullwidth(payload: str) -> str:
+    # Printable ASCII maps onto the fullwidth block U+FF01..U+FF5E, which some normalizers fold back
+    return "".join(chr(ord(char) + 0xFEE0) if "!" <= char <= "~" else char for char in payload)
+
+def _html_entities(payload: str) -> str:
+    return "".join(f"&#x{ord(char):x};" for char in payload)
+
+def _base64(payload: str) -> str:
+    return base64.b64encode(payload.encode("utf-8")).decode("ascii")
+
+def _hex(payload: str) -> str:
+    return payload.encode("utf-8").hex()
+
+# name -> (transform, memoize)
+TRANSFORMS: Dict[str, tuple] = {
+    "identity": (lambda payload: payload, False),
+    "url_encode": (_url_encode, True),
+    "double_url_encode": (_double_url_encode, True),
+    "case_flip": (str.swapcase, False),
+    "upper": (str.upper, False),
+    "lower": (str.lower, False),
+    "alternate_case": (_alternate_case, True),
+    "unicode_escape": (_unicode_escape, True),
+    "fullwidth": (_fullwidth, True),
+    "html_entities": (_html_entities, True),
+    "html_escape": (html.escape, True),
+    "base64": (_base64, True),
+    "hex": (_hex, True),
+    "reverse": (lambda payload: payload[::-1], False),
+}
+
+class Transform:
+    """
+    Transform is a single named payload transformation with optional memoization and usage statistics.
+
+    Attributes:
+        name (str): Transform spec, e.g. "base64" or "suffix:%00".
+        applied (int): Number of times the transform has been applied.
+
+    Methods:
+        __call__(payload: str) -> str
+        stats() -> Dict[str, int]
+    """
+
+    def __init__(self, name: str, func: Callable[[str], str], memoize: bool, cache_size: int) -> None:
+        self.name = name
+        self.applied = 0
+        self._func = functools.lru_cache(maxsize=cache_size)(func) if memoize else func
+
+    def __call__(self, payload: str) -> str:
+        self.applied += 1
+        return self._func(payload)
+
+    def stats(self) -> Dict[str, int]:
+        stats = {"applied": self.applied, "cache_hits": 0, "cache_misses": 0}
+        if hasattr(self._func, "cache_info"):
+            info = self._func.cache_info()
+            stats["cache_hits"] = info.hits
+            stats["cache_misses"] = info.misses
+        return stats
+
+class MutationPipeline:
+    """
+    MutationPipeline expands each base payload into a fixed list of variants, each produced by a chain of transforms.
+
+    Attributes:
+        variants (List[List[Transform]]): Transform chain of every variant, in output order.
+
+    Methods:
+        expand(payload: str) -> Iterator[str]
+        apply(variant_index: int, payload: str) -> str
+        stats() -> Dict[str, Dict[str, int]]
+
+    Notes:
+        Variants are declared as strings of "|"-separated transform specs applied left to right, e.g.
+        ["identity", "url_encode", "url_encode|url_encode", "prefix:'|base64"]. "prefix:<text>" and
+        "suffix:<text>" take their text after the colon. A transform spec used in several chains is
+        shared, so its memo cache and statistics cover all of them. Expensive transforms (encodings)
+        are memoized in a bounded LRU cache, which pays off when the same base payload appears in
+        several parameters or chains share a first step.
+    """
+
+    def __init__(self, variant_specs: List[str], cache_size: int = 4096) -> None:
+        if not variant_specs:
+            raise ValueError("At least one mutation variant is required.")
+        self._transforms: Dict[str, Transform] = {}
+        self.variants = [
+            [self._transform(spec.strip(), cache_size) for spec in variant.split("|")]
+            for variant in variant_specs
+        ]
+
+    def _transform(self, spec: str, cache_size: int) -> Transform:
+        if spec in self._transforms:
+            return self._transforms[spec]
+        name, _, argument = spec.partition(":")
+        if name == "prefix" and argument:
+            transform = Transform(spec, lambda payload: argument + payload, False, cache_size)
+        elif name == "suffix" and argument:
+            transform = Transform(spec, lambda payload: payload + argument, False, cache_size)
+        elif spec in TRANSFORMS:
+            func, memoize = TRANSFORMS[spec]
+            transform = Transform(spec, func, memoize, cache_size)
+        else:
+            raise ValueError(f"Unknown payload mutation: {spec}")
+        self._transforms[spec] = transform
+        return transform
+
+    def __len__(self) -> int:
+        return len(self.variants)
+
+    def apply(self, variant_index: int, payload: str) -> str:
+        """
+        apply runs the transform chain of one variant over a base payload.
+        """
+        for transform in self.variants[variant_index]:
+            payload = transform(payload)
+        return payload
+
+    def expand(self, payload: str, first_variant: int = 0) -> Iterator[str]:
+        """
+        expand lazily yields the variants of a base payload, starting at `first_variant`.
+        """
+        for variant_index in range(first_variant, len(self.variants)):
+            yield self.apply(variant_index, payload)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        stats returns the applied/cache hit/cache miss counters of every transform.
+        """
+        return {spec: transform.stats() for spec, transform in self._transforms.items()}
+
+class MutatedPayloadSource(PayloadSource):
+    """
+    MutatedPayloadSource expands another payload source through a MutationPipeline on the fly.
+
+    Notes:
+        Item i is variant (i mod V) of base payload (i div V), V being the number of variants, so the count
+        and random access stay arithmetic and resuming at any index only touches the base payloads from there.
+    """
+
+    def __init__(self, source: PayloadSource, pipeline: MutationPipeline) -> None:
+        self.source = source
+        self.pipeline = pipeline
+
+    def count(self) -> Optional[int]:
+        size = self.source.count()
+        return None if size is None else size * len(self.pipeline)
+
+    def get(self, index: int) -> str:
+        base_index, variant_index = divmod(index, len(self.pipeline))
+        return self.pipeline.apply(variant_index, self.source.get(base_index))
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        base_index, variant_index = divmod(start, len(self.pipeline))
+        for payload in self.source.iter_from(base_index):
+            yield from self.pipeline.expand(payload, variant_index)
+            variant_index = 0
+
+    def close(self) -> None:
+        self.source.close()
@@ -0,0 +1,223 @@
+# payload_source.py
+
+import os
+import hashlib
+import itertools
+from abc import ABC, abstractmethod
+from typing import List, Iterator, Iterable, Callable, Optional, Union
+from src.modules.common.line_index import LineIndexedFile, INDEX_CACHE_ROOT
+
+class PayloadSource(ABC):
+    """
+    PayloadSource is the base class for lazily evaluated fuzzing payload sequences.
+
+    Attributes:
+        None
+
+    Methods:
+        count() -> Optional[int]
+        get(index: int) -> str
+        iter_from(start: int = 0) -> Iterator[str]
+        __iter__() -> Iterator[str]
+        close() -> None
+
+    Notes:
+        Sources never materialize their payloads. `count()` returns None when the size cannot be known
+        without consuming the source (generators). `get()` is O(1) for every source except generators
+        and deduplicated sources, which raise TypeError. Sources holding files release them on `close()`,
+        and can be used as context managers.
+    """
+
+    def count(self) -> Optional[int]:
+        return None
+
+    def get(self, index: int) -> str:
+        raise TypeError(f"{type(self).__name__} does not support random access")
+
+    @abstractmethod
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        """
+        iter_from lazily yields the payloads from position `start` on.
+        """
+
+    def __iter__(self) -> Iterator[str]:
+        return self.iter_from(0)
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self) -> "PayloadSource":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class ListPayloadSource(PayloadSource):
+    """
+    ListPayloadSource serves payloads from an inline list.
+    """
+
+    def __init__(self, payloads: List[str]) -> None:
+        self.payloads = payloads
+
+    def count(self) -> Optional[int]:
+        return len(self.payloads)
+
+    def get(self, index: int) -> str:
+        return self.payloads[index]
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        return itertools.islice(self.payloads, start, None)
+
+class FilePayloadSource(PayloadSource):
+    """
+    FilePayloadSource serves the non-blank, stripped lines of a wordlist file through a memory-mapped line index.
+    """
+
+    def __init__(self, path: str, index_root: str = INDEX_CACHE_ROOT) -> None:
+        self.path = path
+        self.lines = LineIndexedFile(path, index_root)
+
+    def count(self) -> Optional[int]:
+        return len(self.lines)
+
+    def get(self, index: int) -> str:
+        return self.lines.line(index)
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        return self.lines.iter_from(start)
+
+    def close(self) -> None:
+        self.lines.close()
+
+class RangePayloadSource(PayloadSource):
+    """
+    RangePayloadSource serves formatted integers, e.g. numeric IDs or zero-padded PINs.
+    """
+
+    def __init__(self, start: int, stop: int, step: int = 1, template: str = "{}") -> None:
+        self.numbers = range(start, stop, step)
+        self.template = template
+
+    def count(self) -> Optional[int]:
+        return len(self.numbers)
+
+    def get(self, index: int) -> str:
+        return self.template.format(self.numbers[index])
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        return map(self.template.format, self.numbers[start:])
+
+class GeneratorPayloadSource(PayloadSource):
+    """
+    GeneratorPayloadSource serves payloads produced by a factory returning a fresh iterable on every call.
+    """
+
+    def __init__(self, factory: Callable[[], Iterable[str]], count: int = None) -> None:
+        self.factory = factory
+        self._count = count
+
+    def count(self) -> Optional[int]:
+        return self._count
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        return itertools.islice(self.factory(), start, None)
+
+class ChainPayloadSource(PayloadSource):
+    """
+    ChainPayloadSource concatenates several sources, e.g. inline payloads followed by a payload file.
+    """
+
+    def __init__(self, sources: List[PayloadSource]) -> None:
+        self.sources = sources
+
+    def count(self) -> Optional[int]:
+        counts = [source.count() for source in self.sources]
+        return None if None in counts else sum(counts)
+
+    def get(self, index: int) -> str:
+        for source in self.sources:
+            size = source.count()
+            if size is None:
+                return source.get(index)
+            if index < size:
+                return source.get(index)
+            index -= size
+        raise IndexError("payload index out of range")
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        for source in self.sources:
+            size = source.count()
+            if size is not None and start >= size:
+                start -= size
+                continue
+            yield from source.iter_from(start)
+            start = 0
+
+    def close(self) -> None:
+        for source in self.sources:
+            source.close()
+
+class DedupPayloadSource(PayloadSource):
+    """
+    DedupPayloadSource drops repeated payloads from another source while streaming.
+
+    Notes:
+        Only an 8-byte digest of each distinct payload is remembered, so memory grows with the number of
+        unique payloads rather than their size. `count()` streams the underlying source once to count the
+        unique payloads and caches the result; it returns None for sources of unknown size, which may not end.
+    """
+
+    def __init__(self, source: PayloadSource) -> None:
+        self.source = source
+        self._count = None
+
+    def count(self) -> Optional[int]:
+        if self._count is None and self.source.count() is not None:
+            seen = set()
+            self._count = sum(1 for payload in self.source if not self._seen_before(seen, payload))
+        return self._count
+
+    def iter_from(self, start: int = 0) -> Iterator[str]:
+        seen = set()
+        unique = (payload for payload in self.source if not self._seen_before(seen, payload))
+        return itertools.islice(unique, start, None)
+
+    @staticmethod
+    def _seen_before(seen: set, payload: str) -> bool:
+        digest = hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest()
+        if digest in seen:
+            return True
+        seen.add(digest)
+        return False
+
+    def close(self) -> None:
+        self.source.close()
+
+def as_payload_source(payloads: Union[PayloadSource, List[str], range, str], dedup: bool = False) -> PayloadSource:
+    """
+    as_payload_source wraps the payload specifications accepted by the fuzzer into a PayloadSource.
+
+    Args:
+        payloads (Union[PayloadSource, List[str], range, str]): A source, an inline list, a range or a path to a wordlist file.
+        dedup ([bool]): Whether repeated payloads should be dropped while streaming.
+
+    Returns:
+        PayloadSource: The lazily evaluated source.
+
+    Raises:
+        ValueError: If payloads is none of the supported types.
+
+    @ensures isinstance(result, PayloadSource);
+    """
+    if isinstance(payloads, PayloadSource):
+        source = payloads
+    elif isinstance(payloads, list):
+        source = ListPayloadSource(payloads)
+    elif isinstance(payloads, range):
+        source = RangePayloadSource(payloads.start, payloads.stop, payloads.step)
+    elif isinstance(payloads, str) and os.path.isfile(payloads):
+        source = FilePayloadSource(payloads)
+    else:
+        raise ValueError("Payloads must be a non-empty list or a valid file path.")
+    return DedupPayloadSource(source) if dedup else source
@@ -0,0 +1,482 @@
+# raw_http_client.py
+
+import ssl
+import zlib
+import time
+import asyncio
+from collections import deque
+from urllib.parse import urlsplit, urlencode, quote
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from src.modules.fuzzer.http_client import AsyncHttpClient, BODY_METHODS
+from src.modules.common.body_metrics import BodyMetrics
+from src.modules.common.http_response import HttpResponse, header_value
+from src.modules.common.request_timing import RequestTiming
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+# Statuses that never carry a body (RFC 9112 section 6.3)
+_NO_BODY_STATUSES = (204, 304)
+_MAX_HEAD = 64 * 1024
+
+class HttpParseError(Exception):
+    """
+    HttpParseError is raised when a server answers with something that is not a valid HTTP/1.1 response.
+    """
+
+class _StaleConnection(Exception):
+    """
+    _StaleConnection is raised when a reused connection fails before any byte of the response arrived, so the request can be sent again.
+    """
+
+class _PendingRequest:
+    __slots__ = ("future", "method", "sent", "first_byte")
+
+    def __init__(self, future: asyncio.Future, method: str, sent: float) -> None:
+        self.future = future
+        self.method = method
+        self.sent = sent
+        self.first_byte = None
+
+class HttpConnection(asyncio.Protocol):
+    """
+    HttpConnection is one persistent HTTP/1.1 connection, answering its requests in order (pipelining).
+
+    Attributes:
+        pending (Deque[_PendingRequest]): Requests written and not answered yet, oldest first.
+        closed (bool): True once the connection cannot take new requests.
+
+    Methods:
+        send(request: bytes, method: str) -> asyncio.Future
+        close() -> None
+
+    Notes:
+        Responses are parsed straight from the received buffer: the status line and headers up to the
+        blank line, then a Content-Length body, a chunked body or a body running to the end of the
+        connection. Each parsed response resolves the future of the oldest pending request with
+        (status, headers, body, first byte time). Anything the server does to desynchronize the
+        pipeline (a parse error, a closed connection) fails every pending request.
+    """
+
+    def __init__(self) -> None:
+        self.transport = None
+        self.pending: Deque[_PendingRequest] = deque()
+        self.closed = False
+        self._buffer = bytearray()
+        self._head = None
+        self._body_state = None
+
+    def connection_made(self, transport) -> None:
+        self.transport = transport
+
+    def send(self, request: bytes, method: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append(_PendingRequest(future, method, time.perf_counter()))
+        self.transport.write(request)
+        return future
+
+    def data_received(self, data: bytes) -> None:
+        if self.pending and self.pending[0].first_byte is None:
+            self.pending[0].first_byte = time.perf_counter()
+        self._buffer += data
+        try:
+            while self.pending and self._parse():
+                if self.pending and self._buffer and self.pending[0].first_byte is None:
+                    self.pending[0].first_byte = time.perf_counter()
+        except HttpParseError as e:
+            self._fail(e)
+            self.close()
+
+    def _parse(self) -> bool:
+        """
+        _parse consumes one complete response from the buffer and resolves the oldest pending request, False when more data is needed.
+        """
+        buffer = self._buffer
+        if self._head is None:
+            end = buffer.find(b"\r\n\r\n")
+            if end < 0:
+                if len(buffer) > _MAX_HEAD:
+                    raise HttpParseError("Response head too large")
+                return False
+            lines = bytes(buffer[:end]).decode("latin-1").split("\r\n")
+            del buffer[:end + 4]
+            parts = lines[0].split(" ", 2)
+            if len(parts) < 2 or not parts[0].startswith("HTTP/") or not parts[1].isdigit():
+                raise HttpParseError(f"Invalid status line: {lines[0][:100]}")
+            status = int(parts[1])
+            headers: Dict[str, str] = {}
+            for line in lines[1:]:
+                name, separator, value = line.partition(":")
+                if not separator:
+                    raise HttpParseError(f"Invalid header line: {line[:100]}")
+                name, value = name.strip(), value.strip()
+                headers[name] = f"{headers[name]}, {value}" if name in headers else value
+            if 100 <= status < 200:
+                # Interim response (100 Continue...), the final one follows
+                return True
+            keep_alive = parts[0] != "HTTP/1.0" and (header_value(headers, "connection") or "").lower() != "close"
+            self._head = (status, headers, keep_alive)
+            if self.pending[0].method == "HEAD" or status in _NO_BODY_STATUSES:
+                self._body_state = ("length", 0)
+            elif "chunked" in (header_value(headers, "transfer-encoding") or "").lower():
+                self._body_state = ("chunked", bytearray())
+            elif header_value(headers, "content-length") is not None:
+                try:
+                    self._body_state = ("length", int(header_value(headers, "content-length")))
+                except ValueError:
+                    raise HttpParseError("Invalid Content-Length")
+            else:
+                self._body_state = ("close", None)
+
+        kind, state = self._body_state
+        if kind == "length":
+            if len(buffer) < state:
+                return False
+            body = bytes(buffer[:state])
+            del buffer[:state]
+        elif kind == "chunked":
+            body = self._parse_chunks(state)
+            if body is None:
+                return False
+        else:
+            # Delimited by the end of the connection, completed in connection_lost
+            return False
+        self._finish(body)
+        return True
+
+    def _parse_chunks(self, body: bytearray) -> Optional[bytes]:
+        buffer = self._buffer
+        while True:
+            line_end = buffer.find(b"\r\n")
+            if line_end < 0:
+                return None
+            try:
+                size = int(bytes(buffer[:line_end]).split(b";", 1)[0].strip(), 16)
+            except ValueError:
+                raise HttpParseError("Invalid chunk size")
+            if size == 0:
+                # Last chunk, then optional trailers up to a blank line
+                trailers_end = buffer.find(b"\r\n\r\n", line_end)
+                if buffer[line_end:line_end + 4] == b"\r\n\r\n":
+                    trailers_end = line_end
+                if trailers_end < 0:
+                    return None
+                del buffer[:trailers_end + 4]
+                return bytes(body)
+            if len(buffer) < line_end + 2 + size + 2:
+                return None
+            body += buffer[line_end + 2:line_end + 2 + size]
+            del buffer[:line_end + 2 + size + 2]
+
+    def _finish(self, body: bytes) -> None:
+        status, headers, keep_alive = self._head
+        self._head = None
+        self._body_state = None
+        request = self.pending.popleft()
+        if not request.future.done():
+            request.future.set_result((status, headers, body, request.first_byte or time.perf_counter()))
+        if not keep_alive:
+            self.close()
+
+    def _fail(self, error: Exception) -> None:
+        while self.pending:
+            request = self.pending.popleft()
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        self.closed = True
+        if self._head is not None and self._body_state[0] == "close" and self.pending:
+            body = bytes(self._buffer)
+            self._buffer.clear()
+            self._finish(body)
+        self._fail(exc or ConnectionResetError("Connection closed by the server"))
+
+    def close(self) -> None:
+        self.closed = True
+        if self.transport is not None:
+            self.transport.close()
+
+class _ConnectionPool:
+    """
+    _ConnectionPool holds the connections to one origin, at most `size` of them with up to `depth` requests in flight each.
+    """
+
+    def __init__(self, scheme: str, host: str, port: int, size: int, depth: int, ssl_context) -> None:
+        self.scheme, self.host, self.port = scheme, host, port
+        self.size = size
+        self.depth = depth
+        self.ssl_context = ssl_context
+        self.connections: List[HttpConnection] = []
+        self.opening = set()
+        self.slots = asyncio.Semaphore(size * depth)
+
+    async def acquire(self) -> Tuple[HttpConnection, Optional[float]]:
+        """
+        acquire returns the least loaded open connection with room in its pipeline, opening one when possible,
+        with the time spent connecting (None for a reused connection). The caller holds a slot.
+        """
+        while True:
+            self.connections = [connection for connection in self.connections if not connection.closed]
+            available = [connection for connection in self.connections if len(connection.pending) < self.depth]
+            if any(not connection.pending for connection in available) or (available and len(self.connections) + len(self.opening) >= self.size):
+                return min(available, key=lambda connection: len(connection.pending)), None
+            if len(self.connections) + len(self.opening) < self.size:
+                return await self._open()
+            # Every connection is full or still opening: wait for one to be established
+            await asyncio.wait(self.opening, return_when=asyncio.FIRST_COMPLETED)
+
+    async def _open(self) -> Tuple[HttpConnection, float]:
+        started = time.perf_counter()
+        opening = asyncio.ensure_future(asyncio.get_running_loop().create_connection(
+            HttpConnection,
+            self.host,
+            self.port,
+            ssl=self.ssl_context if self.scheme == "https" else None,
+            server_hostname=self.host if self.scheme == "https" else None
+        ))
+        self.opening.add(opening)
+        try:
+            _, connection = await opening
+        finally:
+            # On a timeout the connection attempt is abandoned, the requests waiting on it open their own
+            self.opening.discard(opening)
+            if not opening.done():
+                opening.cancel()
+        self.connections.append(connection)
+        return connection, time.perf_counter() - started
+
+    def close(self) -> None:
+        for connection in self.connections:
+            connection.close()
+        self.connections = []
+
+class RawHttpClient:
+    """
+    RawHttpClient is a minimal HTTP/1.1 client built on asyncio.Protocol, for fuzzing at the highest request rates.
+
+    Attributes:
+        pool_size (int): Maximum number of persistent connections per origin.
+        pipeline_depth (int): Maximum number of requests written ahead on a connection before its responses arrive (1 disables pipelining).
+        archive (HttpArchive): Optional archive every exchange is recorded to.
+        signature_matcher (SignatureMatcher): Optional matcher every body is scanned with.
+
+    Methods:
+        async def send(method: str, url: str, headers: Dict = None, cookies: Dict = None, data: Any = None, params: Dict = None, proxy: Any = None, timeout: int = 5) -> HttpResponse
+        async def close() -> None
+
+    Notes:
+        A drop-in replacement for AsyncHttpClient.send(): same arguments, same HttpResponse, errors
+        returned as HttpResponse.error. Requests are serialized to bytes directly, the header block
+        of a given headers dict being built once and reused, and written to pooled keep-alive
+        connections; responses are parsed with no more than the status line, the headers and the
+        Content-Length/chunked framing. gzip and deflate bodies are decompressed. Redirects are not followed,
+        and requests through a proxy are delegated to AsyncHttpClient. A request that fails on a reused
+        connection before any byte of its response arrived (the server closed it while idle) is retried
+        once; errors on a fresh connection or after a partial response are returned. The timeout covers
+        the whole request, from waiting for a pooled connection to the end of the response.
+    """
+
+    def __init__(self, archive=None, signature_matcher=None, pool_size: int = 10, pipeline_depth: int = 1, ssl_context=None) -> None:
+        if pool_size < 1 or pipeline_depth < 1:
+            raise ValueError("The pool size and the pipeline depth must be at least 1.")
+        self.archive = archive
+        self.signature_matcher = signature_matcher
+        self.pool_size = pool_size
+        self.pipeline_depth = pipeline_depth
+        self.ssl_context = ssl_context or ssl.create_default_context()
+        self._pools: Dict[Tuple[str, str, int], _ConnectionPool] = {}
+        self._header_blocks: Dict[int, Tuple[Dict[str, str], bytes]] = {}
+        self._fallback = None
+
+    def _pool(self, scheme: str, host: str, port: int) -> _ConnectionPool:
+        key = (scheme, host, port)
+        pool = self._pools.get(key)
+        if pool is None:
+            pool = self._pools[key] = _ConnectionPool(scheme, host, port, self.pool_size, self.pipeline_depth, self.ssl_context)
+        return pool
+
+    def _header_block(self, headers: Optional[Dict[str, str]]) -> bytes:
+        """
+        _header_block serializes the caller's headers, cached per dict: a request template passes the same dict for every request.
+        """
+        if not headers:
+            return b""
+        cached = self._header_blocks.get(id(headers))
+        if cached is not None and cached[0] is headers:
+            return cached[1]
+        block = "".join(
+            f"{name}: {value}\r\n" for name, value in headers.items()
+            if name.lower() not in ("host", "content-length", "connection", "transfer-encoding")
+        ).encode("latin-1", errors="replace")
+        if len(self._header_blocks) > 256:
+            self._header_blocks.clear()
+        self._header_blocks[id(headers)] = (headers, block)
+        return block
+
+    def build_request(self, method: str, url: str, headers: Dict[str, str] = None, cookies: Dict[str, str] = None, data: Any = None, params: Dict[str, str] = None) -> Tuple[bytes, Tuple[str, str, int], str]:
+        """
+        build_request serializes a request, returning (request bytes, (scheme, host, port), full URL).
+
+        Raises:
+            ValueError: If the URL is not an absolute http(s) URL.
+        """
+        method = method.upper()
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in DEFAULT_PORTS or not parts.hostname:
+            raise ValueError(f"Unsupported URL: {url}")
+        port = parts.port or DEFAULT_PORTS[scheme]
+        target = quote(parts.path or "/", safe="/%:@!$&'()*+,;=-._~")
+        query = parts.query
+        if params and method == "GET":
+            query = f"{query}&{urlencode(params)}" if query else urlencode(params)
+        if query:
+            target = f"{target}?{query}"
+        host = parts.hostname if port == DEFAULT_PORTS[scheme] else f"{parts.hostname}:{port}"
+
+        body = b""
+        extra = ""
+        if data is not None and method in BODY_METHODS:
+            if isinstance(data, dict):
+                body = urlencode(data).encode("utf-8")
+                if header_value(headers, "content-type") is None:
+                    extra += "Content-Type: application/x-www-form-urlencoded\r\n"
+            elif isinstance(data, str):
+                body = data.encode("utf-8")
+            else:
+                body = bytes(data)
+        if body or method in BODY_METHODS:
+            extra += f"Content-Length: {len(body)}\r\n"
+        if cookies:
+            extra += "Cookie: " + "; ".join(f"{name}={value}" for name, value in cookies.items()) + "\r\n"
+        head = f"{method} {target} HTTP/1.1\r\nHost: {host}\r\n".encode("latin-1") + self._header_block(headers) + extra.encode("latin-1") + b"\r\n"
+        return head + body, (scheme, parts.hostname, port), f"{scheme}://{host}{target}"
+
+    async def _exchange(self, pool: _ConnectionPool, request: bytes, method: str, timing: RequestTiming):
+        connection, connect_time = await pool.acquire()
+        timing.connect = connect_time
+        future = connection.send(request, method)
+        pending = connection.pending[-1]
+        try:
+            return await future
+        except (ConnectionError, HttpParseError) as e:
+            if connect_time is None and pending.first_byte is None:
+                raise _StaleConnection(str(e) or type(e).__name__) from e
+            raise
+        except asyncio.CancelledError:
+            # Timed out: the pipeline cannot be resynchronized once a response is missing
+            connection.close()
+            raise
+
+    async def _request(self, pool: _ConnectionPool, request: bytes, method: str, timing: RequestTiming):
+        """
+        _request sends a request on a pooled connection, returning (response, start time). A keep-alive connection
+        closed by the server before it answered anything is replaced by a fresh one and the request sent again once.
+        """
+        started = time.perf_counter()
+        async with pool.slots:
+            try:
+                return await self._exchange(pool, request, method, timing), started
+            except _StaleConnection:
+                started = time.perf_counter()
+                return await self._exchange(pool, request, method, timing), started
+
+    async def send(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str] = None,
+        cookies: Dict[str, str] = None,
+        data: Any = None,
+        params: Dict[str, str] = None,
+        proxy: Any = None,
+        timeout: int = 5
+    ) -> HttpResponse:
+        """
+        send() sends an HTTP/1.1 request over a pooled connection and returns the response as a bytes-first HttpResponse.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The full http or https URL to send the request to.
+            headers (Optional[Dict[str, str]]): HTTP headers to include in the request.
+            cookies (Optional[Dict[str, str]]): Cookies to include in the request.
+            data (Optional[Any]): Body for POST/PUT/PATCH/DELETE, form fields as a dict, or raw str/bytes.
+            params (Optional[Dict[str, str]]): Query parameters to include for GET requests.
+            proxy (Optional[Any]): Proxy URL; proxied requests go through AsyncHttpClient.
+            timeout (int): Request timeout in seconds.
+
+        Returns:
+            HttpResponse: The response, or an error response carrying the error message.
+
+        Raises:
+            None
+
+        @requires isinstance(url, str) and url.startswith("http");
+        @requires timeout > 0;
+        @ensures isinstance(result, HttpResponse);
+        """
+        if proxy:
+            if self._fallback is None:
+                self._fallback = AsyncHttpClient(archive=self.archive, signature_matcher=self.signature_matcher)
+            return await self._fallback.send(method, url, headers, cookies, data, params, proxy, timeout)
+        method = method.upper()
+        try:
+            request, origin, full_url = self.build_request(method, url, headers, cookies, data, params)
+            pool = self._pool(*origin)
+            timing = RequestTiming()
+            # One deadline covers waiting for a slot, connecting (TLS handshake included) and the response
+            (status, response_headers, body, first_byte), started = await asyncio.wait_for(self._request(pool, request, method, timing), timeout)
+            encoding = (header_value(response_headers, "content-encoding") or "").lower()
+            if encoding in ("gzip", "x-gzip", "deflate") and body:
+                body = zlib.decompress(body, 16 + zlib.MAX_WBITS if "gzip" in encoding else zlib.MAX_WBITS)
+            timing.ttfb = first_byte - started
+            timing.total = time.perf_counter() - started
+            scanner = self.signature_matcher.scanner() if self.signature_matcher is not None else None
+            if scanner is not None:
+                scanner.feed(body)
+            if self.archive is not None:
+                self.archive.record(
+                    method=method,
+                    url=url,
+                    status=status,
+                    body=body,
+                    request_headers=headers,
+                    response_headers=response_headers,
+                    params=params if method == "GET" else None,
+                    data=data if method in BODY_METHODS else None,
+                    elapsed=timing.total,
+                    response_url=full_url
+                )
+            return HttpResponse(
+                url=full_url,
+                status=status,
+                body=body,
+                headers=response_headers,
+                elapsed=timing.total,
+                metrics=BodyMetrics.of(body).as_dict(),
+                signatures=scanner.matches if scanner is not None else None,
+                timing=timing
+            )
+        except Exception as e:
+            message = str(e) or type(e).__name__
+            print(f"[RawHttpClient] Error sending request to {url}: {message}")
+            if self.archive is not None:
+                self.archive.record_error(
+                    method=method,
+                    url=url,
+                    error=message,
+                    request_headers=headers,
+                    params=params if method == "GET" else None,
+                    data=data if method in BODY_METHODS else None
+                )
+            return HttpResponse.error(url, message)
+
+    async def close(self) -> None:
+        """
+        close closes every pooled connection, and the session of the client proxied requests went through.
+        """
+        for pool in self._pools.values():
+            pool.close()
+        self._pools = {}
+        if self._fallback is not None:
+            await self._fallback.close()
+            self._fallback = None
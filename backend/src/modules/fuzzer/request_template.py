@@ -0,0 +1,315 @@
+# request_template.py
+
+import re
+import json
+from abc import ABC, abstractmethod
+from urllib.parse import quote, urlsplit
+from typing import List, Dict, Any, Callable, Union
+
+MARKER = "§"
+_MARKER_PATTERN = re.compile(f"{MARKER}([^{MARKER}]*){MARKER}")
+# Headers recomputed by the HTTP client for every request
+_DROPPED_HEADERS = ("content-length", "host", "connection", "transfer-encoding")
+
+class RenderedRequest:
+    """
+    RenderedRequest is one request produced from a template, ready to hand to the HTTP client's send().
+    """
+
+    __slots__ = ("method", "url", "headers", "params", "data")
+
+    def __init__(self, method: str, url: str, headers: Dict[str, str], params: Dict[str, str] = None, data: Any = None) -> None:
+        self.method = method
+        self.url = url
+        self.headers = headers
+        self.params = params
+        self.data = data
+
+class SegmentTemplate:
+    """
+    SegmentTemplate is a string or bytes split once into static segments and named injection slots.
+
+    Attributes:
+        names (List[str]): Injection point names, in order of appearance (repeated names listed once).
+
+    Methods:
+        render(values: Dict[str, str]) -> Union[str, bytes]
+
+    Notes:
+        Rendering copies the precomputed segment list, drops the encoded payloads into the slot
+        positions and joins, so the static parts are never re-scanned or re-encoded per request.
+        A slot whose name has no value in `values` takes its default.
+    """
+
+    def __init__(self, parts: List[Union[str, bytes, tuple]], encoder: Callable[[str], Union[str, bytes]]) -> None:
+        self._encoder = encoder
+        self._parts = []
+        self._slots = []
+        self.names = []
+        for part in parts:
+            if isinstance(part, tuple):
+                name, default = part
+                self._slots.append((len(self._parts), name, default))
+                self._parts.append(default)
+                if name not in self.names:
+                    self.names.append(name)
+            elif part:
+                self._parts.append(part)
+        self._empty = b"" if any(isinstance(part, bytes) for part in self._parts) else ""
+        if not self._slots:
+            self._static = self._empty.join(self._parts)
+
+    @classmethod
+    def from_markers(cls, text: str, encoder: Callable[[str], Union[str, bytes]], binary: bool = False) -> "SegmentTemplate":
+        """
+        from_markers compiles text containing §name§ or §name:default§ injection points.
+        Static text and defaults are kept literally (UTF-8 encoded when `binary`), only payloads go through `encoder`.
+        """
+        literal = (lambda value: value.encode("utf-8")) if binary else str
+        parts, position = [], 0
+        for match in _MARKER_PATTERN.finditer(text):
+            name, _, default = match.group(1).partition(":")
+            parts.append(literal(text[position:match.start()]))
+            parts.append((name, literal(default)))
+            position = match.end()
+        parts.append(literal(text[position:]))
+        return cls(parts, encoder)
+
+    def render(self, values: Dict[str, str]) -> Union[str, bytes]:
+        if not self._slots:
+            return self._static
+        parts = self._parts.copy()
+        encoder = self._encoder
+        for index, name, default in self._slots:
+            value = values.get(name)
+            parts[index] = default if value is None else encoder(value)
+        return self._empty.join(parts)
+
+class RequestTemplate(ABC):
+    """
+    RequestTemplate is the compiled form of the request every fuzzing work item is rendered from.
+
+    Attributes:
+        method (str): HTTP method.
+        injection_points (List[str]): Names of the places payloads can be injected.
+
+    Methods:
+        render(assignments: Dict[str, str]) -> RenderedRequest
+    """
+
+    method = "GET"
+    injection_points: List[str] = []
+
+    @abstractmethod
+    def render(self, assignments: Dict[str, str]) -> RenderedRequest:
+        """
+        render builds the request of one work item, each injection point filled with its assigned payload or its default.
+        """
+
+    def check_parameters(self, parameters: List[str]) -> None:
+        """
+        check_parameters ensures every fuzzed parameter names an injection point of the template.
+
+        Raises:
+            ValueError: If a parameter has no injection point.
+        """
+        missing = [param for param in parameters if param not in self.injection_points]
+        if missing:
+            raise ValueError(f"No injection point in the request template for parameter(s): {', '.join(missing)}")
+
+class FormRequestTemplate(RequestTemplate):
+    """
+    FormRequestTemplate fills a flat dict of form/query fields, sent as query parameters for GET and as form data for POST/PUT.
+
+    Notes:
+        This is the historical body_template behaviour: every field of the template is sent, fuzzed
+        parameters overriding their template value. Method dispatch is decided once at compile time.
+    """
+
+    def __init__(self, target_url: str, method: str, headers: Dict[str, str], body_template: Dict[str, str], parameters: List[str]) -> None:
+        self.method = method
+        self.url = target_url
+        self.headers = headers
+        self.base = dict(body_template or {})
+        self.injection_points = list(dict.fromkeys([*self.base, *parameters]))
+        self._as_params = method == "GET"
+        self._as_data = method in ("POST", "PUT")
+
+    def render(self, assignments: Dict[str, str]) -> RenderedRequest:
+        fields = self.base.copy()
+        fields.update(assignments)
+        return RenderedRequest(
+            self.method,
+            self.url,
+            self.headers,
+            params=fields if self._as_params else None,
+            data=fields if self._as_data else None
+        )
+
+class RawRequestTemplate(RequestTemplate):
+    """
+    RawRequestTemplate compiles a raw HTTP request with §name§ (or §name:default§) injection points in its
+    request target, header values or body.
+
+    Notes:
+        The scheme and host come from the absolute request target if there is one, otherwise from the
+        Host header with the scheme of `target_url`, falling back to `target_url` itself. Payloads are
+        percent-encoded in the URL and inserted verbatim (UTF-8) in headers and body. Content-Length,
+        Host, Connection and Transfer-Encoding are left to the HTTP client.
+    """
+
+    def __init__(self, raw_request: str, target_url: str = None, headers: Dict[str, str] = None) -> None:
+        head, body = self._split(raw_request)
+        lines = head.splitlines()
+        if not lines or len(lines[0].split()) < 2:
+            raise ValueError("Raw request must start with a request line such as 'GET /path HTTP/1.1'.")
+        method, request_target = lines[0].split()[:2]
+        self.method = method.upper()
+
+        raw_headers = {}
+        for line in lines[1:]:
+            name, separator, value = line.partition(":")
+            if not separator:
+                raise ValueError(f"Malformed header line in raw request: {line}")
+            raw_headers[name.strip()] = value.strip()
+        host = next((value for name, value in raw_headers.items() if name.lower() == "host"), None)
+
+        if urlsplit(request_target).scheme:
+            url = request_target
+        else:
+            base = urlsplit(target_url or "")
+            scheme = base.scheme or "http"
+            netloc = host or base.netloc
+            if not netloc:
+                raise ValueError("Raw request needs a Host header or a target URL.")
+            url = f"{scheme}://{netloc}{request_target}"
+
+        self._url = SegmentTemplate.from_markers(url, lambda value: quote(value, safe=""))
+        self._static_headers = dict(headers or {})
+        self._headers = {}
+        for name, value in raw_headers.items():
+            if name.lower() in _DROPPED_HEADERS:
+                continue
+            template = SegmentTemplate.from_markers(value, str)
+            if template.names:
+                self._headers[name] = template
+            else:
+                self._static_headers[name] = value
+        self._body = SegmentTemplate.from_markers(body, lambda value: value.encode("utf-8"), binary=True) if body else None
+
+        names = self._url.names + [name for template in self._headers.values() for name in template.names]
+        if self._body is not None:
+            names += self._body.names
+        self.injection_points = list(dict.fromkeys(names))
+
+    @staticmethod
+    def _split(raw_request: str):
+        match = re.search(r"\r?\n\r?\n", raw_request)
+        if match is None:
+            return raw_request.strip(), ""
+        return raw_request[:match.start()].strip(), raw_request[match.end():]
+
+    def render(self, assignments: Dict[str, str]) -> RenderedRequest:
+        headers = self._static_headers
+        if self._headers:
+            headers = dict(headers)
+            for name, template in self._headers.items():
+                headers[name] = template.render(assignments)
+        data = self._body.render(assignments) if self._body is not None else None
+        return RenderedRequest(self.method, self._url.render(assignments), headers, data=data)
+
+class JsonRequestTemplate(RequestTemplate):
+    """
+    JsonRequestTemplate compiles a JSON body whose injection points are JSON pointers (RFC 6901), e.g. "/user/name" or "/items/0/id".
+
+    Notes:
+        The document is serialized once with a unique placeholder at every pointer and split around the
+        placeholders, so rendering only splices the JSON-encoded payload strings between static byte
+        segments. A pointer that is not assigned in a work item keeps its original value.
+    """
+
+    def __init__(self, target_url: str, method: str, headers: Dict[str, str], json_template: Union[Dict, List, str], parameters: List[str]) -> None:
+        document = json.loads(json_template) if isinstance(json_template, str) else json.loads(json.dumps(json_template))
+        self.method = method
+        self.url = target_url
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.injection_points = list(parameters)
+
+        placeholders = {}
+        for index, pointer in enumerate(parameters):
+            placeholder = f"\x00inject{index}\x00"
+            original = self._replace(document, pointer, placeholder)
+            placeholders[json.dumps(placeholder)] = (pointer, json.dumps(original, ensure_ascii=False).encode("utf-8"))
+
+        serialized = json.dumps(document, ensure_ascii=False, separators=(",", ":"))
+        pattern = re.compile("|".join(re.escape(placeholder) for placeholder in placeholders))
+        parts, position = [], 0
+        for match in pattern.finditer(serialized):
+            parts.append(serialized[position:match.start()].encode("utf-8"))
+            parts.append(placeholders[match.group(0)])
+            position = match.end()
+        parts.append(serialized[position:].encode("utf-8"))
+        self._body = SegmentTemplate(parts, lambda value: json.dumps(value, ensure_ascii=False).encode("utf-8"))
+
+    @staticmethod
+    def _replace(document: Any, pointer: str, value: Any) -> Any:
+        """
+        _replace sets the value at a JSON pointer and returns the value it replaced.
+
+        Raises:
+            ValueError: If the pointer does not resolve to an existing member or array item.
+        """
+        if not pointer.startswith("/"):
+            raise ValueError(f"Invalid JSON pointer: {pointer}")
+        tokens = [token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")]
+        target = document
+        try:
+            for token in tokens[:-1]:
+                target = target[int(token)] if isinstance(target, list) else target[token]
+            key = int(tokens[-1]) if isinstance(target, list) else tokens[-1]
+            original = target[key]
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"JSON pointer {pointer} does not match the JSON template.")
+        target[key] = value
+        return original
+
+    def render(self, assignments: Dict[str, str]) -> RenderedRequest:
+        return RenderedRequest(self.method, self.url, self.headers, data=self._body.render(assignments))
+
+def compile_request_template(
+    target_url: str,
+    http_method: str,
+    headers: Dict[str, str] = None,
+    body_template: Dict[str, str] = None,
+    parameters: List[str] = None,
+    raw_request: str = None,
+    json_template: Union[Dict, List, str] = None
+) -> RequestTemplate:
+    """
+    compile_request_template compiles the request template of a fuzzing run.
+
+    Args:
+        target_url (str): URL to send requests to, or the scheme/host base of a raw request.
+        http_method (str): HTTP method, ignored for raw requests which carry their own.
+        headers ([Dict]): HTTP headers sent with every request.
+        body_template ([Dict]): Flat form/query fields.
+        parameters ([List[str]]): Fuzzed parameters: field names, raw request marker names or JSON pointers.
+        raw_request ([str]): Raw HTTP request with §name§ injection points.
+        json_template ([Dict, List, str]): JSON body whose injection points are the JSON pointers in `parameters`.
+
+    Returns:
+        RequestTemplate: The compiled template.
+
+    Raises:
+        ValueError: If both a raw request and a JSON template are given, or the template is invalid.
+    """
+    if raw_request and json_template is not None:
+        raise ValueError("Use either a raw request or a JSON template, not both.")
+    if raw_request:
+        template = RawRequestTemplate(raw_request, target_url, headers)
+    elif json_template is not None:
+        template = JsonRequestTemplate(target_url, http_method.upper(), headers, json_template, parameters or [])
+    else:
+        template = FormRequestTemplate(target_url, http_method.upper(), headers or {}, body_template, parameters or [])
+    template.check_parameters(parameters or [])
+    return template
@@ -7,9 +7,17 @@ import os
 import json
 import time
 import random
+import functools
 
 from src.modules.fuzzer.fuzzer_manager import FuzzerManager
 from src.modules.fuzzer.http_client import AsyncHttpClient
+from src.modules.fuzzer.raw_http_client import RawHttpClient
+from src.modules.fuzzer.payload_source import ChainPayloadSource, FilePayloadSource, ListPayloadSource, RangePayloadSource
+from src.modules.common.http_archive import build_http_client, close_http_client
+from src.modules.common.checkpoint import WorkCheckpoint, checkpoint_path
+from src.modules.common.body_store import BodyStore
+from src.modules.common.signature_matcher import build_signature_matcher
+from src.modules.common.result_filter import combine_expressions, sizes_expression
 
 # set up the logging
 logging.basicConfig(level=logging.INFO)
@@ -22,6 +30,8 @@ job_results = {}
 # Format: {job_id, {status, result_file, urls_processed, completed_at, logs}}
 active_connections = {}
 # Format: {job_id: {websocket1, websocket2,...}}
+# Minimum number of seconds between two recomputations of the request statistics pushed with the progress
+STATS_INTERVAL = 1.0
 
 # Dictionary to keep track of fuzzer instances
 fuzzer_instances: Dict[str, Any] = {}
@@ -37,12 +47,60 @@ class FuzzerConfig(BaseModel):
     cookies: Optional[Dict[str, str]] = None
     proxy: Optional[str] = None
     body_template: Optional[Dict[str, str]] = None
+    # Raw HTTP request with §name§ injection points, its scheme taken from target_url
+    raw_request: Optional[str] = None
+    # JSON body fuzzed at the JSON pointers listed in parameters, e.g. '/user/name'
+    json_template: Optional[Any] = None
     parameters: List[str]
+    # Discover hidden parameters first from a name wordlist, packing mining_batch_size names per request, and fuzz them too
+    mine_parameters: Optional[bool] = False
+    parameter_wordlist: Optional[List[str]] = None
+    parameter_wordlist_file: Optional[str] = None
+    mining_batch_size: Optional[int] = 256
     payloads: Optional[List[str]] = None
     payload_file: Optional[str] = None
+    # [start, stop] or [start, stop, step] of numeric payloads
+    payload_range: Optional[List[int]] = None
+    dedup_payloads: Optional[bool] = False
+    # sniper, battering_ram, pitchfork or cluster_bomb
+    attack_mode: Optional[str] = "sniper"
+    parameter_payloads: Optional[Dict[str, List[str]]] = None
+    parameter_payload_files: Optional[Dict[str, str]] = None
+    shard_index: Optional[int] = None
+    shard_count: Optional[int] = None
+    # Payload mutation variants, each a '|'-separated transform chain such as 'url_encode|base64'
+    mutations: Optional[List[str]] = None
     hide_status: Optional[List[int]] = None
     show_status: Optional[List[int]] = None
+    # Response sizes to hide
     filter_content_length: Optional[List[int]] = None
+    # Result expressions such as 'status == 200 and body ~ "admin"', see result_filter.FilterExpression
+    match_expression: Optional[str] = None
+    filter_expression: Optional[str] = None
+    concurrency: Optional[int] = 10
+    # Requests per second sent on a fixed open-loop timetable instead of by `concurrency` workers
+    rate: Optional[float] = None
+    max_in_flight: Optional[int] = 1000
+    # 'aiohttp' or 'raw': the raw engine keeps persistent HTTP/1.1 connections and writes up to pipeline_depth requests ahead on each
+    http_engine: Optional[str] = "aiohttp"
+    pipeline_depth: Optional[int] = 1
+    # Flag response times this many standard deviations above their parameter's median (time-based blind injection), re-testing them
+    latency_z_threshold: Optional[float] = 4.0
+    latency_confirmations: Optional[int] = 2
+    # Send random payloads first and suppress responses that look like them, clustering the rest
+    auto_calibrate: Optional[bool] = False
+    calibration_samples: Optional[int] = 3
+    # Keep the full body of every result in the content-addressed body store
+    capture_bodies: Optional[bool] = False
+    # Flag results whose body contains error signatures: the built-in SQL error/stack trace set and/or custom ones keyed by ID
+    signature_scan: Optional[bool] = False
+    signatures: Optional[Dict[str, str]] = None
+    # Stop reading a body at its first signature match
+    stop_on_signature: Optional[bool] = False
+    # Record/replay settings: archive_mode is 'record' or 'replay', archive_path a file name under src/database/archives
+    archive_mode: Optional[str] = None
+    archive_path: Optional[str] = None
+    replay_latency: Optional[bool] = False
 
     # Handles any formatted issues from the frontend
     class Config:
@@ -66,6 +124,12 @@ class FuzzerJobResponse(BaseModel):
     progress: Optional[float] = 0
     urls_processed: Optional[int] = 0
     total_urls: Optional[int] = 0
+    # Connect/TTFB/total latency percentiles in milliseconds, throughput and error rates
+    latency: Optional[Dict[str, Any]] = None
+    bytes_per_second: Optional[float] = None
+    error_rate: Optional[float] = None
+    # Schedule statistics of open-loop runs: missed schedules and coordinated-omission corrected latency
+    open_loop: Optional[Dict[str, Any]] = None
 
 class FuzzerResultItem(BaseModel):
     """
@@ -79,6 +143,14 @@ class FuzzerResultItem(BaseModel):
     payload: str
     length: int
     error: bool
+    time: Optional[float] = None
+    cluster_size: Optional[int] = None
+    # Digest of the full body in the body store, when captured
+    body_ref: Optional[str] = None
+    # IDs of the error signatures found in the body
+    signatures: Optional[List[str]] = None
+    # z-score, re-test latencies and confirmation of a response time outlier
+    latency_anomaly: Optional[Dict[str, Any]] = None
 
 class FuzzerResults(BaseModel):
     """
@@ -86,6 +158,13 @@ class FuzzerResults(BaseModel):
     """
     results: List[FuzzerResultItem]
 
+class FuzzerResultFilter(BaseModel):
+    """
+    Match/filter expressions re-applied to the stored results of a job, on status, size, words, lines and time only.
+    """
+    match: Optional[str] = None
+    filter: Optional[str] = None
+
 class FuzzerProgressTracker:
     """
     Tracks progress of a fuzzer job and broadcasts updates through the websockets
@@ -94,6 +173,10 @@ class FuzzerProgressTracker:
         self.job_id = job_id
         self.processed_requests = 0
         self.logs = []
+        # Returns the fuzzer's request statistics, polled at most every STATS_INTERVAL seconds
+        self.stats_source = None
+        self.request_stats = {}
+        self._stats_refreshed = 0
 
     def add_log(self, message):
         """
@@ -136,9 +219,11 @@ class FuzzerProgressTracker:
             else:
                 progress = min(int((elapsed / duration) * 99), 99)
             
+            stats = self.refresh_request_stats()
             running_jobs[self.job_id].update({
                 'urls_processed': self.processed_requests,
-                'progress': progress
+                'progress': progress,
+                **stats
             })
 
             # Broadcast progress update to the connected websockets
@@ -146,7 +231,8 @@ class FuzzerProgressTracker:
                 'processed_requests': self.processed_requests,
                 'progress': progress,
                 'total_requests': limit,
-                'current_payload': current_payload
+                'current_payload': current_payload,
+                **stats
             })
 
         if error:
@@ -154,6 +240,16 @@ class FuzzerProgressTracker:
         elif current_payload:
             self.add_log(f'Processing payload: {current_payload}')
 
+    def refresh_request_stats(self):
+        """
+        Return the latency, throughput and error rate statistics, recomputed at most every STATS_INTERVAL seconds.
+        """
+        now = time.monotonic()
+        if callable(self.stats_source) and now - self._stats_refreshed >= STATS_INTERVAL:
+            self.request_stats = self.stats_source()
+            self._stats_refreshed = now
+        return self.request_stats
+
     def set_status(self, status):
         """
         Set job status and broadcast to connected clients.
@@ -180,42 +276,83 @@ class FuzzerProgressTracker:
             for websocket in active_connections[self.job_id]:
                 asyncio.create_task(websocket.send_json(message))
 
-async def run_fuzzer_task(job_id: str, config: FuzzerConfig):
+async def run_fuzzer_task(job_id: str, config: FuzzerConfig, resume_state: Dict[str, Any] = None):
     """
     Run a fuzzer job asynchronously and update state.
+    With resume_state, the job restarts from that checkpoint instead of the first payload.
     """
     tracker = FuzzerProgressTracker(job_id)
     tracker.add_log(f'Starting fuzzer job with config: {config.model_dump()}')
+    http_client = None
+    payload_sources = []
 
     try:
         tracker.set_status('running')
         running_jobs[job_id]['started_at'] = datetime.now().isoformat()
 
         # Initialize fuzzer manager
-        fuzzer = FuzzerManager()
+        if config.http_engine == 'raw':
+            live_client_cls = functools.partial(
+                RawHttpClient, pool_size=config.concurrency or 10, pipeline_depth=config.pipeline_depth or 1
+            )
+        elif config.http_engine in (None, 'aiohttp'):
+            live_client_cls = functools.partial(AsyncHttpClient, connection_limit=config.concurrency or 10)
+        else:
+            raise ValueError(f'Unknown HTTP engine: {config.http_engine}')
+        http_client = build_http_client(live_client_cls, config.archive_mode, config.archive_path, config.replay_latency)
+        fuzzer = FuzzerManager(http_client=http_client)
 
         # Store the fuzzer instance so can pause/stop it
         fuzzer_instances[job_id] = fuzzer
+        tracker.stats_source = fuzzer.get_request_stats
 
         def handle_new_row(row):
             print(f'[Backend] Broadcasting new row for {job_id}: {row['payload']}')
             tracker._broadcast_message('new_row', {'row': row})
         fuzzer.on_new_row = handle_new_row
 
-        # Prepare the payloads
-        payloads = config.payloads or []
+        # Prepare the payloads as lazy sources, payload files are streamed rather than read into memory
+        if config.payloads:
+            payload_sources.append(ListPayloadSource(config.payloads))
+        if config.payload_range:
+            payload_sources.append(RangePayloadSource(*config.payload_range))
         if config.payload_file and os.path.exists(config.payload_file):
-            with open(config.payload_file, 'r', encoding='utf-8') as f:
-                file_payloads = [line.strip() for line in f if line.strip()]
-                payloads.extend(file_payloads)
+            payload_sources.append(FilePayloadSource(config.payload_file))
 
         # Use default payloads if onhe isn't provided
-        if not payloads:
-            payloads = ['test', 'admin', 'password', '1234', '<script>alert(1)</script>']
-
-        # Calcualte total requests for progress tracking
-        total_requests = len(payloads) * len(config.parameters)
-        running_jobs[job_id]['total_urls'] = total_requests
+        if not payload_sources:
+            payload_sources.append(ListPayloadSource(['test', 'admin', 'password', '1234', '<script>alert(1)</script>']))
+        payloads = ChainPayloadSource(list(payload_sources))
+
+        # Separate payload sources per parameter for pitchfork and cluster bomb
+        parameter_payloads = {}
+        for param, param_payloads in (config.parameter_payloads or {}).items():
+            parameter_payloads[param] = ListPayloadSource(param_payloads)
+        for param, param_file in (config.parameter_payload_files or {}).items():
+            if os.path.exists(param_file):
+                parameter_payloads[param] = FilePayloadSource(param_file)
+                payload_sources.append(parameter_payloads[param])
+
+        # Discover hidden parameters before configuring, they are fuzzed along with the given ones
+        parameters = list(config.parameters)
+        if config.mine_parameters and not config.raw_request and config.json_template is None:
+            candidates = config.parameter_wordlist or config.parameter_wordlist_file
+            if not candidates or (isinstance(candidates, str) and not os.path.exists(candidates)):
+                raise ValueError('Parameter mining needs a parameter wordlist or wordlist file.')
+            tracker.add_log('Mining parameters')
+            found = await fuzzer.mine_parameters(
+                target_url=config.target_url,
+                http_method=config.http_method,
+                candidates=candidates,
+                headers=config.headers or {},
+                cookies=config.cookies or {},
+                proxy=config.proxy,
+                body_template=config.body_template or {},
+                batch_size=config.mining_batch_size or 256
+            )
+            tracker.add_log(f'Found {len(found)} parameter(s) in {fuzzer.mining_stats["requests"]} requests: {", ".join(hit["name"] for hit in found)}')
+            tracker._broadcast_message('parameters_found', {'parameters': found})
+            parameters = list(dict.fromkeys(parameters + [hit['name'] for hit in found]))
 
         # Configure the fuzzer
         tracker.add_log('Configuring fuzzer')
@@ -231,6 +368,18 @@ async def run_fuzzer_task(job_id: str, config: FuzzerConfig):
                 status_filter=config.show_status,
                 hide_codes=[]
             )
+        body_store = BodyStore() if config.capture_bodies else None
+        fuzzer.response_processor.set_body_store(body_store)
+        if config.signature_scan or config.signatures:
+            fuzzer.set_signature_matcher(build_signature_matcher(
+                use_defaults=config.signature_scan or False,
+                signatures=config.signatures,
+                stop_on_match=config.stop_on_signature or False
+            ))
+        fuzzer.response_processor.set_expressions(
+            match=config.match_expression,
+            filter=combine_expressions('or', config.filter_expression, sizes_expression(config.filter_content_length))
+        )
 
         fuzzer.configure_fuzzing(
             target_url=config.target_url,
@@ -239,9 +388,37 @@ async def run_fuzzer_task(job_id: str, config: FuzzerConfig):
             cookies=config.cookies or {},
             proxy=config.proxy,
             body_template=config.body_template or {},
-            parameters=config.parameters,
-            payloads=payloads
+            parameters=parameters,
+            payloads=payloads,
+            concurrency=config.concurrency or 10,
+            dedup_payloads=config.dedup_payloads or False,
+            attack_mode=config.attack_mode or 'sniper',
+            parameter_payloads=parameter_payloads,
+            mutations=config.mutations,
+            auto_calibrate=config.auto_calibrate or False,
+            calibration_samples=config.calibration_samples or 3,
+            raw_request=config.raw_request,
+            json_template=config.json_template,
+            rate=config.rate,
+            max_in_flight=config.max_in_flight or 1000,
+            latency_z_threshold=config.latency_z_threshold,
+            latency_confirmations=config.latency_confirmations if config.latency_confirmations is not None else 2
+        )
+        if config.shard_count:
+            fuzzer.shard(config.shard_index or 0, config.shard_count)
+
+        # Checkpoint the run so it can be resumed after a stop or a restart
+        fuzzer.enable_checkpoints(
+            checkpoint_path('fuzzer', job_id),
+            static_state={'job_id': job_id, 'config': config.model_dump()},
+            resume_state=resume_state
         )
+        if resume_state:
+            tracker.add_log(f'Resuming from checkpoint at work item {fuzzer.checkpoint.watermark}')
+
+        # Calcualte total requests for progress tracking
+        total_requests = fuzzer.get_total_requests()
+        running_jobs[job_id]['total_urls'] = total_requests
 
         tracker.add_log('Fuzzer configured successfully')
 
@@ -252,7 +429,7 @@ async def run_fuzzer_task(job_id: str, config: FuzzerConfig):
                 if job_status == 'stopped':
                     fuzzer.stop()
                     raise asyncio.CancelledError('Job stopped by user.')
-                elif job_status == 'paused':
+                elif job_status == 'paused' and not fuzzer._paused:
                     fuzzer.pause()
                     asyncio.create_task(wait_for_resume(job_id, fuzzer))
             tracker.update_progress(request_count, total_count, current_payload, error)
@@ -266,18 +443,32 @@ async def run_fuzzer_task(job_id: str, config: FuzzerConfig):
         metrics = fuzzer.get_metrics()
         results = fuzzer.get_filtered_results()
 
+        # Workers complete out of order, restore the work item order before saving
+        results = sorted(results, key=lambda result: result.get('request_id') or 0)
+
         formatted_results = []
         for idx, result in enumerate(results):
             formatted_results.append({
                 'id': idx+1,
                 'response': result.get('response', 0),
-                'lines': len(result.get('snippet', '').splitlines()),
-                'words': len(result.get('snippet', '').split()),
-                'chars': len(result.get('snippet', '')),
+                # Full-body counts measured while streaming, the snippet only stands in for clients without them
+                'lines': result.get('lines', len(result.get('snippet', '').splitlines())),
+                'words': result.get('words', len(result.get('snippet', '').split())),
+                'chars': result.get('chars', len(result.get('snippet', ''))),
                 'payload': result.get('payload', ''),
                 'length': result.get('length', 0),
-                'error': result.get('error', False)
+                'error': result.get('error', False),
+                'time': result.get('time'),
+                'cluster_size': result.get('cluster_size'),
+                'body_ref': result.get('body_ref'),
+                'signatures': result.get('signatures'),
+                'latency_anomaly': result.get('latency_anomaly')
             })
+            if body_store is not None and result.get('body_ref'):
+                body_store.add_ref(job_id, idx + 1, result['body_ref'], result.get('content_type'))
+        if body_store is not None:
+            body_store.save_refs(job_id)
+            metrics['body_store'] = body_store.stats()
 
         # Save the results
         results_file = f'src/database/fuzzer/Fuzzer_results_{job_id}.json' 
@@ -305,6 +496,10 @@ async def run_fuzzer_task(job_id: str, config: FuzzerConfig):
             'message': 'Fuzzer job completed successfully'
         })
 
+        # The run is complete, its checkpoint is no longer needed unless it was stopped early
+        if not fuzzer._stopped:
+            fuzzer.checkpoint.remove()
+
         # Clean up
         if job_id in fuzzer_instances:
             del fuzzer_instances[job_id]
@@ -356,6 +551,14 @@ async def run_fuzzer_task(job_id: str, config: FuzzerConfig):
             if job_id in running_jobs:
                 del running_jobs[job_id]
 
+    finally:
+        # Release the connections and the archive however the job ended, so its last records are flushed
+        if http_client is not None:
+            await close_http_client(http_client)
+        # Unmap the payload files
+        for source in payload_sources:
+            source.close()
+
 async def wait_for_resume(job_id: str, fuzzer: FuzzerManager):
     """
     Wait for job status to change from paused to something else
@@ -417,4 +620,10 @@ def get_job_logs(job_id: str):
         return running_jobs[job_id]['logs']
     elif job_id in job_results and 'logs' in job_results[job_id]:
         return job_results[job_id]['logs']
-    return []
\ No newline at end of file
+    return []
+
+def load_checkpoint(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Load the checkpoint saved by an interrupted job, None if it has none.
+    """
+    return WorkCheckpoint.load(checkpoint_path('fuzzer', job_id))
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, BackgroundTasks, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Response, WebSocket, WebSocketDisconnect
 import logging
 import json
 import uuid
@@ -11,14 +11,18 @@ from src.modules.fuzzer.service.fuzzer_service import (
     FuzzerConfig,
     FuzzerJobResponse,
     FuzzerResults,
+    FuzzerResultFilter,
     running_jobs,
     fuzzer_instances,
     job_results,
     active_connections,
     run_fuzzer_task,
     get_job_status_message,
-    get_job_logs
+    get_job_logs,
+    load_checkpoint
 )
+from src.modules.common.result_filter import apply_filters, FilterSyntaxError
+from src.modules.common.body_store import BodyStore
 
 # Set up logger
 logging.basicConfig(level=logging.INFO)
@@ -165,7 +169,11 @@ async def get_fuzzer_status(job_id: str):
             status=job['status'],
             progress=job.get('progress', 0),
             urls_processed=job.get('urls_processed', 0),
-            total_urls=job.get('total_urls', 0)
+            total_urls=job.get('total_urls', 0),
+            latency=job.get('latency'),
+            bytes_per_second=job.get('bytes_per_second'),
+            error_rate=job.get('error_rate'),
+            open_loop=job.get('open_loop')
         )
 
     if job_id in job_results:
@@ -177,7 +185,11 @@ async def get_fuzzer_status(job_id: str):
             status=job.get('status', 'completed'),
             progress=100 if job.get('status') == 'completed' else 0,
             urls_processed=job.get('urls_processed', 0),
-            total_urls=job.get('total_urls', job.get('urls_processed', 0))
+            total_urls=job.get('total_urls', job.get('urls_processed', 0)),
+            latency=job.get('metrics', {}).get('latency'),
+            bytes_per_second=job.get('metrics', {}).get('bytes_per_second'),
+            error_rate=job.get('metrics', {}).get('error_rate'),
+            open_loop=job.get('metrics', {}).get('open_loop')
         )
 
     logger.warning(f'Fuzzer job {job_id} not found')
@@ -217,6 +229,43 @@ async def get_fuzzer_results(job_id: str):
     logger.warning(f"Results for job {job_id} not found.")
     raise HTTPException(status_code=404, detail=f'Results for job {job_id} not found.')
 
+@fuzzer_router.get('/{job_id}/results/{result_id}/body')
+async def get_fuzzer_result_body(job_id: str, result_id: int):
+    """
+    Return the full response body captured for a result of a job run with capture_bodies.
+    """
+    try:
+        captured = BodyStore().get_result_body(job_id, result_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if captured is None:
+        raise HTTPException(status_code=404, detail=f'No body captured for result {result_id} of job {job_id}.')
+    body, content_type = captured
+    return Response(content=body, media_type=content_type or 'application/octet-stream')
+
+@fuzzer_router.post('/{job_id}/filter', response_model=FuzzerResults)
+async def filter_fuzzer_results(job_id: str, expressions: FuzzerResultFilter):
+    logger.info(f'Filtering results for job: {job_id}')
+
+    if job_id not in job_results:
+        if job_id in running_jobs:
+            raise HTTPException(status_code=202, detail='Job is still running, no results available yet.')
+        raise HTTPException(status_code=404, detail=f'Results for job {job_id} not found.')
+
+    results_file = job_results[job_id].get('results_file')
+    if not results_file or not os.path.exists(results_file):
+        return FuzzerResults(results=[])
+
+    with open(results_file, 'r') as file:
+        data = json.load(file)
+    try:
+        filtered = apply_filters(data, match=expressions.match, filter=expressions.filter)
+    except FilterSyntaxError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    add_log_entry(job_id, f'Results re-filtered via API: {len(filtered)} of {len(data)} records kept')
+    return FuzzerResults(results=filtered)
+
 @fuzzer_router.get('/{job_id}/logs')
 async def get_fuzzer_logs(job_id: str):
     logger.info(f"Getting logs for job: {job_id}")
@@ -314,7 +363,7 @@ async def pause_fuzzer_job(job_id: str):
     raise HTTPException(status_code=404, detail=f'Job {job_id} not found.')
 
 @fuzzer_router.post('/{job_id}/resume')
-async def resume_fuzzer_job(job_id: str):
+async def resume_fuzzer_job(job_id: str, background_tasks: BackgroundTasks):
     logger.info(f"Request to resume fuzzer job: {job_id}")
 
     if job_id in running_jobs:
@@ -340,9 +389,49 @@ async def resume_fuzzer_job(job_id: str):
 
         return {'success': True, 'message': 'Job resumed successfully'}
 
+    # Not running anymore: restart it from the checkpoint it saved when it was stopped or interrupted
+    try:
+        checkpoint = load_checkpoint(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if checkpoint and checkpoint.get('config'):
+        config = FuzzerConfig.model_validate(checkpoint['config'])
+        running_jobs[job_id] = {
+            'status': 'initializing',
+            'created_at': datetime.now().isoformat(),
+            'progress': 0,
+            'urls_processed': 0,
+            'total_urls': 0,
+            'logs': []
+        }
+        job_results.pop(job_id, None)
+        add_log_entry(job_id, f"Resuming from checkpoint at work item {checkpoint['watermark']}")
+        background_tasks.add_task(run_fuzzer_task, job_id, config, checkpoint)
+        return {'success': True, 'message': 'Job resumed from checkpoint', 'resumed_from': checkpoint['watermark']}
+
     logger.warning(f"Fuzzer job {job_id} not found when attempting to resume")
     raise HTTPException(status_code=404, detail=f'Job {job_id} not found.')
 
+@fuzzer_router.get('/{job_id}/checkpoint')
+async def get_fuzzer_checkpoint(job_id: str):
+    """
+    Return where an interrupted job would resume from.
+    """
+    try:
+        checkpoint = load_checkpoint(job_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail=f'No checkpoint for job {job_id}.')
+    return {
+        'job_id': job_id,
+        'watermark': checkpoint['watermark'],
+        'in_flight': checkpoint.get('in_flight', []),
+        'completed_ahead': len(checkpoint.get('completed', [])),
+        'results': len(checkpoint.get('results', [])),
+        'saved_at': datetime.fromtimestamp(checkpoint['saved_at']).isoformat()
+    }
+
 def get_service_routers():
     return [fuzzer_router]
 
@@ -27,9 +27,9 @@ class crawler_manager:
         - Processed data is stored in JSON format for further analysis.
     """
 
-    def __init__(self):
+    def __init__(self, http_client: RealHTTPClient = None):
         self.config = {}
-        self.http_client = RealHTTPClient()
+        self.http_client = http_client or RealHTTPClient()
         self.processor = CrawlerResponseProcessor()
         self.visited = set()
         self.results = []
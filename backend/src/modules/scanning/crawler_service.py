@@ -7,6 +7,8 @@ import os
 import json
 
 from src.modules.scanning.crawler_manager import crawler_manager
+from src.modules.scanning.mock_http import RealHTTPClient
+from src.modules.common.http_archive import build_http_client, close_http_client
 
 # set up the logging
 logging.basicConfig(level=logging.INFO)
@@ -37,6 +39,10 @@ class CrawlerConfig(BaseModel):
     excluded_urls: Optional[str] = None
     crawl_date: Optional[str] = None
     crawl_time: Optional[str] = None
+    # Record/replay settings: archive_mode is 'record' or 'replay', archive_path a file name under src/database/archives
+    archive_mode: Optional[str] = None
+    archive_path: Optional[str] = None
+    replay_latency: Optional[bool] = False
 
     # Handles any formatted issues from the frontend
     class Config:
@@ -193,6 +199,7 @@ async def run_crawler_task(job_id: str, config: CrawlerConfig):
     """
     tracker = CrawlerProgressTracker(job_id)
     tracker.add_log(f'Starting crawler job with config: {config.model_dump()}')
+    http_client = None
 
     try:
         # Update job status
@@ -200,7 +207,8 @@ async def run_crawler_task(job_id: str, config: CrawlerConfig):
         running_jobs[job_id]['started_at'] = datetime.now().isoformat()
 
         # Initialize crawler manager
-        crawler = crawler_manager()
+        http_client = build_http_client(RealHTTPClient, config.archive_mode, config.archive_path, config.replay_latency)
+        crawler = crawler_manager(http_client=http_client)
 
         # Store the crawler instance so you can pause/stop it
         crawler_instances[job_id] = crawler
@@ -352,6 +360,11 @@ async def run_crawler_task(job_id: str, config: CrawlerConfig):
             # Remove from the running_jobs list
             del running_jobs[job_id]
 
+    finally:
+        # Release the archive however the job ended, so its last records are flushed
+        if http_client is not None:
+            await close_http_client(http_client)
+
 async def wait_for_resume(job_id: str, crawler: crawler_manager):
     """
     Wait for job status to change from paused to something else
@@ -1,13 +1,16 @@
 # mock_http
 
+import time
+import asyncio
 import aiohttp
+from src.modules.common.http_response import HttpResponse
 
 class RealHTTPClient:
     """
     RealHTTPClient is responsible for performing HTTP GET requests asynchronously. It uses the aiohttp library to send requests and retrieve responses.
 
     Attributes:
-        None
+        archive (HttpArchive): Optional archive every exchange is recorded to.
     
     Methods:
         get(url: str, headers: dict = None, proxy: str = None) -> str:
@@ -16,6 +19,9 @@ class RealHTTPClient:
         None
     """
 
+    def __init__(self, archive=None):
+        self.archive = archive
+
     async def get(self, url, headers=None, proxy=None):
         """
         get sends an HTTP GET request to the specified URL and returns the response content.
@@ -34,10 +40,27 @@ class RealHTTPClient:
         @requires url != "";
         @ensures response == string.
         """
-        async with aiohttp.ClientSession(headers=headers) as session:
-            if proxy:
-                async with session.get(url, proxy=proxy) as response:
-                    return await response.text()
-            else:
-                async with session.get(url) as response:
-                    return await response.text()
\ No newline at end of file
+        started = time.perf_counter()
+        try:
+            async with aiohttp.ClientSession(headers=headers) as session:
+                async with session.get(url, proxy=proxy or None) as response:
+                    # Decode with the declared charset (UTF-8 fallback) rather than running charset detection
+                    body = await response.read()
+                    text = HttpResponse(str(response.url), response.status, body, dict(response.headers)).text
+                    if self.archive is not None:
+                        self.archive.record(
+                            method="GET",
+                            url=url,
+                            status=response.status,
+                            body=body,
+                            request_headers=headers,
+                            response_headers=dict(response.headers),
+                            elapsed=time.perf_counter() - started,
+                            response_url=str(response.url)
+                        )
+                    return text
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            # Archived so a replay fails this request the same way
+            if self.archive is not None:
+                self.archive.record_error(method="GET", url=url, error=str(e) or type(e).__name__, request_headers=headers, elapsed=time.perf_counter() - started)
+            raise
\ No newline at end of file
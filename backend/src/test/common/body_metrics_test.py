@@ -0,0 +1,54 @@
+# body_metrics_test.py
+
+import unittest
+from types import SimpleNamespace
+from src.modules.common.body_metrics import BodyMetrics, read_body
+from src.modules.common.http_response import declared_length
+from src.modules.common.response_fingerprint import ResponseFingerprint
+
+class TestBodyMetrics(unittest.TestCase):
+    BODY = "  Héllo wörld,\nthis is\t\ta test ✓\n\nlast line without newline".encode("utf-8")
+
+    def feed(self, body, chunk_size):
+        metrics = BodyMetrics()
+        for start in range(0, len(body), chunk_size):
+            metrics.feed(body[start:start + chunk_size])
+        return metrics.as_dict()
+
+    def test_counts_match_full_body(self):
+        text = self.BODY.decode("utf-8")
+        expected = {
+            "bytes": len(self.BODY),
+            "chars": len(text),
+            "lines": len(text.splitlines()),
+            "words": len(text.split()),
+            "hash": ResponseFingerprint.from_text(200, text).body_hash
+        }
+        self.assertEqual(BodyMetrics.of(self.BODY).as_dict(), expected)
+
+    def test_counts_do_not_depend_on_chunking(self):
+        expected = BodyMetrics.of(self.BODY).as_dict()
+        for chunk_size in (1, 2, 3, 5, 7, 64):
+            self.assertEqual(self.feed(self.BODY, chunk_size), expected, msg=f"chunk size {chunk_size}")
+
+    def test_empty_and_trailing_newline(self):
+        self.assertEqual(BodyMetrics.of(b"").as_dict()["lines"], 0)
+        self.assertEqual(BodyMetrics.of(b"a\nb\n").as_dict()["lines"], 2)
+
+class TestReadBody(unittest.IsolatedAsyncioTestCase):
+    async def test_limit_stops_reading(self):
+        async def iter_chunked(size):
+            for start in range(0, 100, 30):
+                yield b"x" * min(30, 100 - start)
+        response = SimpleNamespace(content=SimpleNamespace(iter_chunked=iter_chunked))
+        body, metrics = await read_body(response, limit=45)
+        self.assertEqual((len(body), metrics.bytes), (45, 45))
+        body, _ = await read_body(response, limit=1000)
+        self.assertEqual(len(body), 100)
+
+    def test_declared_length(self):
+        self.assertEqual(declared_length({"Content-Range": "bytes 0-1023/52311", "Content-Length": "1024"}), 52311)
+        self.assertEqual(declared_length({"content-length": "812"}), 812)
+        self.assertIsNone(declared_length({"Content-Range": "bytes 0-1023/*"}))
+
+unittest.main()
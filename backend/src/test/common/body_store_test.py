@@ -0,0 +1,63 @@
+# body_store_test.py
+
+import os
+import tempfile
+import unittest
+from src.modules.common.body_store import BodyStore
+from src.modules.fuzzer.fuzzer_manager import MockResponse
+from src.modules.fuzzer.fuzzer_response_processor import FuzzerResponseProcessor
+from src.modules.common.http_response import HttpResponse
+
+class TestBodyStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = BodyStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_identical_bodies_are_stored_once(self):
+        error_page = b"<html>" + b"Internal Server Error " * 500 + b"</html>"
+        digests = {self.store.put(error_page) for _ in range(1000)}
+        self.assertEqual(len(digests), 1)
+        self.assertEqual(self.store.stats(), {"stored": 1, "deduplicated": 999})
+        objects = [name for _, _, names in os.walk(os.path.join(self.directory.name, "objects")) for name in names]
+        self.assertEqual(len(objects), 1)
+        digest = digests.pop()
+        self.assertLess(os.path.getsize(self.store._object_path(digest)), len(error_page) // 10)
+        self.assertEqual(self.store.get(digest), error_page)
+        # A new instance finds the bodies already on disk
+        other = BodyStore(self.directory.name)
+        other.put(error_page)
+        self.assertEqual(other.stats(), {"stored": 0, "deduplicated": 1})
+        self.assertIsNone(self.store.get("0" * 64))
+        with self.assertRaises(ValueError):
+            self.store.get("../../etc/passwd")
+
+    def test_job_reference_table(self):
+        digest = self.store.put(b'{"ok": true}')
+        self.store.add_ref("job-1", 3, digest, "application/json")
+        self.store.save_refs("job-1")
+        self.assertEqual(self.store.get_result_body("job-1", 3), (b'{"ok": true}', "application/json"))
+        self.assertIsNone(self.store.get_result_body("job-1", 4))
+        self.assertIsNone(self.store.get_result_body("job-2", 3))
+        with self.assertRaises(ValueError):
+            self.store.load_refs("../job-1")
+
+    def test_processor_captures_stored_results(self):
+        processor = FuzzerResponseProcessor()
+        processor.set_filters(status_filter=[200])
+        processor.set_body_store(self.store)
+        body = "é" * 300
+        for status in (200, 200, 404):
+            response = HttpResponse("http://t", status, body.encode("utf-8"), headers={"content-type": "text/plain; charset=utf-8"})
+            processor.process_response(MockResponse("http://t", status, None, response=response))
+        results = processor.get_filtered_results()
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]["body_ref"], results[1]["body_ref"])
+        self.assertEqual(results[0]["content_type"], "text/plain; charset=utf-8")
+        self.assertEqual(self.store.get(results[0]["body_ref"]).decode("utf-8"), body)
+        self.assertEqual(len(results[0]["snippet"]), 200)
+        self.assertEqual(self.store.stats(), {"stored": 1, "deduplicated": 1})
+
+unittest.main()
@@ -0,0 +1,89 @@
+# checkpoint_test.py
+
+import os
+import json
+import tempfile
+import unittest
+from src.modules.common.checkpoint import WorkCheckpoint
+
+class TestWorkCheckpoint(unittest.TestCase):
+    def test_watermark_advances_over_contiguous_items(self):
+        checkpoint = WorkCheckpoint(start_index=10)
+        for index in (10, 11, 12, 13):
+            checkpoint.begin(index)
+        checkpoint.complete(12)
+        checkpoint.complete(13)
+        self.assertEqual(checkpoint.watermark, 10)
+        self.assertEqual(checkpoint.completed, {12, 13})
+        checkpoint.complete(10)
+        self.assertEqual(checkpoint.watermark, 11)
+        self.assertEqual(checkpoint.in_flight, {11})
+        self.assertTrue(checkpoint.is_completed(12))
+        self.assertFalse(checkpoint.is_completed(11))
+        checkpoint.complete(11)
+        self.assertEqual((checkpoint.watermark, checkpoint.completed, checkpoint.in_flight), (14, set(), set()))
+
+    def test_atomic_save_and_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "nested", "job.json")
+            checkpoint = WorkCheckpoint(path, interval=3600, extra_state=lambda: {"config": {"a": 1}})
+            for index in range(4):
+                checkpoint.begin(index)
+            checkpoint.complete(0)
+            checkpoint.complete(2)
+            self.assertFalse(os.path.exists(path))
+            checkpoint.save()
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["job.json"])
+            state = WorkCheckpoint.load(path)
+            self.assertEqual((state["watermark"], state["in_flight"], state["completed"], state["config"]), (1, [1, 3], [2], {"a": 1}))
+            resumed = WorkCheckpoint.from_state(path, state)
+            self.assertEqual((resumed.watermark, resumed.completed, resumed.in_flight), (1, {2}, set()))
+            resumed.remove()
+            self.assertIsNone(WorkCheckpoint.load(path))
+            with open(path, "w") as file:
+                json.dump({"version": 99}, file)
+            with self.assertRaises(ValueError):
+                WorkCheckpoint.load(path)
+
+    def test_periodic_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "job.json")
+            checkpoint = WorkCheckpoint(path, interval=0)
+            checkpoint.begin(0)
+            checkpoint.complete(0)
+            self.assertEqual(WorkCheckpoint.load(path)["watermark"], 1)
+
+    def test_config_and_results_are_written_next_to_the_checkpoint(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "job.json")
+            rows = [{"id": 1}]
+            checkpoint = WorkCheckpoint(path, interval=3600, static_state={"config": {"a": 1}}, results=lambda: rows)
+            checkpoint.save()
+            with open(checkpoint.sidecar_path("config"), "w") as file:
+                json.dump({"config": {"a": 2}}, file)
+            rows.append({"id": 2})
+            checkpoint.save()
+            # The config is written once and each save only appends the new rows
+            self.assertEqual(WorkCheckpoint.load(path)["config"], {"a": 2})
+            with open(checkpoint.sidecar_path("results")) as file:
+                self.assertEqual([json.loads(line) for line in file], [{"id": 1}, {"id": 2}])
+            with open(path) as file:
+                self.assertEqual(set(json.load(file)) & {"config", "results"}, set())
+
+            # Rows appended after the last checkpoint are ignored on load
+            with open(checkpoint.sidecar_path("results"), "a") as file:
+                file.write(json.dumps({"id": 3}) + "\n")
+            self.assertEqual(WorkCheckpoint.load(path)["results"], [{"id": 1}, {"id": 2}])
+            rows.append({"id": 3})
+            rows.append({"id": 4})
+            checkpoint.save()
+            self.assertEqual(WorkCheckpoint.load(path)["results"], rows)
+
+            # A replaced list is rewritten
+            rows = [{"id": 1}]
+            checkpoint.save()
+            self.assertEqual(WorkCheckpoint.load(path)["results"], [{"id": 1}])
+            checkpoint.remove()
+            self.assertEqual(os.listdir(directory), [])
+
+unittest.main()
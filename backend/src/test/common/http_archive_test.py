@@ -0,0 +1,102 @@
+# http_archive_test.py
+
+import os
+import tempfile
+import unittest
+from src.modules.common.http_archive import HttpArchive, ReplayHttpClient, build_http_client, close_http_client
+from src.modules.fuzzer.http_client import AsyncHttpClient
+
+class TestHttpArchive(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "run.archive")
+        self.archive = HttpArchive(self.path)
+
+    def tearDown(self):
+        self.archive.close()
+        self.tmp_dir.cleanup()
+
+    def test_record_and_lookup(self):
+        self.archive.record("POST", "http://test.com/login", 403, b"Forbidden",
+                            data={"user": "admin", "pass": "x"}, elapsed=0.25)
+        record = self.archive.lookup("post", "http://test.com/login", data={"pass": "x", "user": "admin"})
+        self.assertEqual(record["status"], 403)
+        self.assertEqual(record["body"], b"Forbidden")
+        self.assertEqual(record["elapsed"], 0.25)
+        self.assertIsNone(self.archive.lookup("POST", "http://test.com/login", data={"user": "other"}))
+
+    def test_latest_record_wins(self):
+        self.archive.record("GET", "http://test.com/", 500, b"first", params={"q": "1"})
+        self.archive.record("GET", "http://test.com/", 200, b"second", params={"q": "1"})
+        self.assertEqual(self.archive.lookup("GET", "http://test.com/", params={"q": "1"})["body"], b"second")
+
+    async def test_request_headers_are_part_of_the_key(self):
+        self.archive.record("GET", "http://test.com/big", 206, b"<p>", request_headers={"Range": "bytes=0-2"})
+        self.archive.record("GET", "http://test.com/big", 200, b"<p>full page</p>")
+        self.archive.record("GET", "http://test.com/", 200, b"a", request_headers={"X-Forwarded-For": "127.0.0.1"})
+        self.archive.record("GET", "http://test.com/", 403, b"b", request_headers={"X-Forwarded-For": "10.0.0.1"})
+        client = ReplayHttpClient(self.archive)
+        ranged = await client.send(method="GET", url="http://test.com/big", headers={"range": "bytes=0-2"})
+        self.assertEqual((ranged["status"], ranged["text"]), (206, "<p>"))
+        self.assertEqual((await client.send(method="GET", url="http://test.com/big"))["status"], 200)
+        fuzzed = await client.send(method="GET", url="http://test.com/", headers={"X-Forwarded-For": "127.0.0.1"})
+        self.assertEqual(fuzzed["text"], "a")
+        # Headers set by the transport do not change the key
+        self.assertEqual(
+            HttpArchive.make_key("GET", "http://test.com/", headers={"Host": "test.com", "Content-Length": "0"}),
+            HttpArchive.make_key("GET", "http://test.com/")
+        )
+
+    def test_index_rebuilt_when_missing(self):
+        self.archive.record("GET", "http://test.com/a", 200, b"a\r\nbody")
+        self.archive.record("GET", "http://test.com/b", 404, b"")
+        self.archive.close()
+        os.remove(self.path + ".idx")
+        reopened = HttpArchive(self.path)
+        self.assertEqual(reopened.lookup("GET", "http://test.com/a")["body"], b"a\r\nbody")
+        self.assertEqual(reopened.lookup("GET", "http://test.com/b")["status"], 404)
+        self.assertTrue(os.path.exists(self.path + ".idx"))
+
+    async def test_replay_client(self):
+        self.archive.record("GET", "http://test.com/page", 200, "héllo".encode("utf-8"),
+                            params={"id": "1"}, response_url="http://test.com/page?id=1")
+        client = ReplayHttpClient(self.archive)
+        result = await client.send(method="GET", url="http://test.com/page", params={"id": "1"})
+        self.assertEqual(result["status"], 200)
+        self.assertEqual(result["text"], "héllo")
+        self.assertEqual(result["url"], "http://test.com/page?id=1")
+
+        missing = await client.send(method="GET", url="http://test.com/missing")
+        self.assertIsNone(missing["status"])
+        with self.assertRaises(KeyError):
+            await client.get("http://test.com/missing")
+
+    async def test_transport_errors_are_replayed(self):
+        self.archive.record_error("GET", "http://test.com/down", "Connection refused", elapsed=0.01)
+        client = ReplayHttpClient(self.archive)
+        result = await client.send(method="GET", url="http://test.com/down")
+        self.assertIsNone(result["status"])
+        self.assertEqual(result["text"], "Connection refused")
+        with self.assertRaises(ConnectionError):
+            await client.get("http://test.com/down")
+
+    async def test_build_http_client(self):
+        root = self.tmp_dir.name
+        self.assertIsInstance(build_http_client(AsyncHttpClient), AsyncHttpClient)
+        recording = build_http_client(AsyncHttpClient, "record", "run.archive", archive_root=root)
+        self.assertIsInstance(recording.archive, HttpArchive)
+        self.assertEqual(recording.archive.path, self.path)
+        replaying = build_http_client(AsyncHttpClient, "replay", "run.archive", archive_root=root)
+        self.assertIsInstance(replaying, ReplayHttpClient)
+        with self.assertRaises(ValueError):
+            build_http_client(AsyncHttpClient, "record")
+        # Archives stay in their directory
+        for name in ("../run.archive", "/tmp/run.archive", "sub/run.archive", ".hidden"):
+            with self.assertRaises(ValueError):
+                build_http_client(AsyncHttpClient, "record", name, archive_root=root)
+        recording.archive.record("GET", "http://test.com/", 200, b"ok")
+        await close_http_client(recording)
+        await close_http_client(replaying)
+        self.assertIsNone(recording.archive._archive_file)
+
+unittest.main()
@@ -0,0 +1,40 @@
+# http_response_test.py
+
+import unittest
+from src.modules.common.http_response import HttpResponse, charset_from_headers
+
+class TestHttpResponse(unittest.TestCase):
+    def test_charset_from_headers(self):
+        self.assertEqual(charset_from_headers({"Content-Type": "text/html; charset=ISO-8859-1"}), "iso8859-1")
+        self.assertEqual(charset_from_headers({"content-type": 'text/html; charset="utf-8"'}), "utf-8")
+        self.assertEqual(charset_from_headers({"Content-Type": "application/json"}), "utf-8")
+        self.assertIsNone(charset_from_headers({"Content-Type": "text/html"}))
+        self.assertIsNone(charset_from_headers({"Content-Type": "text/html; charset=bogus"}))
+
+    def test_text_is_decoded_lazily(self):
+        response = HttpResponse("http://test.com", 200, "café".encode("latin-1"), {"Content-Type": "text/plain; charset=latin-1"})
+        self.assertIsNone(response._text)
+        self.assertEqual(response.snippet(3), "caf")
+        self.assertIsNone(response._text)
+        self.assertEqual(response.text, "café")
+        self.assertEqual(response.length, 4)
+
+    def test_undeclared_charset_falls_back_to_utf8(self):
+        response = HttpResponse("http://test.com", 200, "naïve".encode("utf-8") + b"\xff")
+        self.assertEqual(response.length, 6)
+        self.assertIsNone(response._text)
+        self.assertEqual(response.text, "naïve�")
+
+    def test_dict_compatibility(self):
+        response = HttpResponse("http://test.com", 404, b"Not found", {"Server": "test"}, elapsed=0.25)
+        self.assertEqual((response["url"], response["status"], response["text"]), ("http://test.com", 404, "Not found"))
+        self.assertEqual(response.get("metrics")["words"], 2)
+        self.assertIsNone(response.get("cookies"))
+        with self.assertRaises(KeyError):
+            response["body_hash"]
+        error = HttpResponse.error("http://test.com", "Connection refused")
+        self.assertIsNone(error["status"])
+        self.assertEqual(error["text"], "Connection refused")
+        self.assertIsNone(error.metrics)
+
+unittest.main()
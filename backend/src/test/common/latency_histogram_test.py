@@ -0,0 +1,74 @@
+# latency_histogram_test.py
+
+import random
+import unittest
+from src.modules.common.latency_histogram import LatencyHistogram, RequestStats
+from src.modules.common.http_response import HttpResponse
+from src.modules.common.request_timing import RequestTiming
+
+class TestLatencyHistogram(unittest.TestCase):
+    def test_percentiles_within_relative_error(self):
+        generator = random.Random(7)
+        values = sorted(generator.lognormvariate(-3, 1.2) for _ in range(20000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+        for percent in (50, 90, 99):
+            exact = values[int(percent / 100 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent), exact, delta=exact / 16)
+        self.assertEqual(histogram.percentile(100), values[-1])
+        self.assertAlmostEqual(histogram.percentile(0), values[0], delta=values[0] / 16 + 1e-6)
+        self.assertEqual(histogram.count, len(values))
+
+    def test_fixed_memory_and_clamping(self):
+        histogram = LatencyHistogram()
+        size = len(histogram.counts)
+        for value in (0, -1, 1e-7, 3.5, 10 ** 9):
+            histogram.record(value)
+        self.assertEqual(len(histogram.counts), size)
+        self.assertEqual(sum(histogram.counts), 5)
+        self.assertEqual(histogram.min, 0.0)
+        self.assertEqual(histogram.percentile(100), 10 ** 9)
+
+    def test_bucket_bounds_are_contiguous(self):
+        previous = -1
+        for index in range(LatencyHistogram.BUCKETS):
+            upper = LatencyHistogram._upper_bound(index)
+            self.assertEqual(LatencyHistogram._index(previous + 1), index)
+            self.assertEqual(LatencyHistogram._index(upper), index)
+            previous = upper
+        self.assertEqual(previous, LatencyHistogram.MAX_VALUE)
+
+    def test_merge_and_summary(self):
+        first, second = LatencyHistogram(), LatencyHistogram()
+        self.assertEqual(first.summary(), {"count": 0})
+        for value in (0.010, 0.020):
+            first.record(value)
+        second.record(0.300)
+        first.merge(second)
+        summary = first.summary()
+        self.assertEqual((summary["count"], summary["max_ms"]), (3, 300.0))
+        self.assertAlmostEqual(summary["p50_ms"], 20.0, delta=1.0)
+        self.assertAlmostEqual(summary["mean_ms"], 110.0, places=3)
+        with self.assertRaises(ValueError):
+            first.percentile(101)
+
+class TestRequestStats(unittest.TestCase):
+    def test_records_timings_bytes_and_errors(self):
+        stats = RequestStats()
+        timing = RequestTiming()
+        timing.connect, timing.ttfb, timing.total = 0.002, 0.015, 0.020
+        stats.record(HttpResponse("http://x/a", 200, b"x" * 1000, elapsed=0.020, timing=timing))
+        stats.record(HttpResponse("http://x/b", 503, b"down", elapsed=0.040))
+        stats.record(HttpResponse.error("http://x/c", "timeout"))
+        stats.record_error()
+        summary = stats.summary(running_time=2.0)
+        self.assertEqual(summary["bytes_received"], 1004)
+        self.assertEqual(summary["bytes_per_second"], 502)
+        self.assertEqual((summary["errors"], summary["error_rate"]), (2, 0.5))
+        self.assertEqual((summary["server_errors"], summary["server_error_rate"]), (1, 0.25))
+        self.assertEqual(summary["latency"]["connect"]["count"], 1)
+        self.assertEqual(summary["latency"]["total"]["count"], 2)
+        self.assertEqual(summary["latency"]["ttfb"]["max_ms"], 15.0)
+
+unittest.main()
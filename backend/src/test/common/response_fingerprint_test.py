@@ -0,0 +1,29 @@
+# response_fingerprint_test.py
+
+import unittest
+from src.modules.common.response_fingerprint import ResponseFingerprint, BaselineSet
+
+class TestResponseFingerprint(unittest.TestCase):
+    def test_fingerprint_counts(self):
+        fingerprint = ResponseFingerprint.from_text(404, "Not found\nnothing here")
+        self.assertEqual((fingerprint.status, fingerprint.length, fingerprint.words, fingerprint.lines), (404, 22, 4, 2))
+        self.assertEqual(fingerprint.body_hash, ResponseFingerprint.from_text(404, "Not found\nnothing here").body_hash)
+        self.assertEqual(fingerprint.cluster_key(10), (404, 4, 2, 2))
+
+    def test_static_baseline_matches_exact_length(self):
+        baselines = BaselineSet(length_tolerance=2)
+        baselines.add(ResponseFingerprint.from_text(404, "Page not found"))
+        self.assertTrue(baselines.matches(ResponseFingerprint.from_text(404, "Page not found!!")))
+        self.assertFalse(baselines.matches(ResponseFingerprint.from_text(404, "Page not found - try again later")))
+        self.assertFalse(baselines.matches(ResponseFingerprint.from_text(404, "Page not foundxxxx")))
+
+    def test_baseline_ignores_length_of_reflected_payloads(self):
+        baselines = BaselineSet()
+        baselines.add(ResponseFingerprint.from_text(200, "No results for abcdefgh"))
+        baselines.add(ResponseFingerprint.from_text(200, "No results for abcdefghijklmnop"))
+        self.assertTrue(baselines.matches(ResponseFingerprint.from_text(200, "No results for admin")))
+        self.assertFalse(baselines.matches(ResponseFingerprint.from_text(200, "Welcome back, admin")))
+        self.assertFalse(baselines.matches(ResponseFingerprint.from_text(500, "No results for admin123")))
+        self.assertEqual(baselines.as_list(), [{"status": 200, "words": 4, "lines": 1, "min_length": 23, "max_length": 31}])
+
+unittest.main()
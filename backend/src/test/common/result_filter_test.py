@@ -0,0 +1,50 @@
+# result_filter_test.py
+
+import unittest
+from src.modules.common.result_filter import compile_filter, apply_filters, combine_expressions, sizes_expression, FilterSyntaxError
+
+class TestResultFilter(unittest.TestCase):
+    def evaluate(self, source, status=200, text="", headers=None, elapsed=None):
+        expression = compile_filter(source)
+        return expression(expression.subject(status, text, headers, elapsed))
+
+    def test_numeric_fields(self):
+        self.assertTrue(self.evaluate("status == 200 and size > 3", text="hello"))
+        self.assertTrue(self.evaluate("status in [200, 301-399]", status=302))
+        self.assertFalse(self.evaluate("status not in [200, 301-399]", status=302))
+        self.assertTrue(self.evaluate("words == 3 and lines == 2", text="one two\nthree"))
+        self.assertTrue(self.evaluate("time >= 0.5", elapsed=0.75))
+
+    def test_text_fields_and_precedence(self):
+        headers = {"Server": "nginx/1.25", "Content-Type": "application/json"}
+        self.assertTrue(self.evaluate('header.server ~ "NGINX"', headers=headers))
+        self.assertTrue(self.evaluate('header["content-type"] == "application/json"', headers=headers))
+        self.assertTrue(self.evaluate('body ~ "sql" or status == 500 and size == 0', text="SQL syntax error"))
+        self.assertFalse(self.evaluate('not (body !~ "error")', text="all good"))
+
+    def test_only_referenced_fields_are_computed(self):
+        expression = compile_filter("status == 200")
+        self.assertNotIn("words", expression.subject(200, "a b c"))
+        self.assertEqual(compile_filter("lines > 1").fields, {"lines"})
+
+    def test_invalid_expressions(self):
+        for source in ["", "status ~ 'x'", "body in [1]", "cookies == 1", "(status == 1", "status == 200 200", "body ~ '('"]:
+            with self.assertRaises(FilterSyntaxError, msg=source):
+                compile_filter(source)
+
+    def test_apply_filters_to_stored_results(self):
+        results = [
+            {"id": 1, "response": 200, "length": 1534, "words": 80, "lines": 10, "payload": "a"},
+            {"id": 2, "response": 200, "length": 900, "words": 40, "lines": 5, "payload": "b"},
+            {"id": 3, "response": 500, "length": 120, "words": 12, "lines": 1, "payload": "c"},
+            {"id": 4, "status": 403, "length": 0, "payload": "d"}
+        ]
+        hide = combine_expressions("or", "status == 403", sizes_expression([1534]))
+        self.assertEqual([r["id"] for r in apply_filters(results, filter=hide)], [2, 3])
+        self.assertEqual([r["id"] for r in apply_filters(results, match="words >= 40", filter="size == 1534")], [2])
+        # Stored rows have no body or headers to test
+        for source in ["body ~ 'admin'", "status == 200 and header.server ~ 'nginx'"]:
+            with self.assertRaises(FilterSyntaxError, msg=source):
+                apply_filters(results, match=source)
+
+unittest.main()
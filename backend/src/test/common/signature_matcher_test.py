@@ -0,0 +1,52 @@
+# signature_matcher_test.py
+
+import unittest
+from src.modules.common.signature_matcher import SignatureMatcher, build_signature_matcher, DEFAULT_SIGNATURES
+from src.modules.fuzzer.fuzzer_manager import MockResponse
+from src.modules.fuzzer.fuzzer_response_processor import FuzzerResponseProcessor
+from src.modules.common.http_response import HttpResponse
+
+class TestSignatureMatcher(unittest.TestCase):
+    def test_overlapping_signatures_in_one_pass(self):
+        matcher = SignatureMatcher({"he": "he", "she": "she", "his": "his", "hers": "hers", "usher": "usher"})
+        self.assertEqual(sorted(matcher.scan(b"USHERS and that")), ["he", "hers", "she", "usher"])
+        self.assertEqual(matcher.scan(b"nothing to see"), [])
+        self.assertEqual(matcher.scan(b"this"), ["his"])
+
+    def test_signatures_split_across_chunks(self):
+        matcher = SignatureMatcher()
+        body = b"<p>Warning: " + b"x" * 100 + b" You have an error in your SQL syntax; check the manual</p>Traceback (most recent call last):"
+        for size in (1, 2, 3, 7, 64):
+            scanner = matcher.scanner()
+            for start in range(0, len(body), size):
+                scanner.feed(body[start:start + size])
+            self.assertEqual(scanner.matches, ["sql.mysql", "trace.python"], size)
+            self.assertFalse(scanner.decided)
+
+    def test_stop_on_match(self):
+        matcher = build_signature_matcher(signatures={"custom.secret": "API_KEY="}, stop_on_match=True)
+        self.assertGreater(len(matcher.signatures), len(DEFAULT_SIGNATURES))
+        scanner = matcher.scanner()
+        self.assertFalse(scanner.feed(b"config: api_k"))
+        self.assertTrue(scanner.feed(b"ey=123 and ORA-01756"))
+        self.assertTrue(scanner.feed(b"ORA-00933"))
+        self.assertEqual(scanner.matches, ["custom.secret"])
+        self.assertIsNone(build_signature_matcher(use_defaults=False))
+        with self.assertRaises(ValueError):
+            SignatureMatcher({"short": "x"})
+
+    def test_processor_flags_rows(self):
+        processor = FuzzerResponseProcessor()
+        processor.set_filters(status_filter=[200, 500])
+        processor.set_signature_matcher(SignatureMatcher())
+        streamed = HttpResponse("http://t", 500, b"boom", signatures=["sql.pdo"])
+        response = MockResponse("http://t", 500, None, response=streamed)
+        processor.process_response(response)
+        unscanned = MockResponse("http://t", 200, None, response=HttpResponse("http://t", 200, b"<b>Warning</b>: <script>x</script>"))
+        unscanned.payload = "<script>x</script>"
+        processor.process_response(unscanned)
+        results = processor.get_filtered_results()
+        self.assertEqual(results[0]["signatures"], ["sql.pdo"])
+        self.assertEqual(results[1]["signatures"], ["trace.php_warning", "reflected"])
+
+unittest.main()
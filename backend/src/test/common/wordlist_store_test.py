@@ -0,0 +1,75 @@
+# wordlist_store_test.py
+
+import os
+import tempfile
+import unittest
+from src.modules.common.wordlist_store import WordlistStore, read_upload
+
+async def stream(body, size):
+    for start in range(0, len(body), size):
+        yield body[start:start + size]
+
+class TestWordlistStore(unittest.IsolatedAsyncioTestCase):
+    BODY = b"# directory wordlist\nadmin\r\n/Login\n\n  backup/ \nadmin\nimages\n/login\nLOGIN"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = WordlistStore(self.directory.name)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def save(self, body, size=3, **options):
+        writer = self.store.writer("common.txt", **options)
+        for start in range(0, len(body), size):
+            writer.feed(body[start:start + size])
+        return writer.finish()
+
+    def test_normalizes_and_deduplicates(self):
+        meta = self.save(self.BODY, lowercase=True)
+        self.assertEqual((meta["entries"], meta["duplicates"], meta["skipped"]), (4, 3, 2))
+        self.assertEqual(meta["directory_words"], 1)
+        words = self.store.acquire(meta["id"])
+        self.assertEqual([words[i] for i in range(len(words))], ["admin", "login", "backup/", "images"])
+        # Opened from the index saved with the upload
+        self.assertIsNotNone(words._index_map)
+        self.store.release(meta["id"])
+        # The same words in any chunking are stored once
+        self.assertEqual(self.save(self.BODY, size=1000, lowercase=True)["id"], meta["id"])
+        self.assertNotEqual(self.save(self.BODY)["id"], meta["id"])
+        self.assertEqual(len(self.store.list()), 2)
+        with self.assertRaises(ValueError):
+            self.save(b"\n# only a comment\n")
+
+    def test_jobs_share_an_open_wordlist(self):
+        meta = self.save(b"\n".join(b"word%d" % i for i in range(1000)))
+        first, second = self.store.acquire(meta["id"]), self.store.acquire(meta["id"])
+        self.assertIs(first, second)
+        self.assertEqual(second[999], "word999")
+        self.store.release(meta["id"])
+        with self.assertRaises(ValueError):
+            self.store.delete(meta["id"])
+        self.store.release(meta["id"])
+        self.assertTrue(self.store.delete(meta["id"]))
+        # The words, metadata and line index are all removed
+        self.assertEqual(os.listdir(self.directory.name), [])
+        self.assertIsNone(self.store.get(meta["id"]))
+        with self.assertRaises(KeyError):
+            self.store.acquire(meta["id"])
+        self.assertFalse(self.store.delete("../../etc/passwd"))
+
+    async def test_streams_multipart_uploads(self):
+        body = (b"--XyZ\r\nContent-Disposition: form-data; name=\"note\"\r\n\r\nignored\r\n"
+                b"--XyZ\r\nContent-Disposition: form-data; name=\"file\"; filename=\"raft.txt\"\r\n"
+                b"Content-Type: text/plain\r\n\r\n" + self.BODY + b"\r\n--XyZ--\r\n")
+        chunks = []
+        filename = await read_upload(stream(body, 7), "multipart/form-data; boundary=XyZ", chunks.append)
+        self.assertEqual(filename, "raft.txt")
+        self.assertEqual(b"".join(chunks), self.BODY)
+        chunks = []
+        self.assertIsNone(await read_upload(stream(self.BODY, 5), "text/plain", chunks.append))
+        self.assertEqual(b"".join(chunks), self.BODY)
+        with self.assertRaises(ValueError):
+            await read_upload(stream(b"--XyZ--\r\n", 4), "multipart/form-data; boundary=XyZ", chunks.append)
+
+unittest.main()
@@ -0,0 +1,61 @@
+# bench_dbf_probe.py
+#
+# Compares the body bytes read and the time of DirectoryBruteForceManager scans in GET, HEAD and range
+# probe modes against a local site with large pages: 200 KB for the few paths that exist and a 50 KB
+# custom 404 page for the rest (served by werkzeug's threaded server in a separate process). The site
+# ignores Range headers like most dynamic pages, so the range run relies on the client closing the
+# connection after the first bytes. Run from backend/:
+#     PYTHONPATH=. python src/test/dbf/bench_dbf_probe.py [words]
+
+import sys
+import time
+import asyncio
+import multiprocessing
+from flask import Flask
+from werkzeug.serving import make_server
+from src.modules.dbf.dbf_manager import DirectoryBruteForceManager
+from src.modules.dbf.httpmock import AsyncHttpClient
+
+PORT = 5003
+FOUND = {"admin", "images", "login", "backup"}
+
+app = Flask(__name__)
+
+@app.route("/", defaults={"path": ""})
+@app.route("/<path:path>")
+def page(path):
+    if not path or path in FOUND:
+        return "<p>content</p>\n" * 13000
+    return "<p>this page does not exist</p>\n" * 1600, 404
+
+def serve_website():
+    make_server("127.0.0.1", PORT, app, threaded=True).serve_forever()
+
+async def scan(wordlist, probe):
+    client = AsyncHttpClient(connection_limit=10)
+    manager = DirectoryBruteForceManager(http_client=client)
+    manager.configure_scan(f"http://127.0.0.1:{PORT}", wordlist, show_only_status=[200], concurrency=10, probe=probe)
+    started = time.perf_counter()
+    try:
+        await manager.start_scan()
+    finally:
+        await client.close()
+    elapsed = time.perf_counter() - started
+    return manager.get_metrics()["bytes_received"], elapsed, manager.get_filtered_count()
+
+async def main(words):
+    wordlist = sorted(FOUND) + [f"missing{i}" for i in range(words - len(FOUND))]
+    server = multiprocessing.Process(target=serve_website, daemon=True)
+    server.start()
+    # Give the server time to bind
+    time.sleep(1)
+    try:
+        for probe in ("get", "head", "range"):
+            received, elapsed, found = await scan(wordlist, probe)
+            print(f"{probe:<6} {received / 1e6:9.2f} MB of bodies read, {received / words / 1e3:7.1f} KB/word, {elapsed:6.2f} s, {found} found")
+    finally:
+        server.terminate()
+
+if __name__ == "__main__":
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    asyncio.run(main(words))
@@ -0,0 +1,52 @@
+# bench_dbf_processor.py
+#
+# Measures the per-request cost of a DirectoryBruteForceManager scan as the results pile up, with an
+# in-process client answering instantly so only the manager's own bookkeeping is timed. The progress
+# callback reads the metrics on every request like the service does. The filtered count used to be
+# taken from a copy of the whole filtered list (and the ids re-checked on it), O(n) per request and
+# O(n^2) over a scan; the "copy" run shows that growth on a smaller list. Run from backend/:
+#     PYTHONPATH=. python src/test/dbf/bench_dbf_processor.py [words]
+
+import sys
+import time
+import asyncio
+from src.modules.dbf.dbf_manager import DirectoryBruteForceManager
+
+CHUNKS = 10
+
+class InstantClient:
+    """Answers every tenth word with a 200 and the rest with a 404"""
+    def __init__(self):
+        self.sent = 0
+
+    async def send(self, method, url, headers=None):
+        self.sent += 1
+        status = 200 if self.sent % 10 == 0 else 404
+        return {"url": url, "status": status, "text": "found" if status == 200 else "missing"}
+
+async def scan(words, copy):
+    manager = DirectoryBruteForceManager(http_client=InstantClient())
+    manager.configure_scan("http://127.0.0.1", [f"word{i}" for i in range(words)], show_only_status=[200], concurrency=10)
+    chunk = words // CHUNKS
+    marks = [time.perf_counter()]
+
+    def progress(processed, total, word=None, error=None):
+        if copy:
+            len(list(manager.get_filtered_results()))
+        else:
+            manager.get_metrics()
+        if processed % chunk == 0:
+            marks.append(time.perf_counter())
+    manager.progress_callback = progress
+    await manager.start_scan()
+    return [(end - start) / chunk * 1e6 for start, end in zip(marks, marks[1:])], manager.get_filtered_count()
+
+async def main(words):
+    for label, count, copy in (("counters", words, False), ("copy", words // 20, True)):
+        costs, found = await scan(count, copy)
+        print(f"{label:<9} {count:>8} words, {found} found, us/request per tenth of the scan:")
+        print("          " + " ".join(f"{cost:6.1f}" for cost in costs))
+
+if __name__ == "__main__":
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    asyncio.run(main(words))
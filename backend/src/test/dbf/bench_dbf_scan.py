@@ -0,0 +1,56 @@
+# bench_dbf_scan.py
+#
+# Measures the requests/second of DirectoryBruteForceManager scans against the local test website
+# (testing_website.py, served by werkzeug's threaded server in a separate process) for a range of
+# worker counts, plus a rate-limited run. The scan engine used to send one request at a time with a
+# 0.1 s pause after each, under 10 requests/second. Run from backend/:
+#     PYTHONPATH=. python src/test/dbf/bench_dbf_scan.py [words]
+
+import sys
+import time
+import asyncio
+import multiprocessing
+from werkzeug.serving import make_server
+from src.modules.dbf.dbf_manager import DirectoryBruteForceManager
+from src.modules.dbf.httpmock import AsyncHttpClient
+from src.test.dbf.testing_website import app
+
+PORT = 5002
+
+def serve_website():
+    make_server("127.0.0.1", PORT, app, threaded=True).serve_forever()
+
+def start_website():
+    server = multiprocessing.Process(target=serve_website, daemon=True)
+    server.start()
+    # Give the server time to bind
+    time.sleep(1)
+    return server
+
+async def scan(wordlist, concurrency, rate=None):
+    client = AsyncHttpClient(connection_limit=concurrency)
+    manager = DirectoryBruteForceManager(http_client=client)
+    manager.configure_scan(f"http://127.0.0.1:{PORT}", wordlist, show_only_status=[200], concurrency=concurrency, rate=rate)
+    started = time.perf_counter()
+    try:
+        await manager.start_scan()
+    finally:
+        await client.close()
+    elapsed = time.perf_counter() - started
+    return manager.request_count / elapsed, len(manager.get_filtered_results())
+
+async def main(words):
+    known = ["", "level1/page1", "level1/page2", "level2/page1", "level2/page2", "level2/page3"]
+    wordlist = known + [f"missing{i}" for i in range(words - len(known))]
+    server = start_website()
+    try:
+        for concurrency, rate in ((1, None), (10, None), (25, None), (50, None), (25, 200)):
+            rps, found = await scan(wordlist, concurrency, rate)
+            label = f"{concurrency} worker(s)" + (f", rate {rate}/s" if rate else "")
+            print(f"{label:<24} {rps:8.1f} requests/second, {found} found")
+    finally:
+        server.terminate()
+
+if __name__ == "__main__":
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    asyncio.run(main(words))
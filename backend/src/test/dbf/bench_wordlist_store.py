@@ -0,0 +1,48 @@
+# bench_wordlist_store.py
+#
+# Times the start of a DBF job on a large wordlist: parsing the job's JSON configuration and configuring
+# the scan, with the words inline in the request (validated by pydantic and held per job) and with the
+# ID of a wordlist uploaded once to the WordlistStore (memory-mapped and shared by the jobs). Also
+# reports the one-off upload time. Run from backend/:
+#     PYTHONPATH=. python src/test/dbf/bench_wordlist_store.py [words]
+
+import sys
+import json
+import time
+import tempfile
+from src.modules.common.wordlist_store import WordlistStore
+from src.modules.dbf.dbf_manager import DirectoryBruteForceManager
+from src.modules.dbf.services.dbf_service import DBFConfig
+
+CHUNK_SIZE = 64 * 1024
+
+def start_job(body, store=None):
+    started = time.perf_counter()
+    config = DBFConfig.model_validate_json(body)
+    wordlist = store.acquire(config.wordlist_id) if config.wordlist_id else config.wordlist
+    DirectoryBruteForceManager().configure_scan(config.target_url, wordlist)
+    elapsed = time.perf_counter() - started
+    if config.wordlist_id:
+        store.release(config.wordlist_id)
+    return elapsed
+
+def main(words):
+    wordlist = [f"path-{i:07d}" for i in range(words)]
+    inline = json.dumps({"target_url": "http://127.0.0.1", "wordlist": wordlist})
+    print(f"inline wordlist   {start_job(inline) * 1e3:10.1f} ms to start a job ({len(inline) / 1e6:.1f} MB request)")
+
+    with tempfile.TemporaryDirectory() as root:
+        store = WordlistStore(root)
+        data = "\n".join(wordlist).encode()
+        started = time.perf_counter()
+        writer = store.writer("bench.txt")
+        for start in range(0, len(data), CHUNK_SIZE):
+            writer.feed(data[start:start + CHUNK_SIZE])
+        meta = writer.finish()
+        print(f"upload (once)     {(time.perf_counter() - started) * 1e3:10.1f} ms for {meta['entries']} words")
+        by_id = json.dumps({"target_url": "http://127.0.0.1", "wordlist_id": meta["id"]})
+        print(f"wordlist_id       {start_job(by_id, store) * 1e3:10.1f} ms to start a job ({len(by_id)} byte request)")
+
+if __name__ == "__main__":
+    words = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    main(words)
@@ -0,0 +1,354 @@
+# dbf_manager_test.py
+
+import os
+import time
+import asyncio
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from src.modules.dbf.dbf_manager import DirectoryBruteForceManager
+
+class TestDirectoryBruteForceManager(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+        async def send(method, url, headers=None):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.02)
+            self.in_flight -= 1
+            status = 200 if url.endswith("/admin") else 404
+            return {"url": url, "status": status, "text": "found" if status == 200 else "missing"}
+        self.http_client = MagicMock()
+        self.http_client.send = AsyncMock(side_effect=send)
+        self.manager = DirectoryBruteForceManager(http_client=self.http_client)
+        self.wordlist = [f"word{i}" for i in range(39)] + ["admin"]
+
+    async def test_workers_scan_concurrently(self):
+        rows, progress = [], []
+        self.manager.on_new_row = rows.append
+        self.manager.progress_callback = lambda processed, total, word, error: progress.append((processed, total))
+        self.manager.configure_scan("http://test.com/", self.wordlist, top_dir="/files/", concurrency=8)
+        started = time.perf_counter()
+        await self.manager.start_scan()
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(self.max_in_flight, 8)
+        self.assertEqual(self.manager.request_count, 40)
+        self.assertEqual(sorted(row["id"] for row in rows), list(range(1, 41)))
+        self.assertEqual(progress[-1], (40, 40))
+        results = self.manager.get_filtered_results()
+        self.assertEqual([result["url"] for result in results], ["http://test.com/files/admin"])
+
+    async def test_attempt_limit_and_rate(self):
+        self.manager.configure_scan("http://test.com", self.wordlist, attempt_limit=10, concurrency=4, rate=100)
+        started = time.perf_counter()
+        await self.manager.start_scan()
+        self.assertEqual(self.manager.request_count, 10)
+        sent = [call.kwargs["url"] for call in self.http_client.send.call_args_list]
+        self.assertEqual(sorted(sent), sorted(f"http://test.com/word{i}" for i in range(10)))
+        # Ten slots 10 ms apart
+        self.assertGreaterEqual(time.perf_counter() - started, 0.09)
+        with self.assertRaises(ValueError):
+            self.manager.configure_scan("http://test.com", self.wordlist, concurrency=0)
+        with self.assertRaises(ValueError):
+            self.manager.configure_scan("http://test.com", self.wordlist, rate=0)
+
+    async def test_pause_resume_and_stop(self):
+        self.manager.configure_scan("http://test.com", self.wordlist, concurrency=2)
+
+        def progress(processed, total, word, error):
+            if processed == 4:
+                self.manager.pause()
+                asyncio.get_running_loop().call_later(0.1, self.manager.resume)
+            if processed == 10:
+                self.manager.stop()
+        self.manager.progress_callback = progress
+        self.manager._wait_pause = lambda interval=0.5: asyncio.sleep(0.01)
+        started = time.perf_counter()
+        await self.manager.start_scan()
+        self.assertGreaterEqual(time.perf_counter() - started, 0.1)
+        # The request in flight on the other worker completes after the stop
+        self.assertIn(self.manager.request_count, (10, 11))
+        self.assertIsNotNone(self.manager.end_time)
+
+    async def test_resume_skips_completed_words(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            self.manager.configure_scan("http://test.com", self.wordlist, concurrency=3)
+            self.manager.enable_checkpoints(path)
+            self.manager.progress_callback = lambda processed, total, word, error: processed == 12 and self.manager.stop()
+            await self.manager.start_scan()
+            state = self.manager.checkpoint.state()
+
+            resumed = DirectoryBruteForceManager(http_client=self.http_client)
+            resumed.configure_scan("http://test.com", self.wordlist, concurrency=3)
+            resumed.enable_checkpoints(path, resume_state=state)
+            await resumed.start_scan()
+        self.assertEqual(self.manager.request_count + resumed.request_count, 40)
+        sent = [call.kwargs["url"] for call in self.http_client.send.call_args_list]
+        self.assertEqual(sorted(sent), sorted(f"http://test.com/{word}" for word in self.wordlist))
+
+class TestRecursiveScan(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Redirected to its trailing slash, forbidden directory, plain page
+        self.site = {
+            "/admin": ("/admin/", 200),
+            "/admin/backup/": (None, 403),
+            "/admin/config": (None, 200),
+            "/admin/backup/config": (None, 200),
+            "/old/": (None, 403),
+            "/static": (None, 301, "/static/"),
+        }
+
+        async def send(method, url, headers=None):
+            path = url[len("http://test.com"):]
+            final, status, *location = self.site.get(path, (None, 404))
+            return {
+                "url": f"http://test.com{final}" if final else url,
+                "status": status,
+                "text": "page",
+                "headers": {"Location": location[0]} if location else {}
+            }
+        self.http_client = MagicMock()
+        self.http_client.send = AsyncMock(side_effect=send)
+        self.manager = DirectoryBruteForceManager(http_client=self.http_client)
+        self.wordlist = ["admin", "backup/", "config", "old", "old/", "static"]
+
+    async def test_descends_into_found_directories(self):
+        progress = []
+        self.manager.progress_callback = lambda processed, total, word, error: progress.append(total)
+        self.manager.configure_scan("http://test.com", self.wordlist, show_only_status=[200, 403], concurrency=1, recursive=True, max_depth=2)
+        await self.manager.start_scan()
+        self.assertEqual([directory["path"] for directory in self.manager.directories], ["", "admin", "static", "admin/backup"])
+        self.assertEqual(self.manager.request_count, 24)
+        self.assertEqual(progress[-1], 24)
+        # old/ exists but old is dead: no descent
+        self.assertTrue(self.manager.dead_paths.covers("old/x"))
+        # Nothing can be queued below max_depth, its dead paths are not kept
+        self.assertTrue(self.manager.dead_paths.covers("admin/old"))
+        self.assertFalse(self.manager.dead_paths.covers("admin/backup/old"))
+        self.assertEqual(self.manager.get_metrics()["pruned_directories"], 1)
+        tree = self.manager.get_tree()
+        admin = next(child for child in tree["children"] if child["name"] == "admin")
+        self.assertTrue(admin["directory"])
+        self.assertEqual([child["name"] for child in admin["children"]], ["backup", "config"])
+        self.assertEqual(admin["children"][0]["children"][0]["path"], "/admin/backup/config")
+
+    async def test_resume_with_attempt_limit(self):
+        # The words past the attempt limit are never sent in any directory
+        wordlist = self.wordlist + [f"unused{i}" for i in range(20)]
+        options = dict(show_only_status=[200, 403], concurrency=1, recursive=True, max_depth=2, attempt_limit=len(self.wordlist))
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            self.manager.configure_scan("http://test.com", wordlist, **options)
+            self.manager.enable_checkpoints(path)
+            self.manager.progress_callback = lambda processed, total, word, error: processed == 15 and self.manager.stop()
+            await self.manager.start_scan()
+            state = self.manager.checkpoint.state()
+            # Items are numbered without gaps, the watermark follows every item done
+            self.assertEqual((state["watermark"], state["completed"]), (15, []))
+
+            resumed = DirectoryBruteForceManager(http_client=self.http_client)
+            resumed.configure_scan("http://test.com", wordlist, **options)
+            resumed.enable_checkpoints(path, resume_state=state)
+            await resumed.start_scan()
+            self.assertEqual((resumed.checkpoint.watermark, resumed.checkpoint.completed), (24, set()))
+        self.assertEqual(self.manager.request_count + resumed.request_count, 24)
+        sent = [call.kwargs["url"] for call in self.http_client.send.call_args_list]
+        self.assertEqual(len(sent), len(set(sent)))
+
+    async def test_flat_scans_keep_no_dead_paths(self):
+        self.manager.configure_scan("http://test.com", self.wordlist, show_only_status=[200, 403], concurrency=1)
+        await self.manager.start_scan()
+        self.assertEqual(len(self.manager.dead_paths), 0)
+
+    async def test_depth_and_budget_limits(self):
+        self.manager.configure_scan("http://test.com", self.wordlist, concurrency=4, recursive=True, max_depth=1, depth_budget=1)
+        await self.manager.start_scan()
+        self.assertEqual(len(self.manager.directories), 2)
+        self.assertEqual(self.manager.request_count, 12)
+        with self.assertRaises(ValueError):
+            self.manager.configure_scan("http://test.com", self.wordlist, recursive=True, max_depth=0)
+
+class TestWordExpansion(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.found = {"/index", "/index.php", "/index.php.bak", "/admin/"}
+
+        async def send(method, url, headers=None):
+            path = url[len("http://test.com"):]
+            return {"url": url, "status": 200 if path in self.found else 404, "text": "page"}
+        self.http_client = MagicMock()
+        self.http_client.send = AsyncMock(side_effect=send)
+        self.manager = DirectoryBruteForceManager(http_client=self.http_client)
+        self.wordlist = ["index", "login", "admin/", "config"]
+
+    def sent(self):
+        return sorted(call.kwargs["url"][len("http://test.com/"):] for call in self.http_client.send.call_args_list)
+
+    async def test_expands_every_word(self):
+        self.manager.configure_scan("http://test.com", self.wordlist, extensions=["php", ".txt"], suffixes=[".bak"], concurrency=3)
+        # admin/ is only requested bare, which is known once the words have been generated
+        self.assertEqual(self.manager.get_total_requests(), 4 * 6)
+        await self.manager.start_scan()
+        self.assertEqual(self.manager.get_total_requests(), 3 * 6 + 1)
+        self.assertEqual(self.manager.request_count, 19)
+        self.assertIn("config.txt.bak", self.sent())
+        self.assertNotIn("admin/.php", self.sent())
+        self.assertEqual(sorted(result["payload"] for result in self.manager.get_filtered_results()), ["admin/", "index", "index.php", "index.php.bak"])
+
+    def test_known_directory_words_give_the_total_up_front(self):
+        self.manager.configure_scan("http://test.com", self.wordlist, extensions=["php"], directory_words=1)
+        self.assertEqual(self.manager.get_total_requests(), 3 * 2 + 1)
+        # The count covers the whole wordlist, not a part of it
+        self.manager.configure_scan("http://test.com", self.wordlist, extensions=["php"], start_index=1, directory_words=1)
+        self.assertEqual(self.manager.get_total_requests(), 3 * 2)
+
+    async def test_extensions_on_hit_only_expand_found_words(self):
+        progress = []
+        self.manager.progress_callback = lambda processed, total, word, error: progress.append((processed, total))
+        self.manager.configure_scan("http://test.com", self.wordlist, extensions=["php", "txt"], suffixes=[".bak"], extensions_on_hit=True, concurrency=2)
+        self.assertEqual(self.manager.get_total_requests(), 4)
+        await self.manager.start_scan()
+        self.assertEqual(self.sent(), sorted(["index", "login", "admin/", "config", "index.php", "index.txt", "index.bak", "index.php.bak", "index.txt.bak"]))
+        self.assertEqual(progress[-1], (9, 9))
+        self.assertEqual(self.manager.get_metrics()["expanded_words"], 1)
+
+    async def test_resume_sends_the_variants_still_owed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            self.manager.configure_scan("http://test.com", self.wordlist, extensions=["php"], extensions_on_hit=True, concurrency=1)
+            self.manager.enable_checkpoints(path)
+            # Stop right after the bare words, before the variant of index is sent
+            self.manager.progress_callback = lambda processed, total, word, error: word == "index" and self.manager.stop()
+            await self.manager.start_scan()
+            state = self.manager.checkpoint.state()
+
+            resumed = DirectoryBruteForceManager(http_client=self.http_client)
+            resumed.configure_scan("http://test.com", self.wordlist, extensions=["php"], extensions_on_hit=True, concurrency=1)
+            resumed.enable_checkpoints(path, resume_state=state)
+            await resumed.start_scan()
+            self.assertEqual(resumed.checkpoint.watermark, 8)
+        self.assertEqual(self.sent(), sorted(self.wordlist + ["index.php"]))
+
+    async def test_resume_with_extensions_from_a_start_index(self):
+        wordlist = [f"skipped{i}" for i in range(10)] + self.wordlist
+        options = dict(extensions=["php", "bak"], start_index=10, concurrency=1)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "scan.json")
+            self.manager.configure_scan("http://test.com", wordlist, **options)
+            self.manager.enable_checkpoints(path)
+            self.manager.progress_callback = lambda processed, total, word, error: processed == 5 and self.manager.stop()
+            await self.manager.start_scan()
+            state = self.manager.checkpoint.state()
+            self.assertEqual((state["watermark"], state["completed"]), (30 + 5, []))
+
+            resumed = DirectoryBruteForceManager(http_client=self.http_client)
+            resumed.configure_scan("http://test.com", wordlist, **options)
+            resumed.enable_checkpoints(path, resume_state=state)
+            await resumed.start_scan()
+            self.assertEqual((resumed.checkpoint.watermark, resumed.checkpoint.completed), (42, set()))
+        self.assertEqual(self.manager.request_count + resumed.request_count, 3 * 3 + 1)
+        self.assertEqual(len(self.sent()), len(set(self.sent())))
+
+class TestWildcardCalibration(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        async def send(method, url, headers=None):
+            path = url[len("http://test.com"):]
+            if path == "/admin":
+                return {"url": url + "/", "status": 200, "text": "<h1>Admin console</h1>\n<form>login</form>"}
+            if path.startswith("/admin/"):
+                if path == "/admin/users":
+                    return {"url": url, "status": 200, "text": "user list"}
+                return {"url": url, "status": 404, "text": "not found"}
+            if path.startswith("/app/"):
+                # Unknown paths redirect to the login page
+                return {"url": url, "status": 302, "text": "", "headers": {"Location": "/app/login"}}
+            # Soft 404: every other path answers 200 with a page echoing it
+            return {"url": url, "status": 200, "text": f"<p>Sorry, {path} was not found</p>"}
+        self.http_client = MagicMock()
+        self.http_client.send = AsyncMock(side_effect=send)
+        self.manager = DirectoryBruteForceManager(http_client=self.http_client)
+
+    async def test_suppresses_soft_404s_per_directory(self):
+        rows = []
+        self.manager.on_new_row = rows.append
+        wordlist = ["admin", "users", "backup", "index", "secret", "config"]
+        self.manager.configure_scan("http://test.com", wordlist, concurrency=2, recursive=True, max_depth=1, auto_calibrate=True)
+        await self.manager.start_scan()
+        self.assertEqual(self.manager.calibration_requests, 6)
+        self.assertEqual([row["url"] for row in rows if row["depth"] == 0], ["http://test.com/admin"])
+        self.assertEqual(len(rows), 7)
+        self.assertEqual([result["url"] for result in self.manager.get_filtered_results()], ["http://test.com/admin/", "http://test.com/admin/users"])
+        self.assertEqual([directory["path"] for directory in self.manager.directories], ["", "admin"])
+        metrics = self.manager.get_metrics()
+        self.assertEqual(metrics["suppressed"], 5)
+        self.assertEqual(metrics["wildcard_directories"], ["/"])
+        self.assertEqual(metrics["suppressed_by_directory"], {"/": 5})
+        self.assertEqual(self.manager.get_request_stats()["suppressed"], 5)
+        # Suppressed responses are not counted
+        self.assertEqual(self.manager.response_processor.counts()["total"], 7)
+
+    async def test_suppresses_calibrated_redirects(self):
+        self.manager.configure_scan("http://test.com", ["a", "b"], top_dir="app", show_only_status=[302], auto_calibrate=True, calibration_samples=2)
+        await self.manager.start_scan()
+        self.assertEqual(self.manager.get_filtered_results(), [])
+        self.assertEqual(self.manager.get_metrics()["suppressed"], 2)
+
+class TestProbing(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.head_status = None
+
+        async def send(method, url, headers=None):
+            found = url in ("http://test.com/", "http://test.com/admin")
+            if method == "HEAD" and self.head_status is not None:
+                return {"url": url, "status": self.head_status, "text": "", "headers": {}}
+            page = "<p>admin</p>" * 1000 if found else "<p>not found</p>" * 100
+            size = {"Content-Length": str(len(page))}
+            if method == "HEAD":
+                return {"url": url, "status": 200 if found else 404, "text": "", "headers": size}
+            if headers and "Range" in headers:
+                return {"url": url, "status": 206 if found else 404, "text": page[:16],
+                        "headers": {"Content-Range": f"bytes 0-15/{len(page)}"} if found else size}
+            return {"url": url, "status": 200 if found else 404, "text": page, "headers": size}
+        self.http_client = MagicMock()
+        self.http_client.send = AsyncMock(side_effect=send)
+        self.manager = DirectoryBruteForceManager(http_client=self.http_client)
+        self.wordlist = [f"word{i}" for i in range(9)] + ["admin"]
+
+    def sent(self):
+        return [(call.kwargs["method"], (call.kwargs["headers"] or {}).get("Range")) for call in self.http_client.send.call_args_list]
+
+    async def test_head_probe_confirms_hits_with_get(self):
+        rows = []
+        self.manager.on_new_row = rows.append
+        self.manager.configure_scan("http://test.com", self.wordlist, probe="head")
+        await self.manager.start_scan()
+        # Two HEAD/GET calibration pairs, ten probes and one confirmation
+        self.assertEqual(self.sent().count(("HEAD", None)), 12)
+        self.assertEqual(self.sent().count(("GET", None)), 3)
+        self.assertEqual([result["url"] for result in self.manager.get_filtered_results()], ["http://test.com/admin"])
+        # The misses report the size their HEAD announced
+        self.assertEqual({row["length"] for row in rows if row["status"] == 404}, {1600})
+        metrics = self.manager.get_metrics()
+        self.assertEqual((metrics["probe"], metrics["probe_requests"], metrics["confirm_requests"]), ("head", 10, 1))
+
+    async def test_range_probe(self):
+        self.manager.configure_scan("http://test.com", self.wordlist, probe="range", probe_bytes=16)
+        await self.manager.start_scan()
+        self.assertEqual(self.sent().count(("GET", "bytes=0-15")), 12)
+        self.assertEqual(self.sent().count(("GET", None)), 3)
+        self.assertEqual(self.manager.get_filtered_results()[0]["length"], 12000)
+        with self.assertRaises(ValueError):
+            self.manager.configure_scan("http://test.com", self.wordlist, probe="options")
+
+    async def test_falls_back_to_get_when_head_is_mishandled(self):
+        self.head_status = 405
+        self.manager.configure_scan("http://test.com", self.wordlist, probe="head")
+        await self.manager.start_scan()
+        self.assertEqual(self.sent().count(("HEAD", None)), 1)
+        self.assertEqual(self.sent().count(("GET", None)), 11)
+        self.assertEqual(self.manager.get_metrics()["probe"], "get")
+        self.assertEqual(len(self.manager.get_filtered_results()), 1)
+
+unittest.main()
@@ -0,0 +1,49 @@
+# dbf_response_processor_test.py
+
+import unittest
+from types import SimpleNamespace
+from src.modules.dbf.dbf_response_processor import ResponseProcessor
+
+def response(payload, status):
+    return SimpleNamespace(url=f"http://test.com/{payload}", status_code=status, payload=payload, text="x" * status, error=None)
+
+class TestResponseProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = ResponseProcessor()
+        self.processor.set_filters([200, 403])
+        for i, status in enumerate([200, 404, 403, 404, 200, 500]):
+            self.processor.process_response(response(f"word{i}", status))
+
+    def test_incremental_counts(self):
+        self.assertEqual(self.processor.counts(), {"total": 6, "filtered": 3, "status": {200: 2, 404: 2, 403: 1, 500: 1}})
+        self.assertEqual([result["id"] for result in self.processor.get_filtered_results()], [1, 2, 3])
+        # Only the results added since the last fetch
+        self.processor.process_response(response("word6", 200))
+        self.assertEqual([result["payload"] for result in self.processor.get_filtered_results(3)], ["word6"])
+        self.assertEqual(self.processor.filtered_count(), 4)
+
+    def test_results_are_returned_as_a_copy(self):
+        fetched = self.processor.get_filtered_results()
+        fetched.clear()
+        self.assertEqual(self.processor.filtered_count(), 3)
+        self.assertEqual(len(self.processor.get_filtered_results()), 3)
+
+    def test_refilter_narrows_and_renumbers(self):
+        fetched = self.processor.get_filtered_results()
+        self.processor.set_filters([200])
+        self.assertEqual(len(fetched), 3)
+        # The responses filtered out are counted but not kept
+        self.assertEqual(self.processor.counts(), {"total": 6, "filtered": 2, "status": {200: 2, 404: 2, 403: 1, 500: 1}})
+        self.assertEqual([(result["id"], result["payload"]) for result in self.processor.get_filtered_results()], [(1, "word0"), (2, "word4")])
+        self.processor.set_filters([200, 403])
+        self.assertEqual(self.processor.filtered_count(), 2)
+
+    def test_load_replaces_results_and_counts(self):
+        stored = [{"id": 7, "status": 403, "url": "a"}, {"id": 9, "status": 200, "url": "b"}, {"id": 9, "status": 404, "url": "c"}]
+        self.processor.load(stored)
+        self.assertEqual(self.processor.counts(), {"total": 3, "filtered": 2, "status": {403: 1, 200: 1, 404: 1}})
+        self.assertEqual([result["id"] for result in self.processor.get_filtered_results()], [1, 2])
+        self.processor.process_response(response("word7", 200))
+        self.assertEqual([result["id"] for result in self.processor.get_filtered_results()], [1, 2, 3])
+
+unittest.main()
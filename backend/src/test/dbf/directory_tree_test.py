@@ -0,0 +1,34 @@
+# directory_tree_test.py
+
+import unittest
+from src.modules.dbf.directory_tree import PathTrie, build_tree
+
+class TestPathTrie(unittest.TestCase):
+    def test_covers_paths_below_added_prefixes(self):
+        trie = PathTrie()
+        trie.add("/old/archive")
+        self.assertTrue(trie.covers("old/archive/2019/"))
+        self.assertFalse(trie.covers("old"))
+        trie.add("old/")
+        trie.add("old/other")
+        self.assertTrue(trie.covers("/old/x"))
+        self.assertFalse(trie.covers("older"))
+        self.assertEqual(len(trie), 1)
+
+class TestBuildTree(unittest.TestCase):
+    def test_nests_results_under_the_target(self):
+        results = [
+            {"url": "http://test.com/app/admin/", "status": 200},
+            {"url": "http://test.com/app/admin/login.php", "status": 200},
+            {"url": "http://test.com/app/robots.txt", "status": 200},
+        ]
+        tree = build_tree("http://test.com/app", results, ["admin/uploads"])
+        self.assertEqual([child["name"] for child in tree["children"]], ["admin", "robots.txt"])
+        admin, robots = tree["children"]
+        self.assertEqual((admin["status"], admin["directory"]), (200, True))
+        self.assertFalse(robots["directory"])
+        self.assertEqual([child["path"] for child in admin["children"]], ["/admin/login.php", "/admin/uploads"])
+        self.assertTrue(admin["children"][1]["directory"])
+        self.assertIsNone(admin["children"][1]["status"])
+
+unittest.main()
@@ -0,0 +1,49 @@
+# httpmock_test.py
+
+import unittest
+from aiohttp import web
+from src.modules.dbf.httpmock import AsyncHttpClient
+
+class TestAsyncHttpClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        async def handler(request):
+            return web.Response(text="<p>content</p>\n" * 100000)
+
+        app = web.Application()
+        app.router.add_get("/{path:.*}", handler)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        self.url = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        self.client = AsyncHttpClient(connection_limit=1)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.runner.cleanup()
+
+    async def test_session_is_reused(self):
+        connect_times = []
+        for word in ("admin", "login", "backup"):
+            result = await self.client.send(method="GET", url=f"{self.url}/{word}")
+            self.assertEqual(result["status"], 200)
+            connect_times.append(result.timing.connect)
+        session = self.client._session
+        self.assertEqual(len(session.connector._conns), 1)
+        # Only the first word opened a connection
+        self.assertIsNotNone(connect_times[0])
+        self.assertEqual(connect_times[1:], [None, None])
+        await self.client.close()
+        self.assertTrue(session.closed)
+
+    async def test_range_cut_only_drops_its_connection(self):
+        ranged = await self.client.send(method="GET", url=f"{self.url}/admin", headers={"Range": "bytes=0-99"})
+        self.assertEqual(len(ranged["text"]), 100)
+        self.assertTrue(ranged.truncated)
+        session = self.client._session
+        result = await self.client.send(method="GET", url=f"{self.url}/login")
+        self.assertEqual(result["status"], 200)
+        self.assertIs(self.client._session, session)
+        self.assertFalse(result.truncated)
+
+unittest.main()
@@ -31,7 +31,10 @@ async def run_directory_brute_force_test():
     )
 
     # Start scanning
-    await manager.start_scan()
+    try:
+        await manager.start_scan()
+    finally:
+        await client.close()
 
     # Results
     print("\n--- Filtered Results ---")
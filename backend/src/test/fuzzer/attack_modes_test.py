@@ -0,0 +1,96 @@
+# attack_modes_test.py
+
+import unittest
+from src.modules.fuzzer.attack_modes import AttackPlan
+from src.modules.fuzzer.payload_source import ListPayloadSource, RangePayloadSource, GeneratorPayloadSource
+
+class TestAttackPlan(unittest.TestCase):
+    def setUp(self):
+        self.users = ListPayloadSource(["admin", "root"])
+        self.passwords = ListPayloadSource(["123", "abc", "pw"])
+
+    def items(self, plan, start=0, stop=None):
+        return [item for _, item in plan.iter_range(start, stop)]
+
+    def test_sniper_is_payload_major(self):
+        plan = AttackPlan("sniper", ["user", "pass"], {"user": self.users, "pass": self.users})
+        self.assertEqual(plan.count(), 4)
+        self.assertEqual(self.items(plan), [
+            {"user": "admin"}, {"pass": "admin"}, {"user": "root"}, {"pass": "root"}
+        ])
+        self.assertEqual(self.items(plan, 1, 3), [{"pass": "admin"}, {"user": "root"}])
+
+    def test_sniper_streams_its_source(self):
+        consumed = []
+
+        def payloads():
+            for i in range(1000):
+                consumed.append(i)
+                yield f"payload{i}"
+
+        # A single generator that cannot be restarted, like a payload stream
+        stream = payloads()
+        source = GeneratorPayloadSource(lambda: stream)
+        plan = AttackPlan("sniper", ["user", "pass"], {"user": source, "pass": source})
+        self.assertEqual(next(plan.iter_range(0)), (0, {"user": "payload0"}))
+        self.assertEqual(consumed, [0])
+
+    def test_battering_ram(self):
+        plan = AttackPlan("battering_ram", ["user", "pass"], {"user": self.users, "pass": self.users})
+        self.assertEqual(plan.count(), 2)
+        self.assertEqual(plan.get(1), {"user": "root", "pass": "root"})
+
+    def test_pitchfork_stops_at_shortest_source(self):
+        plan = AttackPlan("pitchfork", ["user", "pass"], {"user": self.users, "pass": self.passwords})
+        self.assertEqual(plan.count(), 2)
+        self.assertEqual(self.items(plan), [{"user": "admin", "pass": "123"}, {"user": "root", "pass": "abc"}])
+
+    def test_cluster_bomb_iteration_matches_random_access(self):
+        pins = RangePayloadSource(0, 4)
+        plan = AttackPlan("cluster_bomb", ["user", "pass", "pin"],
+                          {"user": self.users, "pass": self.passwords, "pin": pins})
+        self.assertEqual(plan.count(), 24)
+        items = self.items(plan)
+        self.assertEqual(items[0], {"user": "admin", "pass": "123", "pin": "0"})
+        self.assertEqual(items[-1], {"user": "root", "pass": "pw", "pin": "3"})
+        self.assertEqual(items, [plan.get(index) for index in range(24)])
+        self.assertEqual(self.items(plan, 13, 16), items[13:16])
+
+    def test_cluster_bomb_reads_inner_sources_by_index(self):
+        class IndexedOnly(RangePayloadSource):
+            def iter_from(self, start=0):
+                raise AssertionError("inner source enumerated")
+
+        pins = IndexedOnly(0, 10 ** 6, template="{:06d}")
+        tokens = GeneratorPayloadSource(lambda: iter(["x", "y"]))
+        plan = AttackPlan("cluster_bomb", ["user", "pin", "token"], {"user": self.users, "pin": pins, "token": tokens})
+        # Resuming in the second user's block decodes the inner position instead of skipping to it
+        start = 2 * 10 ** 6 + 2 * 999998 + 1
+        self.assertEqual(self.items(plan, start, start + 4), [
+            {"user": "root", "pin": "999998", "token": "y"},
+            {"user": "root", "pin": "999999", "token": "x"},
+            {"user": "root", "pin": "999999", "token": "y"}
+        ])
+        self.assertEqual(self.items(plan, 1, 4), [
+            {"user": "admin", "pin": "000000", "token": "y"},
+            {"user": "admin", "pin": "000001", "token": "x"},
+            {"user": "admin", "pin": "000001", "token": "y"}
+        ])
+
+    def test_shards_cover_plan_without_overlap(self):
+        plan = AttackPlan("cluster_bomb", ["user", "pass"], {"user": self.users, "pass": self.passwords})
+        shards = [plan.shard(index, 4) for index in range(4)]
+        self.assertEqual(shards[0][0], 0)
+        self.assertEqual(shards[-1][1], plan.count())
+        for (_, stop), (start, _) in zip(shards, shards[1:]):
+            self.assertEqual(stop, start)
+        indices = [index for start, stop in shards for index, _ in plan.iter_range(start, stop)]
+        self.assertEqual(indices, list(range(plan.count())))
+
+    def test_invalid_plans(self):
+        with self.assertRaises(ValueError):
+            AttackPlan("shotgun", ["user"], {"user": self.users})
+        with self.assertRaises(ValueError):
+            AttackPlan("pitchfork", ["user", "pass"], {"user": self.users})
+
+unittest.main()
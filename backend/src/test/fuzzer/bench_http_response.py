@@ -0,0 +1,95 @@
+# bench_http_response.py
+#
+# Compares requests/second of reading responses through aiohttp's response.text() against the
+# bytes-first HttpResponse, over a local server serving a mixed-encoding corpus. aiohttp releases
+# before 3.8.6 ran charset detection on bodies without a declared charset, which the "detected"
+# row reproduces with charset_normalizer (installed with aiohttp's requests dependency tree). Run from backend/:
+#     PYTHONPATH=. python src/test/fuzzer/bench_http_response.py [requests] [concurrency]
+
+import sys
+import time
+import asyncio
+import aiohttp
+import charset_normalizer
+from aiohttp import web
+from src.modules.common.body_metrics import read_body
+from src.modules.common.http_response import HttpResponse
+
+PORT = 5098
+
+def build_corpus():
+    text = "Résultats de recherche: aucun élément trouvé. Página no encontrada. 検索結果はありません。\n" * 400
+    return {
+        "/utf8-declared": (text.encode("utf-8"), "text/html; charset=utf-8"),
+        "/utf8-undeclared": (text.encode("utf-8"), "text/html"),
+        "/latin1-undeclared": (text.encode("latin-1", errors="replace"), "text/html"),
+        "/shift-jis-undeclared": (text.encode("shift_jis", errors="replace"), "text/plain"),
+        "/json": (('{"items": [' + ",".join(f'"{word}"' for word in text.split()[:2000]) + "]}").encode("utf-8"), "application/json"),
+    }
+
+async def start_server(corpus):
+    async def handler(request):
+        body, content_type = corpus[request.path]
+        return web.Response(body=body, headers={"Content-Type": content_type})
+    app = web.Application()
+    for path in corpus:
+        app.router.add_get(path, handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+    return runner
+
+async def read_with_text(response):
+    text = await response.text(errors="replace")
+    return response.status, len(text), text[:200]
+
+def detect_charset(response, body):
+    return charset_normalizer.detect(body)["encoding"] or "utf-8"
+
+async def read_bytes_first(response):
+    body, metrics = await read_body(response)
+    result = HttpResponse(str(response.url), response.status, body, dict(response.headers), metrics=metrics.as_dict())
+    return result.status, result.length, result.snippet(200)
+
+async def read_bytes_only(response):
+    # Status, byte length and snippet only: nothing beyond the first few hundred bytes is ever decoded
+    result = HttpResponse(str(response.url), response.status, await response.read(), dict(response.headers))
+    return result.status, len(result.body), result.snippet(200)
+
+async def run(reader, urls, total, concurrency, **session_options):
+    queue = asyncio.Queue()
+    for index in range(total):
+        queue.put_nowait(urls[index % len(urls)])
+    async with aiohttp.ClientSession(**session_options) as session:
+        async def worker():
+            while not queue.empty():
+                url = queue.get_nowait()
+                async with session.get(url) as response:
+                    await reader(response)
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return total / (time.perf_counter() - started)
+
+async def main(total, concurrency):
+    corpus = build_corpus()
+    runner = await start_server(corpus)
+    urls = [f"http://127.0.0.1:{PORT}{path}" for path in corpus]
+    try:
+        # Warm up connections and code paths before measuring
+        await run(read_bytes_first, urls, 50, concurrency)
+        modes = (
+            ("response.text() detected", read_with_text, {"fallback_charset_resolver": detect_charset}),
+            ("response.text() utf-8", read_with_text, {}),
+            ("bytes-first + metrics", read_bytes_first, {}),
+            ("bytes-first, no metrics", read_bytes_only, {}),
+        )
+        for name, reader, session_options in modes:
+            rps = await run(reader, urls, total, concurrency, **session_options)
+            print(f"{name:<26} {rps:8.1f} requests/second")
+    finally:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    asyncio.run(main(total, concurrency))
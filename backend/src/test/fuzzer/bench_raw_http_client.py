@@ -0,0 +1,74 @@
+# bench_raw_http_client.py
+#
+# Compares requests/second of the fuzzer's HTTP clients against a local aiohttp server: AsyncHttpClient
+# (one keep-alive aiohttp session per client, as the fuzzer sends them), a shared aiohttp session for reference,
+# and RawHttpClient with and without pipelining. Run from backend/:
+#     PYTHONPATH=. python src/test/fuzzer/bench_raw_http_client.py [requests] [concurrency]
+
+import sys
+import time
+import asyncio
+import aiohttp
+from aiohttp import web
+from src.modules.fuzzer.http_client import AsyncHttpClient
+from src.modules.fuzzer.raw_http_client import RawHttpClient
+
+PORT = 5099
+
+async def start_server():
+    body = b"<html><body>Not found</body></html>\n" * 20
+
+    async def handler(request):
+        return web.Response(body=body, content_type="text/html")
+    app = web.Application()
+    app.router.add_get("/{path:.*}", handler)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", PORT).start()
+    return runner
+
+async def run(send, total, concurrency):
+    counter = iter(range(total))
+    headers = {"User-Agent": "bench"}
+
+    async def worker():
+        for index in counter:
+            response = await send("GET", f"http://127.0.0.1:{PORT}/fuzz", headers=headers, params={"q": str(index)})
+            if response["status"] != 200:
+                raise RuntimeError(f"Unexpected response: {response['status']} {response['text']}")
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - started)
+
+async def main(total, concurrency):
+    runner = await start_server()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async def shared_session_send(method, url, headers=None, params=None):
+                async with session.request(method, url, headers=headers, params=params) as response:
+                    return {"status": response.status, "text": await response.read()}
+
+            client = AsyncHttpClient(connection_limit=concurrency)
+            raw = RawHttpClient(pool_size=concurrency)
+            pipelined = RawHttpClient(pool_size=max(1, concurrency // 8), pipeline_depth=8)
+            modes = (
+                ("AsyncHttpClient", client.send),
+                ("aiohttp shared session", shared_session_send),
+                ("RawHttpClient", raw.send),
+                ("RawHttpClient pipelined x8", pipelined.send),
+            )
+            for name, send in modes:
+                # Warm up connections and code paths before measuring
+                await run(send, 100, concurrency)
+                rps = await run(send, total, concurrency)
+                print(f"{name:<28} {rps:8.1f} requests/second")
+            await client.close()
+            await raw.close()
+            await pipelined.close()
+    finally:
+        await runner.cleanup()
+
+if __name__ == "__main__":
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    asyncio.run(main(total, concurrency))
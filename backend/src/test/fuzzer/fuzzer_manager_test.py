@@ -1,9 +1,13 @@
 # fuzzer_manager_test.py
 
+import os
+import json
 import asyncio
+import tempfile
 import unittest
 from unittest.mock import AsyncMock, MagicMock
 from src.modules.fuzzer.fuzzer_manager import FuzzerManager
+from src.modules.common.checkpoint import WorkCheckpoint
 
 class TestFuzzerManager(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
@@ -61,4 +65,234 @@ class TestFuzzerManager(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(filtered_results[0]["response"], 200)
         self.assertEqual(filtered_results[0]["url"], "http://test.com")
 
-unittest.main()
\ No newline at end of file
+    async def test_start_fuzzing_concurrent_workers(self):
+        async def slow_send(**kwargs):
+            await asyncio.sleep(0.05)
+            return {"url": "http://test.com", "status": 200, "text": kwargs["data"]["username"]}
+        self.mock_http_client.send = AsyncMock(side_effect=slow_send)
+        rows = []
+        self.fuzzer.on_new_row = rows.append
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method=self.config["http_method"],
+            body_template=self.config["body_template"],
+            parameters=self.config["parameters"],
+            payloads=[f"p{i}" for i in range(40)],
+            concurrency=20
+        )
+        await asyncio.wait_for(self.fuzzer.start_fuzzing(), timeout=1.0)
+        self.assertEqual(self.fuzzer.request_count, 40)
+        self.assertEqual(sorted(row["id"] for row in rows), list(range(1, 41)))
+        for row in rows:
+            self.assertEqual(row["payload"], f"p{row['id'] - 1}")
+        request_ids = [result["request_id"] for result in self.fuzzer.get_filtered_results()]
+        self.assertEqual(sorted(request_ids), list(range(1, 41)))
+
+    async def test_stop_halts_workers(self):
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method=self.config["http_method"],
+            parameters=self.config["parameters"],
+            payloads=[f"p{i}" for i in range(1000)],
+            concurrency=4
+        )
+        self.fuzzer.progress_callback = lambda count, total, payload=None: count >= 10 and self.fuzzer.stop()
+        await asyncio.wait_for(self.fuzzer.start_fuzzing(), timeout=1.0)
+        self.assertLess(self.fuzzer.request_count, 20)
+        self.assertIsNotNone(self.fuzzer.end_time)
+
+    async def test_cluster_bomb_shard(self):
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method="GET",
+            body_template={"user": "", "pass": "", "submit": "1"},
+            parameters=["user", "pass"],
+            payloads=["unused"],
+            attack_mode="cluster_bomb",
+            parameter_payloads={"user": ["admin", "root"], "pass": ["1", "2", "3"]}
+        )
+        self.assertEqual(self.fuzzer.get_total_requests(), 6)
+        self.fuzzer.shard(1, 2)
+        self.assertEqual(self.fuzzer.get_total_requests(), 3)
+        await self.fuzzer.start_fuzzing()
+        sent = sorted(call.kwargs["params"]["user"] + call.kwargs["params"]["pass"]
+                      for call in self.mock_http_client.send.call_args_list)
+        self.assertEqual(sent, ["root1", "root2", "root3"])
+        self.assertEqual(self.mock_http_client.send.call_args.kwargs["params"]["submit"], "1")
+
+    async def test_mutated_payloads(self):
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method="GET",
+            parameters=["q"],
+            payloads=["<x>"],
+            mutations=["identity", "url_encode", "prefix:'|base64"]
+        )
+        self.assertEqual(self.fuzzer.get_total_requests(), 3)
+        await self.fuzzer.start_fuzzing()
+        sent = sorted(call.kwargs["params"]["q"] for call in self.mock_http_client.send.call_args_list)
+        self.assertEqual(sent, ["%3Cx%3E", "<x>", "Jzx4Pg=="])
+        self.assertEqual(self.fuzzer.get_metrics()["mutation_stats"]["base64"]["applied"], 1)
+
+    async def test_auto_calibration_suppresses_baseline_and_clusters(self):
+        async def reflect(**kwargs):
+            query = kwargs["params"]["q"]
+            if query.startswith("'"):
+                return {"url": "http://test.com", "status": 500, "text": f"SQL syntax error near {query}"}
+            return {"url": "http://test.com", "status": 200, "text": f"No results for {query}"}
+        self.mock_http_client.send = AsyncMock(side_effect=reflect)
+        rows = []
+        self.fuzzer.on_new_row = rows.append
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method="GET",
+            parameters=["q"],
+            payloads=["admin", "test123", "'", "'--", "'#"],
+            auto_calibrate=True
+        )
+        await self.fuzzer.start_fuzzing()
+        self.assertEqual(self.fuzzer.request_count, 5)
+        metrics = self.fuzzer.get_metrics()
+        self.assertEqual(metrics["calibration_requests"], 3)
+        self.assertEqual(metrics["baseline_matches"], 2)
+        self.assertEqual(sorted(row["payload"] for row in rows), ["'", "'#", "'--"])
+        results = self.fuzzer.get_filtered_results()
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["cluster_size"], 3)
+        self.assertEqual(metrics["clusters"][0]["size"], 3)
+
+    async def test_json_template_fuzzing(self):
+        self.fuzzer.configure_fuzzing(
+            target_url="http://test.com/api",
+            http_method="POST",
+            headers={"User-Agent": "MockAgent"},
+            json_template={"user": {"name": "bob"}, "id": 1},
+            parameters=["/user/name"],
+            payloads=["x", "y\""]
+        )
+        await self.fuzzer.start_fuzzing()
+        calls = self.mock_http_client.send.call_args_list
+        bodies = sorted(json.loads(call.kwargs["data"])["user"]["name"] for call in calls)
+        self.assertEqual(bodies, ["x", "y\""])
+        self.assertEqual(calls[0].kwargs["headers"]["Content-Type"], "application/json")
+        self.assertIsNone(calls[0].kwargs["params"])
+
+    async def test_checkpoint_resume_skips_completed_items(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "job.json")
+            self.fuzzer.configure_fuzzing(
+                target_url=self.config["target_url"],
+                http_method="GET",
+                parameters=["q"],
+                payloads=[f"p{i}" for i in range(10)],
+                concurrency=1
+            )
+            self.fuzzer.enable_checkpoints(path, static_state={"config": {"job": 1}})
+            self.fuzzer.progress_callback = lambda count, total, payload=None: count >= 4 and self.fuzzer.stop()
+            await self.fuzzer.start_fuzzing()
+            state = WorkCheckpoint.load(path)
+            self.assertEqual(state["watermark"], 4)
+            self.assertEqual(state["config"], {"job": 1})
+            self.assertEqual(len(state["results"]), 4)
+            # The periodic state only holds the resume point, the config and results live next to it
+            with open(path) as file:
+                self.assertEqual(set(json.load(file)) & {"config", "results"}, set())
+
+            # Simulate an item completed out of order before the interruption
+            state["completed"] = [6]
+            resumed = FuzzerManager(http_client=self.mock_http_client)
+            resumed.configure_fuzzing(
+                target_url=self.config["target_url"],
+                http_method="GET",
+                parameters=["q"],
+                payloads=[f"p{i}" for i in range(10)],
+                concurrency=1
+            )
+            self.mock_http_client.send.reset_mock()
+            resumed.enable_checkpoints(path, resume_state=state)
+            await resumed.start_fuzzing()
+            sent = [call.kwargs["params"]["q"] for call in self.mock_http_client.send.call_args_list]
+            self.assertEqual(sent, ["p4", "p5", "p7", "p8", "p9"])
+            self.assertEqual(len(resumed.get_filtered_results()), 9)
+            self.assertEqual(WorkCheckpoint.load(path)["watermark"], 10)
+
+    async def test_open_loop_rate(self):
+        async def slow_send(**kwargs):
+            await asyncio.sleep(0.05)
+            return {"url": kwargs["url"], "status": 200, "text": "OK"}
+        self.mock_http_client.send = AsyncMock(side_effect=slow_send)
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method="GET",
+            parameters=["q"],
+            payloads=[f"p{i}" for i in range(20)],
+            concurrency=1,
+            rate=200
+        )
+        started = asyncio.get_running_loop().time()
+        await self.fuzzer.start_fuzzing()
+        # A closed loop with one worker would need 20 x 50 ms
+        self.assertLess(asyncio.get_running_loop().time() - started, 0.5)
+        self.assertEqual(self.fuzzer.request_count, 20)
+        open_loop = self.fuzzer.get_metrics()["open_loop"]
+        self.assertEqual((open_loop["scheduled"], open_loop["target_rate"]), (20, 200))
+        self.assertGreaterEqual(open_loop["corrected_latency"]["p50_ms"], 45)
+        with self.assertRaises(ValueError):
+            self.fuzzer.configure_fuzzing(target_url=self.config["target_url"], http_method="GET", parameters=["q"], payloads=["a"], rate=0)
+
+    async def test_response_time_outlier_is_confirmed(self):
+        async def timed_send(**kwargs):
+            payload = kwargs["params"]["q"]
+            elapsed = 3.0 if "sleep" in payload else 0.05 + len(payload) % 3 * 0.001
+            return {"url": kwargs["url"], "status": 200, "text": "OK", "elapsed": elapsed}
+        self.mock_http_client.send = AsyncMock(side_effect=timed_send)
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method="GET",
+            parameters=["q"],
+            payloads=[f"p{'x' * i}" for i in range(20)] + ["1' AND sleep(3)-- "],
+            concurrency=1
+        )
+        await self.fuzzer.start_fuzzing()
+        self.assertEqual(self.mock_http_client.send.call_count, 23)
+        flagged = [result for result in self.fuzzer.get_filtered_results() if result.get("latency_anomaly")]
+        self.assertEqual(len(flagged), 1)
+        self.assertEqual(flagged[0]["payload"], "1' AND sleep(3)-- ")
+        self.assertTrue(flagged[0]["latency_anomaly"]["confirmed"])
+        self.assertEqual(flagged[0]["latency_anomaly"]["retests"], [3.0, 3.0])
+        metrics = self.fuzzer.get_metrics()
+        self.assertEqual(metrics["confirmation_requests"], 2)
+        self.assertEqual(metrics["latency_baselines"]["q"]["confirmed"], 1)
+        # The re-tests are part of the request stats
+        self.assertEqual(self.fuzzer.request_stats.requests, 23)
+
+    async def test_latency_retests_do_not_block_the_worker(self):
+        sent = []
+        async def timed_send(**kwargs):
+            payload = kwargs["params"]["q"]
+            sent.append(payload)
+            if "sleep" in payload:
+                # Only the re-tests really take long
+                if sent.count(payload) > 1:
+                    await asyncio.sleep(0.2)
+                return {"url": kwargs["url"], "status": 200, "text": "OK", "elapsed": 3.0}
+            return {"url": kwargs["url"], "status": 200, "text": "OK", "elapsed": 0.05 + len(payload) % 3 * 0.001}
+        self.mock_http_client.send = AsyncMock(side_effect=timed_send)
+        payloads = [f"p{'x' * i}" for i in range(20)] + ["1' AND sleep(3)-- "] + [f"q{i}" for i in range(5)]
+        self.fuzzer.configure_fuzzing(
+            target_url=self.config["target_url"],
+            http_method="GET",
+            parameters=["q"],
+            payloads=payloads,
+            concurrency=1
+        )
+        await self.fuzzer.start_fuzzing()
+        # The single worker sent the remaining payloads while the first re-test was still waiting
+        self.assertEqual(sent.count("1' AND sleep(3)-- "), 3)
+        self.assertEqual(sent[-1], "1' AND sleep(3)-- ")
+        self.assertLess(sent.index("q4"), len(sent) - 1)
+        flagged = [result for result in self.fuzzer.get_filtered_results() if result.get("latency_anomaly")]
+        self.assertEqual(flagged[0]["latency_anomaly"]["retests"], [3.0, 3.0])
+        self.assertTrue(flagged[0]["latency_anomaly"]["confirmed"])
+
+unittest.main()
@@ -60,4 +60,12 @@ class TestFuzzerResponseProcessor(unittest.TestCase):
         results = self.processor.get_filtered_results()
         self.assertEqual(len(results), 0)
 
+    def test_process_response_expressions(self):
+        self.processor.set_filters(status_filter=[200, 500], hide_codes=[], length_threshold=0)
+        self.processor.set_expressions(match='status == 500 or body ~ "welcome"', filter="size in [11]")
+        for status, text in [(200, "Login failed"), (200, "Welcome, admin!"), (500, "Stack trace"), (500, "SQL syntax error")]:
+            self.processor.process_response(MockResponse("http://test.com", status, text))
+        results = self.processor.get_filtered_results()
+        self.assertEqual([result["snippet"] for result in results], ["Welcome, admin!", "SQL syntax error"])
+
 unittest.main()
\ No newline at end of file
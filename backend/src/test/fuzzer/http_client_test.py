@@ -3,32 +3,74 @@
 import asyncio
 import aiohttp
 import unittest
+from aiohttp import web
 from unittest.mock import patch, AsyncMock, MagicMock
 from src.modules.fuzzer.http_client import AsyncHttpClient
 
 class TestAsyncHttpClient(unittest.IsolatedAsyncioTestCase):
+    async def stream(self, chunks):
+        for chunk in chunks:
+            yield chunk
+
     @patch("aiohttp.ClientSession")
     async def test_send_successful_get_request(self, mock_client_session):
         mock_response = AsyncMock()
         mock_response.url = "http://test.com"
         mock_response.status = 200
-        mock_response.text = AsyncMock(return_value="Success")
+        mock_response.headers = {"Content-Type": "text/plain"}
+        mock_response.charset = None
+        mock_response.content.iter_chunked = MagicMock(return_value=self.stream([b"Succ", b"ess"]))
         mock_request_ctx = AsyncMock()
         mock_request_ctx.__aenter__.return_value = mock_response
         mock_session_instance = MagicMock()
         mock_session_instance.request.return_value = mock_request_ctx
-        mock_client_session.return_value.__aenter__.return_value = mock_session_instance
+        mock_session_instance.closed = False
+        mock_client_session.return_value = mock_session_instance
         client = AsyncHttpClient()
         result = await client.send(method="GET", url="http://test.com")
         self.assertEqual(result["url"], "http://test.com")
         self.assertEqual(result["status"], 200)
         self.assertEqual(result["text"], "Success")
+        self.assertEqual(result["headers"], {"Content-Type": "text/plain"})
+        self.assertGreaterEqual(result["elapsed"], 0)
+        self.assertEqual(result["metrics"]["bytes"], 7)
+        self.assertEqual(result["metrics"]["words"], 1)
+
+    async def test_session_is_reused(self):
+        async def handler(request):
+            return web.Response(text="ok")
+
+        connect_times = []
+        app = web.Application()
+        app.router.add_get("/", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        client = AsyncHttpClient(connection_limit=1)
+        try:
+            for _ in range(3):
+                result = await client.send(method="GET", url=f"http://127.0.0.1:{port}/", cookies={"session": "abc"})
+                self.assertEqual(result["status"], 200)
+                connect_times.append(result.timing.connect)
+            session = client._session
+            self.assertEqual(len(session.connector._conns), 1)
+            # Only the first request opened a connection
+            self.assertIsNotNone(connect_times[0])
+            self.assertEqual(connect_times[1:], [None, None])
+            await client.close()
+            self.assertTrue(session.closed)
+        finally:
+            await client.close()
+            await runner.cleanup()
 
     @patch("aiohttp.ClientSession")
     async def test_send_request_exception(self, mock_client_session):
         mock_session_instance = MagicMock()
         mock_session_instance.request.side_effect = Exception("Connection failed")
-        mock_client_session.return_value.__aenter__.return_value = mock_session_instance
+        mock_session_instance.closed = False
+        mock_client_session.return_value = mock_session_instance
         client = AsyncHttpClient()
         result = await client.send(method="GET", url="http://test.com")
         self.assertEqual(result["url"], "http://test.com")
@@ -0,0 +1,57 @@
+# latency_anomaly_test.py
+
+import random
+import unittest
+from src.modules.fuzzer.latency_anomaly import P2Quantile, LatencyAnomalyDetector
+
+class TestP2Quantile(unittest.TestCase):
+    def test_estimates_quantiles_of_a_stream(self):
+        generator = random.Random(3)
+        values = [generator.gauss(0.2, 0.03) for _ in range(5000)]
+        median, p90 = P2Quantile(0.5), P2Quantile(0.9)
+        for value in values:
+            median.add(value)
+            p90.add(value)
+        ordered = sorted(values)
+        self.assertAlmostEqual(median.value(), ordered[2500], delta=0.003)
+        self.assertAlmostEqual(p90.value(), ordered[4500], delta=0.003)
+
+    def test_small_streams_are_exact(self):
+        sketch = P2Quantile(0.5)
+        self.assertIsNone(sketch.value())
+        for value in (3, 1, 2):
+            sketch.add(value)
+        self.assertEqual(sketch.value(), 2)
+        with self.assertRaises(ValueError):
+            P2Quantile(1)
+
+class TestLatencyAnomalyDetector(unittest.TestCase):
+    def test_flags_outliers_and_keeps_them_out_of_the_baseline(self):
+        detector = LatencyAnomalyDetector(z_threshold=4, min_samples=10)
+        generator = random.Random(5)
+        for _ in range(50):
+            self.assertIsNone(detector.observe("id", generator.uniform(0.04, 0.06)))
+        # Not enough excess over the median to count, however stable the baseline
+        self.assertIsNone(detector.observe("id", 0.09))
+        z_score = detector.observe("id", 5.0)
+        self.assertGreater(z_score, 100)
+        baseline = detector.baselines["id"]
+        self.assertEqual((baseline.count, baseline.flagged), (51, 1))
+        self.assertTrue(detector.confirm("id", [5.1, 4.9]))
+        self.assertFalse(detector.confirm("id", [5.1, 0.05]))
+        summary = detector.summary()["id"]
+        self.assertEqual((summary["flagged"], summary["confirmed"]), (1, 1))
+        self.assertAlmostEqual(summary["median_ms"], 50, delta=5)
+
+    def test_no_flags_before_warmup_or_without_threshold(self):
+        detector = LatencyAnomalyDetector(z_threshold=4, min_samples=10)
+        for _ in range(5):
+            detector.observe("q", 0.05)
+        self.assertIsNone(detector.observe("q", 5.0))
+        collecting = LatencyAnomalyDetector(z_threshold=None)
+        for _ in range(20):
+            collecting.observe("q", 0.05)
+        self.assertIsNone(collecting.observe("q", 5.0))
+        self.assertEqual(collecting.baselines["q"].count, 21)
+
+unittest.main()
@@ -0,0 +1,54 @@
+# open_loop_test.py
+
+import time
+import asyncio
+import unittest
+from src.modules.fuzzer.open_loop import OpenLoopScheduler
+
+class TestOpenLoopScheduler(unittest.IsolatedAsyncioTestCase):
+    async def test_sends_on_fixed_timetable(self):
+        scheduler = OpenLoopScheduler(rate=50)
+        sent = []
+
+        async def send(item):
+            sent.append((item, time.perf_counter()))
+            await asyncio.sleep(0.03)
+
+        await scheduler.run(range(10), send)
+        self.assertEqual([item for item, _ in sent], list(range(10)))
+        offsets = [at - sent[0][1] for _, at in sent]
+        for index, offset in enumerate(offsets):
+            self.assertAlmostEqual(offset, index / 50, delta=0.015)
+        self.assertEqual(scheduler.stats()["missed_schedules"], 0)
+
+    async def test_corrects_for_coordinated_omission(self):
+        # One slot in flight: every request waits for the previous one, so most miss their slot
+        scheduler = OpenLoopScheduler(rate=100, max_in_flight=1)
+
+        async def send(item):
+            await asyncio.sleep(0.05)
+
+        await scheduler.run(range(6), send)
+        stats = scheduler.stats()
+        self.assertEqual((stats["scheduled"], stats["missed_schedules"]), (6, 5))
+        self.assertLess(stats["service_latency"]["max_ms"], 80)
+        # The last request was due at 50 ms and completed around 300 ms
+        self.assertGreater(stats["corrected_latency"]["max_ms"], 200)
+        self.assertGreater(stats["max_lag_ms"], 150)
+
+    async def test_send_error_stops_schedule(self):
+        scheduler = OpenLoopScheduler(rate=1000)
+        calls = []
+
+        async def send(item):
+            calls.append(item)
+            if item == 2:
+                raise asyncio.CancelledError("stopped by user")
+
+        with self.assertRaises(asyncio.CancelledError):
+            await scheduler.run(range(1000), send)
+        self.assertLess(len(calls), 20)
+        with self.assertRaises(ValueError):
+            OpenLoopScheduler(rate=0)
+
+unittest.main()
@@ -0,0 +1,61 @@
+# param_miner_test.py
+
+import math
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+from src.modules.fuzzer.param_miner import ParamMiner
+from src.modules.fuzzer.fuzzer_manager import FuzzerManager
+
+HIDDEN = {"debug", "admin", "callback"}
+
+def fake_target(max_params=None):
+    """A target that changes its page for `debug` and `admin`, reflects `callback` and rejects too many parameters"""
+    async def send(values):
+        if max_params is not None and len(values) > max_params:
+            return {"status": 414, "text": "URI Too Long"}
+        text = "<html>home</html>"
+        if "debug" in values:
+            text += "\nstack trace enabled"
+        if "admin" in values:
+            return {"status": 403, "text": "forbidden"}
+        if "callback" in values:
+            text = f"{values['callback']}({text})"
+        return {"status": 200, "text": text}
+    return send
+
+class TestParamMiner(unittest.IsolatedAsyncioTestCase):
+    async def test_finds_hidden_parameters_in_few_requests(self):
+        names = [f"name{i}" for i in range(5000)]
+        names[1234], names[4321], names[77] = "debug", "admin", "callback"
+        miner = ParamMiner(fake_target(), batch_size=256)
+        hits = await miner.mine(names)
+        self.assertEqual({hit["name"] for hit in hits}, HIDDEN)
+        reasons = {hit["name"]: hit["reason"] for hit in hits}
+        self.assertEqual(reasons["callback"], "reflected")
+        self.assertEqual(reasons["admin"], "changed")
+        budget = 3 + math.ceil(5000 / 256) + len(HIDDEN) * (2 * math.log2(256) + 1)
+        self.assertLess(miner.requests, budget)
+        self.assertLess(miner.requests, 120)
+
+    async def test_batch_size_shrinks_when_target_rejects_it(self):
+        miner = ParamMiner(fake_target(max_params=100), batch_size=256)
+        self.assertEqual(await miner.calibrate(), 64)
+        hits = await miner.mine([f"n{i}" for i in range(300)] + ["debug"])
+        self.assertEqual([hit["name"] for hit in hits], ["debug"])
+
+    async def test_manager_mines_query_parameters(self):
+        client = MagicMock()
+        target = fake_target()
+
+        async def send(**kwargs):
+            return await target(kwargs["params"] or {})
+        client.send = AsyncMock(side_effect=send)
+        fuzzer = FuzzerManager(http_client=client)
+        hits = await fuzzer.mine_parameters("http://test.com", "GET", ["a", "debug", "b", "a"], body_template={"page": "1"})
+        self.assertEqual([hit["name"] for hit in hits], ["debug"])
+        self.assertEqual(client.send.call_args_list[0].kwargs["params"], {"page": "1"})
+        self.assertEqual(fuzzer.mining_stats["candidates"], 3)
+        with self.assertRaises(ValueError):
+            await fuzzer.mine_parameters("http://test.com", "GET", [])
+
+unittest.main()
@@ -0,0 +1,55 @@
+# payload_mutations_test.py
+
+import unittest
+from src.modules.fuzzer.payload_mutations import MutationPipeline, MutatedPayloadSource
+from src.modules.fuzzer.payload_source import ListPayloadSource
+
+class TestPayloadMutations(unittest.TestCase):
+    def test_transform_chains(self):
+        pipeline = MutationPipeline([
+            "identity",
+            "url_encode",
+            "url_encode|url_encode",
+            "double_url_encode",
+            "case_flip",
+            "prefix:'|suffix:--",
+            "base64",
+            "unicode_escape",
+            "html_entities"
+        ])
+        self.assertEqual(list(pipeline.expand("<a b>")), [
+            "<a b>",
+            "%3Ca%20b%3E",
+            "%253Ca%2520b%253E",
+            "%253Ca%2520b%253E",
+            "<A B>",
+            "'<a b>--",
+            "PGEgYj4=",
+            "\\u003c\\u0061\\u0020\\u0062\\u003e",
+            "&#x3c;&#x61;&#x20;&#x62;&#x3e;"
+        ])
+
+    def test_memoization_statistics(self):
+        pipeline = MutationPipeline(["base64", "url_encode|base64"])
+        for _ in range(3):
+            list(pipeline.expand("a b"))
+        stats = pipeline.stats()
+        self.assertEqual(stats["base64"]["applied"], 6)
+        self.assertEqual(stats["base64"]["cache_misses"], 2)
+        self.assertEqual(stats["base64"]["cache_hits"], 4)
+        self.assertEqual(stats["url_encode"]["applied"], 3)
+
+    def test_mutated_source_is_lazy_and_indexable(self):
+        source = MutatedPayloadSource(ListPayloadSource(["a", "b", "c"]), MutationPipeline(["identity", "upper"]))
+        self.assertEqual(source.count(), 6)
+        self.assertEqual(list(source), ["a", "A", "b", "B", "c", "C"])
+        self.assertEqual(list(source.iter_from(3)), ["B", "c", "C"])
+        self.assertEqual(source.get(4), "c")
+
+    def test_unknown_mutation(self):
+        with self.assertRaises(ValueError):
+            MutationPipeline(["rot13"])
+        with self.assertRaises(ValueError):
+            MutationPipeline([])
+
+unittest.main()
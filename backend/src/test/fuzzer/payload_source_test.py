@@ -0,0 +1,96 @@
+# payload_source_test.py
+
+import os
+import tempfile
+import unittest
+from src.modules.fuzzer.payload_source import (
+    PayloadSource,
+    ListPayloadSource,
+    FilePayloadSource,
+    RangePayloadSource,
+    GeneratorPayloadSource,
+    ChainPayloadSource,
+    DedupPayloadSource,
+    as_payload_source
+)
+
+class TestPayloadSources(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "payloads.txt")
+        self.index_root = os.path.join(self.tmp_dir.name, "cache")
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("admin\n\n  ' OR 1=1 --  \r\n<script>\nadmin\nlast")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_file_source_matches_stripped_lines(self):
+        source = FilePayloadSource(self.path, self.index_root)
+        self.assertEqual(source.count(), 5)
+        self.assertEqual(list(source), ["admin", "' OR 1=1 --", "<script>", "admin", "last"])
+        self.assertEqual(source.get(2), "<script>")
+        self.assertEqual(list(source.iter_from(3)), ["admin", "last"])
+        source.close()
+        # The index is cached, nothing is written next to the payload file
+        self.assertEqual(sorted(os.listdir(self.tmp_dir.name)), ["cache", "payloads.txt"])
+        self.assertEqual(len(os.listdir(self.index_root)), 1)
+
+    def test_file_source_reuses_persisted_index(self):
+        FilePayloadSource(self.path, self.index_root).close()
+        with FilePayloadSource(self.path, self.index_root) as reopened:
+            self.assertIsInstance(reopened.lines._offsets, memoryview)
+            self.assertEqual(reopened.get(4), "last")
+        # A file that changed gets a new index
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\nmore")
+        with FilePayloadSource(self.path, self.index_root) as changed:
+            self.assertEqual(changed.count(), 6)
+        self.assertEqual(len(os.listdir(self.index_root)), 2)
+
+    def test_index_kept_in_memory_when_cache_is_not_writable(self):
+        blocked = os.path.join(self.tmp_dir.name, "blocked")
+        with open(blocked, "w") as f:
+            f.write("not a directory")
+        with FilePayloadSource(self.path, os.path.join(blocked, "cache")) as source:
+            self.assertEqual(source.count(), 5)
+            self.assertEqual(source.get(4), "last")
+
+    def test_range_and_generator_sources(self):
+        pins = RangePayloadSource(0, 10000, template="{:04d}")
+        self.assertEqual(pins.count(), 10000)
+        self.assertEqual(pins.get(42), "0042")
+        self.assertEqual(next(pins.iter_from(9999)), "9999")
+
+        generated = GeneratorPayloadSource(lambda: (f"user{i}" for i in range(3)))
+        self.assertIsNone(generated.count())
+        self.assertEqual(list(generated.iter_from(1)), ["user1", "user2"])
+        with self.assertRaises(TypeError):
+            generated.get(0)
+
+    def test_chain_source(self):
+        chain = ChainPayloadSource([ListPayloadSource(["a", "b"]), RangePayloadSource(0, 3)])
+        self.assertEqual(chain.count(), 5)
+        self.assertEqual(chain.get(3), "1")
+        self.assertEqual(list(chain.iter_from(1)), ["b", "0", "1", "2"])
+
+    def test_streaming_dedup(self):
+        source = DedupPayloadSource(FilePayloadSource(self.path, self.index_root))
+        self.assertEqual(list(source), ["admin", "' OR 1=1 --", "<script>", "last"])
+        self.assertEqual(list(source.iter_from(2)), ["<script>", "last"])
+        self.assertEqual(source.count(), 4)
+        source.close()
+        self.assertIsNone(DedupPayloadSource(GeneratorPayloadSource(lambda: iter(["a", "a"]))).count())
+
+    def test_invalid_payloads(self):
+        with self.assertRaises(ValueError):
+            as_payload_source("/does/not/exist.txt")
+
+    def test_sources_must_implement_iter_from(self):
+        class Incomplete(PayloadSource):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+unittest.main()
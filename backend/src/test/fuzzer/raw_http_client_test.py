@@ -0,0 +1,172 @@
+# raw_http_client_test.py
+
+import gzip
+import asyncio
+import unittest
+from src.modules.fuzzer.raw_http_client import RawHttpClient
+
+class TestRawHttpClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.requests = []
+        self.connections = 0
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        self.base = f"http://127.0.0.1:{self.server.sockets[0].getsockname()[1]}"
+        self.client = RawHttpClient(pool_size=2, pipeline_depth=4)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        # Let the handlers see the connections close before the server goes away
+        await asyncio.sleep(0.05)
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        served = 0
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode("latin-1").split("\r\n")
+                headers = {line.split(":", 1)[0].lower(): line.split(":", 1)[1].strip() for line in lines[1:] if ":" in line}
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append((lines[0], headers, body))
+                path = lines[0].split(" ")[1]
+                if path.startswith("/chunked"):
+                    writer.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n4;ext=1\r\nWiki\r\n6\r\npedia \r\n0\r\nX-Trailer: 1\r\n\r\n")
+                elif path.startswith("/close"):
+                    writer.write(b"HTTP/1.1 500 Internal Server Error\r\nConnection: close\r\n\r\nuntil the end")
+                    await writer.drain()
+                    writer.close()
+                    return
+                elif path.startswith("/reset") or (path.startswith("/stale") and served):
+                    # Drop the connection without answering
+                    writer.transport.abort()
+                    return
+                elif path.startswith("/gzip"):
+                    payload = gzip.compress(b"compressed body")
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nContent-Length: %d\r\n\r\n%s" % (len(payload), payload))
+                elif path.startswith("/slow"):
+                    # Never answer, until the client gives up and closes the connection
+                    await reader.read()
+                    writer.close()
+                    return
+                elif lines[0].startswith("HEAD"):
+                    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 1234\r\n\r\n")
+                else:
+                    answer = f"{lines[0].split(' ')[0]} {path} {body.decode()}".encode()
+                    writer.write(b"HTTP/1.1 100 Continue\r\n\r\nHTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: %d\r\n\r\n%s" % (len(answer), answer))
+                await writer.drain()
+                served += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    async def test_get_with_params_and_keep_alive(self):
+        headers = {"User-Agent": "trace", "X-Test": "1"}
+        first = await self.client.send("GET", f"{self.base}/search?a=1", headers=headers, cookies={"sid": "abc"}, params={"q": "a b"})
+        second = await self.client.send("get", f"{self.base}/other", headers=headers)
+        self.assertEqual(first["status"], 200)
+        self.assertEqual(first["text"], "GET /search?a=1&q=a+b ")
+        self.assertEqual(first["metrics"]["bytes"], len(first.body))
+        self.assertEqual(second["text"], "GET /other ")
+        request_line, request_headers, _ = self.requests[0]
+        self.assertEqual(request_line, "GET /search?a=1&q=a+b HTTP/1.1")
+        self.assertEqual(request_headers["cookie"], "sid=abc")
+        self.assertEqual(request_headers["x-test"], "1")
+        self.assertEqual(request_headers["host"], self.base[len("http://"):])
+        self.assertEqual(self.connections, 1)
+        self.assertIsNotNone(first.timing.connect)
+        self.assertIsNone(second.timing.connect)
+        self.assertLessEqual(second.timing.ttfb, second.timing.total)
+
+    async def test_post_form_body(self):
+        response = await self.client.send("POST", f"{self.base}/login", data={"user": "admin", "pass": "x&y"}, params={"ignored": "1"})
+        self.assertEqual(response["text"], "POST /login user=admin&pass=x%26y")
+        _, request_headers, body = self.requests[0]
+        self.assertEqual(request_headers["content-type"], "application/x-www-form-urlencoded")
+        self.assertEqual(int(request_headers["content-length"]), len(body))
+
+    async def test_pipelined_requests_answer_in_order(self):
+        client = RawHttpClient(pool_size=1, pipeline_depth=8)
+        try:
+            responses = await asyncio.gather(*(client.send("GET", f"{self.base}/item{index}") for index in range(20)))
+        finally:
+            await client.close()
+        self.assertEqual([response["text"] for response in responses], [f"GET /item{index} " for index in range(20)])
+        self.assertEqual(self.connections, 1)
+
+    async def test_chunked_gzip_and_close_delimited_bodies(self):
+        chunked = await self.client.send("GET", f"{self.base}/chunked")
+        self.assertEqual(chunked.body, b"Wikipedia ")
+        compressed = await self.client.send("GET", f"{self.base}/gzip")
+        self.assertEqual(compressed.body, b"compressed body")
+        closed = await self.client.send("GET", f"{self.base}/close")
+        self.assertEqual((closed["status"], closed.body), (500, b"until the end"))
+        after = await self.client.send("GET", f"{self.base}/after")
+        self.assertEqual(after["text"], "GET /after ")
+        self.assertEqual(self.connections, 2)
+
+    async def test_head_has_no_body(self):
+        response = await self.client.send("HEAD", f"{self.base}/page")
+        self.assertEqual((response["status"], response.body), (200, b""))
+        follow = await self.client.send("GET", f"{self.base}/next")
+        self.assertEqual(follow["text"], "GET /next ")
+
+    async def test_errors_become_error_responses(self):
+        timed_out = await self.client.send("GET", f"{self.base}/slow", timeout=0.2)
+        self.assertIsNone(timed_out["status"])
+        refused = await RawHttpClient().send("GET", "http://127.0.0.1:1/")
+        self.assertIsNone(refused["status"])
+        invalid = await self.client.send("GET", "ftp://example.com/")
+        self.assertIn("Unsupported URL", invalid["text"])
+
+    async def test_timeout_covers_the_tls_handshake(self):
+        # Accepts connections but never answers the TLS handshake
+        stalled = []
+
+        async def stall(reader, writer):
+            stalled.append(writer)
+            await reader.read()
+            writer.close()
+        server = await asyncio.start_server(stall, "127.0.0.1", 0)
+        client = RawHttpClient(pool_size=1)
+        url = f"https://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+        try:
+            started = asyncio.get_running_loop().time()
+            # The second request waits on the first one's connection attempt, then gets its own deadline
+            responses = await asyncio.gather(client.send("GET", url, timeout=0.3), client.send("GET", url, timeout=0.3))
+            self.assertLess(asyncio.get_running_loop().time() - started, 2)
+            self.assertEqual([response["status"] for response in responses], [None, None])
+            self.assertEqual(next(iter(client._pools.values())).opening, set())
+        finally:
+            await client.close()
+            for writer in stalled:
+                writer.close()
+            server.close()
+            await server.wait_closed()
+
+    async def test_fresh_connection_errors_are_not_retried(self):
+        response = await self.client.send("GET", f"{self.base}/reset")
+        self.assertIsNone(response["status"])
+        self.assertEqual(self.connections, 1)
+
+    async def test_stale_keep_alive_connection_is_retried(self):
+        first = await self.client.send("GET", f"{self.base}/stale/first")
+        self.assertEqual(first["status"], 200)
+        # The server drops the kept-alive connection on the next request, which is sent again on a new one
+        second = await self.client.send("GET", f"{self.base}/stale/again")
+        self.assertEqual(second["text"], "GET /stale/again ")
+        self.assertEqual(self.connections, 2)
+
+    def test_header_block_is_built_once_per_headers_dict(self):
+        headers = {"Accept": "*/*", "Host": "ignored"}
+        first, _, _ = self.client.build_request("GET", "https://example.com:8443/a b", headers=headers)
+        second, origin, url = self.client.build_request("GET", "https://example.com:8443/c", headers=headers)
+        self.assertEqual(len(self.client._header_blocks), 1)
+        self.assertTrue(first.startswith(b"GET /a%20b HTTP/1.1\r\nHost: example.com:8443\r\nAccept: */*\r\n"))
+        self.assertNotIn(b"ignored", second)
+        self.assertEqual(origin, ("https", "example.com", 8443))
+        self.assertEqual(url, "https://example.com:8443/c")
+        with self.assertRaises(ValueError):
+            RawHttpClient(pipeline_depth=0)
+
+unittest.main()
@@ -0,0 +1,81 @@
+# request_template_test.py
+
+import json
+import unittest
+from src.modules.fuzzer.request_template import compile_request_template, SegmentTemplate, RequestTemplate
+
+class TestRequestTemplate(unittest.TestCase):
+    def test_form_template_keeps_dict_behaviour(self):
+        template = compile_request_template(
+            "http://test.com/login", "get", body_template={"user": "", "submit": "1"}, parameters=["user", "extra"]
+        )
+        request = template.render({"user": "admin"})
+        self.assertEqual(request.method, "GET")
+        self.assertEqual(request.params, {"user": "admin", "submit": "1"})
+        self.assertIsNone(request.data)
+        post = compile_request_template("http://test.com", "POST", body_template={"a": "1"}, parameters=["a"])
+        self.assertEqual(post.render({"a": "x"}).data, {"a": "x"})
+        self.assertEqual(post.render({}).data, {"a": "1"})
+
+    def test_raw_request_markers(self):
+        raw = (
+            "PATCH /api/users/§id:1§?debug=§flag§ HTTP/1.1\r\n"
+            "Host: api.test.com\r\n"
+            "X-Token: Bearer §token§\r\n"
+            "Content-Type: application/x-www-form-urlencoded\r\n"
+            "Content-Length: 99\r\n"
+            "\r\n"
+            "name=§name§&name2=§name§"
+        )
+        template = compile_request_template("https://ignored.com", "GET", headers={"User-Agent": "t"}, raw_request=raw, parameters=["id", "name"])
+        self.assertEqual(template.injection_points, ["id", "flag", "token", "name"])
+        request = template.render({"name": "a b", "flag": "x&y=1"})
+        self.assertEqual(request.method, "PATCH")
+        self.assertEqual(request.url, "https://api.test.com/api/users/1?debug=x%26y%3D1")
+        self.assertEqual(request.headers, {
+            "User-Agent": "t",
+            "Content-Type": "application/x-www-form-urlencoded",
+            "X-Token": "Bearer "
+        })
+        self.assertEqual(request.data, b"name=a b&name2=a b")
+        self.assertEqual(template.render({"id": "é"}).url, "https://api.test.com/api/users/%C3%A9?debug=")
+
+    def test_raw_request_errors(self):
+        with self.assertRaises(ValueError):
+            compile_request_template("", "GET", raw_request="GET /§q§ HTTP/1.1\n\n", parameters=["q"])
+        with self.assertRaises(ValueError):
+            compile_request_template("http://t.com", "GET", raw_request="GET /§q§ HTTP/1.1\nHost: t.com", parameters=["missing"])
+        with self.assertRaises(ValueError):
+            compile_request_template("http://t.com", "GET", raw_request="nonsense", parameters=["q"])
+
+    def test_json_pointers(self):
+        document = {"user": {"name": "bob", "roles": ["a", "b"]}, "n/m": 3, "keep": True}
+        template = compile_request_template(
+            "http://api.test.com/v1", "post", json_template=document, parameters=["/user/name", "/user/roles/1", "/n~1m"]
+        )
+        self.assertEqual(template.headers["Content-Type"], "application/json")
+        body = template.render({"/user/name": 'x"}', "/n~1m": "ü"}).data
+        self.assertIsInstance(body, bytes)
+        self.assertEqual(json.loads(body), {"user": {"name": 'x"}', "roles": ["a", "b"]}, "n/m": "ü", "keep": True})
+        self.assertEqual(json.loads(template.render({}).data), document)
+        self.assertEqual(document["user"]["name"], "bob")
+        with self.assertRaises(ValueError):
+            compile_request_template("http://t.com", "POST", json_template='{"a": 1}', parameters=["/b"])
+        with self.assertRaises(ValueError):
+            compile_request_template("http://t.com", "POST", json_template={"a": [1]}, parameters=["/a/5"])
+
+    def test_segment_template_static_and_repeated(self):
+        static = SegmentTemplate.from_markers("no markers", str)
+        self.assertEqual(static.render({"x": "1"}), "no markers")
+        repeated = SegmentTemplate.from_markers("§a§-§b:def§-§a§", str)
+        self.assertEqual(repeated.names, ["a", "b"])
+        self.assertEqual(repeated.render({"a": "1"}), "1-def-1")
+
+    def test_templates_must_implement_render(self):
+        class Incomplete(RequestTemplate):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+unittest.main()